@@ -24,11 +24,13 @@ Usage:
 import argparse
 import os
 import sys
-import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
 from utils.unified_logger import logger
 from utils.unified_console import console
+from utils.network_metrics import (
+    DEFAULT_CLUSTERING_TRIALS, DEFAULT_METRICS_CACHE_DIR, compute_metrics_for_files, format_clustering
+)
 
 
 def parse_arguments():
@@ -41,6 +43,7 @@ Examples:
   %(prog)s network1.graphml network2.graphml
   %(prog)s *.graphml --save-plot metrics.png
   %(prog)s *.graphml --output-dir results --dpi 150
+  %(prog)s *.graphml --jobs 4 --no-show --save-plot metrics.png
         """
     )
 
@@ -84,6 +87,41 @@ Examples:
         help="Don't display the plot (only save if --save-plot is specified)"
     )
 
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes computing metrics, one file per worker (default: 1)"
+    )
+
+    parser.add_argument(
+        "--metrics-cache-dir",
+        type=str,
+        default=DEFAULT_METRICS_CACHE_DIR,
+        help=f"Directory where metrics are cached per file content hash (default: {DEFAULT_METRICS_CACHE_DIR})"
+    )
+
+    parser.add_argument(
+        "--no-metrics-cache",
+        action="store_true",
+        help="Do not read nor write the metrics cache"
+    )
+
+    parser.add_argument(
+        "--fast-metrics",
+        action="store_true",
+        help="Approximate metrics for very large networks: sampled clustering coefficient (labelled ≈value±95%% CI) "
+             "and array-based degree and component metrics"
+    )
+
+    parser.add_argument(
+        "--clustering-trials",
+        type=int,
+        default=DEFAULT_CLUSTERING_TRIALS,
+        help=f"Number of sampled trials of the approximate clustering coefficient with --fast-metrics "
+             f"(default: {DEFAULT_CLUSTERING_TRIALS})"
+    )
+
     return parser.parse_args()
 
 
@@ -116,74 +154,6 @@ def validate_files(files, verbose=False):
     return valid_files
 
 
-def read_graphml_file(filepath, verbose=False):
-    """Read and validate a GraphML file."""
-    try:
-        graph = nx.read_graphml(filepath)
-        filename = os.path.basename(filepath)
-
-        if verbose:
-            console.print(f"  ✓ {filename}: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
-
-        return graph, filename
-
-    except Exception as e:
-        logger.error(f"Error reading {filepath}: {e}")
-        return None, None
-
-
-def calculate_metrics(graph):
-    """Calculate various network metrics."""
-    metrics = {}
-
-    # Basic metrics
-    metrics['num_nodes'] = graph.number_of_nodes()
-    metrics['num_edges'] = graph.number_of_edges()
-    metrics['num_isolates'] = nx.number_of_isolates(graph)
-
-    # Degree metrics
-    degrees = [d for n, d in graph.degree()]
-    metrics['avg_degree'] = np.mean(degrees) if degrees else 0
-    metrics['max_degree'] = max(degrees) if degrees else 0
-    metrics['min_degree'] = min(degrees) if degrees else 0
-
-    # Graph properties
-    metrics['density'] = nx.density(graph) if metrics['num_nodes'] > 1 else 0
-
-    # Clustering coefficient (only for undirected graphs)
-    if not nx.is_directed(graph):
-        try:
-            metrics['avg_clustering'] = nx.average_clustering(graph)
-        except:
-            metrics['avg_clustering'] = 0
-    else:
-        metrics['avg_clustering'] = 0
-
-    # Connected components
-    if nx.is_directed(graph):
-        # Use weakly connected components for directed graphs
-        components = list(nx.weakly_connected_components(graph))
-    else:
-        components = list(nx.connected_components(graph))
-
-    metrics['num_components'] = len(components)
-
-    # Size of largest component
-    if components:
-        largest_component = max(components, key=len)
-        metrics['largest_component_size'] = len(largest_component)
-        metrics['largest_component_percentage'] = (len(largest_component) / metrics['num_nodes']) * 100
-    else:
-        metrics['largest_component_size'] = 0
-        metrics['largest_component_percentage'] = 0
-
-    # Graph type
-    metrics['is_directed'] = nx.is_directed(graph)
-    metrics['is_weighted'] = nx.is_weighted(graph)
-
-    return metrics
-
-
 def create_metrics_dataframe(files_data):
     """Organize metrics into a structured format."""
     data = {
@@ -198,7 +168,10 @@ def create_metrics_dataframe(files_data):
         'largest_component_size': [],
         'largest_component_percentage': [],
         'is_directed': [],
-        'is_weighted': []
+        'is_weighted': [],
+        'approximate': [],
+        'avg_clustering_ci': [],
+        'avg_clustering_label': []
     }
 
     for filename, metrics in files_data:
@@ -214,6 +187,9 @@ def create_metrics_dataframe(files_data):
         data['largest_component_percentage'].append(metrics['largest_component_percentage'])
         data['is_directed'].append(metrics['is_directed'])
         data['is_weighted'].append(metrics['is_weighted'])
+        data['approximate'].append(metrics.get('approximate', False))
+        data['avg_clustering_ci'].append(metrics.get('avg_clustering_ci', 0))
+        data['avg_clustering_label'].append(format_clustering(metrics))
 
     return data
 
@@ -285,10 +261,16 @@ def create_comparison_plot(data, output_dir=".", save_path=None, dpi=100):
 
     # Plot 4: Clustering Coefficient
     ax4 = plt.subplot(3, 3, 4)
-    bars = ax4.bar(display_names, data['avg_clustering'], color='red', alpha=0.7)
+    if any(data['approximate']):
+        # Sampled estimates are shown with their 95% confidence interval
+        bars = ax4.bar(display_names, data['avg_clustering'], color='red', alpha=0.7,
+                       yerr=data['avg_clustering_ci'], capsize=3)
+        ax4.set_title('Average Clustering Coefficient (approx., 95% CI)')
+    else:
+        bars = ax4.bar(display_names, data['avg_clustering'], color='red', alpha=0.7)
+        ax4.set_title('Average Clustering Coefficient')
     ax4.set_xlabel('Graph Files')
     ax4.set_ylabel('Clustering Coefficient')
-    ax4.set_title('Average Clustering Coefficient')
     ax4.tick_params(axis='x', rotation=45)
     ax4.grid(True, alpha=0.3, linestyle='--')
 
@@ -424,7 +406,7 @@ def print_metrics_summary(data):
                "Clustering", "Components", "Largest %", "Directed", "Weighted"]
 
     # Print header
-    header_format = "{:<4} {:<25} {:>8} {:>8} {:>8} {:>8} {:>8} {:>8} {:>10} {:>10} {:>8} {:>8}"
+    header_format = "{:<4} {:<25} {:>8} {:>8} {:>8} {:>8} {:>8} {:>13} {:>10} {:>10} {:>8} {:>8}"
     console.print(header_format.format(*headers))
     console.print("-" * 100)
 
@@ -438,7 +420,7 @@ def print_metrics_summary(data):
             f"{data['num_isolates'][i]:,}",
             f"{data['avg_degree'][i]:.2f}",
             f"{data['density'][i]:.4f}",
-            f"{data['avg_clustering'][i]:.3f}",
+            data['avg_clustering_label'][i],
             f"{data['num_components'][i]:,}",
             f"{data['largest_component_percentage'][i]:.1f}%",
             "✓" if data['is_directed'][i] else "✗",
@@ -464,6 +446,8 @@ def print_metrics_summary(data):
     ]
     console.print(header_format.format(*avg_row))
     console.print("=" * 100)
+    if any(data['approximate']):
+        console.print("≈ Clustering is a sampled estimate ± 95% confidence interval (--fast-metrics)")
 
 
 def main():
@@ -484,16 +468,31 @@ def main():
     if args.verbose:
         console.print(f"\nProcessing {len(valid_files)} GraphML files:")
 
-    # Process each file
+    # Process each file, in parallel and reusing cached metrics
     files_data = []
     failed_files = []
 
-    for filepath in valid_files:
-        graph, filename = read_graphml_file(filepath, args.verbose)
+    def report_file(result, from_cache):
+        filepath, metrics, error = result
+        if error:
+            logger.error(f"Error reading {filepath}: {error}")
+        elif args.verbose:
+            cached = " (cached)" if from_cache else ""
+            console.print(f"  ✓ {os.path.basename(filepath)}: {metrics['num_nodes']} nodes, "
+                          f"{metrics['num_edges']} edges{cached}")
+
+    results = compute_metrics_for_files(
+        valid_files,
+        jobs=args.jobs,
+        cache_dir=None if args.no_metrics_cache else args.metrics_cache_dir,
+        on_result=report_file,
+        fast_metrics=args.fast_metrics,
+        clustering_trials=args.clustering_trials
+    )
 
-        if graph is not None:
-            metrics = calculate_metrics(graph)
-            files_data.append((filename, metrics))
+    for filepath, metrics, error in results:
+        if metrics is not None:
+            files_data.append((os.path.basename(filepath), metrics))
         else:
             failed_files.append(filepath)
 
@@ -24,11 +24,11 @@ Usage:
 import argparse
 import os
 import sys
-import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
 from utils.unified_logger import logger
 from utils.unified_console import console
+from utils import network_metrics
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from rich.table import Table
 from rich import box
@@ -96,6 +96,42 @@ Examples:
         help="Don't display the Rich table summary"
     )
 
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes computing metrics, one file per worker (default: 1)"
+    )
+
+    parser.add_argument(
+        "--metrics-cache-dir",
+        type=str,
+        default=network_metrics.DEFAULT_METRICS_CACHE_DIR,
+        help="Directory where metrics are cached per file content hash "
+             f"(default: {network_metrics.DEFAULT_METRICS_CACHE_DIR})"
+    )
+
+    parser.add_argument(
+        "--no-metrics-cache",
+        action="store_true",
+        help="Do not read nor write the metrics cache"
+    )
+
+    parser.add_argument(
+        "--fast-metrics",
+        action="store_true",
+        help="Approximate metrics for very large networks: sampled clustering coefficient (labelled ≈value±95%% CI) "
+             "and array-based degree and component metrics"
+    )
+
+    parser.add_argument(
+        "--clustering-trials",
+        type=int,
+        default=network_metrics.DEFAULT_CLUSTERING_TRIALS,
+        help=f"Number of sampled trials of the approximate clustering coefficient with --fast-metrics "
+             f"(default: {network_metrics.DEFAULT_CLUSTERING_TRIALS})"
+    )
+
     return parser.parse_args()
 
 
@@ -153,70 +189,6 @@ def validate_files(files, verbose=False):
     return valid_files
 
 
-def read_graphml_file(filepath):
-    """Read and validate a GraphML file."""
-    try:
-        graph = nx.read_graphml(filepath)
-        filename = os.path.basename(filepath)
-        return graph, filename, None
-
-    except Exception as e:
-        return None, None, str(e)
-
-
-def calculate_metrics(graph, filename):
-    """Calculate various network metrics."""
-    metrics = {}
-
-    # Basic metrics
-    metrics['filename'] = filename
-    metrics['num_nodes'] = graph.number_of_nodes()
-    metrics['num_edges'] = graph.number_of_edges()
-    metrics['num_isolates'] = nx.number_of_isolates(graph)
-
-    # Degree metrics
-    degrees = [d for n, d in graph.degree()]
-    metrics['avg_degree'] = np.mean(degrees) if degrees else 0
-    metrics['max_degree'] = max(degrees) if degrees else 0
-    metrics['min_degree'] = min(degrees) if degrees else 0
-
-    # Graph properties
-    metrics['density'] = nx.density(graph) if metrics['num_nodes'] > 1 else 0
-
-    # Clustering coefficient (only for undirected graphs)
-    if not nx.is_directed(graph):
-        try:
-            metrics['avg_clustering'] = nx.average_clustering(graph)
-        except:
-            metrics['avg_clustering'] = 0
-    else:
-        metrics['avg_clustering'] = 0
-
-    # Connected components
-    if nx.is_directed(graph):
-        # Use weakly connected components for directed graphs
-        components = list(nx.weakly_connected_components(graph))
-    else:
-        components = list(nx.connected_components(graph))
-
-    metrics['num_components'] = len(components)
-
-    # Size of largest component
-    if components:
-        largest_component = max(components, key=len)
-        metrics['largest_component_size'] = len(largest_component)
-        metrics['largest_component_percentage'] = (len(largest_component) / metrics['num_nodes']) * 100
-    else:
-        metrics['largest_component_size'] = 0
-        metrics['largest_component_percentage'] = 0
-
-    # Graph type
-    metrics['is_directed'] = nx.is_directed(graph)
-    metrics['is_weighted'] = nx.is_weighted(graph)
-
-    return metrics
-
-
 def create_metrics_dataframe(all_metrics):
     """Organize metrics into a structured format."""
     data = {
@@ -231,7 +203,10 @@ def create_metrics_dataframe(all_metrics):
         'largest_component_size': [],
         'largest_component_percentage': [],
         'is_directed': [],
-        'is_weighted': []
+        'is_weighted': [],
+        'approximate': [],
+        'avg_clustering_ci': [],
+        'avg_clustering_label': []
     }
 
     for metrics in all_metrics:
@@ -247,6 +222,9 @@ def create_metrics_dataframe(all_metrics):
         data['largest_component_percentage'].append(metrics['largest_component_percentage'])
         data['is_directed'].append(metrics['is_directed'])
         data['is_weighted'].append(metrics['is_weighted'])
+        data['approximate'].append(metrics.get('approximate', False))
+        data['avg_clustering_ci'].append(metrics.get('avg_clustering_ci', 0))
+        data['avg_clustering_label'].append(network_metrics.format_clustering(metrics))
 
     return data
 
@@ -318,10 +296,16 @@ def create_comparison_plot(data, output_dir=".", save_path=None, dpi=100):
 
     # Plot 4: Clustering Coefficient
     ax4 = plt.subplot(3, 3, 4)
-    bars = ax4.bar(display_names, data['avg_clustering'], color='red', alpha=0.7)
+    if any(data['approximate']):
+        # Sampled estimates are shown with their 95% confidence interval
+        bars = ax4.bar(display_names, data['avg_clustering'], color='red', alpha=0.7,
+                       yerr=data['avg_clustering_ci'], capsize=3)
+        ax4.set_title('Average Clustering Coefficient (approx., 95% CI)')
+    else:
+        bars = ax4.bar(display_names, data['avg_clustering'], color='red', alpha=0.7)
+        ax4.set_title('Average Clustering Coefficient')
     ax4.set_xlabel('Graph Files')
     ax4.set_ylabel('Clustering Coefficient')
-    ax4.set_title('Average Clustering Coefficient')
     ax4.tick_params(axis='x', rotation=45)
     ax4.grid(True, alpha=0.3, linestyle='--')
 
@@ -450,13 +434,17 @@ def create_comparison_plot(data, output_dir=".", save_path=None, dpi=100):
 def create_rich_metrics_table(data):
     """Create a Rich table with metrics summary."""
 
+    caption = f"Total files: {len(data['filenames'])}"
+    if any(data['approximate']):
+        caption += " • ≈ sampled clustering estimate ± 95% confidence interval"
+
     # Create main table
     table = Table(
         title="[bold cyan]Network Metrics Summary[/bold cyan]",
         box=box.ROUNDED,
         header_style="bold magenta",
         title_style="bold cyan",
-        caption=f"Total files: {len(data['filenames'])}",
+        caption=caption,
         show_lines=True,
     )
 
@@ -489,7 +477,7 @@ def create_rich_metrics_table(data):
             f"[{isolate_color}]{data['num_isolates'][i]:,}[/{isolate_color}]",
             f"{data['avg_degree'][i]:.2f}",
             f"{data['density'][i]:.4f}",
-            f"{data['avg_clustering'][i]:.3f}",
+            data['avg_clustering_label'][i],
             f"{data['num_components'][i]:,}",
             f"{data['largest_component_percentage'][i]:.1f}%",
             "✓" if data['is_directed'][i] else "✗",
@@ -604,20 +592,27 @@ def main():
             filename=""
         )
 
-        for filepath in valid_files:
-            filename = os.path.basename(filepath)
-            progress.update(task, filename=filename[:20] + "..." if len(filename) > 20 else filename)
-
-            graph, filename, error = read_graphml_file(filepath)
+        def advance(result, from_cache):
+            filename = os.path.basename(result[0])
+            progress.update(task, advance=1,
+                            filename=filename[:20] + "..." if len(filename) > 20 else filename)
+
+        # Files are processed in parallel (one per worker), metrics of unchanged files come from the cache
+        results = network_metrics.compute_metrics_for_files(
+            valid_files,
+            jobs=args.jobs,
+            cache_dir=None if args.no_metrics_cache else args.metrics_cache_dir,
+            on_result=advance,
+            fast_metrics=args.fast_metrics,
+            clustering_trials=args.clustering_trials,
+        )
 
-            if graph is not None:
-                metrics = calculate_metrics(graph, filename)
-                all_metrics.append(metrics)
+        for filepath, metrics, error in results:
+            if metrics is not None:
+                all_metrics.append({'filename': os.path.basename(filepath), **metrics})
             else:
                 failed_files.append((filepath, error))
 
-            progress.update(task, advance=1)
-
     if len(all_metrics) < 2:
         console.print("[red]✗ Error: Need at least 2 successfully processed files for comparison[/red]")
         sys.exit(1)
@@ -1,6 +1,6 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import List, DefaultDict, Dict, Set
+from typing import List, DefaultDict, Dict, Optional, Set
 
 import networkx as nx
 import networkx_temporal as tx
@@ -14,6 +14,9 @@ from core.types import EmailAggregationConfig # dict[str, str]
 from core.types import ConnectionWithFile # tuple[Connection, Filename, Timestamp]
 from core.types import Connection # tuple[Email, Email, Timestamp]
 
+from utils.granularity import PathMapper
+from utils.path_filters import PathFilter
+
 
 @dataclass
 class NetworkContainer:
@@ -86,6 +89,16 @@ class NetworkContainer:
 
     """
 
+    org_to_org_weighted_network: nx.Graph = field(default_factory=nx.Graph)
+    """Weighted static inter-organizational graph.
+
+    Built directly from the affiliation x file incidence matrix, without the developer graph.
+    Edge weight = number of files co-edited by developers of both organizations.
+
+    Use for:
+    - Ecosystem-scale analyses where only the firm-level network is needed
+    """
+
 
 @dataclass
 class TimeStampedFileContribution:
@@ -196,6 +209,10 @@ class ProcessingState:
     )
 
     affiliations: Dict[Email, Affiliation] = field(default_factory=dict)
+
+    # Author names used with each email, and the canonical email of each email after identity resolution
+    author_names: DefaultDict[Email, Set[str]] = field(default_factory=lambda: defaultdict(set))
+    identity_map: Dict[Email, Email] = field(default_factory=dict)
     emails_to_filter: Set[Email] = field(default_factory=set)
 
     email_aggregation_config: EmailAggregationConfig = field(default_factory=dict)
@@ -215,7 +232,16 @@ class ProcessingState:
     # NEW
     include_extensions: set[str] = field(default_factory=set)  # e.g. {'.py', '.cpp'}
     exclude_extensions: set[str] = field(default_factory=set)  # e.g. {'.json', '.html'}
+    include_paths: list[str] = field(default_factory=list)  # e.g. ['tensorflow/**', '*.pb.txt']
+    exclude_paths: list[str] = field(default_factory=list)  # e.g. ['third_party/**']
+    path_filter: Optional[PathFilter] = None  # compiled from the filters above, see utils/path_filters.py
+    path_mapper: Optional[PathMapper] = None  # file -> directory/module units, see utils/granularity.py
     strict_validation: bool = False  # Whether to fail on validation errors
+    identity_resolution_mode: bool = False  # Merge emails of the same author name / GitHub login
+    mailmap: list = field(default_factory=list)  # .mailmap entries, see utils/identity_resolution.py
+    animation_file: Optional[str] = None  # .gif/.mp4/.webm file or PNG directory, see utils/temporal_animation.py
+    animation_fps: float = 2  # frames per second of the saved animation (utils.temporal_animation.DEFAULT_FPS)
+    animation_jobs: int = 1  # worker processes rendering the frames of the saved animation
 
     # Network graph
     dev_to_dev_network: nx.Graph = field(default_factory=nx.Graph)
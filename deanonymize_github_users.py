@@ -3,13 +3,19 @@
 
 """
 This module deanonymizes GitHub noreply emails in GraphML files created with ScrapLogGit2Net
+
+The noreply emails of a network are resolved concurrently, paced by the GitHub rate-limit headers and
+cached on disk across runs and files (see utils/github_resolver.py).
+
+With --batch, whole collections of networks are deanonymized together: each noreply email found in any of
+the files is resolved once, then the files are rewritten in parallel (see utils/github_deanonymization.py).
 """
 import json
 import sys
 import os
 import argparse
 import networkx as nx
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List
 import time
 from pathlib import Path
 
@@ -47,7 +53,12 @@ install(
 import requests
 import configparser
 import requests_cache
-from github import Github, GithubException, RateLimitExceededException
+
+from utils.batch_rendering import collect_graphml_files
+from utils.github_deanonymization import (OUTPUT_SUFFIX, apply_resolutions, deanonymize_files, noreply_emails_of_graph,
+                                          output_file_of, print_deanonymization_summary)
+from utils.github_resolver import (DEFAULT_BACKEND, DEFAULT_CONCURRENCY, DEFAULT_GITHUB_CACHE_DIR, GITHUB_API_URL,
+                                   GITHUB_BACKENDS, default_cache_path, resolve_noreply_emails)
 
 # For validating a GraphML File
 import xml.etree.ElementTree as ET
@@ -55,9 +66,6 @@ import xml.etree.ElementTree as ET
 # Set up requests-cache
 requests_cache.install_cache('github_cache', expire_after=3600)
 
-# Global dictionary for caching user affiliations
-already_known_user_affiliations: Dict[str, Tuple[str, str]] = {}
-
 
 def load_configuration(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -141,12 +149,13 @@ def load_configuration(config_path: Optional[str] = None) -> Dict[str, Any]:
     return config_values
 
 
-def test_github_api_access(github_token: str) -> bool:
+def test_github_api_access(github_token: str, api_url: str = GITHUB_API_URL) -> bool:
     """
     Test GitHub API access and authentication.
 
     Args:
         github_token: GitHub API token
+        api_url: Base URL of the GitHub REST API
 
     Returns:
         True if API access is successful, False otherwise
@@ -161,7 +170,7 @@ def test_github_api_access(github_token: str) -> bool:
 
     try:
         # Test with a simple API call to get authenticated user
-        response = requests.get('https://api.github.com/user', headers=headers)
+        response = requests.get(f'{api_url}/user', headers=headers)
 
         if response.status_code == 200:
             user_data = response.json()
@@ -204,12 +213,13 @@ def test_github_api_access(github_token: str) -> bool:
         return False
 
 
-def get_github_rate_limit(github_token: str) -> Dict[str, Any]:
+def get_github_rate_limit(github_token: str, api_url: str = GITHUB_API_URL) -> Dict[str, Any]:
     """
     Get detailed GitHub API rate limit information.
 
     Args:
         github_token: GitHub API token
+        api_url: Base URL of the GitHub REST API
 
     Returns:
         Dictionary with rate limit information
@@ -217,7 +227,7 @@ def get_github_rate_limit(github_token: str) -> Dict[str, Any]:
     headers = {'Authorization': f'token {github_token}'}
 
     try:
-        response = requests.get("https://api.github.com/rate_limit", headers=headers)
+        response = requests.get(f"{api_url}/rate_limit", headers=headers)
         response.raise_for_status()
         rate_data = response.json()
 
@@ -232,14 +242,15 @@ def get_github_rate_limit(github_token: str) -> Dict[str, Any]:
         return {}
 
 
-def display_rate_limit_info(github_token: str) -> None:
+def display_rate_limit_info(github_token: str, api_url: str = GITHUB_API_URL) -> None:
     """
     Display GitHub API rate limit information in a formatted table.
 
     Args:
         github_token: GitHub API token
+        api_url: Base URL of the GitHub REST API
     """
-    rate_limit = get_github_rate_limit(github_token)
+    rate_limit = get_github_rate_limit(github_token, api_url)
 
     if not rate_limit:
         logger.warning("Could not retrieve rate limit information")
@@ -282,12 +293,16 @@ def display_rate_limit_info(github_token: str) -> None:
     console.print(table)
 
 
-def validate_configuration_and_api_access(config_path: Optional[str] = None) -> Dict[str, Any]:
+def validate_configuration_and_api_access(
+        config_path: Optional[str] = None,
+        api_url: str = GITHUB_API_URL
+) -> Dict[str, Any]:
     """
     Validate configuration and test API access in one call.
 
     Args:
         config_path: Optional path to config file
+        api_url: Base URL of the GitHub REST API
 
     Returns:
         Validated configuration dictionary
@@ -313,12 +328,12 @@ def validate_configuration_and_api_access(config_path: Optional[str] = None) ->
 
     # Step 2: Test API access
     logger.info("\nTesting GitHub API access...")
-    if not test_github_api_access(config['token']):
+    if not test_github_api_access(config['token'], api_url):
         raise ValueError("GitHub API access test failed")
 
     # Step 3: Display rate limit information
     logger.info("\nChecking API rate limits...")
-    display_rate_limit_info(config['token'])
+    display_rate_limit_info(config['token'], api_url)
 
     return config
 
@@ -384,82 +399,6 @@ def get_user_organizations(username: str, github_token: str) -> List[str]:
         return []
 
 
-def deanonymize_github_user_with_cache_and_pygithub(
-        email: str,
-        github_token: str,
-        already_known_user_affiliations: Dict[str, Tuple[str, str]]
-) -> Tuple[str, str]:
-    """
-    De-anonymizes a GitHub user using PyGithub with caching.
-
-    Args:
-        email: GitHub noreply email
-        github_token: GitHub API token
-        already_known_user_affiliations: Cache dictionary
-
-    Returns:
-        Tuple of (email, affiliation)
-    """
-    logger.info(f"Deanonymizing GitHub user for email: {email}")
-
-    if '@users.noreply.github.com' not in email:
-        raise ValueError("The provided email address is not a valid GitHub noreply email.")
-
-    if email in already_known_user_affiliations:
-        logger.info(f"Key {email} already exists in cache. Skipping API call.")
-        return already_known_user_affiliations[email]
-
-    github_email = "unknown-by-GitHub"
-    github_affiliation = "unknown-by-github"
-
-    # Extract the username from the email address
-    try:
-        if '+' in email:
-            username = email.split('+')[1].split('@')[0]
-        else:
-            username = email.split('@')[0]
-    except IndexError:
-        raise ValueError("Unable to extract GitHub username from the email address.")
-
-    # Use PyGithub to retrieve user information
-    g = Github(github_token)
-    try:
-        user = g.get_user(username)
-        logger.debug(f"Successfully retrieved information for GitHub user: {username}")
-
-        print_github_user_data(user.raw_data)
-
-        if user.email:
-            github_email = user.email
-
-        if user.company:
-            github_affiliation = user.company
-
-        # Check organizations
-        logger.info(f"Checking if user {username} is a member of organizations")
-        organizations = [org.login for org in user.get_orgs()]
-        console.print(f"Organizations for {username}: {organizations}")
-
-
-        # Use first organization if available and not the current project
-        if organizations:
-            github_affiliation = organizations[0]
-
-    except RateLimitExceededException:
-        logger.warning("API rate limit exceeded. Sleeping for one hour...")
-        time.sleep(3600)
-        logger.info("Resuming API requests...")
-        # Retry after sleep
-        return deanonymize_github_user_with_cache_and_pygithub(
-            email, github_token, already_known_user_affiliations
-        )
-    except GithubException as e:
-        logger.warning(f"Unexpected API error: {e}")
-
-    already_known_user_affiliations[email] = (github_email, github_affiliation)
-    return (github_email, github_affiliation)
-
-
 def print_all_nodes(network: nx.Graph) -> None:
     """Print all nodes in a NetworkX graph with their attributes."""
     logger.info(f"Printing all nodes in network")
@@ -528,7 +467,12 @@ def copy_graph_with_attributes(source_graph: nx.Graph) -> nx.Graph:
 def iterate_graph(
         input_file: str,
         output_file: str,
-        github_token: str
+        github_token: str,
+        api_url: str = GITHUB_API_URL,
+        cache_path: Optional[str] = default_cache_path(),
+        concurrency: int = DEFAULT_CONCURRENCY,
+        backend: str = DEFAULT_BACKEND,
+        graphql_url: Optional[str] = None
         ) -> None:
     """
     Process GraphML file to deanonymize GitHub emails.
@@ -537,6 +481,11 @@ def iterate_graph(
         input_file: Path to input GraphML file
         output_file: Path to output GraphML file
         github_token: GitHub API token
+        api_url: Base URL of the GitHub REST API
+        cache_path: SQLite cache of resolved emails shared across runs, no cache if None
+        concurrency: GitHub API requests in flight at once
+        backend: "graphql" to look users up in batches (REST for misses) or "rest"
+        graphql_url: GraphQL endpoint (api_url + "/graphql" if None)
 
     """
     logger.info(f"Iterating network: {input_file} -> {output_file}")
@@ -562,27 +511,12 @@ def iterate_graph(
     console.rule("Replacing emails and affiliations using GitHub REST API")
     logger.info("Looking for @users.noreply.github.com emails to deanonymize")
 
-    for node, data in G_copy.nodes(data=True):
-        logger.debug(f"Iterating over node: {node}")
-
-        # changing data ont the best approach
-        old_email = data.get('e-mail', '')
-        old_affiliation = data.get('affiliation', '')
-
-        console.print(f"Checking node={node} with email={old_email} and affiliation={old_affiliation}")
-
-        if '@users.noreply.github.com' in old_email:
-            new_email, new_affiliation = deanonymize_github_user_with_cache_and_pygithub(
-                old_email,
-                github_token,
-                already_known_user_affiliations
-            )
-
-            logger.info(f"Updating node={node} with email={new_email} and affiliation={new_affiliation}")
-            if new_email != "unknown-by-GitHub":
-                data['email'] = new_email
-            if new_affiliation.lower() != "unknown-by-github":
-                data['affiliation'] = new_affiliation.lower()
+    noreply_emails = noreply_emails_of_graph(G_copy)
+    console.print(f"Resolving {len(noreply_emails)} GitHub noreply emails")
+    resolutions = resolve_noreply_emails(noreply_emails, github_token, api_url, cache_path, concurrency,
+                                         backend, graphql_url)
+    n_resolved = apply_resolutions(G_copy, resolutions)
+    logger.info(f"Updated {n_resolved} nodes")
 
     # Write the modified graph to output file
     logger.info(f"Writing output GraphML file: {output_file}")
@@ -604,10 +538,12 @@ def main() -> None:
         description="Creates a more correct GraphML file by correcting e-mails and affiliations via the GitHub REST API."
     )
 
-    # Required input file argument
+    # Input file argument, required unless --batch is given
     parser.add_argument(
         'input',
         type=str,
+        nargs='?',
+        default=None,
         help='Path to the input GraphML file.'
     )
 
@@ -635,15 +571,94 @@ def main() -> None:
         help='Skip GitHub API access test (not recommended)'
     )
 
+    parser.add_argument(
+        '--batch',
+        type=str,
+        nargs='+',
+        metavar='PATH',
+        help='GraphML files and directories deanonymized together, each noreply email being resolved once '
+             f'for the whole collection (outputs: <input>{OUTPUT_SUFFIX})'
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default=None,
+        help='Directory of the deanonymized networks in batch mode (default: next to the input files)'
+    )
+
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Worker processes scanning and rewriting the networks in batch mode (default: 1)'
+    )
+
+    parser.add_argument(
+        '--api-url',
+        type=str,
+        default=os.getenv('GITHUB_API_URL', GITHUB_API_URL),
+        help=f'Base URL of the GitHub REST API (default: GITHUB_API_URL environment variable or {GITHUB_API_URL})'
+    )
+
+    parser.add_argument(
+        '--backend',
+        choices=GITHUB_BACKENDS,
+        default=DEFAULT_BACKEND,
+        help='Look users up with batched GraphQL queries (REST for misses) or with REST requests only '
+             f'(default: {DEFAULT_BACKEND})'
+    )
+
+    parser.add_argument(
+        '--graphql-url',
+        type=str,
+        default=None,
+        help='GraphQL endpoint (default: <api-url>/graphql)'
+    )
+
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'GitHub API requests in flight at once (default: {DEFAULT_CONCURRENCY})'
+    )
+
+    parser.add_argument(
+        '--github-cache-dir',
+        type=str,
+        default=DEFAULT_GITHUB_CACHE_DIR,
+        help=f'Directory of the cache of resolved emails, shared across runs (default: {DEFAULT_GITHUB_CACHE_DIR})'
+    )
+
+    parser.add_argument(
+        '--no-github-cache',
+        action='store_true',
+        help='Resolve every email with the GitHub API, without reading or writing the cache'
+    )
+
     args = parser.parse_args()
 
-    # Validate input file
-    validate_input_file(args.input)
+    if args.batch:
+        if args.input or args.output:
+            parser.error("give the input files with --batch only")
+        try:
+            # Outputs of previous runs found in the input directories are not inputs
+            input_files = [f for f in collect_graphml_files(args.batch) if not f.lower().endswith(OUTPUT_SUFFIX)]
+        except FileNotFoundError as e:
+            parser.error(str(e))
+        if not input_files:
+            parser.error(f"No GraphML files found for {args.batch}")
+        for input_file in input_files:
+            validate_input_file(input_file)
+    elif args.input is None:
+        parser.error("the input file (or --batch) is required")
+    else:
+        # Validate input file
+        validate_input_file(args.input)
 
-    # Set default output file if not provided
-    if args.output is None:
-        base, ext = os.path.splitext(args.input)
-        args.output = f"{base}.out.graphml"
+        # Set default output file if not provided
+        if args.output is None:
+            args.output = output_file_of(args.input)
 
     try:
         if args.skip_api_test:
@@ -654,7 +669,7 @@ def main() -> None:
 
         else:
             # Load configuration and test API access
-            config = validate_configuration_and_api_access(args.config)
+            config = validate_configuration_and_api_access(args.config, args.api_url)
             github_token = config['token']
 
 
@@ -662,12 +677,33 @@ def main() -> None:
         console.print(f"[red]Configuration/API error: {e}[/red]")
         sys.exit(1)
 
+    cache_path = None if args.no_github_cache else default_cache_path(args.github_cache_dir)
+
+    if args.batch:
+        summaries, stats = deanonymize_files(
+            input_files,
+            output_dir=args.output_dir,
+            github_token=github_token,
+            api_url=args.api_url,
+            cache_path=cache_path,
+            concurrency=args.concurrency,
+            backend=args.backend,
+            graphql_url=args.graphql_url,
+            jobs=args.jobs
+        )
+        print_deanonymization_summary(summaries, stats, args.jobs)
+        return
+
     # Process the graph
     iterate_graph(
         input_file=args.input,
         output_file=args.output,
         github_token=github_token,
-
+        api_url=args.api_url,
+        cache_path=cache_path,
+        concurrency=args.concurrency,
+        backend=args.backend,
+        graphql_url=args.graphql_url
     )
 
 
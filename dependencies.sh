@@ -8,8 +8,8 @@ apt-get install python3-dateutil
 # For coloring nodes 
 apt-get install python3-colorama
 
-# For generating exel file 
-apt-get install python3-xlwt
+# For generating xlsx reports (pyarrow is only needed for parquet reports)
+apt-get install python3-openpyxl
 
 # To validate GraphML XML files 
 apt-get install libxml2-utils
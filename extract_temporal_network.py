@@ -20,6 +20,7 @@ import sys
 import math
 
 from collections import defaultdict
+from functools import lru_cache
 from typing import Literal, Optional, Any, Union, List
 from typing_extensions import deprecated
 
@@ -30,10 +31,10 @@ import networkx_temporal as tx
 from networkx_temporal import TemporalGraph, TemporalMultiGraph, utils
 
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 
 from core.models import ProcessingState
 from utils.debugging import ask_yes_or_no_question
+from utils.temporal_animation import DEFAULT_FPS, TemporalAnimation, save_animation
 from utils.unified_console import print_success, print_header, print_info, print_warning, print_key_action, console, \
     print_error, inspect, Table, print_note
 from utils.unified_logger import logger
@@ -55,7 +56,10 @@ def plot_temporal_network(
         node_size: int = 300,
         node_color: str = 'lightblue',
         edge_color: str = 'gray',
-        title: str = "Temporal Network Evolution"
+        title: str = "Temporal Network Evolution",
+        animation_file: Optional[str] = None,
+        animation_fps: float = DEFAULT_FPS,
+        animation_jobs: int = 1
 ) -> Optional[Any]:
     """
     Unified function to plot temporal networks in various formats.
@@ -74,6 +78,10 @@ def plot_temporal_network(
         node_color: Color of nodes
         edge_color: Color of edges
         title: Plot title
+        animation_file: Where to save the animation (.gif, .mp4, .webm or a directory for a PNG sequence),
+            defaults to '<filename>_animation.gif' in debug mode
+        animation_fps: Frames per second of the saved animation
+        animation_jobs: Number of worker processes rendering the frames of the saved animation
 
     Returns:
         For "animation" format, returns animation object. For others, returns None.
@@ -118,7 +126,10 @@ def plot_temporal_network(
             edge_color=edge_color,
             title=title,
             interval=animation_interval,
-            filename=filename
+            filename=filename,
+            animation_file=animation_file,
+            fps=animation_fps,
+            jobs=animation_jobs
         )
 
         if plot_format == "animation":
@@ -136,6 +147,7 @@ def _compute_positions(graph, layout_algorithm: str = "spring") -> dict:
 
     # Create combined graph for layout
     combined = nx.Graph()
+    combined.add_nodes_from(all_nodes)
     for snapshot in graph:
         combined.add_edges_from(snapshot.edges())
 
@@ -207,51 +219,35 @@ def _plot_snapshots(graph, state, n_snapshots, max_snapshots, combined_pos,
 
 def _create_animation(graph, state, n_snapshots, combined_pos,
                       figsize, show_labels, node_size, node_color, edge_color,
-                      title, interval, filename):
-    """Create animation of temporal evolution."""
-
-    fig, ax = plt.subplots(figsize=figsize)
-
-    def update(frame):
-        ax.clear()
-        snapshot = graph[frame]
-        time_str = _get_snapshot_time(snapshot, frame)
-
-        if snapshot.number_of_nodes() > 0:
-            # Filter positions to nodes in this snapshot
-            pos = {node: combined_pos[node] for node in snapshot.nodes()
-                   if node in combined_pos}
+                      title, interval, filename, animation_file=None, fps=DEFAULT_FPS, jobs=1):
+    """Create animation of temporal evolution.
 
-            nx.draw(
-                snapshot, pos, ax=ax,
-                node_color=node_color,
-                node_size=node_size,
-                with_labels=show_labels,
-                font_size=9,
-                edge_color=edge_color,
-                width=2
-            )
-        else:
-            ax.text(0.5, 0.5, 'Empty Snapshot',
-                    ha='center', va='center', transform=ax.transAxes)
-
-        ax.set_title(f"{title}\n{time_str}", fontsize=14)
-        ax.axis('off')
-
-    anim = animation.FuncAnimation(
-        fig, update,
-        frames=n_snapshots,
-        interval=interval,
-        repeat=True
+    The union graph of the snapshots is drawn once and each frame only restyles it (see
+    utils/temporal_animation.py), so that the frames can be blitted and saved quickly.
+    """
+    snapshots = [graph[idx] for idx in range(n_snapshots)]
+    animation_kwargs = dict(
+        snapshots=snapshots,
+        pos=combined_pos,
+        titles=[f"{title}\n{_get_snapshot_time(snapshot, idx)}" for idx, snapshot in enumerate(snapshots)],
+        figsize=figsize,
+        show_labels=show_labels,
+        node_size=node_size,
+        node_color=node_color,
+        edge_color=edge_color
     )
 
+    renderer = TemporalAnimation(**animation_kwargs)
+    anim = renderer.animation(interval=interval)
+
     # Save animation
-    if hasattr(state, 'debug_mode') and state.debug_mode:
-        save_path = f'{filename}_animation.gif'
-        anim.save(save_path, writer='pillow', dpi=100)
-        print_info(f"Saved animation to '{save_path}'")
+    if animation_file is None and hasattr(state, 'debug_mode') and state.debug_mode:
+        animation_file = f'{filename}_animation.gif'
+    if animation_file is not None:
+        save_animation(animation_kwargs, animation_file, fps=fps, jobs=jobs)
+        print_info(f"Saved animation to '{animation_file}'")
 
-    plt.close(fig)
+    plt.close(renderer.fig)
     return anim
 
 
@@ -303,7 +299,10 @@ if t_graph_sliced and len(t_graph_sliced) > 0:
         max_snapshots=6,
         filename='temporal_network',
         layout_algorithm='spring',
-        show_labels=True
+        show_labels=True,
+        animation_file=state.animation_file,  # e.g. 'temporal_network.mp4', see scrapLog --animation-file
+        animation_fps=state.animation_fps,
+        animation_jobs=state.animation_jobs
     )
 """
 
@@ -894,8 +893,9 @@ def unix_to_git_timestamp(unix_timestamp: float) -> str:
     return dt.strftime('%a %b %d %H:%M:%S %Y %z')
 
 
+@lru_cache(maxsize=None)
 def git_timestamp_to_iso(git_timestamp_str: str) -> str:
-    """Convert Git timestamp to ISO format with timezone."""
+    """Convert Git timestamp to ISO format with timezone (cached: a commit timestamp is shared by its edges)."""
     dt = datetime.strptime(git_timestamp_str, '%a %b %d %H:%M:%S %Y %z')
     return dt.isoformat()  # Preserves timezone!
 
@@ -1183,11 +1183,14 @@ def extract_temporal_network_from_parsed_change_log_entries(
             plot_temporal_network(
                 graph=t_graph_sliced,
                 state=state,
-                plot_format="snapshots",
+                plot_format="both" if state.animation_file else "snapshots",
                 max_snapshots=6,
                 filename='temporal_network',
                 layout_algorithm='spring',
-                show_labels=True)
+                show_labels=True,
+                animation_file=state.animation_file,
+                animation_fps=state.animation_fps,
+                animation_jobs=state.animation_jobs)
 
         state.accumulated_history_of_contributors_by_file=accumulated_history_of_contributors_by_file
         state.accumulated_history_of_files_by_contributor=accumulated_history_of_files_by_contributor
@@ -1273,11 +1276,26 @@ def extract_coauthorship_temporal_network_from_parsed_change_log_entries(
         plot_temporal_network(
             graph=coauthorship_temporal_network.slice(attr="time"),
             state=state,
-            plot_format="snapshots",
+            plot_format="both" if state.animation_file else "snapshots",
             max_snapshots=6,
             filename='temporal_network',
             layout_algorithm='spring',
-            show_labels=True)
+            show_labels=True,
+            animation_file=state.animation_file,
+            animation_fps=state.animation_fps,
+            animation_jobs=state.animation_jobs)
+    elif state.animation_file:
+        # scrapLog --animation-file: saved without plotting the snapshots
+        plot_temporal_network(
+            graph=coauthorship_temporal_network.slice(attr="time"),
+            state=state,
+            plot_format="animation",
+            filename='temporal_network',
+            layout_algorithm='spring',
+            show_labels=True,
+            animation_file=state.animation_file,
+            animation_fps=state.animation_fps,
+            animation_jobs=state.animation_jobs)
 
     return     coauthorship_temporal_network
 
@@ -8,15 +8,21 @@ import os
 import sys
 import json
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import networkx as nx
-import xlwt
 
 from utils.unified_logger import logger
 from utils.unified_console import console
 from utils.unified_console import Table
 from utils.unified_console import Progress
+from utils.centrality import (DEFAULT_CENTRALITY_CACHE_DIR,
+                              compute_centralities,
+                              parse_centrality_measures,
+                              top_central_nodes)
+from utils.report_writer import ReportWriter, parse_report_formats
+from utils.organization_analysis import OrganizationAnalysis, analyze_organizations
+from utils.graph_filters import OrganizationFilter
 
 
 from rich.progress import SpinnerColumn, TextColumn
@@ -34,6 +40,12 @@ class ReportConfig:
     verbose: bool = False
     top_n_organizations: int = 20
     top_n_individuals: int = 10
+    # The first centrality measure ranks the top individuals
+    centrality_measures: List[str] = field(default_factory=lambda: ["degree"])
+    betweenness_samples: Optional[int] = None
+    jobs: int = 1
+    centrality_cache_dir: Optional[str] = None
+    report_formats: List[str] = field(default_factory=lambda: ["xlsx"])
 
 
 class GraphMLReporter:
@@ -46,6 +58,8 @@ class GraphMLReporter:
         self.stats: Dict[str, Any] = {}
         self.top_organizations: Dict[str, int] = {}
         self.centralities: List[Tuple[str, float]] = []
+        self.centrality_scores: Dict[str, Dict[str, float]] = {}
+        self.organization_analysis: Optional[OrganizationAnalysis] = None
 
     def load_graph(self) -> None:
         """Load and validate GraphML file."""
@@ -114,44 +128,45 @@ class GraphMLReporter:
             logger.info("Affiliation normalization completed")
 
     def filter_by_organizations(self) -> None:
-        """Filter graph based on organization lists."""
+        """Filter graph based on organization lists.
+
+        The filtered graph is a single induced subgraph view of the loaded graph (see utils.graph_filters).
+        """
         if not self.graph:
             return
 
         original_node_count = self.graph.number_of_nodes()
+        organization_filter = OrganizationFilter(self.graph)
 
         # Filter out ignored organizations
         if self.config.org_list_to_ignore:
-            self._filter_organizations(self.config.org_list_to_ignore, exclude=True)
+            self._filter_organizations(organization_filter, self.config.org_list_to_ignore, exclude=True)
 
         # Filter to include only specified organizations
         if self.config.org_list_only:
-            self._filter_organizations(self.config.org_list_only, exclude=False)
+            self._filter_organizations(organization_filter, self.config.org_list_only, exclude=False)
+
+        self.graph = organization_filter.subgraph()
 
         filtered_out = original_node_count - self.graph.number_of_nodes()
         if filtered_out > 0:
             logger.info(f"Filtered out {filtered_out} nodes")
 
-    def _filter_organizations(self, org_list: List[str], exclude: bool = True) -> None:
+    def _filter_organizations(self, organization_filter: OrganizationFilter, org_list: List[str],
+                              exclude: bool = True) -> None:
         """Internal method to filter nodes by organization."""
-        if not self.graph:
-            return
-
         operation = "Excluding" if exclude else "Including only"
         logger.info(f"{operation} organizations: {org_list}")
 
-        nodes_to_remove = []
-        for node, data in self.graph.nodes(data=True):
-            affiliation = data.get('affiliation', '')
-            should_remove = (affiliation in org_list) if exclude else (affiliation not in org_list)
-
-            if should_remove:
-                nodes_to_remove.append(node)
-                if self.config.verbose:
-                    action = "Removing" if exclude else "Filtering out"
-                    logger.debug(f"{action} node {node} ({affiliation})")
+        if exclude:
+            removed = organization_filter.exclude_organizations(org_list)
+        else:
+            removed = organization_filter.only_organizations(org_list)
 
-        self.graph.remove_nodes_from(nodes_to_remove)
+        if self.config.verbose:
+            action = "Removing" if exclude else "Filtering out"
+            for node in organization_filter.in_graph_order(removed):
+                logger.debug(f"{action} node {node} ({self.graph.nodes[node].get('affiliation', '')})")
 
     def calculate_statistics(self) -> None:
         """Calculate comprehensive graph statistics."""
@@ -184,15 +199,28 @@ class GraphMLReporter:
         logger.info("Calculating centrality measures...")
 
         try:
-            degree_centrality = nx.degree_centrality(self.graph)
-            self.centralities = sorted(
-                degree_centrality.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:self.config.top_n_individuals]
+            self.centrality_scores = compute_centralities(
+                self.graph,
+                self.config.centrality_measures,
+                betweenness_samples=self.config.betweenness_samples,
+                jobs=self.config.jobs,
+                cache_dir=self.config.centrality_cache_dir
+            )
+            self.centralities = top_central_nodes(
+                self.centrality_scores[self.config.centrality_measures[0]],
+                self.config.top_n_individuals
+            )
         except Exception as e:
             logger.warning(f"Could not calculate centralities: {e}")
             self.centralities = []
+            self.centrality_scores = {}
+
+    def _centrality_label(self, measure: str) -> str:
+        """Column label of a centrality measure, flagging sampled betweenness as approximate."""
+        label = f"{measure.title()} Centrality"
+        if measure == "betweenness" and self.config.betweenness_samples:
+            label += f" (approx., k={self.config.betweenness_samples})"
+        return label
 
     def analyze_organizations(self) -> None:
         """Analyze organizations in the graph."""
@@ -201,19 +229,11 @@ class GraphMLReporter:
 
         logger.info("Analyzing organizations...")
 
-        affiliations_freq: Dict[str, int] = {}
-        for _, data in self.graph.nodes(data=True):
-            affiliation = data.get('affiliation', '')
-            if affiliation:
-                affiliations_freq[affiliation] = affiliations_freq.get(affiliation, 0) + 1
+        self.organization_analysis = analyze_organizations(self.graph)
 
-        # Sort by frequency and get top N
+        # Sorted by frequency, get top N
         self.top_organizations = dict(
-            sorted(
-                affiliations_freq.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:self.config.top_n_organizations]
+            list(self.organization_analysis.node_counts().items())[:self.config.top_n_organizations]
         )
 
     def calculate_edge_analysis(self) -> Dict[str, Any]:
@@ -223,29 +243,94 @@ class GraphMLReporter:
 
         logger.info("Analyzing edges by organization...")
 
-        # Count edges within and between organizations
-        intra_org_edges = 0
-        inter_org_edges = 0
-        org_edge_counts: Dict[str, int] = {}
+        # Counts of edges within and between organizations derive from the org x org contingency matrix
+        if self.organization_analysis is None:
+            self.organization_analysis = analyze_organizations(self.graph)
+        analysis = self.organization_analysis
 
-        for u, v in self.graph.edges():
-            u_aff = self.graph.nodes[u].get('affiliation', 'unknown')
-            v_aff = self.graph.nodes[v].get('affiliation', 'unknown')
-
-            if u_aff == v_aff:
-                intra_org_edges += 1
-                org_edge_counts[u_aff] = org_edge_counts.get(u_aff, 0) + 1
-            else:
-                inter_org_edges += 1
+        organization_degrees = analysis.degrees()
+        organization_inter_edges = analysis.inter_edge_counts()
+        organization_ei_indexes = analysis.ei_indexes()
 
         return {
-            'intra_organization_edges': intra_org_edges,
-            'inter_organization_edges': inter_org_edges,
-            'organization_edge_counts': dict(
-                sorted(org_edge_counts.items(), key=lambda x: x[1], reverse=True)
+            'intra_organization_edges': analysis.intra_organization_edges,
+            'inter_organization_edges': analysis.inter_organization_edges,
+            'ei_index': analysis.ei_index,
+            'organization_edge_counts': analysis.intra_edge_counts(),
+            'organization_ties': sorted(
+                (
+                    {
+                        'organization': organization,
+                        'intra_organization_edges': int(analysis.contingency[code, code]),
+                        'inter_organization_edges': int(organization_inter_edges[code]),
+                        'degree': int(organization_degrees[code]),
+                        'ei_index': float(organization_ei_indexes[code]),
+                    }
+                    for code, organization in enumerate(analysis.organizations)
+                    if organization_degrees[code] > 0
+                ),
+                key=lambda x: x['degree'],
+                reverse=True
             ),
+            'organization_pair_ties': analysis.organization_pair_ties(),
         }
 
+    def print_edge_analysis(self) -> None:
+        """Print intra/inter-organization edge analysis to console."""
+        edge_analysis = self.calculate_edge_analysis()
+        if not edge_analysis:
+            return
+
+        table = Table(title="Edge Analysis", show_header=True, header_style="bold magenta")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", style="green")
+
+        table.add_row("Intra-organization edges", str(edge_analysis['intra_organization_edges']))
+        table.add_row("Inter-organization edges", str(edge_analysis['inter_organization_edges']))
+        table.add_row("E-I index", f"{edge_analysis['ei_index']:.4f}")
+
+        console.print(table)
+
+        organization_ties = edge_analysis['organization_ties'][:self.config.top_n_organizations]
+        if organization_ties:
+            table = Table(
+                title=f"Top {len(organization_ties)} Organizations by Degree",
+                show_header=True,
+                header_style="bold magenta"
+            )
+            table.add_column("Organization", style="cyan")
+            table.add_column("Degree", style="green")
+            table.add_column("Intra-org edges", style="green")
+            table.add_column("Inter-org edges", style="green")
+            table.add_column("E-I index", style="yellow")
+
+            for ties in organization_ties:
+                table.add_row(
+                    ties['organization'],
+                    str(ties['degree']),
+                    str(ties['intra_organization_edges']),
+                    str(ties['inter_organization_edges']),
+                    f"{ties['ei_index']:.4f}"
+                )
+
+            console.print(table)
+
+        pair_ties = edge_analysis['organization_pair_ties'][:self.config.top_n_organizations]
+        if pair_ties:
+            table = Table(
+                title=f"Top {len(pair_ties)} Organization Pairs by Ties",
+                show_header=True,
+                header_style="bold magenta"
+            )
+            table.add_column("Organization", style="cyan")
+            table.add_column("Organization", style="cyan")
+            table.add_column("Ties", style="green")
+
+            for organization_a, organization_b, ties in pair_ties:
+                table.add_row(organization_a, organization_b, str(ties))
+
+            console.print(table)
+
     def print_statistics(self) -> None:
         """Print statistics to console in a formatted way."""
         if not self.stats:
@@ -307,152 +392,153 @@ class GraphMLReporter:
             console.print("[yellow]No centrality data available[/yellow]")
             return
 
+        measures = list(self.centrality_scores)
         table = Table(
-            title=f"Top {len(self.centralities)} Individuals by Degree Centrality",
+            title=f"Top {len(self.centralities)} Individuals by {self._centrality_label(measures[0])}",
             show_header=True,
             header_style="bold magenta"
         )
         table.add_column("Rank", style="dim")
         table.add_column("Node ID", style="cyan")
-        table.add_column("Centrality", style="green")
+        for measure in measures:
+            table.add_column(measure.title() if len(measures) > 1 else "Centrality", style="green")
         table.add_column("Affiliation", style="yellow")
 
-        for i, (node_id, centrality) in enumerate(self.centralities, 1):
+        for i, (node_id, _) in enumerate(self.centralities, 1):
             affiliation = self.graph.nodes[node_id].get('affiliation', 'unknown') if self.graph else 'unknown'
             table.add_row(
                 str(i),
                 node_id,
-                f"{centrality:.4f}",
+                *(f"{self.centrality_scores[measure][node_id]:.4f}" for measure in measures),
                 affiliation
             )
 
         console.print(table)
 
-    def export_to_excel(self) -> str:
-        """Export all analysis to Excel file."""
+    def export_report(self) -> List[str]:
+        """Export all analysis to the requested report formats (.xlsx, CSV, Parquet).
+
+        Returns:
+            Paths of the written files
+        """
         if not self.graph:
             raise ValueError("No graph data to export")
 
-        logger.info("Exporting to Excel...")
-
-        # Create workbook
-        workbook = xlwt.Workbook(encoding="utf-8")
-
-        # Export basic statistics
-        self._export_statistics_to_excel(workbook)
+        logger.info(f"Exporting report ({', '.join(self.config.report_formats)})...")
 
-        # Export organizations
-        self._export_organizations_to_excel(workbook)
-
-        # Export centralities
-        self._export_centralities_to_excel(workbook)
-
-        # Export nodes list
-        self._export_nodes_to_excel(workbook)
-
-        # Export edge analysis
-        self._export_edge_analysis_to_excel(workbook)
-
-        # Save file
         base_name = os.path.splitext(os.path.basename(self.config.input_file))[0]
-        output_filename = f"{base_name}_report.xls"
 
         try:
-            workbook.save(output_filename)
-            logger.info(f"Exported to {output_filename}")
-        except Exception as e:
-            logger.error(f"Failed to save Excel file: {e}")
-            raise
+            with ReportWriter(f"{base_name}_report", self.config.report_formats) as writer:
+                # Export basic statistics
+                self._export_statistics(writer)
 
-        return output_filename
+                # Export organizations
+                self._export_organizations(writer)
 
-    def _export_statistics_to_excel(self, workbook: xlwt.Workbook) -> None:
-        """Export statistics to Excel sheet."""
-        sheet = workbook.add_sheet("Graph Statistics")
+                # Export centralities
+                self._export_centralities(writer)
 
-        sheet.write(0, 0, "Metric")
-        sheet.write(0, 1, "Value")
+                # Export nodes list
+                self._export_nodes(writer)
 
-        row = 1
-        for key, value in self.stats.items():
-            if key == 'isolates':
-                continue  # Handled separately
-            sheet.write(row, 0, key.replace('_', ' ').title())
-            sheet.write(row, 1, str(value))
-            row += 1
+                # Export edge analysis
+                self._export_edge_analysis(writer)
+        except Exception as e:
+            logger.error(f"Failed to save report: {e}")
+            raise
 
-    def _export_organizations_to_excel(self, workbook: xlwt.Workbook) -> None:
-        """Export organization analysis to Excel sheet."""
-        sheet = workbook.add_sheet("Top Organizations")
+        for output_filename in writer.output_files:
+            logger.info(f"Exported to {output_filename}")
 
-        sheet.write(0, 0, "Organization")
-        sheet.write(0, 1, "Node Count")
-        sheet.write(0, 2, "Percentage")
+        return writer.output_files
+
+    def _export_statistics(self, writer: ReportWriter) -> None:
+        """Export statistics sheet."""
+        writer.write_sheet(
+            "Graph Statistics",
+            ["Metric", "Value"],
+            (
+                (key.replace('_', ' ').title(), str(value))
+                for key, value in self.stats.items()
+                if key != 'isolates'  # Handled separately
+            )
+        )
 
+    def _export_organizations(self, writer: ReportWriter) -> None:
+        """Export organization analysis sheet."""
         total_nodes = self.stats.get('num_nodes', 0)
-        for i, (org, count) in enumerate(self.top_organizations.items(), 1):
-            percentage = (count / total_nodes * 100) if total_nodes > 0 else 0
-            sheet.write(i, 0, org)
-            sheet.write(i, 1, count)
-            sheet.write(i, 2, f"{percentage:.2f}%")
+        writer.write_sheet(
+            "Top Organizations",
+            ["Organization", "Node Count", "Percentage"],
+            (
+                (org, count, f"{(count / total_nodes * 100) if total_nodes > 0 else 0:.2f}%")
+                for org, count in self.top_organizations.items()
+            )
+        )
 
-    def _export_centralities_to_excel(self, workbook: xlwt.Workbook) -> None:
-        """Export centrality analysis to Excel sheet."""
+    def _export_centralities(self, writer: ReportWriter) -> None:
+        """Export centrality analysis sheet."""
         if not self.centralities:
             return
 
-        sheet = workbook.add_sheet("Centralities")
-
-        sheet.write(0, 0, "Node ID")
-        sheet.write(0, 1, "Degree Centrality")
-        sheet.write(0, 2, "Affiliation")
-
-        for i, (node_id, centrality) in enumerate(self.centralities, 1):
-            affiliation = self.graph.nodes[node_id].get('affiliation', 'unknown') if self.graph else 'unknown'
-            sheet.write(i, 0, str(node_id))
-            sheet.write(i, 1, centrality)
-            sheet.write(i, 2, affiliation)
+        measures = list(self.centrality_scores)
+        writer.write_sheet(
+            "Centralities",
+            ["Node ID", *(self._centrality_label(measure) for measure in measures), "Affiliation"],
+            (
+                (
+                    str(node_id),
+                    *(self.centrality_scores[measure][node_id] for measure in measures),
+                    self.graph.nodes[node_id].get('affiliation', 'unknown') if self.graph else 'unknown'
+                )
+                for node_id, _ in self.centralities
+            )
+        )
 
-    def _export_nodes_to_excel(self, workbook: xlwt.Workbook) -> None:
-        """Export node list to Excel sheet."""
+    def _export_nodes(self, writer: ReportWriter) -> None:
+        """Export node list sheet."""
         if not self.graph:
             return
 
-        sheet = workbook.add_sheet("Nodes")
-
-        sheet.write(0, 0, "Node ID")
-        sheet.write(0, 1, "Email")
-        sheet.write(0, 2, "Affiliation")
-
-        for i, (node_id, data) in enumerate(self.graph.nodes(data=True), 1):
-            sheet.write(i, 0, str(node_id))
-            sheet.write(i, 1, data.get('email', ''))
-            sheet.write(i, 2, data.get('affiliation', ''))
+        writer.write_sheet(
+            "Nodes",
+            ["Node ID", "Email", "Affiliation"],
+            (
+                (str(node_id), data.get('email', ''), data.get('affiliation', ''))
+                for node_id, data in self.graph.nodes(data=True)
+            )
+        )
 
-    def _export_edge_analysis_to_excel(self, workbook: xlwt.Workbook) -> None:
-        """Export edge analysis to Excel sheet."""
+    def _export_edge_analysis(self, writer: ReportWriter) -> None:
+        """Export edge analysis and per-organization edge count sheets."""
         edge_analysis = self.calculate_edge_analysis()
 
-        sheet = workbook.add_sheet("Edge Analysis")
-
-        sheet.write(0, 0, "Metric")
-        sheet.write(0, 1, "Value")
-
-        sheet.write(1, 0, "Intra-organization edges")
-        sheet.write(1, 1, edge_analysis.get('intra_organization_edges', 0))
-
-        sheet.write(2, 0, "Inter-organization edges")
-        sheet.write(2, 1, edge_analysis.get('inter_organization_edges', 0))
+        writer.write_sheet(
+            "Edge Analysis",
+            ["Metric", "Value"],
+            [
+                ("Intra-organization edges", edge_analysis.get('intra_organization_edges', 0)),
+                ("Inter-organization edges", edge_analysis.get('inter_organization_edges', 0)),
+                ("E-I index", edge_analysis.get('ei_index', float('nan'))),
+            ]
+        )
 
-        # Add organization edge counts
-        row = 4
-        sheet.write(row, 0, "Organization")
-        sheet.write(row, 1, "Edge Count")
+        writer.write_sheet(
+            "Organization Edge Counts",
+            ["Organization", "Degree", "Intra-organization Edges", "Inter-organization Edges", "E-I Index"],
+            (
+                (ties['organization'], ties['degree'], ties['intra_organization_edges'],
+                 ties['inter_organization_edges'], ties['ei_index'])
+                for ties in edge_analysis.get('organization_ties', [])
+            )
+        )
 
-        org_edge_counts = edge_analysis.get('organization_edge_counts', {})
-        for i, (org, count) in enumerate(org_edge_counts.items(), 1):
-            sheet.write(row + i, 0, org)
-            sheet.write(row + i, 1, count)
+        writer.write_sheet(
+            "Organization Pair Ties",
+            ["Organization", "Organization", "Ties"],
+            edge_analysis.get('organization_pair_ties', [])
+        )
 
 
 def parse_arguments() -> ReportConfig:
@@ -506,6 +592,47 @@ def parse_arguments() -> ReportConfig:
         help="Number of top individuals to report (default: 10)"
     )
 
+    parser.add_argument(
+        "-cm", "--centralities",
+        type=parse_centrality_measures,
+        default=["degree"],
+        help="Comma-separated centrality measures among degree, eigenvector, closeness and betweenness; "
+             "the first one ranks the top individuals (default: degree)"
+    )
+
+    parser.add_argument(
+        "-bs", "--betweenness-samples",
+        type=int,
+        help="Approximate betweenness centrality from k sampled source nodes (default: exact)"
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for closeness and betweenness centrality (default: 1)"
+    )
+
+    parser.add_argument(
+        "--centrality-cache-dir",
+        type=str,
+        default=DEFAULT_CENTRALITY_CACHE_DIR,
+        help=f"Directory where centralities are cached per graph hash (default: {DEFAULT_CENTRALITY_CACHE_DIR})"
+    )
+
+    parser.add_argument(
+        "--no-centrality-cache",
+        action="store_true",
+        help="Do not read nor write the on-disk centrality cache"
+    )
+
+    parser.add_argument(
+        "-fmt", "--formats",
+        type=parse_report_formats,
+        default=["xlsx"],
+        help="Comma-separated report formats among xlsx, csv and parquet (default: xlsx)"
+    )
+
     args = parser.parse_args()
 
     return ReportConfig(
@@ -516,6 +643,11 @@ def parse_arguments() -> ReportConfig:
         verbose=args.verbose,
         top_n_organizations=args.top_n_orgs,
         top_n_individuals=args.top_n_inds,
+        centrality_measures=args.centralities,
+        betweenness_samples=args.betweenness_samples,
+        jobs=args.jobs,
+        centrality_cache_dir=None if args.no_centrality_cache else args.centrality_cache_dir,
+        report_formats=args.formats,
     )
 
 
@@ -555,11 +687,13 @@ def main() -> None:
         # Display results
         reporter.print_statistics()
         reporter.print_organization_analysis()
+        reporter.print_edge_analysis()
         reporter.print_centrality_analysis()
 
-        # Export to Excel
-        output_file = reporter.export_to_excel()
-        console.print(f"\n✅ [bold green]Report saved to:[/bold green] {output_file}")
+        # Export report
+        output_files = reporter.export_report()
+        for output_file in output_files:
+            console.print(f"\n✅ [bold green]Report saved to:[/bold green] {output_file}")
 
         logger.success("Analysis completed successfully!")
 
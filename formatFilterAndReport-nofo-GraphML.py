@@ -8,15 +8,20 @@ import os
 import sys
 import json
 from typing import Dict, List, Tuple, Optional, Any, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import networkx as nx
-import xlwt
 from rich.panel import Panel
 
 from utils.unified_logger import logger
 from utils.unified_console import console, traceback
 from utils.unified_console import Table
+from utils.centrality import (DEFAULT_CENTRALITY_CACHE_DIR,
+                              compute_centralities,
+                              parse_centrality_measures,
+                              top_central_nodes)
+from utils.report_writer import ReportWriter, parse_report_formats
+from utils.organization_analysis import analyze_organizations
 
 
 
@@ -30,6 +35,13 @@ class ReportConfig:
     verbose: bool = False
     output_prefix: Optional[str] = None
 
+    # The first centrality measure ranks the most connected individuals
+    centrality_measures: List[str] = field(default_factory=lambda: ["degree"])
+    betweenness_samples: Optional[int] = None
+    jobs: int = 1
+    centrality_cache_dir: Optional[str] = None
+    report_formats: List[str] = field(default_factory=lambda: ["xlsx"])
+
     # Default company lists
     top_firms_that_matter: List[str] = None
     top_firms_that_do_not_matter: List[str] = None
@@ -57,6 +69,7 @@ class BasicGraphMLReporter:
         self.graph: Optional[nx.Graph] = None
         self.color_map: Dict[str, str] = {}
         self.degree_centrality: Dict[str, float] = {}
+        self.centrality_scores: Dict[str, Dict[str, float]] = {}
         self.top_connected_individuals: List[Tuple[str, float]] = []
         self.organization_counts: Dict[str, int] = {}
 
@@ -174,15 +187,21 @@ class BasicGraphMLReporter:
         console.print("[bold cyan]Calculating centralities...[/bold cyan]")
 
         try:
-            self.degree_centrality = nx.degree_centrality(self.graph)
-            self.top_connected_individuals = sorted(
-                self.degree_centrality.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]  # Top 10 connected individuals
+            self.centrality_scores = compute_centralities(
+                self.graph,
+                self.config.centrality_measures,
+                betweenness_samples=self.config.betweenness_samples,
+                jobs=self.config.jobs,
+                cache_dir=self.config.centrality_cache_dir
+            )
+            self.degree_centrality = self.centrality_scores.get("degree", {})
+            self.top_connected_individuals = top_central_nodes(
+                self.centrality_scores[self.config.centrality_measures[0]], 10
+            )  # Top 10 connected individuals
         except Exception as e:
             logger.error(f"Error calculating centralities: {e}")
             self.degree_centrality = {}
+            self.centrality_scores = {}
             self.top_connected_individuals = []
 
     def analyze_organizations(self) -> None:
@@ -192,19 +211,8 @@ class BasicGraphMLReporter:
 
         console.print("[bold cyan]Analyzing organizations...[/bold cyan]")
 
-        self.organization_counts = {}
-        for _, data in self.graph.nodes(data=True):
-            affiliation = data.get('affiliation', 'unknown')
-            self.organization_counts[affiliation] = self.organization_counts.get(affiliation, 0) + 1
-
-        # Sort by count descending
-        self.organization_counts = dict(
-            sorted(
-                self.organization_counts.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )
-        )
+        # Sorted by count descending, nodes without affiliation count as 'unknown'
+        self.organization_counts = analyze_organizations(self.graph).node_counts(include_unaffiliated=True)
 
     def print_analysis_summary(self) -> None:
         """Print comprehensive analysis summary."""
@@ -275,118 +283,110 @@ class BasicGraphMLReporter:
                 if len(self.organization_counts) > top_n + 20:
                     console.print(f"  ... and {len(self.organization_counts) - (top_n + 20)} more")
 
-    def export_to_excel(self) -> str:
-        """Export analysis to Excel file."""
+    def export_report(self) -> List[str]:
+        """Export analysis to the requested report formats (.xlsx, CSV, Parquet).
+
+        Returns:
+            Paths of the written files
+        """
         if not self.graph:
             raise ValueError("No graph data to export")
 
-        console.print("[bold cyan]Exporting to Excel...[/bold cyan]")
-
-        # Create workbook
-        workbook = xlwt.Workbook(encoding="utf-8")
+        console.print(f"[bold cyan]Exporting report ({', '.join(self.config.report_formats)})...[/bold cyan]")
 
-        # Export basic statistics
-        self._export_basic_stats(workbook)
-
-        # Export organization analysis
-        self._export_organization_analysis(workbook)
-
-        # Export node list
-        self._export_node_list(workbook)
+        try:
+            with ReportWriter(self.config.output_prefix, self.config.report_formats) as writer:
+                # Export basic statistics
+                self._export_basic_stats(writer)
 
-        # Export centrality analysis
-        self._export_centrality_analysis(workbook)
+                # Export organization analysis
+                self._export_organization_analysis(writer)
 
-        # Save file
-        output_filename = f"{self.config.output_prefix}.xls"
+                # Export node list
+                self._export_node_list(writer)
 
-        try:
-            workbook.save(output_filename)
-            console.print(f"[green]✓ Report saved to: {output_filename}[/green]")
+                # Export centrality analysis
+                self._export_centrality_analysis(writer)
         except Exception as e:
-            logger.error(f"Failed to save Excel file: {e}")
+            logger.error(f"Failed to save report: {e}")
             raise
 
-        return output_filename
-
-    def _export_basic_stats(self, workbook: xlwt.Workbook) -> None:
-        """Export basic statistics to Excel."""
-        sheet = workbook.add_sheet("Graph Statistics")
-
-        sheet.write(0, 0, "Metric")
-        sheet.write(0, 1, "Value")
-
-        stats = [
-            ("Number of nodes", self.graph.number_of_nodes()),
-            ("Number of edges", self.graph.number_of_edges()),
-            ("Number of isolates", nx.number_of_isolates(self.graph)),
-        ]
-
-        for i, (metric, value) in enumerate(stats, 1):
-            sheet.write(i, 0, metric)
-            sheet.write(i, 1, value)
-
-    def _export_organization_analysis(self, workbook: xlwt.Workbook) -> None:
-        """Export organization analysis to Excel."""
-        sheet = workbook.add_sheet("Organizations by Node Count")
+        for output_filename in writer.output_files:
+            console.print(f"[green]✓ Report saved to: {output_filename}[/green]")
 
-        sheet.write(0, 0, "Organization")
-        sheet.write(0, 1, "Node Count")
-        sheet.write(0, 2, "Percentage")
+        return writer.output_files
+
+    def _export_basic_stats(self, writer: ReportWriter) -> None:
+        """Export basic statistics sheet."""
+        writer.write_sheet(
+            "Graph Statistics",
+            ["Metric", "Value"],
+            [
+                ("Number of nodes", self.graph.number_of_nodes()),
+                ("Number of edges", self.graph.number_of_edges()),
+                ("Number of isolates", nx.number_of_isolates(self.graph)),
+            ]
+        )
 
+    def _export_organization_analysis(self, writer: ReportWriter) -> None:
+        """Export organization analysis sheet."""
         total_nodes = self.graph.number_of_nodes()
-        for i, (org, count) in enumerate(self.organization_counts.items(), 1):
-            percentage = (count / total_nodes * 100) if total_nodes > 0 else 0
-            sheet.write(i, 0, org)
-            sheet.write(i, 1, count)
-            sheet.write(i, 2, f"{percentage:.2f}%")
-
-    def _export_node_list(self, workbook: xlwt.Workbook) -> None:
-        """Export node list to Excel."""
-        sheet = workbook.add_sheet("Nodes (Developers)")
-
-        sheet.write(0, 0, "ID")
-        sheet.write(0, 1, "Email")
-        sheet.write(0, 2, "Affiliation")
+        writer.write_sheet(
+            "Organizations by Node Count",
+            ["Organization", "Node Count", "Percentage"],
+            (
+                (org, count, f"{(count / total_nodes * 100) if total_nodes > 0 else 0:.2f}%")
+                for org, count in self.organization_counts.items()
+            )
+        )
 
+    def _export_node_list(self, writer: ReportWriter) -> None:
+        """Export node list sheet."""
         # Try to write nodes in order if they're numeric
         try:
             nodes_sorted = sorted(self.graph.nodes(), key=lambda x: int(x))
         except (ValueError, TypeError):
             nodes_sorted = list(self.graph.nodes())
 
-        for i, node in enumerate(nodes_sorted, 1):
-            data = self.graph.nodes[node]
-            sheet.write(i, 0, str(node))
-            sheet.write(i, 1, data.get('e-mail', ''))
-            sheet.write(i, 2, data.get('affiliation', ''))
+        writer.write_sheet(
+            "Nodes (Developers)",
+            ["ID", "Email", "Affiliation"],
+            (
+                (str(node), self.graph.nodes[node].get('e-mail', ''), self.graph.nodes[node].get('affiliation', ''))
+                for node in nodes_sorted
+            )
+        )
 
-    def _export_centrality_analysis(self, workbook: xlwt.Workbook) -> None:
-        """Export centrality analysis to Excel."""
-        if not self.degree_centrality:
+    def _export_centrality_analysis(self, writer: ReportWriter) -> None:
+        """Export centrality analysis sheet."""
+        if not self.centrality_scores:
             return
 
-        sheet = workbook.add_sheet("Centrality Analysis")
-
-        sheet.write(0, 0, "Node ID")
-        sheet.write(0, 1, "Degree Centrality")
-        sheet.write(0, 2, "Email")
-        sheet.write(0, 3, "Affiliation")
-
-        # Sort by centrality descending
-        sorted_centralities = sorted(
-            self.degree_centrality.items(),
-            key=lambda x: x[1],
-            reverse=True
+        measures = list(self.centrality_scores)
+        labels = []
+        for measure in measures:
+            label = f"{measure.title()} Centrality"
+            if measure == "betweenness" and self.config.betweenness_samples:
+                label += f" (approx., k={self.config.betweenness_samples})"
+            labels.append(label)
+
+        # Sort by the first centrality measure descending
+        sorted_centralities = top_central_nodes(self.centrality_scores[measures[0]], len(self.graph))
+
+        writer.write_sheet(
+            "Centrality Analysis",
+            ["Node ID", *labels, "Email", "Affiliation"],
+            (
+                (
+                    str(node_id),
+                    *(self.centrality_scores[measure][node_id] for measure in measures),
+                    self.graph.nodes[node_id].get('e-mail', ''),
+                    self.graph.nodes[node_id].get('affiliation', '')
+                )
+                for node_id, _ in sorted_centralities
+            )
         )
 
-        for i, (node_id, centrality) in enumerate(sorted_centralities, 1):
-            data = self.graph.nodes[node_id]
-            sheet.write(i, 0, str(node_id))
-            sheet.write(i, 1, centrality)
-            sheet.write(i, 2, data.get('e-mail', ''))
-            sheet.write(i, 3, data.get('affiliation', ''))
-
 
 def parse_arguments() -> ReportConfig:
     """Parse command line arguments."""
@@ -445,6 +445,47 @@ def parse_arguments() -> ReportConfig:
         help="Comma-separated list of firms to filter out (overrides default)"
     )
 
+    parser.add_argument(
+        "-cm", "--centralities",
+        type=parse_centrality_measures,
+        default=["degree"],
+        help="Comma-separated centrality measures among degree, eigenvector, closeness and betweenness; "
+             "the first one ranks the most connected individuals (default: degree)"
+    )
+
+    parser.add_argument(
+        "-bs", "--betweenness-samples",
+        type=int,
+        help="Approximate betweenness centrality from k sampled source nodes (default: exact)"
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for closeness and betweenness centrality (default: 1)"
+    )
+
+    parser.add_argument(
+        "--centrality-cache-dir",
+        type=str,
+        default=DEFAULT_CENTRALITY_CACHE_DIR,
+        help=f"Directory where centralities are cached per graph hash (default: {DEFAULT_CENTRALITY_CACHE_DIR})"
+    )
+
+    parser.add_argument(
+        "--no-centrality-cache",
+        action="store_true",
+        help="Do not read nor write the on-disk centrality cache"
+    )
+
+    parser.add_argument(
+        "-fmt", "--formats",
+        type=parse_report_formats,
+        default=["xlsx"],
+        help="Comma-separated report formats among xlsx, csv and parquet (default: xlsx)"
+    )
+
     args = parser.parse_args()
 
     return ReportConfig(
@@ -456,6 +497,11 @@ def parse_arguments() -> ReportConfig:
         output_prefix=args.output_prefix,
         top_firms_that_matter=args.top_firms,
         top_firms_that_do_not_matter=args.filter_firms,
+        centrality_measures=args.centralities,
+        betweenness_samples=args.betweenness_samples,
+        jobs=args.jobs,
+        centrality_cache_dir=None if args.no_centrality_cache else args.centrality_cache_dir,
+        report_formats=args.formats,
     )
 
 
@@ -471,7 +517,7 @@ def print_banner() -> None:
     [dim]TODO:[/dim]
     [dim]• Report on companies with more developers[/dim]
     [dim]• Report on centrality of developers and organizations[/dim]
-    [dim]• Export in XML, HTML, LaTeX, MD, CSV and TXT files[/dim]
+    [dim]• Export in XML, HTML, LaTeX, MD and TXT files[/dim]
     """
     console.print(banner)
 
@@ -515,11 +561,12 @@ def main() -> None:
         # Display results
         reporter.print_analysis_summary()
 
-        # Export to Excel
-        output_file = reporter.export_to_excel()
+        # Export report
+        output_files = reporter.export_report()
 
         console.print(f"\n✅ [bold green]Analysis completed![/bold green]")
-        console.print(f"   Report saved as: [cyan]{output_file}[/cyan]")
+        for output_file in output_files:
+            console.print(f"   Report saved as: [cyan]{output_file}[/cyan]")
 
     except FileNotFoundError as e:
         console.print(f"\n❌ [bold red]Error: File not found[/bold red]")
@@ -2,7 +2,7 @@
 
 # formats and visualizes a graphml file
 # filters by organizational affiliation
-# layout can be circular or spring (default)
+# layout can be circular, spring (default), forceatlas2, sparse-spring or multilevel (see utils/layout.py)
 # colorize accourding to affiliation atribute
 # nodesize according centralities 
 
@@ -33,11 +33,12 @@ import argparse
 import json
 import os
 import sys
+import time
 import random
 import configparser
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any, Set
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog
@@ -54,6 +55,13 @@ from rich.traceback import install as install_rich_traceback
 from rich.table import Table
 from rich.panel import Panel
 
+from utils.batch_rendering import (batch_layout_error, batch_layout_file, collect_graphml_files, print_batch_summary,
+                                   render_batch, summary_row, use_headless_backend)
+from utils.centrality import CENTRALITY_MEASURES, DEFAULT_CENTRALITY_CACHE_DIR, compute_centralities
+from utils.graph_filters import OrganizationFilter
+from utils.layout import DEFAULT_LAYOUT_CACHE_DIR, LAYOUT_ALGORITHMS, cached_layout, load_layout, save_layout
+from utils.rendering import DEFAULT_BUNDLE_STRENGTH, RASTERIZE_EDGES_MODES, draw_edges, draw_nodes
+
 # Configure Rich traceback
 install_rich_traceback(
     show_locals=True,
@@ -103,6 +111,33 @@ class VisualizationConfig:
     save_graphml: bool = False
     verbose: bool = False
     github_token: Optional[str] = None
+    centrality_measure: str = "degree"
+    betweenness_samples: Optional[int] = None
+    centrality_cache_dir: Optional[str] = None
+    layout_iterations: Optional[int] = None
+    layout_cache_dir: Optional[str] = None
+    init_layout: Optional[str] = None
+    save_layout: Optional[str] = None
+    rasterize_edges: str = "auto"
+    bundle_edges: bool = False
+    bundle_strength: float = DEFAULT_BUNDLE_STRENGTH
+    # Batch mode: all the networks to render, worker processes and directory of the figures
+    input_files: List[str] = field(default_factory=list)
+    jobs: int = 1
+    output_dir: Optional[str] = None
+
+
+def load_affiliation_aliases(config_file: str) -> Dict[str, str]:
+    """Read the [aliases] section of an affiliation alias config file (empty if it has none)."""
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    return dict(config['aliases']) if 'aliases' in config else {}
+
+
+def load_color_map_file(color_map_file: str) -> Dict[str, Any]:
+    """Read a JSON color map file, mapping organizations to colors."""
+    with open(color_map_file, 'r') as file:
+        return json.load(file)
 
 
 class GraphMLVisualizer:
@@ -118,6 +153,7 @@ class GraphMLVisualizer:
         self.affiliation_counts: Dict[str, int] = {}
         self.top_organizations: Dict[str, int] = {}
         self.initial_stats: Dict[str, int] = {}
+        self.output_files: List[str] = []
 
     def load_graph(self) -> None:
         """Load GraphML file with error handling."""
@@ -154,8 +190,7 @@ class GraphMLVisualizer:
         """Load color map from JSON file or initialize empty."""
         if self.config.color_map_file:
             try:
-                with open(self.config.color_map_file, 'r') as file:
-                    self.color_map = json.load(file)
+                self.color_map = load_color_map_file(self.config.color_map_file)
                 console.print(f"[green]✓ Loaded color map from {self.config.color_map_file}[/green]")
             except FileNotFoundError:
                 logger.warning(f"Color map file not found: {self.config.color_map_file}")
@@ -167,17 +202,16 @@ class GraphMLVisualizer:
             self.color_map = {}
             console.print("[yellow]No color map provided, using random colors for unknown firms[/yellow]")
 
-    def apply_affiliation_aliases(self) -> None:
-        """Apply affiliation aliases from config file."""
+    def apply_affiliation_aliases(self, aliases: Optional[Dict[str, str]] = None) -> None:
+        """Apply affiliation aliases from config file (or the aliases already loaded for a batch)."""
         if not self.config.affiliation_alias_in_config_file or not self.graph:
             return
 
         try:
-            config = configparser.ConfigParser()
-            config.read(self.config.affiliation_alias_in_config_file)
+            if aliases is None:
+                aliases = load_affiliation_aliases(self.config.affiliation_alias_in_config_file)
 
-            if 'aliases' in config:
-                aliases = dict(config['aliases'])
+            if aliases:
                 console.print(f"[cyan]Applying {len(aliases)} affiliation aliases[/cyan]")
 
                 for node, data in self.graph.nodes(data=True):
@@ -299,100 +333,75 @@ class GraphMLVisualizer:
             )
 
     def filter_graph(self) -> None:
-        """Apply all configured filters to the graph."""
+        """Apply all configured filters to the graph.
+
+        Filters narrow a single keep-set built from an affiliation index (see utils.graph_filters), and
+        the filtered graph is one induced subgraph view of the graph.
+        """
         if not self.graph:
             return
 
         console.print("[bold cyan]Applying filters...[/bold cyan]")
-        self.filtered_graph = self.graph.copy()
+        organization_filter = OrganizationFilter(self.graph)
 
         # Apply ignore list
         if self.config.org_list_to_ignore:
-            self._filter_by_organizations(self.config.org_list_to_ignore, keep=False)
+            self._filter_by_organizations(organization_filter, self.config.org_list_to_ignore, keep=False)
 
         # Apply only list
         if self.config.org_list_only:
-            self._filter_by_organizations(self.config.org_list_only, keep=True)
+            self._filter_by_organizations(organization_filter, self.config.org_list_only, keep=True)
 
         # Apply neighbours filter
         if self.config.org_list_and_neighbours_only:
-            self._filter_by_organizations_and_neighbours(self.config.org_list_and_neighbours_only)
+            self._filter_by_organizations_and_neighbours(organization_filter,
+                                                         self.config.org_list_and_neighbours_only)
 
         # Apply top organizations filter
         if self.config.org_list_top_only:
-            self._filter_top_organizations()
+            self._filter_top_organizations(organization_filter)
 
+        self.filtered_graph = organization_filter.subgraph()
         self._print_filtering_results()
 
-
-
-    def _filter_by_organizations(self, org_list: List[str], keep: bool = True) -> None:
+    def _filter_by_organizations(self, organization_filter: OrganizationFilter, org_list: List[str],
+                                 keep: bool = True) -> None:
         """Filter nodes by organization list."""
-        if not self.filtered_graph:
-            return
-
         operation = "Keeping only" if keep else "Removing"
         console.print(f"[cyan]{operation} organizations: {org_list}[/cyan]")
 
-        nodes_to_remove = []
-        for node, data in self.filtered_graph.nodes(data=True):
-            affiliation = data.get('affiliation', '')
-            should_remove = (affiliation not in org_list) if keep else (affiliation in org_list)
-
-            if should_remove:
-                nodes_to_remove.append(node)
-                if self.config.verbose:
-                    action = "Removing" if not keep else "Filtering out"
-                    console.print(f"  {action} node {node} ({affiliation})")
+        if keep:
+            removed = organization_filter.only_organizations(org_list)
+        else:
+            removed = organization_filter.exclude_organizations(org_list)
 
-        self.filtered_graph.remove_nodes_from(nodes_to_remove)
+        if self.config.verbose:
+            action = "Removing" if not keep else "Filtering out"
+            for node in organization_filter.in_graph_order(removed):
+                affiliation = self.graph.nodes[node].get('affiliation', '')
+                console.print(f"  {action} node {node} ({affiliation})")
 
-    def _filter_by_organizations_and_neighbours(self, org_list: List[str]) -> None:
+    def _filter_by_organizations_and_neighbours(self, organization_filter: OrganizationFilter,
+                                                org_list: List[str]) -> None:
         """Filter to keep only specified organizations and their neighbours."""
-        if not self.filtered_graph:
-            return
-
         console.print(f"[cyan]Keeping organizations and their neighbours: {org_list}[/cyan]")
 
-        nodes_to_keep = set()
-
-        # First, find all nodes from specified organizations
-        for node, data in self.filtered_graph.nodes(data=True):
-            if data.get('affiliation', '') in org_list:
-                nodes_to_keep.add(node)
-                # Add all neighbours
-                for neighbor in self.filtered_graph.neighbors(node):
-                    nodes_to_keep.add(neighbor)
-
-        # Remove nodes not in keep list
-        nodes_to_remove = [
-            node for node in self.filtered_graph.nodes()
-            if node not in nodes_to_keep
-        ]
-
-        self.filtered_graph.remove_nodes_from(nodes_to_remove)
+        removed = organization_filter.only_organizations_and_neighbours(org_list)
 
         if self.config.verbose:
-            console.print(f"  Kept {len(nodes_to_keep)} nodes, removed {len(nodes_to_remove)} nodes")
+            console.print(f"  Kept {len(organization_filter.keep)} nodes, removed {len(removed)} nodes")
 
-    def _filter_top_organizations(self) -> None:
+    def _filter_top_organizations(self, organization_filter: OrganizationFilter) -> None:
         """Filter to keep only top organizations."""
-        if not self.filtered_graph or not self.top_organizations:
+        if not self.top_organizations:
             return
 
         console.print(f"[cyan]Keeping top {len(self.top_organizations)} organizations[/cyan]")
 
-        top_orgs = set(self.top_organizations.keys())
-        nodes_to_remove = []
-
-        for node, data in self.filtered_graph.nodes(data=True):
-            if data.get('affiliation', '') not in top_orgs:
-                nodes_to_remove.append(node)
-
-        self.filtered_graph.remove_nodes_from(nodes_to_remove)
+        removed = organization_filter.only_organizations(self.top_organizations.keys())
 
         if self.config.verbose:
-            console.print(f"  Removed {len(nodes_to_remove)} nodes not in top organizations")
+            console.print(f"  Removed {len(removed)} nodes not in top organizations")
 
     def _print_filtering_results(self) -> None:
         """Print filtering results."""
@@ -437,7 +446,12 @@ class GraphMLVisualizer:
         console.print("[bold cyan]Calculating centrality measures...[/bold cyan]")
 
         try:
-            self.degree_centrality = nx.degree_centrality(self.filtered_graph)
+            self.degree_centrality = compute_centralities(
+                self.filtered_graph,
+                [self.config.centrality_measure],
+                betweenness_samples=self.config.betweenness_samples,
+                cache_dir=self.config.centrality_cache_dir
+            )[self.config.centrality_measure]
 
             # Print top connected individuals
             sorted_centrality = sorted(
@@ -524,13 +538,27 @@ class GraphMLVisualizer:
 
         console.print(f"[cyan]Calculating {self.config.network_layout} layout...[/cyan]")
 
-        if self.config.network_layout == 'circular':
-            self.pos = nx.circular_layout(self.filtered_graph)
-        elif self.config.network_layout == 'spring':
-            self.pos = nx.spring_layout(self.filtered_graph)
-        else:
+        layout = self.config.network_layout
+        if layout not in LAYOUT_ALGORITHMS:
             console.print(f"[yellow]Unknown layout, using spring layout[/yellow]")
-            self.pos = nx.spring_layout(self.filtered_graph)
+            layout = 'spring'
+
+        init_positions = None
+        if self.config.init_layout:
+            init_positions = load_layout(self.config.init_layout, self.filtered_graph)
+            console.print(f"[cyan]Starting from {len(init_positions)} node positions of "
+                          f"{self.config.init_layout}[/cyan]")
+
+        self.pos = cached_layout(
+            self.filtered_graph, layout,
+            iterations=self.config.layout_iterations,
+            init_positions=init_positions,
+            cache_dir=self.config.layout_cache_dir
+        )
+
+        if self.config.save_layout:
+            save_layout(self.pos, self.config.save_layout, layout)
+            console.print(f"[green]✓ Saved layout to {self.config.save_layout}[/green]")
 
     def create_visualization(self) -> None:
         """Create and display/save the visualization."""
@@ -546,23 +574,18 @@ class GraphMLVisualizer:
         node_colors = self.get_node_colors()
         node_sizes = self.get_node_sizes()
 
-        # Draw nodes
-        nx.draw_networkx_nodes(
-            self.filtered_graph,
-            self.pos,
-            node_color=node_colors,
-            node_size=node_sizes,
-            alpha=0.8,
-            ax=ax
-        )
-
-        # Draw edges
-        nx.draw_networkx_edges(
+        # Draw nodes (one scatter) and edges (one LineCollection, rasterised when dense)
+        draw_nodes(ax, self.filtered_graph, self.pos, color=node_colors, size=node_sizes, alpha=0.8)
+        draw_edges(
+            ax,
             self.filtered_graph,
             self.pos,
             width=0.5,
-            alpha=0.5,
-            ax=ax
+            # Bundled edges overlap, so they are blended more lightly
+            alpha=0.15 if self.config.bundle_edges else 0.5,
+            rasterize=self.config.rasterize_edges,
+            bundle=self.config.bundle_edges,
+            bundle_strength=self.config.bundle_strength
         )
 
         # Draw labels (only for top nodes if verbose)
@@ -687,17 +710,20 @@ class GraphMLVisualizer:
         """Save visualization to files."""
         base_name = Path(self.config.input_file).stem
         layout = self.config.network_layout
+        output_dir = Path(self.config.output_dir or '.')
 
         # Save as PNG
-        png_file = f"{base_name}_{layout}.png"
+        png_file = str(output_dir / f"{base_name}_{layout}.png")
         fig.savefig(png_file, dpi=300, bbox_inches='tight')
         console.print(f"[green]✓ Saved PNG: {png_file}[/green]")
 
         # Save as PDF
-        pdf_file = f"{base_name}_{layout}.pdf"
-        fig.savefig(pdf_file, bbox_inches='tight')
+        pdf_file = str(output_dir / f"{base_name}_{layout}.pdf")
+        fig.savefig(pdf_file, dpi=300, bbox_inches='tight')
         console.print(f"[green]✓ Saved PDF: {pdf_file}[/green]")
 
+        self.output_files.extend([png_file, pdf_file])
+
     def save_filtered_graphml(self) -> None:
         """Save filtered graph as GraphML file."""
         if not self.filtered_graph or not self.config.save_graphml:
@@ -731,6 +757,101 @@ class GraphMLVisualizer:
         except Exception as e:
             logger.error(f"Failed to save GraphML file: {e}")
 
+    def run(self, color_map: Optional[Dict[str, Any]] = None, aliases: Optional[Dict[str, str]] = None) -> None:
+        """Load, filter, lay out and render the network (and save the filtered graph if requested).
+
+        Args:
+            color_map: Color map already loaded for a batch, None to load config.color_map_file
+            aliases: Affiliation aliases already loaded for a batch, None to load them from the config file
+        """
+        # Load and process graph
+        self.load_graph()
+        if color_map is None:
+            self.load_color_map()
+        else:
+            self.color_map = dict(color_map)
+        self.apply_affiliation_aliases(aliases)
+        self.normalize_affiliations()
+        self.analyze_affiliations()
+        self.filter_graph()
+        self.reanalyze_affiliations_after_filtering()
+        self.calculate_centralities()
+        self.calculate_layout()
+
+        # Create visualization
+        self.create_visualization()
+
+        # Save filtered graph if requested
+        if self.config.save_graphml:
+            self.save_filtered_graphml()
+
+
+# Configuration shared by all the files of a batch, loaded once by the parent process
+_batch_config: Optional[VisualizationConfig] = None
+_batch_color_map: Dict[str, Any] = {}
+_batch_aliases: Dict[str, str] = {}
+
+
+def init_batch_worker(config: VisualizationConfig, color_map: Dict[str, Any], aliases: Dict[str, str],
+                      quiet: bool = False) -> None:
+    """Process pool initializer receiving the batch configuration, drawing on the Agg backend."""
+    global _batch_config, _batch_color_map, _batch_aliases
+    _batch_config, _batch_color_map, _batch_aliases = config, color_map, aliases
+    use_headless_backend()
+    # Workers would interleave their progress output, the batch summary reports on every file
+    console.quiet = quiet
+
+
+def render_file(input_file: str) -> Dict[str, Any]:
+    """Render one network of individuals file to PNG and PDF (batch mode worker)."""
+    start = time.perf_counter()
+    summary = summary_row(input_file)
+    config = replace(_batch_config, input_file=input_file, input_files=[input_file],
+                     init_layout=batch_layout_file(_batch_config.init_layout, input_file, existing_only=True),
+                     save_layout=batch_layout_file(_batch_config.save_layout, input_file))
+    visualizer = GraphMLVisualizer(config)
+    try:
+        visualizer.run(_batch_color_map, _batch_aliases)
+        summary.update(nodes=visualizer.filtered_graph.number_of_nodes(),
+                       edges=visualizer.filtered_graph.number_of_edges(),
+                       outputs=visualizer.output_files)
+    except Exception as e:
+        summary["status"] = f"failed: {e}"
+
+    summary["seconds"] = f"{time.perf_counter() - start:.2f}"
+    return summary
+
+
+def run_batch(config: VisualizationConfig) -> List[Dict[str, Any]]:
+    """Render every file of config.input_files with config.jobs worker processes, then print a summary."""
+    color_map = {}
+    if config.color_map_file:
+        # As in single-file mode, an unusable color map falls back to random colors
+        try:
+            color_map = load_color_map_file(config.color_map_file)
+        except FileNotFoundError:
+            logger.warning(f"Color map file not found: {config.color_map_file}")
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON in color map file: {config.color_map_file}")
+    aliases = load_affiliation_aliases(config.affiliation_alias_in_config_file) \
+        if config.affiliation_alias_in_config_file else {}
+    if config.output_dir:
+        os.makedirs(config.output_dir, exist_ok=True)
+    if config.plot:
+        logger.warning("Batch mode saves the figures instead of displaying them (--plot ignored)")
+    config = replace(config, plot=False)
+
+    if config.save_layout:
+        os.makedirs(config.save_layout, exist_ok=True)
+
+    console.print(f"[cyan]Rendering {len(config.input_files)} networks with {config.jobs} job(s)[/cyan]")
+    summaries, wall_seconds = render_batch(render_file, config.input_files, config.jobs,
+                                           initializer=init_batch_worker,
+                                           initargs=(config, color_map, aliases, config.jobs > 1))
+    console.quiet = False
+    print_batch_summary(summaries, wall_seconds, config.jobs)
+    return summaries
+
 
 def parse_arguments() -> VisualizationConfig:
     """Parse command line arguments."""
@@ -740,10 +861,24 @@ def parse_arguments() -> VisualizationConfig:
     )
 
     parser.add_argument(
-        "infile",
-        nargs='?',
+        "infiles",
+        nargs='*',
         type=str,
-        help="The network file (created by ScrapLogGit2Net)"
+        help="The network file (created by ScrapLogGit2Net), or several files and directories of "
+             "network files rendered in batch mode"
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes rendering files in batch mode (default: 1)"
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        help="Directory of the PNG and PDF figures (default: the current directory)"
     )
 
     parser.add_argument(
@@ -761,9 +896,67 @@ def parse_arguments() -> VisualizationConfig:
 
     parser.add_argument(
         "-nl", "--network-layout",
-        choices=['circular', 'spring'],
+        choices=LAYOUT_ALGORITHMS,
         default='spring',
-        help="Network layout algorithm"
+        help="Network layout algorithm (forceatlas2, sparse-spring and multilevel scale to large networks)"
+    )
+
+    parser.add_argument(
+        "--layout-iterations",
+        type=int,
+        default=None,
+        help="Number of iterations of the force-directed layouts (default: depends on the layout)"
+    )
+
+    parser.add_argument(
+        "--rasterize-edges",
+        choices=RASTERIZE_EDGES_MODES,
+        default="auto",
+        help="Rasterise the edges inside the PDF (auto: for dense networks), nodes and text stay vector"
+    )
+
+    parser.add_argument(
+        "--bundle-edges",
+        action="store_true",
+        help="Bundle the edges by organization pair, drawn as alpha-blended curves"
+    )
+
+    parser.add_argument(
+        "--bundle-strength",
+        type=float,
+        default=DEFAULT_BUNDLE_STRENGTH,
+        help=f"Pull of the bundled edges towards their organization pair, from 0 to 1 "
+             f"(default: {DEFAULT_BUNDLE_STRENGTH})"
+    )
+
+    parser.add_argument(
+        "--init-layout",
+        type=str,
+        metavar="LAYOUT_FILE",
+        help="Start the layout from the node positions of a layout saved with --save-layout "
+             "(e.g. of the previous year), which needs fewer iterations. In batch mode, a directory of "
+             "<network>.layout.json files"
+    )
+
+    parser.add_argument(
+        "--save-layout",
+        type=str,
+        metavar="LAYOUT_FILE",
+        help="Save the node positions to a layout file, for --init-layout. In batch mode, a directory "
+             "where each network is saved to <network>.layout.json"
+    )
+
+    parser.add_argument(
+        "--layout-cache-dir",
+        type=str,
+        default=DEFAULT_LAYOUT_CACHE_DIR,
+        help=f"Directory where layouts are cached per graph hash (default: {DEFAULT_LAYOUT_CACHE_DIR})"
+    )
+
+    parser.add_argument(
+        "--no-layout-cache",
+        action="store_true",
+        help="Neither read nor write the layout cache"
     )
 
     parser.add_argument(
@@ -864,10 +1057,36 @@ def parse_arguments() -> VisualizationConfig:
         help="GitHub API token for affiliation resolution (not implemented)"
     )
 
+    parser.add_argument(
+        "--centrality",
+        choices=CENTRALITY_MEASURES,
+        default="degree",
+        help="Centrality measure used to size nodes (default: degree)"
+    )
+
+    parser.add_argument(
+        "--betweenness-samples",
+        type=int,
+        help="Approximate betweenness centrality from k sampled source nodes (default: exact)"
+    )
+
+    parser.add_argument(
+        "--centrality-cache-dir",
+        type=str,
+        default=DEFAULT_CENTRALITY_CACHE_DIR,
+        help=f"Directory where centralities are cached per graph hash (default: {DEFAULT_CENTRALITY_CACHE_DIR})"
+    )
+
+    parser.add_argument(
+        "--no-centrality-cache",
+        action="store_true",
+        help="Do not read nor write the on-disk centrality cache"
+    )
+
     args = parser.parse_args()
 
     # Handle file input via dialog if not provided
-    if not args.infile:
+    if not args.infiles:
         console.print("[yellow]No input file provided, opening file dialog...[/yellow]")
         root = tk.Tk()
         root.withdraw()
@@ -881,15 +1100,23 @@ def parse_arguments() -> VisualizationConfig:
             console.print("[red]No file selected. Exiting.[/red]")
             sys.exit(1)
 
-        args.infile = input_file
+        args.infiles = [input_file]
 
-    # Validate input file
-    if not Path(args.infile).is_file():
-        console.print(f"[red]File not found: {args.infile}[/red]")
+    # Validate input files, directories are expanded to their GraphML files
+    try:
+        input_files = collect_graphml_files(args.infiles)
+    except FileNotFoundError as e:
+        console.print(f"[red]File not found: {e}[/red]")
+        sys.exit(1)
+    if not input_files:
+        console.print(f"[red]No GraphML files found in {', '.join(args.infiles)}[/red]")
         sys.exit(1)
+    layout_error = batch_layout_error(args.init_layout, args.save_layout) if len(input_files) > 1 else None
+    if layout_error:
+        parser.error(layout_error)
 
     return VisualizationConfig(
-        input_file=args.infile,
+        input_file=input_files[0],
         color_map_file=args.color_map_file,
         network_layout=args.network_layout,
         node_sizing_strategy=args.node_sizing_strategy,
@@ -907,6 +1134,19 @@ def parse_arguments() -> VisualizationConfig:
         save_graphml=args.save_graphml,
         verbose=args.verbose,
         github_token=args.github_token,
+        centrality_measure=args.centrality,
+        betweenness_samples=args.betweenness_samples,
+        centrality_cache_dir=None if args.no_centrality_cache else args.centrality_cache_dir,
+        layout_iterations=args.layout_iterations,
+        layout_cache_dir=None if args.no_layout_cache else args.layout_cache_dir,
+        init_layout=args.init_layout,
+        save_layout=args.save_layout,
+        rasterize_edges=args.rasterize_edges,
+        bundle_edges=args.bundle_edges,
+        bundle_strength=args.bundle_strength,
+        input_files=input_files,
+        jobs=args.jobs,
+        output_dir=args.output_dir,
     )
 
 
@@ -938,26 +1178,18 @@ def main() -> None:
                 level="DEBUG",
             )
 
-        # Create visualizer
-        visualizer = GraphMLVisualizer(config)
-
-        # Load and process graph
-        visualizer.load_graph()
-        visualizer.load_color_map()
-        visualizer.apply_affiliation_aliases()
-        visualizer.normalize_affiliations()
-        visualizer.analyze_affiliations()
-        visualizer.filter_graph()
-        visualizer.reanalyze_affiliations_after_filtering()  # ← add this line
-        visualizer.calculate_centralities()
-        visualizer.calculate_layout()
+        if len(config.input_files) > 1:
+            summaries = run_batch(config)
+            if any(str(row["status"]).startswith("failed") for row in summaries):
+                sys.exit(1)
+            return
 
-        # Create visualization
-        visualizer.create_visualization()
+        if config.output_dir:
+            os.makedirs(config.output_dir, exist_ok=True)
 
-        # Save filtered graph if requested
-        if config.save_graphml:
-            visualizer.save_filtered_graphml()
+        # Create visualizer, then load, filter, lay out and render the graph
+        visualizer = GraphMLVisualizer(config)
+        visualizer.run()
 
         console.print("\n✅ [bold green]Visualization completed successfully![/bold green]")
 
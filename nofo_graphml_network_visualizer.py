@@ -9,15 +9,23 @@ import json
 import math
 import random
 import argparse
+import time
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 import networkx as nx
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
 
 from utils.unified_logger import logger
+from utils.batch_rendering import (batch_layout_error, batch_layout_file, collect_graphml_files, print_batch_summary,
+                                   render_batch, summary_row, use_headless_backend)
+from utils.layout import DEFAULT_LAYOUT_CACHE_DIR, LAYOUT_ALGORITHMS, cached_layout, load_layout, save_layout
+from utils.rendering import RASTERIZE_EDGES_MODES, draw_edges, draw_nodes
+from utils.centrality import (CENTRALITY_MEASURES,
+                              DEFAULT_CENTRALITY_CACHE_DIR,
+                              compute_centralities)
 from utils.unified_console import (console,
                                    inspect,
                                    print_info,
@@ -50,6 +58,27 @@ class NetworkConfig:
     exclude_orgs: Optional[List[str]] = None
     # Add legend info data file
     legend_info_file: Optional[str] = None
+    # Centrality used for node sizing and top-n filtering, see utils/centrality.py
+    centrality_measure: str = "eigenvector"
+    betweenness_samples: Optional[int] = None
+    centrality_cache_dir: Optional[str] = None
+    # Iterations of the force-directed layouts, None for the defaults of utils/layout.py
+    layout_iterations: Optional[int] = None
+    # Layout cache (None to disable) and layout files to start from / save to, see utils/layout.py
+    layout_cache_dir: Optional[str] = None
+    init_layout: Optional[str] = None
+    save_layout: Optional[str] = None
+    # Rasterisation of the edge layer of the PDF, see utils/rendering.py
+    rasterize_edges: str = "auto"
+    # Batch mode: all the networks to render and number of worker processes
+    input_files: List[str] = field(default_factory=list)
+    jobs: int = 1
+
+
+def load_color_map_file(color_map_file: str) -> Dict[str, Any]:
+    """Read a JSON color map file, mapping organizations to colors."""
+    with open(color_map_file, 'r') as file:
+        return json.load(file)
 
 
 class NetworkVisualizer:
@@ -62,6 +91,7 @@ class NetworkVisualizer:
         self.known_org_node_colors: Dict[str, Any] = {}
         self.degree_centrality: Optional[Dict[str, float]] = None
         self.legend_info: Dict[str, Dict[str, Any]] = {}  # Store legend info by organization_id
+        self.output_files: List[str] = []
 
     def load_graph(self) -> None:
         """Load GraphML file from string or Path object."""
@@ -288,11 +318,19 @@ class NetworkVisualizer:
 
         # Use eigenvector centrality for weighted graphs
         # If the graph has no edges or is disconnected, fall back to degree centrality
+        measure = self.config.centrality_measure
         try:
-            self.degree_centrality = nx.eigenvector_centrality(self.graph, max_iter=1000)
+            self.degree_centrality = compute_centralities(
+                self.graph,
+                [measure],
+                betweenness_samples=self.config.betweenness_samples,
+                cache_dir=self.config.centrality_cache_dir
+            )[measure]
         except (nx.PowerIterationFailedConvergence, nx.NetworkXError):
-            logger.warning("Eigenvector centrality failed, using degree centrality instead")
-            self.degree_centrality = nx.degree_centrality(self.graph)
+            logger.warning(f"{measure.title()} centrality failed, using degree centrality instead")
+            self.degree_centrality = compute_centralities(
+                self.graph, ["degree"], cache_dir=self.config.centrality_cache_dir
+            )["degree"]
 
         sorted_centrality = sorted(
             self.degree_centrality.items(),
@@ -309,8 +347,7 @@ class NetworkVisualizer:
         """Load color map from JSON file or initialize empty."""
         if self.config.color_map_file:
             try:
-                with open(self.config.color_map_file, 'r') as file:
-                    self.known_org_node_colors = json.load(file)
+                self.known_org_node_colors = load_color_map_file(self.config.color_map_file)
                 logger.info(f"Loaded color map from {self.config.color_map_file}")
             except FileNotFoundError:
                 logger.warning(f"Color map file not found: {self.config.color_map_file}")
@@ -382,13 +419,29 @@ class NetworkVisualizer:
         if not self.graph:
             return {}
 
-        if self.config.network_layout == 'circular':
-            return nx.circular_layout(self.graph)
-        elif self.config.network_layout == 'spring':
-            return nx.spring_layout(self.graph, seed=42)  # Add seed for reproducibility
-        else:
-            logger.error(f"Unknown layout: {self.config.network_layout}")
-            return nx.spring_layout(self.graph, seed=42)
+        layout = self.config.network_layout
+        if layout not in LAYOUT_ALGORITHMS:
+            logger.error(f"Unknown layout: {layout}")
+            layout = 'spring'
+
+        init_positions = None
+        if self.config.init_layout:
+            init_positions = load_layout(self.config.init_layout, self.graph)
+            logger.info(f"Starting from {len(init_positions)} node positions of {self.config.init_layout}")
+
+        # Seed for reproducibility
+        positions = cached_layout(
+            self.graph, layout,
+            iterations=self.config.layout_iterations,
+            seed=42,
+            init_positions=init_positions,
+            cache_dir=self.config.layout_cache_dir
+        )
+
+        if self.config.save_layout:
+            save_layout(positions, self.config.save_layout, layout)
+            logger.info(f"Saved layout to {self.config.save_layout}")
+        return positions
 
     def get_legend_elements(self) -> List[Line2D]:
         """Create legend elements for the plot with enhanced information, sorted by number of contributors."""
@@ -506,22 +559,11 @@ class NetworkVisualizer:
         node_sizes = self.get_node_sizes()
         edge_thickness = self.get_edge_thickness()
 
-        # Draw nodes
-        node_options = {
-            'node_shape': 'o',
-            'node_color': node_colors,
-            'node_size': node_sizes,
-            'alpha': 0.75
-        }
-
-        nx.draw_networkx_nodes(self.graph, self.pos, **node_options)
-
-        # Draw edges
-        edge_options = {
-            'width': edge_thickness,
-            'alpha': 0.2
-        }
-        nx.draw_networkx_edges(self.graph, self.pos, **edge_options)
+        # Draw nodes (one scatter) and edges (one LineCollection)
+        ax = plt.gca()
+        draw_nodes(ax, self.graph, self.pos, color=node_colors, size=node_sizes, alpha=0.75, marker='o')
+        draw_edges(ax, self.graph, self.pos, width=edge_thickness, alpha=0.2,
+                   rasterize=self.config.rasterize_edges)
 
         # Draw labels
         nx.draw_networkx_labels(
@@ -616,6 +658,7 @@ class NetworkVisualizer:
 
             logger.info(f"Saving PNG to {png_path}")
             plt.savefig(png_path, format='png', dpi=300, bbox_inches='tight')
+            self.output_files.extend([str(png_path), str(pdf_path)])
 
         plt.close()
 
@@ -624,6 +667,115 @@ class NetworkVisualizer:
             create_webpage(self.config.input_file, png_path, str(sys.argv))
 
 
+    def run(self, color_map: Optional[Dict[str, Any]] = None) -> None:
+        """Load, filter and render the network.
+
+        Args:
+            color_map: Color map already loaded for a batch, None to load config.color_map_file
+        """
+        # Load graph
+        console.print(f"[bold blue] loading the graph {self.config.input_file=}\n")
+        self.load_graph()
+        console.print("[bold green] Success:[/bold green] Graph loaded 😀\n")
+
+        # Load legend info data if available (do this early so it's available for filtering)
+        console.print(f"[bold blue] Loading legend information\n")
+        self.load_legend_info()
+        console.print("[bold green] Success:[/bold green] Legend information loaded 😀\n")
+
+        # Apply organization name filtering IMMEDIATELY (removes nodes and their edges)
+        if self.config.include_only_orgs or self.config.exclude_orgs:
+            console.print(f"[bold blue] Filtering by organization names\n")
+            self.filter_by_organization_names()
+            console.print("[bold green] Success:[/bold green] Organization filtering applied 😀\n")
+
+        # Calculate centrality on FILTERED graph
+        console.print(f"[bold blue] Calculating centrality of nodes \n")
+        self.calculate_centralities()
+        console.print("[bold green] Success:[/bold green] Centrality calculated 😀\n")
+
+        # Apply top N filter if requested (on already filtered graph)
+        if self.config.filter_by_n_top_central_firms_only:
+            console.print(
+                f"[bold blue] Filtering to show top {self.config.filter_by_n_top_central_firms_only} central firms\n")
+            self.filter_top_n_central_firms()
+            console.print(
+                f"[bold green] Success:[/bold green] Filtered to top {self.config.filter_by_n_top_central_firms_only} central firms 😀\n")
+
+        console.print(f"[bold blue] Load color map vs. random colors for nodes \n")
+        if color_map is None:
+            self.load_color_map()
+        else:
+            self.known_org_node_colors = dict(color_map)
+        console.print("[bold green] Success:[/bold green] Nodes associated with colors 😀\n")
+
+        # Generate visualization
+        if self.config.verbose:
+            console.print(f"[bold blue] Visualizing the graph {inspect(self)} \n")
+        self.visualize()
+        console.print("[bold green] Success:[/bold green] Visualization completed successfully! 😀\n")
+
+
+# Configuration shared by all the files of a batch, loaded once by the parent process
+_batch_config: Optional[NetworkConfig] = None
+_batch_color_map: Dict[str, Any] = {}
+
+
+def init_batch_worker(config: NetworkConfig, color_map: Dict[str, Any], quiet: bool = False) -> None:
+    """Process pool initializer receiving the batch configuration, drawing on the Agg backend."""
+    global _batch_config, _batch_color_map
+    _batch_config, _batch_color_map = config, color_map
+    use_headless_backend()
+    # Workers would interleave their progress output, the batch summary reports on every file
+    console.quiet = quiet
+
+
+def render_file(input_file: str) -> Dict[str, Any]:
+    """Render one network of organizations file to PDF and PNG (batch mode worker)."""
+    start = time.perf_counter()
+    summary = summary_row(input_file)
+    config = replace(_batch_config, input_file=Path(input_file), input_files=[input_file],
+                     init_layout=batch_layout_file(_batch_config.init_layout, input_file, existing_only=True),
+                     save_layout=batch_layout_file(_batch_config.save_layout, input_file))
+    visualizer = NetworkVisualizer(config)
+    try:
+        visualizer.run(_batch_color_map)
+        summary.update(nodes=visualizer.graph.number_of_nodes(), edges=visualizer.graph.number_of_edges(),
+                       outputs=visualizer.output_files)
+    except Exception as e:
+        summary["status"] = f"failed: {e}"
+
+    summary["seconds"] = f"{time.perf_counter() - start:.2f}"
+    return summary
+
+
+def run_batch(config: NetworkConfig) -> List[Dict[str, Any]]:
+    """Render every file of config.input_files with config.jobs worker processes, then print a summary."""
+    color_map = {}
+    if config.color_map_file:
+        # As in single-file mode, an unusable color map falls back to random colors
+        try:
+            color_map = load_color_map_file(config.color_map_file)
+        except FileNotFoundError:
+            logger.warning(f"Color map file not found: {config.color_map_file}")
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON in color map file: {config.color_map_file}")
+    if config.show_visualization:
+        logger.warning("Batch mode saves the figures instead of displaying them (--show ignored)")
+    config = replace(config, show_visualization=False)
+
+    if config.save_layout:
+        os.makedirs(config.save_layout, exist_ok=True)
+
+    console.print(f"[cyan]Rendering {len(config.input_files)} networks with {config.jobs} job(s)[/cyan]")
+    summaries, wall_seconds = render_batch(render_file, config.input_files, config.jobs,
+                                           initializer=init_batch_worker,
+                                           initargs=(config, color_map, config.jobs > 1))
+    console.quiet = False
+    print_batch_summary(summaries, wall_seconds, config.jobs)
+    return summaries
+
+
 def create_webpage(input_file: Path, png_path: Path, caption: str):
     """
     Creates a simple HTML file with the figure and caption.
@@ -674,15 +826,68 @@ def parse_arguments() -> NetworkConfig:
 
     parser.add_argument(
         "file",
-        type=Path,
-        help="The network file (created by ScrapLogGit2Net)"
+        nargs='+',
+        type=str,
+        help="The network file (created by ScrapLogGit2Net), or several files and directories of "
+             "network files rendered in batch mode"
+    )
+
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes rendering files in batch mode (default: 1)"
     )
 
     parser.add_argument(
         "-n", "--network_layout",
-        choices=['circular', 'spring'],
+        choices=LAYOUT_ALGORITHMS,
         default='spring',
-        help="Network layout algorithm"
+        help="Network layout algorithm (forceatlas2, sparse-spring and multilevel scale to large networks)"
+    )
+
+    parser.add_argument(
+        "--layout-iterations",
+        type=int,
+        default=None,
+        help="Number of iterations of the force-directed layouts (default: depends on the layout)"
+    )
+
+    parser.add_argument(
+        "--rasterize-edges",
+        choices=RASTERIZE_EDGES_MODES,
+        default="auto",
+        help="Rasterise the edges inside the PDF (auto: for dense networks), nodes and text stay vector"
+    )
+
+    parser.add_argument(
+        "--init-layout",
+        type=str,
+        metavar="LAYOUT_FILE",
+        help="Start the layout from the node positions of a layout saved with --save-layout "
+             "(e.g. of the previous year), which needs fewer iterations. In batch mode, a directory of "
+             "<network>.layout.json files"
+    )
+
+    parser.add_argument(
+        "--save-layout",
+        type=str,
+        metavar="LAYOUT_FILE",
+        help="Save the node positions to a layout file, for --init-layout. In batch mode, a directory "
+             "where each network is saved to <network>.layout.json"
+    )
+
+    parser.add_argument(
+        "--layout-cache-dir",
+        type=str,
+        default=DEFAULT_LAYOUT_CACHE_DIR,
+        help=f"Directory where layouts are cached per graph hash (default: {DEFAULT_LAYOUT_CACHE_DIR})"
+    )
+
+    parser.add_argument(
+        "--no-layout-cache",
+        action="store_true",
+        help="Neither read nor write the layout cache"
     )
 
     parser.add_argument(
@@ -755,6 +960,32 @@ def parse_arguments() -> NetworkConfig:
         help="JSON file with organization information for enhanced legend display (default: looks for labels.json in current directory)"
     )
 
+    parser.add_argument(
+        "--centrality",
+        choices=CENTRALITY_MEASURES,
+        default="eigenvector",
+        help="Centrality measure used to size nodes and to select top central firms (default: eigenvector)"
+    )
+
+    parser.add_argument(
+        "--betweenness-samples",
+        type=int,
+        help="Approximate betweenness centrality from k sampled source nodes (default: exact)"
+    )
+
+    parser.add_argument(
+        "--centrality-cache-dir",
+        type=str,
+        default=DEFAULT_CENTRALITY_CACHE_DIR,
+        help=f"Directory where centralities are cached per graph hash (default: {DEFAULT_CENTRALITY_CACHE_DIR})"
+    )
+
+    parser.add_argument(
+        "--no-centrality-cache",
+        action="store_true",
+        help="Do not read nor write the on-disk centrality cache"
+    )
+
     # Single argument with multiple option strings
     parser.add_argument(
         "-s", "--show", "-p", "--plot",  # All four are valid
@@ -777,8 +1008,16 @@ def parse_arguments() -> NetworkConfig:
 
     args = parser.parse_args()
 
+    # Directories are expanded to their GraphML files, missing files are reported when loaded
+    input_files = collect_graphml_files(args.file, missing_ok=True)
+    if not input_files:
+        raise FileNotFoundError(f"No GraphML files found in {', '.join(args.file)}")
+    layout_error = batch_layout_error(args.init_layout, args.save_layout) if len(input_files) > 1 else None
+    if layout_error:
+        parser.error(layout_error)
+
     return NetworkConfig(
-        input_file=args.file,
+        input_file=Path(input_files[0]),
         network_layout=args.network_layout,
         node_sizing_strategy=args.node_sizing_strategy,
         node_coloring_strategy=args.node_coloring_strategy,
@@ -794,6 +1033,16 @@ def parse_arguments() -> NetworkConfig:
         include_only_orgs=args.include_only if args.include_only else None,
         exclude_orgs=args.exclude if args.exclude else None,
         legend_info_file=args.legend_info_data,
+        centrality_measure=args.centrality,
+        betweenness_samples=args.betweenness_samples,
+        centrality_cache_dir=None if args.no_centrality_cache else args.centrality_cache_dir,
+        layout_iterations=args.layout_iterations,
+        layout_cache_dir=None if args.no_layout_cache else args.layout_cache_dir,
+        init_layout=args.init_layout,
+        save_layout=args.save_layout,
+        rasterize_edges=args.rasterize_edges,
+        input_files=input_files,
+        jobs=args.jobs,
     )
 
 
@@ -818,50 +1067,19 @@ def main() -> None:
         console.print("[bold green]"
                       " Success:[/bold green] Arguments parsed 😀\n")
 
+        if len(config.input_files) > 1:
+            summaries = run_batch(config)
+            if any(str(row["status"]).startswith("failed") for row in summaries):
+                sys.exit(1)
+            return
+
         # Create visualizer
         if config.verbose:
             console.print(f"[bold blue] Creating visualizer based on[/bold blue] {config=}\n")
         visualizer = NetworkVisualizer(config)
         console.print("[bold green] Success:[/bold green] Visualizer created 😀\n")
 
-        # Load graph
-        console.print(f"[bold blue] loading the graph {config.input_file=}\n")
-        visualizer.load_graph()
-        console.print("[bold green] Success:[/bold green] Graph loaded 😀\n")
-
-        # Load legend info data if available (do this early so it's available for filtering)
-        console.print(f"[bold blue] Loading legend information\n")
-        visualizer.load_legend_info()
-        console.print("[bold green] Success:[/bold green] Legend information loaded 😀\n")
-
-        # Apply organization name filtering IMMEDIATELY (removes nodes and their edges)
-        if config.include_only_orgs or config.exclude_orgs:
-            console.print(f"[bold blue] Filtering by organization names\n")
-            visualizer.filter_by_organization_names()
-            console.print("[bold green] Success:[/bold green] Organization filtering applied 😀\n")
-
-        # Calculate centrality on FILTERED graph
-        console.print(f"[bold blue] Calculating centrality of nodes \n")
-        visualizer.calculate_centralities()
-        console.print("[bold green] Success:[/bold green] Centrality calculated 😀\n")
-
-        # Apply top N filter if requested (on already filtered graph)
-        if config.filter_by_n_top_central_firms_only:
-            console.print(
-                f"[bold blue] Filtering to show top {config.filter_by_n_top_central_firms_only} central firms\n")
-            visualizer.filter_top_n_central_firms()
-            console.print(
-                f"[bold green] Success:[/bold green] Filtered to top {config.filter_by_n_top_central_firms_only} central firms 😀\n")
-
-        console.print(f"[bold blue] Load color map vs. random colors for nodes \n")
-        visualizer.load_color_map()
-        console.print("[bold green] Success:[/bold green] Nodes associated with colors 😀\n")
-
-        # Generate visualization
-        if config.verbose:
-            console.print(f"[bold blue] Visualizing the graph {inspect(visualizer)} \n")
-        visualizer.visualize()
-        console.print("[bold green] Success:[/bold green] Visualization completed successfully! 😀\n")
+        visualizer.run()
 
         logger.success("Visualization completed successfully!")
 
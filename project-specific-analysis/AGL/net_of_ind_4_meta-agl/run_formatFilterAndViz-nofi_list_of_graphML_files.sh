@@ -20,16 +20,24 @@ fi
 
 # Check if at least one argument is provided
 if [ "$#" -lt 1 ]; then
-    echo "Usage: $0 file1 [file2 ... fileN]"
+    echo "Usage: [JOBS=N] $0 file1 [file2 ... fileN]"
     exit 1
 fi
 
-# Loop through each argument and call formatFilterAndViz-nofi-GraphML.py with the specified options
+# Keep the existing files (or directories of files) given as arguments
+files=()
 for file in "$@"; do
-    if [ -f "$file" ]; then
-        "$VIZNOFI_PATH" -nl spring -l  -oi gmail -a alias.scraplog.config.ini "$file"
+    if [ -e "$file" ]; then
+        files+=("$file")
     else
         echo "File $file does not exist."
     fi
 done
 
+if [ "${#files[@]}" -eq 0 ]; then
+    exit 1
+fi
+
+# Render all the files with one call of formatFilterAndViz-nofi-GraphML.py, JOBS files at a time
+"$VIZNOFI_PATH" -nl spring -l  -oi gmail -a alias.scraplog.config.ini --jobs "${JOBS:-$(nproc)}" "${files[@]}"
+
@@ -13,10 +13,10 @@ import pickle
 import re
 import sys
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Set, Tuple
+from typing import Iterable, List, Optional, Set, Tuple
 
 import networkx as nx
 import networkx_temporal as tx
@@ -26,14 +26,23 @@ import export_log_data
 from extract_temporal_network import extract_temporal_network_from_parsed_change_log_entries, \
     extract_coauthorship_temporal_network_from_parsed_change_log_entries
 from extract_unweighted_network import extract_unweighted_from_weighted_network
+from extract_inter_organizational_network import extract_inter_organizational_from_parsed_change_log_entries
 
 from core.models import ProcessingState, TimeStampedFileContribution
 from core.types import Filename, EmailAggregationConfig, Email, DeveloperInfo, ChangeLogEntry, ConnectionWithFile, \
     Connection
 from extract_weighted_network import extract_weighted_from_extracted_temporal_network, show_weighted_edges
 from utils.debugging import handle_step_completion, ask_yes_or_no_question
+from utils.git_log_stream import GitLogError, stream_git_log
+from utils.granularity import GRANULARITIES, PathMapper, load_module_map, parse_granularity
+from utils.identity_resolution import identity_groups, load_mailmap, resolve_identities
+from utils.incremental_state import (drop_overlap, latest_timestamp, load_incremental_state, merge_stored_state,
+                                     next_update_command, parsing_fingerprint, save_incremental_state,
+                                     snapshot_state, stored_latest_timestamp)
+from utils.path_filters import NOT_INCLUDED, PathFilter, extension_rule
 from utils.string_comparators import find_similar_strings
 from utils.strings_cleaners import clean_email
+from utils.temporal_animation import DEFAULT_FPS, FFMPEG_CODECS, animation_format, ffmpeg_available
 from utils.unified_console import (console, traceback, Table, inspect, print_info, print_tip, print_warning,
                                    print_error, print_success, print_fatal_error)
 from utils.unified_logger import logger
@@ -268,33 +277,45 @@ def parse_exceptional_format(line: str, state: ProcessingState) -> Optional[Deve
         return None
 
 
+def compile_path_filter(state: ProcessingState) -> PathFilter:
+    """
+    Compile the file filters of the state (extensions, path rules and, in file filtering mode, the
+    files to filter) into one PathFilter, see utils/path_filters.py.
+    """
+    include = [extension_rule(ext) for ext in sorted(state.include_extensions)] + state.include_paths
+    exclude = [extension_rule(ext) for ext in sorted(state.exclude_extensions)] + state.exclude_paths
+    if state.file_filtering_mode:
+        exclude += sorted(state.files_to_filter)
+    return PathFilter(include, exclude)
+
+
 def extract_files_from_block(
         block: List[str],
         state: ProcessingState
 ) -> List[Filename]:
+    path_filter = state.path_filter
+    if path_filter is None:
+        path_filter = state.path_filter = compile_path_filter(state)
+    rejecting_rule = path_filter.rejecting_rule if path_filter else None
+
     files: List[Filename] = []
-    n_filtered_by_name = 0
-    n_filtered_by_include_ext = 0
-    n_filtered_by_exclude_ext = 0
+    n_not_included = 0
+    n_excluded = 0
 
     for line in block:
         if not line or line == '\n':
             break
 
         filename = line.rstrip('\n')
-        ext = Path(filename).suffix.lower()
-
-        if state.file_filtering_mode and filename in state.files_to_filter:
-            n_filtered_by_name += 1
-            continue
-
-        if state.include_extensions and ext not in state.include_extensions:
-            n_filtered_by_include_ext += 1
-            continue
 
-        if state.exclude_extensions and ext in state.exclude_extensions:
-            n_filtered_by_exclude_ext += 1
-            continue
+        if rejecting_rule is not None:
+            rule = rejecting_rule(filename)
+            if rule is not None:
+                if rule == NOT_INCLUDED:
+                    n_not_included += 1
+                else:
+                    n_excluded += 1
+                continue
 
         if filename.strip():
             files.append(filename)
@@ -302,12 +323,11 @@ def extract_files_from_block(
 
     # Distinguish between truly empty commits and filtered-to-empty commits
     if not files and state.verbose_mode:
-        if n_filtered_by_include_ext + n_filtered_by_exclude_ext + n_filtered_by_name > 0:
+        if n_not_included + n_excluded > 0:
             print_info(
                 f"Commit skipped after filtering — "
-                f"{n_filtered_by_include_ext} excluded by include-ext, "
-                f"{n_filtered_by_exclude_ext} excluded by exclude-ext, "
-                f"{n_filtered_by_name} excluded by name filter."
+                f"{n_not_included} not matching the include filters, "
+                f"{n_excluded} matching the exclude filters."
             )
         else:
             print_warning("Commit has no files at all — likely a merge, empty, or submodule-only commit.")
@@ -315,6 +335,19 @@ def extract_files_from_block(
     return files
 
 
+def print_path_filter_hits(state: ProcessingState) -> None:
+    """Print the number of files matched by each include and exclude rule of the file filters."""
+    if not state.path_filter:
+        return
+    table = Table(title="File Filter Rules", show_header=True)
+    table.add_column("Filter", style="cyan")
+    table.add_column("Rule", style="green")
+    table.add_column("Files", justify="right")
+    for side, rule, hits in state.path_filter.hit_counts():
+        table.add_row(side, rule, str(hits))
+    console.print(table)
+
+
 def process_commit_block(
         block: List[str],
         state: ProcessingState,
@@ -396,6 +429,8 @@ def process_commit_block(
 
         # Extract files
         changed_files = extract_files_from_block(block[1:], state)
+        if state.path_mapper is not None:
+            changed_files = state.path_mapper.map_files(changed_files)
 
         if not changed_files:
             if state.verbose_mode or state.very_verbose_mode:
@@ -412,6 +447,7 @@ def process_commit_block(
 
         "appending parsed_change_log_entries with the processed commit block"
         state.parsed_change_log_entries.append(new_change_log_entry)
+        state.author_names[dev_email].add(dev_name)
 
         # NEW: Build file history for temporal analysis
         for filename in changed_files:
@@ -560,8 +596,13 @@ def print_processing_summary(state: ProcessingState, in_work_file: Path, out_gra
     console.print(f"Blocks changing code: {state.statistics.n_blocks_changing_code}")
     console.print(f"Files affected: {state.statistics.n_changed_files}")
     console.print(f"Validation errors: {state.statistics.n_validation_errors}")
-    console.print(f"Network nodes (developers): {state.dev_to_dev_network.number_of_nodes()}")
-    console.print(f"Network edges (collaborations): {state.dev_to_dev_network.size()}")
+    if state.network_type == 'inter_organizational_graph_weighted':
+        org_network = state.container_of_extracted_networks.org_to_org_weighted_network
+        console.print(f"Network nodes (organizations): {org_network.number_of_nodes()}")
+        console.print(f"Network edges (inter-organizational collaborations): {org_network.size()}")
+    else:
+        console.print(f"Network nodes (developers): {state.dev_to_dev_network.number_of_nodes()}")
+        console.print(f"Network edges (collaborations): {state.dev_to_dev_network.size()}")
     console.print(f"Unique affiliations: {len(set(state.affiliations.values()))}")
     console.print(
         f"Similar affiliation strings: 0.8 threshold {find_similar_strings(set(state.affiliations.values()))}")
@@ -576,8 +617,17 @@ def parse_arguments() -> argparse.Namespace:
     )
     parser.add_argument('-l', '--load', type=Path,
                         help='loads and processes a serialized changelog')
-    parser.add_argument('-r', '--raw', type=Path, required=True,
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('-r', '--raw', type=Path,
                         help='processes from a raw git changelog')
+    source.add_argument('--repo', type=Path,
+                        help='processes the changelog of a git repository, parsing the output of git log '
+                             '--pretty=format:"==%%an;%%ae;%%ad==" --name-only as it is written')
+    parser.add_argument('--since', help='with --repo, only commits more recent than a date (as git log --since)')
+    parser.add_argument('--until', help='with --repo, only commits older than a date (as git log --until)')
+    parser.add_argument('--rev-range', help='with --repo, only the commits of a revision range (e.g. v2.15.0..v2.16.0)')
+    parser.add_argument('--tee-log', type=Path,
+                        help='with --repo, also writes the git log into a raw changelog file, to rerun with -r')
     parser.add_argument('-s', '--save', type=Path,
                         help='processes from a raw git changelog and saves it into a serialized changelog')
     parser.add_argument('-fe', '--filter-emails', type=Path,
@@ -597,6 +647,40 @@ def parse_arguments() -> argparse.Namespace:
         metavar='EXT',
         help='skip files with these extensions (e.g. -xe .json .html .php)'
     )
+    parser.add_argument(
+        '-ip', '--include-only-paths',
+        nargs='+',
+        metavar='PATTERN',
+        help="only process files matching these path rules: '*.ext' extensions, 'dir/**' directories, "
+             "globs such as '*.pb.txt' or 'tensorflow/**/BUILD', or exact paths"
+    )
+    parser.add_argument(
+        '-xp', '--exclude-paths',
+        nargs='+',
+        metavar='PATTERN',
+        help="skip files matching these path rules (e.g. -xp 'third_party/**' '*.pb.txt')"
+    )
+    parser.add_argument(
+        '-g', '--granularity',
+        default='file',
+        metavar='|'.join(GRANULARITIES),
+        help='co-editing unit: files, their directory at depth N (e.g. dir:2), or the modules of --module-map '
+             '(default: file)'
+    )
+    parser.add_argument(
+        '--module-map',
+        type=Path,
+        help='JSON file mapping path rules to modules, first match wins (e.g. {"tensorflow/compiler/**": "xla"}), '
+             'for --granularity module-map'
+    )
+    parser.add_argument('-u', '--update', type=Path, metavar='STATE_DIR',
+                        help='incremental mode: parses only the commits of the raw changelog (e.g. git log --since '
+                             'output) that are not in the state stored in STATE_DIR, adds them to it and regenerates '
+                             'the outputs from the whole history (the first run stores the full changelog)')
+    parser.add_argument('-ri', '--resolve-identities', action='store_true',
+                        help='merges the emails of the same developer (same author name or GitHub noreply login)')
+    parser.add_argument('-mm', '--mailmap', type=Path,
+                        help='merges emails as mapped by a .mailmap file (git-check-mailmap format)')
     parser.add_argument('-a', '--aggregate-email-prefixes', type=Path,
                         help='JSON file defining email domain prefixes to aggregate (e.g., {"ibm": "ibm", "google": "google"})')
     parser.add_argument('-t', '--type-of-network',
@@ -604,13 +688,21 @@ def parse_arguments() -> argparse.Namespace:
                                  'inter_individual_graph_weighted',
                                  'inter_individual_graph_temporal',
                                  'inter_individual_weighted_LOC_temporal',
-                                 'inter_individual_graph_weighted_SUM_LOC'],
+                                 'inter_individual_graph_weighted_SUM_LOC',
+                                 'inter_organizational_graph_weighted'],
                         default='inter_individual_graph_unweighted',
                         help='Type of network to generate (default: inter_individual_graph_unweighted)')
     parser.add_argument('-tntr', '--temporal-network-time-resolution', type=int, default=1,
                         help='Temporal network time resolution (default: 1 second)')
     parser.add_argument('-o', '--output-file', type=Path,
                         help='creates a network/graph graphml file with the given name')
+    parser.add_argument('--animation-file', type=Path,
+                        help='saves an animation of the temporal co-authorship network: .gif, .mp4 or .webm '
+                             '(ffmpeg) file, or a directory for a PNG sequence')
+    parser.add_argument('--animation-fps', type=float, default=DEFAULT_FPS,
+                        help=f'frames per second of --animation-file (default: {DEFAULT_FPS})')
+    parser.add_argument('--animation-jobs', type=int, default=1,
+                        help='worker processes rendering the frames of --animation-file in parallel (default: 1)')
 
     parser.add_argument(
         '-v', '--verbose',
@@ -622,7 +714,10 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument('-st', '--strict', action='store_true',
                         help="strict validation mode - fail on validation errors")
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.repo and (args.since or args.until or args.rev_range or args.tee_log):
+        parser.error('--since, --until, --rev-range and --tee-log require --repo')
+    return args
 
 
 def setup_processing_state(state: ProcessingState, args: argparse.Namespace) -> None:
@@ -652,6 +747,16 @@ def setup_processing_state(state: ProcessingState, args: argparse.Namespace) ->
             args.aggregate_email_prefixes
         )
 
+    # Set identity resolution modes
+    state.identity_resolution_mode = args.resolve_identities
+    if args.mailmap:
+        try:
+            state.mailmap = load_mailmap(args.mailmap)
+        except IOError as e:
+            print_fatal_error(f"Could not read mailmap file {args.mailmap}: {e}")
+            sys.exit(1)
+        print_info(f"Loaded {len(state.mailmap)} mailmap entries from {args.mailmap}")
+
     # Set filtering modes
     if args.filter_emails:
         state.email_filtering_mode = True
@@ -661,6 +766,7 @@ def setup_processing_state(state: ProcessingState, args: argparse.Namespace) ->
     if args.filter_files:
         state.file_filtering_mode = True
         console.print("\nFile filtering turned on")
+        load_file_filter_file(state, args.filter_files)
 
     # Load specific filter files
     if state.email_filtering_mode and args.filter_emails:
@@ -691,6 +797,61 @@ def setup_processing_state(state: ProcessingState, args: argparse.Namespace) ->
             )
             sys.exit(1)
 
+    if args.include_only_paths:
+        state.include_paths = list(args.include_only_paths)
+        print_info(f"Include-paths filter active: {state.include_paths}")
+
+    if args.exclude_paths:
+        state.exclude_paths = list(args.exclude_paths)
+        print_info(f"Exclude-paths filter active: {state.exclude_paths}")
+
+    state.path_filter = compile_path_filter(state)
+
+    # Map files to directories or modules at parse time
+    try:
+        kind, depth = parse_granularity(args.granularity)
+        if kind == 'module-map' and not args.module_map:
+            raise ValueError("--granularity module-map requires a --module-map file")
+        module_map = load_module_map(args.module_map) if kind == 'module-map' else []
+    except (ValueError, IOError) as e:
+        print_fatal_error(f"Invalid granularity: {e}")
+        sys.exit(1)
+    if kind != 'file':
+        state.path_mapper = PathMapper(kind, depth, module_map)
+        print_info(f"Co-editing granularity: {args.granularity}")
+
+    # Animation of the temporal network, checked before the changelog is parsed
+    if args.animation_file:
+        try:
+            output_format = animation_format(str(args.animation_file))
+        except ValueError as e:
+            print_fatal_error(f"Invalid --animation-file: {e}")
+            sys.exit(1)
+        if output_format in FFMPEG_CODECS and not ffmpeg_available():
+            print_fatal_error(f"ffmpeg is required to write {args.animation_file}, save a .gif or a PNG directory instead")
+            sys.exit(1)
+        if state.network_type == 'inter_organizational_graph_weighted':
+            print_fatal_error("--animation-file needs a temporal network, not inter_organizational_graph_weighted")
+            sys.exit(1)
+        if args.animation_fps <= 0 or args.animation_jobs < 1:
+            print_fatal_error("--animation-fps must be positive and --animation-jobs at least 1")
+            sys.exit(1)
+        state.animation_file = str(args.animation_file)
+        state.animation_fps = args.animation_fps
+        state.animation_jobs = args.animation_jobs
+
+
+def load_file_filter_file(state: ProcessingState, filter_file_path: str) -> None:
+    """Load the files to filter (one path or path rule per line, see utils/path_filters.py) from a file."""
+    try:
+        with open(filter_file_path, 'r') as ff:
+            state.files_to_filter = {line.strip() for line in ff if line.strip()}
+        console.print(f"\tLoaded {len(state.files_to_filter)} files to filter")
+    except IOError as e:
+        console.print(f" Could not read filter file {filter_file_path}: {e}")
+        state.file_filtering_mode = False
+
+
 def load_email_filter_file(state: ProcessingState, filter_file_path: str) -> None:
     """Load email filter list from file."""
     try:
@@ -702,21 +863,50 @@ def load_email_filter_file(state: ProcessingState, filter_file_path: str) -> Non
         state.email_filtering_mode = False
 
 
+def changelog_source(args: argparse.Namespace) -> Path:
+    """Raw changelog file or git repository the changelog is read from."""
+    return args.raw if args.raw else args.repo
+
+
+def parse_changelog_lines(lines: Iterable[str], state: ProcessingState, args: argparse.Namespace) -> None:
+    """Parse the lines of a changelog, incrementally with --update."""
+    if args.update:
+        process_file_lines_incrementally(list(lines), state, args.update)
+    else:
+        process_file_lines(lines, state)
+
+
 def process_changelog_file(state: ProcessingState, args: argparse.Namespace) -> None:
-    """Process the raw changelog file."""
-    work_file = args.raw
+    """Process the raw changelog file, or the git log of the repository given with --repo."""
+    work_file = changelog_source(args)
 
     start_scrapping_time = datetime.now()
     # console.print(f"\nStarting processing of {work_file} at {start_scrapping_time}")
     console.print(f"\nStarting processing of {work_file} at {start_scrapping_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
     try:
-        with open(work_file, 'r') as f:
-            lines = f.readlines()
-
-        process_file_lines(lines, state)
+        if args.repo:
+            since = args.since
+            if args.update and not (since or args.rev_range):
+                # The commit of the stored state is listed again, and dropped as already ingested
+                since = stored_latest_timestamp(str(args.update))
+            with stream_git_log(args.repo, since, args.until, args.rev_range, args.tee_log) as lines:
+                parse_changelog_lines(lines, state, args)
+            if args.tee_log:
+                print_info(f"Raw changelog written to {args.tee_log}")
+        else:
+            with open(work_file, 'r') as f:
+                lines = f.readlines()
+            parse_changelog_lines(lines, state, args)
 
         print_success(f"\n✓ Successfully processed {len(state.parsed_change_log_entries)} commits")
+        print_path_filter_hits(state)
+        if state.path_mapper is not None:
+            n_paths, n_units = state.path_mapper.vocabulary_sizes()
+            print_info(f"Mapped {n_paths} distinct files to {n_units} units ({args.granularity})")
+
+        if state.identity_resolution_mode or state.mailmap:
+            resolve_developer_identities(state)
 
         if state.debug_mode and ask_yes_or_no_question('do you want to inspect parsed_change_log_entries?'):
             console.print(inspect(state.parsed_change_log_entries))
@@ -729,14 +919,17 @@ def process_changelog_file(state: ProcessingState, args: argparse.Namespace) ->
     except FileNotFoundError:
         console.print(f"ERROR: Input file not found: {work_file}")
         sys.exit(1)
+    except GitLogError as e_git:
+        print_fatal_error(f"Cannot read the git log of {work_file}", str(e_git))
+        sys.exit(1)
     except Exception as e:
         console.print(f"ERROR processing file: {e}")
         traceback.print_exc()
         sys.exit(1)
 
 
-def process_file_lines(lines: List[str], state: ProcessingState) -> None:
-    """Process all lines from the input file."""
+def process_file_lines(lines: Iterable[str], state: ProcessingState) -> None:
+    """Process all lines from the input file (or any iterable of lines, such as a git log stream)."""
     current_block: List[str] = []
     commit_index = 0  # Add counter for commit order
 
@@ -771,6 +964,82 @@ def process_file_lines(lines: List[str], state: ProcessingState) -> None:
         # process_commit_block(current_block, state, commit_index, extra_debug=True)
 
 
+def process_file_lines_incrementally(lines: List[str], state: ProcessingState, state_dir: Path) -> None:
+    """
+    Parse only the commits of a log tail that are not in the state stored in state_dir, then merge the stored
+    state after them and store the result (see utils/incremental_state.py).
+
+    The merged state is the state a full parse of the whole history gives. It is stored before identity
+    resolution, which rewrites emails with options that may change between runs.
+    """
+    fingerprint = parsing_fingerprint(state)
+    try:
+        stored = load_incremental_state(str(state_dir), fingerprint)
+    except ValueError as e_state:
+        print_fatal_error(f"Cannot update {state_dir}", str(e_state))
+        sys.exit(1)
+
+    lines, block_keys, n_dropped = drop_overlap(lines, stored.block_keys if stored else [])
+    process_file_lines(lines, state)
+    n_new_entries = len(state.parsed_change_log_entries)
+    latest = latest_timestamp(state.parsed_change_log_entries, stored.latest_timestamp if stored else None)
+
+    if stored is not None:
+        merge_stored_state(state, stored, n_new_blocks=len(block_keys))
+        block_keys.extend(stored.block_keys)
+    save_incremental_state(str(state_dir), snapshot_state(state, fingerprint, block_keys, latest))
+
+    if stored is None:
+        print_info(f"Stored the state of {n_new_entries} commits in {state_dir}")
+    else:
+        print_info(f"Ingested {n_new_entries} new commits ({n_dropped} commit blocks already in {state_dir} "
+                   f"skipped), {len(state.parsed_change_log_entries)} commits in total")
+    if latest:
+        print_tip(f"Next update: {next_update_command(latest)} > tail.IN")
+
+
+def resolve_developer_identities(state: ProcessingState) -> None:
+    """
+    Merge the emails of the same developer and rewrite the parsed changelog entries to canonical emails.
+
+    Emails are merged by .mailmap entries and, in identity resolution mode, by normalised author name and
+    GitHub noreply login (see utils/identity_resolution.py), before any network is extracted.
+    """
+    commit_counts = Counter(entry[0][0] for entry in state.parsed_change_log_entries)
+    state.identity_map = resolve_identities(state.author_names, commit_counts, state.mailmap,
+                                            match_names=state.identity_resolution_mode,
+                                            match_noreply=state.identity_resolution_mode)
+    identity_map = state.identity_map
+
+    affiliations = {}
+    for email, canonical in identity_map.items():
+        if canonical not in affiliations:
+            affiliations[canonical] = extract_affiliation_from_email(canonical, state)
+
+    state.parsed_change_log_entries = [
+        ((identity_map[email], affiliations[identity_map[email]]), files, commit_time)
+        for (email, _), files, commit_time in state.parsed_change_log_entries
+    ]
+    for contributions in state.file_history.values():
+        for contribution in contributions:
+            contribution.email = identity_map.get(contribution.email, contribution.email)
+
+    author_names = defaultdict(set)
+    for email, names in state.author_names.items():
+        author_names[identity_map[email]].update(names)
+    state.author_names = author_names
+
+    groups = identity_groups(identity_map)
+    print_success(f"✓ Resolved {len(identity_map)} emails to {len(set(identity_map.values()))} developers "
+                  f"({sum(len(emails) for emails in groups.values())} emails merged into {len(groups)} developers)")
+
+    if state.verbose_mode:
+        for canonical, emails in sorted(groups.items()):
+            logger.info(f"{canonical} <- {emails}")
+
+    handle_step_completion(state, "resolve_developer_identities")
+
+
 def log_and_validate_current_block_being_processed(state: ProcessingState, current_block: List[str]) -> None:
     """Handle logging for the current block being processed."""
     if state.verbose_mode:
@@ -817,6 +1086,11 @@ def save_processed_data(state: ProcessingState, save_path: Path) -> None:
 
 def execute_data_processing_pipeline(state: ProcessingState) -> None:
     """Execute the main data processing pipeline."""
+    if state.network_type == "inter_organizational_graph_weighted":
+        # The firm-level network is built directly from the changelog, skipping the developer graph
+        process_inter_organizational_network_step(state)
+        return
+
     process_aggregation_step(state)
 
     print_info(f"Pipeline stage extract_coauthorship_temporal_network_from_parsed_change_log_entries")
@@ -852,6 +1126,16 @@ def execute_data_processing_pipeline(state: ProcessingState) -> None:
     apply_email_filtering(state)
 
 
+def process_inter_organizational_network_step(state: ProcessingState) -> None:
+    """Create the weighted inter-organizational network from the affiliation x file incidence matrix."""
+    print_info(f"Pipeline stage extract_inter_organizational_from_parsed_change_log_entries")
+    org_to_org_weighted_graph = extract_inter_organizational_from_parsed_change_log_entries(state)
+    print_info(f"{org_to_org_weighted_graph=}")
+    state.container_of_extracted_networks.org_to_org_weighted_network = org_to_org_weighted_graph
+
+    handle_step_completion(state, "process_inter_organizational_network_step")
+
+
 def process_aggregation_step(state: ProcessingState) -> None:
     """Aggregate files and contributors."""
     console.print("[blue] Aggregating data:[/blue] For each file, what are the contributors.")
@@ -972,7 +1256,7 @@ def export_results(state: ProcessingState, args: argparse.Namespace) -> None:
     if args.output_file:
         graphml_filename = Path(args.output_file)
     else:
-        base = Path(args.raw).stem
+        base = args.repo.resolve().name if args.repo else Path(args.raw).stem
         if state.network_type == 'inter_individual_graph_temporal':
             graphml_filename = base + ".temporal.graphml.zip"
 
@@ -980,6 +1264,8 @@ def export_results(state: ProcessingState, args: argparse.Namespace) -> None:
             graphml_filename = base + ".WeightedNetwork.graphML"
         elif state.network_type == 'inter_individual_graph_unweighted':
             graphml_filename = base + ".NetworkFile.graphML"
+        elif state.network_type == 'inter_organizational_graph_weighted':
+            graphml_filename = base + ".InterOrgWeightedNetwork.graphML"
         else:
             print_error("Unknown network type")
             print_info(f"{state.network_type=}")
@@ -1027,6 +1313,23 @@ def export_results(state: ProcessingState, args: argparse.Namespace) -> None:
             #nx.write_graphml(output_static_uw_graph_with_affiliation, graphml_filename)
             export_log_data.create_graphml_file(state.dev_to_dev_network, graphml_filename)
 
+        elif state.network_type == 'inter_organizational_graph_weighted':
+            output_org_graph: nx.Graph = state.container_of_extracted_networks.org_to_org_weighted_network
+
+            if output_org_graph is None:
+                print_fatal_error("The input did not led to the creation of a valid inter-organizational network")
+                sys.exit(1)
+
+            if state.verbose_mode:
+                console.print(f"Exporting{output_org_graph=}")
+                console.print(f"to file{graphml_filename=}")
+
+            if state.debug_mode and ask_yes_or_no_question("Do you want to inspect output_org_graph?"):
+                inspect(output_org_graph)
+                show_weighted_edges(output_org_graph)
+
+            nx.write_graphml(output_org_graph, graphml_filename)
+
         else:
             print_error("Unknown network type at writing graphml files")
             print_info(f"{state.network_type=}")
@@ -1040,7 +1343,7 @@ def export_results(state: ProcessingState, args: argparse.Namespace) -> None:
         traceback.print_exc()
         sys.exit(1)
 
-    print_processing_summary(state, args.raw, graphml_filename )
+    print_processing_summary(state, changelog_source(args), graphml_filename )
 
 
 def main() -> None:
@@ -9,13 +9,16 @@ be invisible in a co-editing network).
 Also lists every solo-edited file with its sole developer, and can export
 results to CSV.
 
-Input log format:
+Input log format (parsed by scrapLog.py, or loaded from its --save output):
     ==Name;email;timestamp==
     path/to/file1
     path/to/file2
     ==Name2;email2;timestamp==
     ...
 
+Each commit is bucketed into its study period once, by bisecting the sorted
+period boundaries, so any number of periods costs one scan of the log.
+
 Usage:
     # summary counts only
     python solo_contributors.py --log pytorch.log --project PyTorch
@@ -25,18 +28,28 @@ Usage:
 
     # also write CSVs alongside the log file
     python solo_contributors.py --log pytorch.log --project PyTorch --list-files --csv
+
+    # yearly periods instead of the default pre / washout / post
+    python solo_contributors.py --log pytorch.log --period y2023 2023-01-01 2023-12-31 \\
+        --period y2024 2024-01-01 2024-12-31
 """
 
 import argparse
 import csv
-import re
+import json
+import pickle
 import sys
+from bisect import bisect_right
 from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import datetime, time, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 
+from core.models import ProcessingState
+from scrapLog import process_file_lines
+
 # ── Period boundaries ─────────────────────────────────────────────────────────
+# Default study periods, replaced by --period or --periods-file
 PERIODS = {
     "pre":     (datetime(2019,  9,  1, tzinfo=timezone.utc),
                 datetime(2022,  8, 31, 23, 59, 59, tzinfo=timezone.utc)),
@@ -46,12 +59,93 @@ PERIODS = {
                 datetime(2026,  1, 31, 23, 59, 59, tzinfo=timezone.utc)),
 }
 
-COMMIT_RE = re.compile(r'^==(.+?);(.+?);(.+?)==\s*$')
+
+# ── Periods ───────────────────────────────────────────────────────────────────
+
+def parse_period_bound(value: str, end: bool = False) -> datetime:
+    """
+    ISO date or date-time of a period bound, UTC unless it has an offset.
+    A date alone ends a period at 23:59:59 of that day.
+    """
+    dt = datetime.fromisoformat(value.strip())
+    if end and len(value.strip()) == 10:
+        dt = datetime.combine(dt.date(), time(23, 59, 59))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def make_periods(bounds: list) -> dict:
+    """
+    Periods from (name, start, end) triples of ISO dates, in chronological order.
+    Raises ValueError if a period ends before it starts or overlaps another one.
+    """
+    periods = {}
+    for name, start, end in bounds:
+        if name in periods:
+            raise ValueError(f"Period {name} defined twice")
+        periods[name] = (parse_period_bound(start), parse_period_bound(end, end=True))
+
+    ordered = sorted(periods.items(), key=lambda item: item[1][0])
+    for name, (start, end) in ordered:
+        if end < start:
+            raise ValueError(f"Period {name} ends ({end}) before it starts ({start})")
+    for (name1, (_, end1)), (name2, (start2, _)) in zip(ordered, ordered[1:]):
+        if start2 <= end1:
+            raise ValueError(f"Periods {name1} and {name2} overlap")
+    return dict(ordered)
+
+
+def load_periods(path: str) -> dict:
+    """
+    Periods of a JSON file mapping each period name to its [start, end] ISO dates:
+        {"pre": ["2019-09-01", "2022-08-31"], "post": ["2023-02-01", "2026-01-31"]}
+    """
+    with open(path, encoding="utf-8") as fh:
+        return make_periods([(name, start, end) for name, (start, end) in json.load(fh).items()])
+
+
+def period_boundaries(periods: dict) -> tuple:
+    """Sorted start and end POSIX timestamps of non-overlapping periods, for assign_period."""
+    bounds = sorted((start.timestamp(), end.timestamp()) for start, end in periods.values())
+    return [start for start, _ in bounds], [end for _, end in bounds]
+
+
+def assign_period(dt: datetime | None, starts: list, ends: list) -> int | None:
+    """Index of the period containing dt (bisecting the period starts), None outside all periods."""
+    if dt is None:
+        return None
+    t = dt.timestamp()
+    i = bisect_right(starts, t) - 1
+    return i if i >= 0 and t <= ends[i] else None
 
 
 # ── Parsing ───────────────────────────────────────────────────────────────────
 
+_MONTHS = {m: i for i, m in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+_OFFSETS: dict = {}
+
+
+def parse_git_timestamp(ts_str: str) -> datetime | None:
+    """Fast path for git's default date format, e.g. 'Mon Jan 1 10:00:00 2024 +0100'."""
+    parts = ts_str.split()
+    if len(parts) != 6 or parts[1] not in _MONTHS or len(parts[5]) != 5:
+        return None
+    offset = parts[5]
+    tz = _OFFSETS.get(offset)
+    if tz is None:
+        minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+        tz = _OFFSETS[offset] = timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+    try:
+        hour, minute, second = map(int, parts[3].split(":"))
+        return datetime(int(parts[4]), _MONTHS[parts[1]], int(parts[2]), hour, minute, second, tzinfo=tz)
+    except ValueError:
+        return None
+
+
 def parse_timestamp(ts_str: str) -> datetime | None:
+    dt = parse_git_timestamp(ts_str)
+    if dt is not None:
+        return dt
     try:
         return parsedate_to_datetime(ts_str.strip())
     except Exception:
@@ -64,97 +158,119 @@ def parse_timestamp(ts_str: str) -> datetime | None:
     return None
 
 
-def assign_period(dt: datetime) -> str | None:
-    if dt is None:
-        return None
-    for name, (start, end) in PERIODS.items():
-        if start <= dt <= end:
-            return name
-    return None
+def parse_log(path: str, by_email: bool = False) -> list:
+    """
+    Returns list of (author_id, timestamp, files) tuples, parsed by scrapLog.
+    author_id is email if by_email else 'Name <email>' (names used with the
+    email joined by ' / ').
+    """
+    state = ProcessingState()
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        process_file_lines(fh.readlines(), state)
 
+    names = defaultdict(set)
+    if not by_email:
+        for email, email_names in state.author_names.items():
+            names[email.lower()].update(email_names)
+    return commits_of_entries(state.parsed_change_log_entries, names)
 
-def parse_log(path: str, by_email: bool = False) -> list:
+
+def load_changelog(path: str) -> list:
     """
-    Returns list of (author_id, period, files) tuples.
-    author_id is email if by_email else 'Name <email>'.
+    Returns list of (author_id, timestamp, files) tuples of a changelog
+    serialized by scrapLog.py --save. author_id is the email.
     """
-    commits = []
-    current_author = None
-    current_period = None
-    current_files = []
+    with open(path, "rb") as fh:
+        return commits_of_entries(pickle.load(fh))
 
-    with open(path, encoding="utf-8", errors="replace") as fh:
-        for line in fh:
-            line = line.rstrip("\n")
-            m = COMMIT_RE.match(line)
-            if m:
-                if current_author and current_files:
-                    commits.append((current_author, current_period, current_files))
-                name, email, ts_str = m.group(1), m.group(2), m.group(3)
-                dt = parse_timestamp(ts_str)
-                current_period = assign_period(dt)
-                current_author = (email.lower() if by_email
-                                  else f"{name} <{email.lower()}>")
-                current_files = []
-            elif line.strip() and current_author is not None:
-                current_files.append(line.strip())
-
-        if current_author and current_files:
-            commits.append((current_author, current_period, current_files))
 
+def commits_of_entries(entries: list, names: dict | None = None) -> list:
+    """(author_id, timestamp, files) of scrapLog changelog entries, labelled 'Name <email>' when names are known."""
+    labels = {}
+    commits = []
+    for (email, _affiliation), files, timestamp in entries:
+        label = labels.get(email)
+        if label is None:
+            key = email.lower()
+            label = labels[email] = (f"{' / '.join(sorted(names[key]))} <{key}>" if names and names.get(key)
+                                     else key)
+        commits.append((label, timestamp, files))
     return commits
 
 
 # ── Analysis ──────────────────────────────────────────────────────────────────
 
-def build_period_data(commits: list, period: str) -> dict:
+def build_periods_data(commits: list, periods: dict) -> dict:
     """
-    Returns a dict with all derived data for one period:
-      file_authors   : file  → set of authors
-      author_files   : author → set of files
-      co_edited      : set of files touched by >1 author
-      solo_files     : set of files touched by exactly 1 author
+    Buckets each commit into its period once and returns, per period name,
+    a dict with all derived data for that period (None if it has no commits):
+      file_authors   : file id  → set of author ids
+      author_files   : author id → set of file ids
+      co_edited      : set of file ids touched by >1 author
+      solo_files     : set of file ids touched by exactly 1 author
       solo_only_devs : set of authors whose files are ALL solo-edited
       solo_file_dev  : list of (author, file) sorted by author then file
+    Authors and files are interned to integer ids shared by all periods,
+    so an arbitrary number of periods costs a single scan of the commits.
     """
-    period_commits = [(a, fs) for a, p, fs in commits if p == period]
+    names = list(periods)
+    starts, ends = period_boundaries(periods)
+    by_start = sorted(range(len(names)), key=lambda i: periods[names[i]][0])
 
-    file_authors: dict[str, set] = defaultdict(set)
-    author_files: dict[str, set] = defaultdict(set)
+    author_ids, file_ids = {}, {}
+    file_authors = [defaultdict(set) for _ in names]
+    author_files = [defaultdict(set) for _ in names]
 
-    for author, files in period_commits:
+    for author, timestamp, files in commits:
+        i = assign_period(parse_timestamp(timestamp), starts, ends)
+        if i is None:
+            continue
+        period = by_start[i]
+        a = author_ids.setdefault(author, len(author_ids))
+        fa, af = file_authors[period], author_files[period][a]
         for f in files:
-            file_authors[f].add(author)
-            author_files[author].add(f)
-
-    co_edited   = {f for f, devs in file_authors.items() if len(devs) > 1}
-    solo_files  = {f for f, devs in file_authors.items() if len(devs) == 1}
-
-    solo_only_devs = {a for a, files in author_files.items()
-                      if files.isdisjoint(co_edited)}
-
-    # (author, file) pairs where file is solo-edited
-    solo_file_dev = sorted(
-        ((next(iter(file_authors[f])), f) for f in solo_files),
-        key=lambda x: (x[0].lower(), x[1])
-    )
+            fid = file_ids.setdefault(f, len(file_ids))
+            fa[fid].add(a)
+            af.add(fid)
 
-    return {
-        "file_authors":   file_authors,
-        "author_files":   author_files,
-        "co_edited":      co_edited,
-        "solo_files":     solo_files,
-        "solo_only_devs": solo_only_devs,
-        "solo_file_dev":  solo_file_dev,
-    }
+    author_names = list(author_ids)
+    file_names = list(file_ids)
 
-
-def print_summary(project: str, results: dict) -> None:
+    results = {}
+    for period, name in enumerate(names):
+        if not author_files[period]:
+            results[name] = None
+            continue
+        fa, af = file_authors[period], author_files[period]
+        co_edited  = {f for f, devs in fa.items() if len(devs) > 1}
+        solo_files = {f for f, devs in fa.items() if len(devs) == 1}
+
+        solo_only_devs = {author_names[a] for a, files in af.items()
+                          if files.isdisjoint(co_edited)}
+
+        # (author, file) pairs where file is solo-edited
+        solo_file_dev = sorted(
+            ((author_names[next(iter(fa[f]))], file_names[f]) for f in solo_files),
+            key=lambda x: (x[0].lower(), x[1])
+        )
+
+        results[name] = {
+            "file_authors":   fa,
+            "author_files":   af,
+            "co_edited":      co_edited,
+            "solo_files":     solo_files,
+            "solo_only_devs": solo_only_devs,
+            "solo_file_dev":  solo_file_dev,
+        }
+    return results
+
+
+def print_summary(project: str, results: dict, periods: dict) -> None:
     print(f"\n{'='*62}")
     print(f"  Project: {project}")
     print(f"{'='*62}")
 
-    for period in ("pre", "washout", "post"):
+    for period, (start, end) in periods.items():
         d = results[period]
         if d is None:
             print(f"\n  [{period:8s}]  no commits in window")
@@ -172,7 +288,6 @@ def print_summary(project: str, results: dict) -> None:
         pct_fc = 100 * n_files_co   / n_files_total if n_files_total else 0
         pct_fs = 100 * n_files_solo / n_files_total if n_files_total else 0
 
-        start, end = PERIODS[period]
         print(f"\n  [{period:8s}]  {start.date()} – {end.date()}")
         print(f"  {'─'*52}")
         print(f"  Developers total           : {n_total:>6}")
@@ -184,12 +299,11 @@ def print_summary(project: str, results: dict) -> None:
     print()
 
 
-def print_developer_listing(results: dict) -> None:
-    for period in ("pre", "washout", "post"):
+def print_developer_listing(results: dict, periods: dict) -> None:
+    for period, (start, end) in periods.items():
         d = results[period]
         if d is None or not d["solo_only_devs"]:
             continue
-        start, end = PERIODS[period]
         devs = sorted(d["solo_only_devs"], key=str.lower)
         print(f"\n  Solo-only developers [{period}]  "
               f"{start.date()} \u2013 {end.date()}  ({len(devs)} developers)")
@@ -199,13 +313,12 @@ def print_developer_listing(results: dict) -> None:
     print()
 
 
-def print_file_listing(results: dict) -> None:
-    for period in ("pre", "washout", "post"):
+def print_file_listing(results: dict, periods: dict) -> None:
+    for period, (start, end) in periods.items():
         d = results[period]
         if d is None or not d["solo_file_dev"]:
             continue
 
-        start, end = PERIODS[period]
         print(f"\n  Solo-edited files [{period}]  "
               f"{start.date()} – {end.date()}")
         print(f"  {'─'*70}")
@@ -227,7 +340,7 @@ def print_file_listing(results: dict) -> None:
 
 # ── CSV export ────────────────────────────────────────────────────────────────
 
-def write_csv(log_path: str, project: str, results: dict) -> None:
+def write_csv(log_path: str, project: str, results: dict, periods: dict) -> None:
     base = Path(log_path).stem
     summary_path = Path(log_path).parent / f"{base}_solo_summary.csv"
     detail_path  = Path(log_path).parent / f"{base}_solo_files.csv"
@@ -239,9 +352,8 @@ def write_csv(log_path: str, project: str, results: dict) -> None:
                     "n_developers", "n_collaborative", "n_solo_only",
                     "pct_solo_only", "n_files", "n_co_edited", "n_solo_edited",
                     "pct_solo_files"])
-        for period in ("pre", "washout", "post"):
+        for period, (start, end) in periods.items():
             d = results[period]
-            start, end = PERIODS[period]
             if d is None:
                 w.writerow([project, period, start.date(), end.date()] +
                            [""] * 8)
@@ -265,7 +377,7 @@ def write_csv(log_path: str, project: str, results: dict) -> None:
     with open(detail_path, "w", newline="", encoding="utf-8") as fh:
         w = csv.writer(fh)
         w.writerow(["project", "period", "developer", "file"])
-        for period in ("pre", "washout", "post"):
+        for period in periods:
             d = results[period]
             if d is None:
                 continue
@@ -280,40 +392,63 @@ def main():
     parser = argparse.ArgumentParser(
         description=__doc__,
         formatter_class=argparse.RawDescriptionHelpFormatter)
-    parser.add_argument("--log",        required=True,
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--log",
                         help="Path to ScrapLogGit2Net raw log file")
+    source.add_argument("--load",
+                        help="Path to a changelog serialized by scrapLog.py --save "
+                             "(authors identified by email)")
     parser.add_argument("--project",    default="",
                         help="Project label (e.g. PyTorch)")
     parser.add_argument("--by-email",   action="store_true",
                         help="Identify authors by email only")
+    parser.add_argument("--period",     nargs=3, action="append",
+                        metavar=("NAME", "START", "END"),
+                        help="Study period with ISO start and end dates, "
+                             "repeatable (default: pre, washout, post)")
+    parser.add_argument("--periods-file",
+                        help='JSON file of periods: {"NAME": ["START", "END"], ...}')
+    parser.add_argument("--list-developers", action="store_true",
+                        help="Print the solo-only developers of each period")
     parser.add_argument("--list-files", action="store_true",
                         help="Print full Developer – File listing")
     parser.add_argument("--csv",        action="store_true",
                         help="Write summary and detail CSVs alongside the log")
     args = parser.parse_args()
 
-    commits = parse_log(args.log, by_email=args.by_email)
+    try:
+        if args.periods_file:
+            periods = load_periods(args.periods_file)
+        elif args.period:
+            periods = make_periods(args.period)
+        else:
+            periods = PERIODS
+    except (OSError, ValueError) as e:
+        parser.error(f"invalid periods: {e}")
+
+    log_path = args.log or args.load
+    if args.log:
+        commits = parse_log(args.log, by_email=args.by_email)
+    else:
+        commits = load_changelog(args.load)
     if not commits:
-        print(f"ERROR: no commits parsed from {args.log}", file=sys.stderr)
+        print(f"ERROR: no commits parsed from {log_path}", file=sys.stderr)
         sys.exit(1)
 
-    project = args.project or Path(args.log).stem
+    project = args.project or Path(log_path).stem
 
-    results = {}
-    for period in ("pre", "washout", "post"):
-        has_data = any(p == period for _, p, _ in commits)
-        results[period] = build_period_data(commits, period) if has_data else None
+    results = build_periods_data(commits, periods)
 
-    print_summary(project, results)
+    print_summary(project, results, periods)
 
     if args.list_developers:
-        print_developer_listing(results)
+        print_developer_listing(results, periods)
 
     if args.list_files:
-        print_file_listing(results)
+        print_file_listing(results, periods)
 
     if args.csv:
-        write_csv(args.log, project, results)
+        write_csv(log_path, project, results, periods)
 
 
 if __name__ == "__main__":
@@ -1,2 +1,2 @@
 ./formatFilterAndReport-nofi-GraphML.py test-data/2-org-with-2-developers-each-all-in-inter-firm-cooperation-relationships.graphML
-libreoffice 2-org-with-2-developers-each-all-in-inter-firm-cooperation-relationships_report.xls
+libreoffice 2-org-with-2-developers-each-all-in-inter-firm-cooperation-relationships_report.xlsx
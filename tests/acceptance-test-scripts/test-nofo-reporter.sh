@@ -1,2 +1,2 @@
 ./formatFilterAndReport-nofo-GraphML.py test-data/5-pentagon-with-star-transformed-to-nofo.graphML
-libreoffice 5-pentagon-with-star-transformed-to-nofo.xls
+libreoffice 5-pentagon-with-star-transformed-to-nofo.xlsx
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the time-to-layout of utils/layout.py on networks of 1k, 10k and 50k developers.
+
+The networks are built from the Koha and TensorFlow test networks: copies of them are joined until
+the requested number of nodes is reached, so that the degree distribution and the organizational
+clusters are those of real networks. nx.spring_layout is only timed up to --max-spring-nodes.
+
+Usage (from the project root):
+python tests/benchmarks/benchmark_layouts.py
+python tests/benchmarks/benchmark_layouts.py --sizes 1000 10000 --layouts forceatlas2 multilevel
+"""
+
+import argparse
+import os
+import sys
+import time
+from itertools import cycle
+from typing import List
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import networkx as nx
+
+from utils.layout import LAYOUT_ALGORITHMS, compute_layout
+from utils.unified_console import console, Table
+
+DEFAULT_NETWORKS: List[str] = [
+    "test-data/Koha/JASIST-2024-wp-networks-graphML/Koha-git-log-until-31-may-2016.NetworkFile.graphML",
+    "test-data/TensorFlow/icis-2024-wp-networks-graphML/tensorFlowGitLog-2017-git-log-outpuyt-by-Jose.IN.NetworkFile.graphML",
+    "test-data/TensorFlow/icis-2024-wp-networks-graphML/tensorFlowGitLog-2019-git-log-outpuyt-by-Jose.IN.NetworkFile.graphML",
+    "test-data/TensorFlow/icis-2024-wp-networks-graphML/tensorFlowGitLog-2021-git-log-outpuyt-by-Jose.IN.NetworkFile.graphML",
+]
+
+
+def build_network(networks: List[nx.Graph], n_nodes: int) -> nx.Graph:
+    """Disjoint union of copies of the networks, cut to the first n_nodes nodes."""
+    graph = nx.Graph()
+    for copy, network in enumerate(cycle(networks)):
+        graph.update(nx.relabel_nodes(network, {node: (copy, node) for node in network}))
+        if graph.number_of_nodes() >= n_nodes:
+            break
+    return graph.subgraph(list(graph.nodes())[:n_nodes]).copy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the layouts of utils/layout.py")
+    parser.add_argument("files", nargs="*", default=DEFAULT_NETWORKS, help="GraphML networks of individuals")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 50000],
+                        help="number of nodes of the benchmark networks")
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUT_ALGORITHMS,
+                        default=["spring", "forceatlas2", "sparse-spring", "multilevel"], help="layouts to time")
+    parser.add_argument("--max-spring-nodes", type=int, default=10000,
+                        help="largest network laid out with nx.spring_layout (O(N^2) memory)")
+    args = parser.parse_args()
+
+    networks = [nx.Graph(nx.read_graphml(os.path.join(project_root, file_name)
+                                         if not os.path.isabs(file_name) else file_name))
+                for file_name in args.files]
+
+    table = Table(title="Time-to-layout benchmark", show_header=True)
+    table.add_column("Nodes", justify="right")
+    table.add_column("Edges", justify="right")
+    for layout in args.layouts:
+        table.add_column(f"{layout} (s)", justify="right", style="green" if layout != "spring" else "yellow")
+
+    for n_nodes in args.sizes:
+        graph = build_network(networks, n_nodes)
+        row = [f"{graph.number_of_nodes():,}", f"{graph.number_of_edges():,}"]
+
+        for layout in args.layouts:
+            if layout == "spring" and graph.number_of_nodes() > args.max_spring_nodes:
+                row.append("skipped")
+                continue
+            start = time.perf_counter()
+            compute_layout(graph, layout)
+            row.append(f"{time.perf_counter() - start:.2f}")
+            console.print(f"{layout} layout of {graph.number_of_nodes():,} nodes: {row[-1]} s")
+
+        table.add_row(*row)
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
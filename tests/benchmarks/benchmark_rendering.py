@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the render time and output size of utils/rendering.py against networkx drawing.
+
+The networks are built as in benchmark_layouts.py, laid out once with the multilevel layout, and drawn
+with nx.draw_networkx_nodes/edges, with the batched renderer (rasterised edges), and with the batched
+renderer bundling edges by organization pair. Each figure is saved as PDF and PNG at 300 dpi.
+
+Usage (from the project root):
+python tests/benchmarks/benchmark_rendering.py
+python tests/benchmarks/benchmark_rendering.py --sizes 1000 20000 --output-dir /tmp/renderings
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import networkx as nx
+
+from benchmark_layouts import DEFAULT_NETWORKS, build_network
+from utils.layout import compute_layout
+from utils.rendering import draw_edges, draw_nodes
+from utils.unified_console import console, Table
+
+
+def draw_with_networkx(ax, graph, pos, colors):
+    nx.draw_networkx_nodes(graph, pos, node_color=colors, node_size=20, alpha=0.8, ax=ax)
+    nx.draw_networkx_edges(graph, pos, width=0.5, alpha=0.5, ax=ax)
+
+
+def draw_batched(ax, graph, pos, colors):
+    draw_nodes(ax, graph, pos, color=colors, size=20, alpha=0.8)
+    draw_edges(ax, graph, pos, width=0.5, alpha=0.5)
+
+
+def draw_bundled(ax, graph, pos, colors):
+    draw_nodes(ax, graph, pos, color=colors, size=20, alpha=0.8)
+    draw_edges(ax, graph, pos, width=0.5, alpha=0.15, bundle=True)
+
+
+RENDERERS = {"networkx": draw_with_networkx, "batched": draw_batched, "bundled": draw_bundled}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the renderers of utils/rendering.py")
+    parser.add_argument("files", nargs="*", default=DEFAULT_NETWORKS, help="GraphML networks of individuals")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 5000, 20000],
+                        help="number of nodes of the benchmark networks")
+    parser.add_argument("--renderers", nargs="+", choices=list(RENDERERS), default=list(RENDERERS),
+                        help="renderers to time")
+    parser.add_argument("--output-dir", help="directory of the rendered figures (default: a temporary one)")
+    args = parser.parse_args()
+
+    networks = [nx.Graph(nx.read_graphml(os.path.join(project_root, file_name)
+                                         if not os.path.isabs(file_name) else file_name))
+                for file_name in args.files]
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix="renderings-")
+    os.makedirs(output_dir, exist_ok=True)
+
+    table = Table(title="Rendering benchmark (300 dpi)", show_header=True)
+    for column in ("Nodes", "Edges", "Renderer", "Draw (s)", "PDF (s)", "PDF (MB)", "PNG (s)", "PNG (MB)"):
+        table.add_column(column, justify="left" if column == "Renderer" else "right")
+
+    for n_nodes in args.sizes:
+        graph = build_network(networks, n_nodes)
+        pos = compute_layout(graph, "multilevel")
+        organizations = sorted({str(affiliation) for _, affiliation in graph.nodes(data="affiliation", default="")})
+        colors = [f"C{organizations.index(str(affiliation)) % 10}"
+                  for _, affiliation in graph.nodes(data="affiliation", default="")]
+
+        for name in args.renderers:
+            fig, ax = plt.subplots(figsize=(10, 8))
+            start = time.perf_counter()
+            RENDERERS[name](ax, graph, pos, colors)
+            row = [f"{graph.number_of_nodes():,}", f"{graph.number_of_edges():,}", name,
+                   f"{time.perf_counter() - start:.2f}"]
+
+            for extension in ("pdf", "png"):
+                file_name = os.path.join(output_dir, f"{name}-{graph.number_of_nodes()}.{extension}")
+                start = time.perf_counter()
+                fig.savefig(file_name, dpi=300, bbox_inches="tight")
+                row += [f"{time.perf_counter() - start:.2f}", f"{os.path.getsize(file_name) / 1e6:.2f}"]
+            plt.close(fig)
+
+            console.print(f"{name} rendering of {graph.number_of_nodes():,} nodes: {', '.join(row[3:])}")
+            table.add_row(*row)
+
+    console.print(table)
+    console.print(f"Figures saved in {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
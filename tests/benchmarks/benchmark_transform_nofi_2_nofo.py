@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of create_organizational_network on the Koha and TensorFlow test networks.
+
+Compares the vectorised transform with the former edge-by-edge implementation,
+which rebuilt the node->affiliation dictionary twice for every edge.
+
+Usage (from the project root):
+python tests/benchmarks/benchmark_transform_nofi_2_nofo.py
+python tests/benchmarks/benchmark_transform_nofi_2_nofo.py --skip-legacy path/to/network.graphML
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import List
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import networkx as nx
+
+from transform_nofi_2_nofo_graphml import create_organizational_network
+from utils.unified_console import console, Table
+
+DEFAULT_NETWORKS: List[str] = [
+    "test-data/Koha/JASIST-2024-wp-networks-graphML/Koha-git-log-until-31-may-2016.NetworkFile.graphML",
+    "test-data/TensorFlow/icis-2024-wp-networks-graphML/tensorFlowGitLog-2015-git-log-outpuyt-by-Jose.IN.NetworkFile.graphML",
+    "test-data/TensorFlow/icis-2024-wp-networks-graphML/tensorFlowGitLog-2019-git-log-outpuyt-by-Jose.IN.NetworkFile.graphML",
+]
+
+
+def legacy_create_organizational_network(individual_network: nx.Graph) -> nx.Graph:
+    """Edge-by-edge transform as it was implemented before the vectorised version."""
+    org_network = nx.Graph()
+    org_edges = defaultdict(int)
+
+    for edge in individual_network.edges():
+        org_affiliation_from = nx.get_node_attributes(individual_network, "affiliation")[edge[0]]
+        org_affiliation_to = nx.get_node_attributes(individual_network, "affiliation")[edge[1]]
+        if org_affiliation_from != org_affiliation_to:
+            org_edges[frozenset([org_affiliation_from, org_affiliation_to])] += 1
+
+    for org_edge, weight in org_edges.items():
+        org_u, org_v = list(org_edge)
+        org_network.add_edge(org_u, org_v, weight=weight)
+
+    return org_network
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the nofi to nofo transform")
+    parser.add_argument("files", nargs="*", default=DEFAULT_NETWORKS, help="GraphML networks of individuals")
+    parser.add_argument("--skip-legacy", action="store_true", help="do not time the former edge-by-edge transform")
+    args = parser.parse_args()
+
+    table = Table(title="create_organizational_network benchmark", show_header=True)
+    table.add_column("Network", style="cyan")
+    table.add_column("Nodes", justify="right")
+    table.add_column("Edges", justify="right")
+    table.add_column("Vectorised (s)", style="green", justify="right")
+    table.add_column("Legacy (s)", style="yellow", justify="right")
+    table.add_column("Same result", justify="center")
+
+    for file_name in args.files:
+        path = os.path.join(project_root, file_name) if not os.path.isabs(file_name) else file_name
+        graph = nx.read_graphml(path)
+
+        start = time.perf_counter()
+        org_network = create_organizational_network(graph)
+        vectorised_time = time.perf_counter() - start
+
+        legacy_time, same_result = "skipped", "-"
+        if not args.skip_legacy:
+            start = time.perf_counter()
+            legacy_network = legacy_create_organizational_network(graph)
+            legacy_time = f"{time.perf_counter() - start:.3f}"
+            same_result = "✓" if (
+                {frozenset(e[:2]): e[2]["weight"] for e in org_network.edges(data=True)} ==
+                {frozenset(e[:2]): e[2]["weight"] for e in legacy_network.edges(data=True)}
+            ) else "✗"
+
+        table.add_row(os.path.basename(path), str(graph.number_of_nodes()), str(graph.number_of_edges()),
+                      f"{vectorised_time:.3f}", legacy_time, same_result)
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
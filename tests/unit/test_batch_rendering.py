@@ -0,0 +1,68 @@
+"""
+Test cases for utils/batch_rendering.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_batch_rendering.py::test_render_batch_keeps_input_order
+"""
+
+import os
+
+import matplotlib
+import pytest
+
+from utils.batch_rendering import (batch_layout_error, batch_layout_file, collect_graphml_files, print_batch_summary,
+                                   render_batch, summary_row)
+
+
+def fake_render(input_file: str) -> dict:
+    """Worker stand-in recording the backend it draws on and the process it runs in."""
+    summary = summary_row(input_file)
+    summary.update(status=matplotlib.get_backend().lower(), nodes=os.getpid(), seconds="0.01",
+                   outputs=[f"{input_file}.png", f"{input_file}.pdf"])
+    return summary
+
+
+def test_collect_graphml_files(tmp_path):
+    """Directories expand to their sorted GraphML files, explicit files keep their order, once each."""
+    for name in ("b.graphML", "a.graphml", "notes.txt"):
+        (tmp_path / name).write_text("")
+    extra = tmp_path / "sub" / "c.graphml"
+    extra.parent.mkdir()
+    extra.write_text("")
+
+    files = collect_graphml_files([str(extra), str(tmp_path), str(tmp_path / "a.graphml")])
+
+    assert files == [str(extra), str(tmp_path / "a.graphml"), str(tmp_path / "b.graphML")]
+    with pytest.raises(FileNotFoundError):
+        collect_graphml_files([str(tmp_path / "missing.graphml")])
+    assert collect_graphml_files(["missing.graphml"], missing_ok=True) == ["missing.graphml"]
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_render_batch_keeps_input_order(jobs, capsys):
+    """Summary rows come back in input order, rendered on the Agg backend (in worker processes if jobs > 1)."""
+    input_files = [f"network-{i}.graphml" for i in range(6)]
+
+    summaries, wall_seconds = render_batch(fake_render, input_files, jobs)
+
+    assert [row["input"] for row in summaries] == input_files
+    assert all(row["status"] == "agg" for row in summaries)
+    assert (len({row["nodes"] for row in summaries} - {os.getpid()}) > 0) == (jobs > 1)
+    assert wall_seconds >= 0
+
+    print_batch_summary(summaries, wall_seconds, jobs)
+    assert "Rendered 6 of 6 files" in capsys.readouterr().out
+
+
+def test_batch_layout_files(tmp_path):
+    """Each network of a batch warm-starts from and saves its own layout file of the layout directories."""
+    (tmp_path / "net-2023.layout.json").write_text("{}")
+
+    assert batch_layout_file(str(tmp_path), "in/net-2023.graphML") == str(tmp_path / "net-2023.layout.json")
+    assert batch_layout_file(str(tmp_path), "in/net-2024.graphML") == str(tmp_path / "net-2024.layout.json")
+    assert batch_layout_file(str(tmp_path), "in/net-2024.graphML", existing_only=True) is None
+    assert batch_layout_file(None, "in/net-2023.graphML") is None
+
+    assert batch_layout_error(str(tmp_path), str(tmp_path / "new")) is None
+    assert "--init-layout" in batch_layout_error(str(tmp_path / "net-2023.layout.json"), None)
+    assert "--save-layout" in batch_layout_error(None, str(tmp_path / "net-2023.layout.json"))
@@ -0,0 +1,138 @@
+"""
+Test cases for utils/centrality.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_centrality.py::test_exact_centralities_match_networkx
+"""
+
+import json
+import os
+
+import networkx as nx
+import pytest
+
+from utils.centrality import (
+    CENTRALITY_MEASURES,
+    clear_centrality_cache,
+    compute_centralities,
+    graph_hash,
+    parse_centrality_measures
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_memory_cache():
+    """Each test starts without centralities cached in memory."""
+    clear_centrality_cache()
+    yield
+    clear_centrality_cache()
+
+
+@pytest.fixture
+def collaboration_network() -> nx.Graph:
+    """Small disconnected network of individuals with string node ids, as read from GraphML."""
+    graph = nx.relabel_nodes(nx.karate_club_graph(), lambda node: f"n{node}")
+    graph.add_edges_from([("x1", "x2"), ("x2", "x3")])
+    graph.add_node("isolate")
+    return graph
+
+
+def assert_scores_close(scores, expected):
+    assert set(scores) == set(expected)
+    for node, value in expected.items():
+        assert scores[node] == pytest.approx(value, abs=1e-9)
+
+
+def test_exact_centralities_match_networkx(collaboration_network):
+    """Degree, closeness and exact betweenness are identical to networkx."""
+    results = compute_centralities(collaboration_network, CENTRALITY_MEASURES)
+
+    assert_scores_close(results["degree"], nx.degree_centrality(collaboration_network))
+    assert_scores_close(results["closeness"], nx.closeness_centrality(collaboration_network))
+    assert_scores_close(results["betweenness"], nx.betweenness_centrality(collaboration_network))
+
+
+def test_eigenvector_matches_networkx():
+    """The sparse power iteration converges to the networkx eigenvector centrality."""
+    graph = nx.karate_club_graph()
+    results = compute_centralities(graph, ["eigenvector"], weight="weight")
+
+    expected = nx.eigenvector_centrality(graph, max_iter=1000, weight="weight")
+    for node, value in expected.items():
+        assert results["eigenvector"][node] == pytest.approx(value, abs=1e-4)
+
+
+def test_directed_centralities_match_networkx():
+    """Directed graphs use incoming distances for closeness and ordered pairs for betweenness."""
+    graph = nx.gnp_random_graph(40, 0.08, seed=7, directed=True)
+    results = compute_centralities(graph, ["closeness", "betweenness"])
+
+    assert_scores_close(results["closeness"], nx.closeness_centrality(graph))
+    assert_scores_close(results["betweenness"], nx.betweenness_centrality(graph))
+
+
+def test_sampled_betweenness_is_parallel_safe_and_close():
+    """Sampled betweenness gives the same estimate with one or two workers, close to the exact values."""
+    graph = nx.gnp_random_graph(200, 0.05, seed=3)
+    exact = nx.betweenness_centrality(graph)
+
+    sequential = compute_centralities(graph, ["betweenness"], betweenness_samples=150, jobs=1)["betweenness"]
+    clear_centrality_cache()
+    parallel = compute_centralities(graph, ["betweenness"], betweenness_samples=150, jobs=2)["betweenness"]
+
+    assert_scores_close(parallel, sequential)
+    assert max(abs(sequential[node] - exact[node]) for node in graph) < 0.01
+
+
+def test_results_are_cached_on_disk(collaboration_network, tmp_path):
+    """A second computation on the same graph structure reads the on-disk cache."""
+    compute_centralities(collaboration_network, ["closeness"], cache_dir=str(tmp_path))
+    cache_files = os.listdir(tmp_path)
+    assert len(cache_files) == 1
+    assert cache_files[0].startswith(graph_hash(collaboration_network))
+
+    # Tamper with the cached values to check they are the ones returned
+    with open(tmp_path / cache_files[0], "r") as file:
+        cached = json.load(file)
+    with open(tmp_path / cache_files[0], "w") as file:
+        json.dump({node: 0.5 for node in cached}, file)
+
+    clear_centrality_cache()
+    results = compute_centralities(collaboration_network.copy(), ["closeness"], cache_dir=str(tmp_path))
+    assert set(results["closeness"].values()) == {0.5}
+
+
+def test_graph_hash_ignores_order_but_not_structure():
+    """The cache key does not depend on insertion order, only on the structure."""
+    graph = nx.Graph([("a", "b"), ("b", "c")])
+    same = nx.Graph([("c", "b"), ("b", "a")])
+    other = nx.Graph([("a", "b"), ("a", "c")])
+
+    assert graph_hash(graph) == graph_hash(same)
+    assert graph_hash(graph) != graph_hash(other)
+
+
+def test_cached_results_follow_the_node_order_of_the_graph(collaboration_network, tmp_path):
+    """Cache hits on the same structure with another node order return the scores in that order."""
+    reordered = nx.Graph()
+    reordered.add_nodes_from(reversed(list(collaboration_network.nodes())))
+    reordered.add_edges_from(collaboration_network.edges())
+    expected = compute_centralities(collaboration_network, ["degree"], cache_dir=str(tmp_path))["degree"]
+
+    from_memory = compute_centralities(reordered, ["degree"], cache_dir=str(tmp_path))["degree"]
+    clear_centrality_cache()
+    from_disk = compute_centralities(reordered, ["degree"], cache_dir=str(tmp_path))["degree"]
+
+    for scores in (from_memory, from_disk):
+        assert list(scores) == list(reordered.nodes())
+        assert_scores_close(scores, expected)
+
+
+def test_empty_graph_and_unknown_measure():
+    """Empty graphs have empty centralities and unknown measures are rejected."""
+    assert compute_centralities(nx.Graph(), ["degree", "betweenness"]) == {"degree": {}, "betweenness": {}}
+
+    with pytest.raises(ValueError):
+        compute_centralities(nx.path_graph(3), ["pagerank"])
+
+    assert parse_centrality_measures("degree, betweenness") == ["degree", "betweenness"]
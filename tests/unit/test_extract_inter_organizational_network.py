@@ -0,0 +1,67 @@
+"""
+Test cases for extract_inter_organizational_network.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_extract_inter_organizational_network.py::test_co_editing_weights_count_shared_files
+"""
+
+import pytest
+
+from core.models import ProcessingState
+from extract_inter_organizational_network import (
+    build_affiliation_file_incidence_matrix,
+    extract_inter_organizational_from_parsed_change_log_entries
+)
+
+
+@pytest.fixture
+def state_with_entries() -> ProcessingState:
+    """Processing state with a few parsed changelog entries from three organizations."""
+    state = ProcessingState()
+    state.parsed_change_log_entries = [
+        (("alice@apple.com", "apple"), ["a.py", "b.py"], "Mon Jan 16 10:00:00 2023 +0000"),
+        (("anne@apple.com", "apple"), ["a.py"], "Mon Jan 16 11:00:00 2023 +0000"),
+        (("nick@nokia.com", "nokia"), ["a.py", "b.py", "c.py"], "Tue Jan 17 10:00:00 2023 +0000"),
+        (("greg@google.com", "google"), ["c.py"], "Wed Jan 18 10:00:00 2023 +0000"),
+        (("solo@ibm.com", "ibm"), ["d.py"], "Thu Jan 19 10:00:00 2023 +0000"),
+    ]
+    return state
+
+
+def test_incidence_matrix_is_binary(state_with_entries):
+    """Two Apple developers editing a.py still give a single affiliation x file incidence."""
+    incidence, affiliations, files = build_affiliation_file_incidence_matrix(state_with_entries)
+
+    assert affiliations == ["apple", "nokia", "google", "ibm"]
+    assert files == ["a.py", "b.py", "c.py", "d.py"]
+    assert incidence.shape == (4, 4)
+    assert incidence.max() == 1
+    assert incidence[0].toarray().tolist() == [[1, 1, 0, 0]]
+
+
+def test_co_editing_weights_count_shared_files(state_with_entries):
+    """Organizations are connected by the number of files co-edited by both."""
+    org_network = extract_inter_organizational_from_parsed_change_log_entries(state_with_entries)
+
+    assert org_network["apple"]["nokia"]["weight"] == 2
+    assert org_network["nokia"]["google"]["weight"] == 1
+    assert not org_network.has_edge("apple", "google")
+    assert org_network.nodes["nokia"]["n_files"] == 3
+
+    # Organizations without collaborative relationships are not kept
+    assert "ibm" not in org_network
+
+
+def test_filtered_emails_are_ignored(state_with_entries):
+    """Entries of filtered emails do not contribute to the incidence matrix."""
+    state_with_entries.email_filtering_mode = True
+    state_with_entries.emails_to_filter = {"greg@google.com"}
+
+    org_network = extract_inter_organizational_from_parsed_change_log_entries(state_with_entries)
+
+    assert "google" not in org_network
+
+
+def test_no_entries_returns_none():
+    """Without parsed entries there is no network to extract."""
+    assert extract_inter_organizational_from_parsed_change_log_entries(ProcessingState()) is None
@@ -0,0 +1,74 @@
+"""
+Test cases for utils/git_log_stream.py and scrapLog --repo
+
+For a single test case run:
+pytest -v -s tests/unit/test_git_log_stream.py::test_stream_parses_like_the_changelog_file
+"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from scrapLog import ProcessingState, process_file_lines
+from utils.git_log_stream import GitLogError, git_log_command, stream_git_log
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+COMMITS = [("Jane Doe", "jane@ibm.com", "2024-01-01T10:00:00+0000", ["a.py", "b.py"]),
+           ("John Smith", "john@google.com", "2024-01-02T10:00:00+0000", ["a.py"]),
+           ("Ann Lee", "ann@redhat.com", "2024-01-03T10:00:00+0000", ["src/c.py"])]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "project"
+    path.mkdir()
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    for name, email, date, files in COMMITS:
+        for filename in files:
+            (path / filename).parent.mkdir(exist_ok=True)
+            (path / filename).write_text(f"{email}\n", encoding="utf-8")
+        env = dict(os.environ, GIT_AUTHOR_NAME=name, GIT_AUTHOR_EMAIL=email, GIT_AUTHOR_DATE=date,
+                   GIT_COMMITTER_NAME=name, GIT_COMMITTER_EMAIL=email, GIT_COMMITTER_DATE=date)
+        subprocess.run(["git", "-C", str(path), "add", "."], check=True)
+        subprocess.run(["git", "-C", str(path), "commit", "-q", "-m", name], check=True, env=env)
+    return path
+
+
+def test_git_log_command():
+    assert git_log_command("repo", since="2024-01-01", rev_range="v1..v2") == \
+           ["git", "-C", "repo", "log", "--pretty=format:==%an;%ae;%ad==", "--name-only", "--since=2024-01-01",
+            "v1..v2", "--"]
+
+
+def test_stream_parses_like_the_changelog_file(repo, tmp_path):
+    """The streamed log is parsed as the file git log writes, which --tee-log keeps."""
+    tee = tmp_path / "project.IN"
+    streamed = ProcessingState()
+    with stream_git_log(repo, tee_path=tee) as lines:
+        process_file_lines(lines, streamed)
+
+    from_file = ProcessingState()
+    with open(tee, "r") as f:
+        process_file_lines(f.readlines(), from_file)
+
+    assert [(entry[0][0], entry[1]) for entry in streamed.parsed_change_log_entries] == \
+           [("ann@redhat.com", ["src/c.py"]), ("john@google.com", ["a.py"]), ("jane@ibm.com", ["a.py", "b.py"])]
+    assert streamed.parsed_change_log_entries == from_file.parsed_change_log_entries
+    assert tee.read_text().startswith("==Ann Lee;ann@redhat.com;Wed Jan 3 10:00:00 2024 +0000==\nsrc/c.py\n")
+
+
+def test_stream_restricts_commits(repo):
+    state = ProcessingState()
+    # git's own date format, as stored by --update, is accepted by --since
+    with stream_git_log(repo, since="Tue Jan 2 10:00:00 2024 +0000", rev_range="HEAD~2..HEAD") as lines:
+        process_file_lines(lines, state)
+    assert [entry[0][0] for entry in state.parsed_change_log_entries] == ["ann@redhat.com", "john@google.com"]
+
+
+def test_stream_reports_git_errors(tmp_path):
+    with pytest.raises(GitLogError, match="exit code"):
+        with stream_git_log(tmp_path) as lines:
+            list(lines)
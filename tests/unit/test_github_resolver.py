@@ -0,0 +1,273 @@
+"""
+Test cases for utils/github_resolver.py and utils/github_deanonymization.py, against a local stand-in of the
+GitHub REST and GraphQL APIs
+
+For a single test case run:
+pytest -v -s tests/unit/test_github_resolver.py::test_resolver_waits_for_rate_limit_reset
+"""
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import networkx as nx
+import pytest
+
+from utils.github_deanonymization import deanonymize_files, noreply_emails_of_graph, scan_noreply_emails
+from utils.github_resolver import (GRAPHQL_BATCH_SIZE, UNKNOWN_AFFILIATION, UNKNOWN_EMAIL, GitHubResolver,
+                                   GitHubUserCache, RateLimiter, resolve_noreply_emails)
+
+USERS = {
+    "alice": {"login": "alice", "email": "alice@ibm.com", "company": "IBM"},
+    "bob": {"login": "bob", "email": None, "company": "@google"},
+    "carol": {"login": "carol", "email": "carol@example.org", "company": None},
+    "dave": {"login": "dave", "email": None, "company": None},
+    "tensorflow": {"login": "tensorflow", "type": "Organization", "email": None, "company": None},
+}
+ORGS = {"alice": [{"login": "ibm"}], "carol": [{"login": "tensorflow"}, {"login": "google"}]}
+
+# user(login:) nodes as returned by the GitHub GraphQL API (organization accounts are not users there)
+with open(os.path.join(os.path.dirname(__file__), "..", "..", "test-data", "GitHub", "graphql-user-nodes.json")) as f:
+    GRAPHQL_USERS = json.load(f)
+
+
+class StandInGitHub(ThreadingHTTPServer):
+    """GitHub REST stand-in serving /users/<login> and /users/<login>/orgs with a per-window request budget."""
+
+    def __init__(self, budget: int = 1000, window: float = 1.0, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.budget, self.window, self.delay = budget, window, delay
+        self.lock = threading.Lock()
+        self.remaining, self.reset_at = budget, time.time() + window
+        self.paths, self.rate_limited, self.in_flight, self.max_in_flight = [], 0, 0, 0
+        self.graphql_batch_sizes = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.respond(self.rest_response)
+
+    def do_POST(self):
+        self.respond(self.graphql_response)
+
+    def rest_response(self):
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "users" and parts[1] in USERS:
+            return 200, USERS[parts[1]] if len(parts) == 2 else ORGS.get(parts[1], [])
+        return 404, {"message": "Not Found"}
+
+    def graphql_response(self):
+        """Answer aliased user(login:) fields from the recorded nodes, null and NOT_FOUND for the others."""
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        aliases = re.findall(r"(u\d+): user\(login: \$(l\d+)\)", request["query"])
+        self.server.graphql_batch_sizes.append(len(aliases))
+        data, errors = {}, []
+        for alias, variable in aliases:
+            login = request["variables"][variable]
+            data[alias] = GRAPHQL_USERS.get(login)
+            if data[alias] is None:
+                errors.append({"type": "NOT_FOUND", "path": [alias],
+                               "message": f"Could not resolve to a User with the login of '{login}'."})
+        return 200, {"data": data, "errors": errors} if errors else {"data": data}
+
+    def respond(self, response):
+        server = self.server
+        with server.lock:
+            now = time.time()
+            if now >= server.reset_at:
+                server.remaining, server.reset_at = server.budget, now + server.window
+            limited = server.remaining <= 0
+            if not limited:
+                server.remaining -= 1
+                server.paths.append(self.path)
+            else:
+                server.rate_limited += 1
+            headers = {"X-RateLimit-Limit": str(server.budget), "X-RateLimit-Remaining": str(server.remaining),
+                       "X-RateLimit-Reset": str(server.reset_at)}
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+
+        time.sleep(server.delay)
+        if limited:
+            status, body = 403, {"message": "API rate limit exceeded"}
+        else:
+            status, body = response()
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        with server.lock:
+            server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def start(**kwargs) -> StandInGitHub:
+        server = StandInGitHub(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def noreply(login: str) -> str:
+    return f"1234+{login}@users.noreply.github.com"
+
+
+@pytest.mark.parametrize("backend, expected_paths", [
+    ("rest", ["/users/alice", "/users/alice/orgs", "/users/bob", "/users/bob/orgs", "/users/carol",
+              "/users/carol/orgs", "/users/dave", "/users/dave/orgs", "/users/nobody", "/users/tensorflow",
+              "/users/tensorflow/orgs"]),
+    # One query for all users, REST for the logins GraphQL does not know
+    ("graphql", ["/graphql", "/users/nobody", "/users/tensorflow", "/users/tensorflow/orgs"]),
+])
+def test_resolve_noreply_emails_with_cache(stand_in, tmp_path, backend, expected_paths):
+    """Emails are resolved once each (organization first, then company), then served from the cache."""
+    server = stand_in()
+    emails = [noreply(login) for login in ("alice", "bob", "carol", "dave", "nobody", "tensorflow", "alice")]
+    cache_path = str(tmp_path / "github" / "users.sqlite")
+
+    resolutions = resolve_noreply_emails(emails, token="t", api_url=server.url, cache_path=cache_path,
+                                         backend=backend)
+
+    assert resolutions == {
+        noreply("alice"): ("alice@ibm.com", "ibm"),
+        noreply("bob"): (UNKNOWN_EMAIL, "@google"),
+        noreply("carol"): ("carol@example.org", "tensorflow"),
+        noreply("dave"): (UNKNOWN_EMAIL, UNKNOWN_AFFILIATION),
+        noreply("nobody"): (UNKNOWN_EMAIL, UNKNOWN_AFFILIATION),
+        noreply("tensorflow"): (UNKNOWN_EMAIL, UNKNOWN_AFFILIATION),
+    }
+    assert sorted(server.paths) == expected_paths
+    with GitHubUserCache(cache_path) as cache:
+        assert len(cache) == 6
+
+    assert resolve_noreply_emails(emails, api_url=server.url, cache_path=cache_path, backend=backend) == resolutions
+    assert len(server.paths) == len(expected_paths)
+
+    with pytest.raises(ValueError):
+        asyncio.run(GitHubResolver(api_url=server.url).resolve("alice@ibm.com"))
+
+
+def test_resolver_waits_for_rate_limit_reset(stand_in):
+    """Once the budget announced by the headers is spent, requests wait for the reset instead of failing."""
+    server = stand_in(budget=3, window=0.5)
+    resolver = GitHubResolver(api_url=server.url, concurrency=1, backend="rest")
+
+    resolutions = asyncio.run(resolver.resolve_many([noreply(login) for login in USERS]))
+    resolver.close()
+
+    assert resolutions[noreply("alice")] == ("alice@ibm.com", "ibm")
+    assert len(server.paths) == 2 * len(USERS)
+    assert server.rate_limited == 0
+    assert resolver.rate_limiter.waited > 0
+
+
+def test_resolver_bounds_concurrency(stand_in):
+    server = stand_in(delay=0.05)
+    resolver = GitHubResolver(api_url=server.url, concurrency=3, rate_limiter=RateLimiter(rate=1000, burst=1000),
+                              backend="rest")
+
+    asyncio.run(resolver.resolve_many([noreply(f"user{i}") for i in range(12)]))
+    resolver.close()
+
+    assert server.max_in_flight == 3
+
+
+def test_graphql_batches_and_falls_back_to_rest(stand_in):
+    """Users are looked up GRAPHQL_BATCH_SIZE at a time; failed queries fall back to REST."""
+    server = stand_in()
+    logins = ["alice", "bob"] + [f"user{i}" for i in range(GRAPHQL_BATCH_SIZE)]
+    resolver = GitHubResolver(api_url=server.url, rate_limiter=RateLimiter(rate=1000, burst=1000), backend="graphql")
+
+    resolutions = asyncio.run(resolver.resolve_many([noreply(login) for login in logins]))
+
+    assert sorted(server.graphql_batch_sizes) == [2, GRAPHQL_BATCH_SIZE]
+    assert resolutions[noreply("alice")] == ("alice@ibm.com", "ibm")
+    assert resolver.n_graphql_misses == GRAPHQL_BATCH_SIZE
+
+    broken = GitHubResolver(api_url=server.url, graphql_url=server.url + "/missing-endpoint", backend="graphql")
+    assert asyncio.run(broken.resolve_many([noreply("carol")])) == {noreply("carol"): ("carol@example.org", "tensorflow")}
+    resolver.close()
+    broken.close()
+
+
+def test_rate_limiter_paces_requests():
+    """The token bucket lets a burst through, then paces requests at its rate."""
+    now = [1000.0]
+
+    async def fake_sleep(seconds):
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=fake_sleep)
+
+    async def acquire(n):
+        for _ in range(n):
+            await limiter.acquire()
+
+    asyncio.run(acquire(6))
+    assert now[0] == pytest.approx(1002.0)
+
+    limiter.update({"x-ratelimit-remaining": "0", "x-ratelimit-reset": "1100"})
+    asyncio.run(acquire(1))
+    assert now[0] == pytest.approx(1100.0)
+
+
+def write_network(path, logins):
+    """Network of the developers of logins, plus a developer with a corporate email."""
+    g = nx.Graph()
+    g.add_node("jane@ibm.com", **{"e-mail": "jane@ibm.com", "affiliation": "ibm"})
+    for login in logins:
+        g.add_node(noreply(login), **{"e-mail": noreply(login), "affiliation": "users"})
+        g.add_edge("jane@ibm.com", noreply(login), weight=1)
+    nx.write_graphml(g, str(path))
+
+
+def test_deanonymize_files_resolves_each_email_once(stand_in, tmp_path):
+    """Emails shared by the networks are looked up once for the whole batch, then every file is rewritten."""
+    server = stand_in()
+    write_network(tmp_path / "2023.graphml", ["alice", "bob"])
+    write_network(tmp_path / "2024.graphml", ["alice", "bob", "carol"])
+    write_network(tmp_path / "2025.graphml", ["bob", "carol"])
+    (tmp_path / "broken.graphml").write_text("<graphml")
+    input_files = sorted(str(path) for path in tmp_path.glob("*.graphml"))
+    assert scan_noreply_emails(input_files[1]) == noreply_emails_of_graph(nx.read_graphml(input_files[1]))
+
+    summaries, stats = deanonymize_files(input_files, output_dir=str(tmp_path / "out"), api_url=server.url,
+                                         cache_path=None, backend="rest", jobs=2)
+
+    assert sorted(server.paths) == ["/users/alice", "/users/alice/orgs", "/users/bob", "/users/bob/orgs",
+                                    "/users/carol", "/users/carol/orgs"]
+    assert (stats["per_file_lookups"], stats["unique_emails"], stats["requests"]) == (7, 3, 6)
+    assert [row["status"] for row in summaries] == ["deanonymized"] * 3 + ["failed: not a GraphML file"]
+    assert [row["resolved"] for row in summaries[:3]] == [2, 3, 2]
+
+    g = nx.read_graphml(str(tmp_path / "out" / "2024.out.graphml"))
+    assert g.nodes[noreply("alice")]["email"] == "alice@ibm.com"
+    assert g.nodes[noreply("carol")]["affiliation"] == "tensorflow"
+    assert g.nodes[noreply("bob")]["affiliation"] == "@google"
+    assert g.nodes["jane@ibm.com"]["affiliation"] == "ibm"
+    assert g.number_of_edges() == 3
@@ -0,0 +1,65 @@
+"""
+Test cases for utils/granularity.py and its use by scrapLog.process_commit_block
+
+For a single test case run:
+pytest -v -s tests/unit/test_granularity.py::test_module_map_first_rule_wins
+"""
+
+import json
+
+import pytest
+
+from scrapLog import ProcessingState, process_commit_block
+from utils.granularity import PathMapper, directory_at_depth, load_module_map, parse_granularity
+
+
+def test_parse_granularity():
+    assert parse_granularity("file") == ("file", 0)
+    assert parse_granularity("dir:2") == ("dir", 2)
+    assert parse_granularity("module-map") == ("module-map", 0)
+    for value in ("dir", "dir:0", "dir:x", "module"):
+        with pytest.raises(ValueError):
+            parse_granularity(value)
+
+
+def test_directory_at_depth():
+    assert directory_at_depth("tensorflow/core/kernels/a.cc", 2) == "tensorflow/core"
+    assert directory_at_depth("tensorflow/BUILD", 2) == "tensorflow"
+    assert directory_at_depth("README.md", 1) == "."
+
+
+def test_module_map_first_rule_wins(tmp_path):
+    module_map_file = tmp_path / "modules.json"
+    module_map_file.write_text(json.dumps({"tensorflow/compiler/mlir/**": "mlir", "tensorflow/compiler/": "xla",
+                                           "*.md": "docs"}))
+    mapper = PathMapper("module-map", module_map=load_module_map(str(module_map_file)))
+
+    assert mapper.map_files(["tensorflow/compiler/mlir/a.cc", "tensorflow/compiler/xla/b.cc",
+                             "tensorflow/compiler/c.h", "tensorflow/compiler/mlir/README.md", "docs/x.md",
+                             "setup.py"]) == ["mlir", "xla", "docs", "setup.py"]
+    assert mapper.vocabulary_sizes() == (6, 4)
+
+
+def test_module_map_directories_match_from_the_root():
+    """Directory rules map files below that directory of the repository, as path filters match them."""
+    mapper = PathMapper("module-map", module_map=[("docs/", "docs"), ("/tools/**", "tools"), ("*/docs/**", "other")])
+
+    assert mapper.unit_of("docs/a.md") == "docs"
+    assert mapper.unit_of("docs/api/b.md") == "docs"
+    assert mapper.unit_of("tools/c.sh") == "tools"
+    assert mapper.unit_of("src/docs/a.md") == "other"
+    assert mapper.unit_of("src/tools/c.sh") == "src/tools/c.sh"
+    assert mapper.unit_of("docs.md") == "docs.md"
+
+
+def test_process_commit_block_maps_files_to_directories():
+    """Files of a commit in the same directory become one unit of the changelog entry and file history."""
+    state = ProcessingState()
+    state.path_mapper = PathMapper("dir", depth=2)
+    block = ["==Jane Doe;jane@ibm.com;Mon Jan 1 10:00:00 2024 +0000==", "tf/core/a.cc", "tf/core/kernels/b.cc",
+             "tf/python/c.py", "README.md"]
+
+    assert process_commit_block(block, state, 0)
+
+    assert state.parsed_change_log_entries[0][1] == ["tf/core", "tf/python", "."]
+    assert sorted(state.file_history) == [".", "tf/core", "tf/python"]
@@ -0,0 +1,94 @@
+"""
+Test cases for utils/graph_filters.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_graph_filters.py::test_composed_filters_match_sequential_removal
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from utils.graph_filters import OrganizationFilter, affiliation_index
+
+ORGANIZATIONS = ["google", "ibm", "nokia", "apple", "intel", "amd"]
+
+
+@pytest.fixture
+def network_of_individuals() -> nx.Graph:
+    """Random network of 400 developers, some of them without affiliation."""
+    rng = random.Random(7)
+    graph = nx.gnm_random_graph(400, 900, seed=7)
+    for node in graph.nodes():
+        if rng.random() < 0.9:
+            graph.nodes[node]["affiliation"] = rng.choice(ORGANIZATIONS)
+    return graph
+
+
+def remove_sequentially(graph, ignore=None, only=None, neighbours=None, top=None):
+    """Reference: copy the graph and remove the filtered-out nodes one filter after the other."""
+    filtered = graph.copy()
+    if ignore:
+        filtered.remove_nodes_from([n for n, d in filtered.nodes(data=True) if d.get("affiliation", "") in ignore])
+    if only:
+        filtered.remove_nodes_from([n for n, d in filtered.nodes(data=True)
+                                    if d.get("affiliation", "") not in only])
+    if neighbours:
+        keep = set()
+        for node, data in filtered.nodes(data=True):
+            if data.get("affiliation", "") in neighbours:
+                keep.add(node)
+                keep.update(filtered.neighbors(node))
+        filtered.remove_nodes_from([n for n in filtered.nodes() if n not in keep])
+    if top:
+        filtered.remove_nodes_from([n for n, d in filtered.nodes(data=True) if d.get("affiliation", "") not in top])
+    return filtered
+
+
+@pytest.mark.parametrize("ignore, only, neighbours, top", [
+    (["google"], None, None, None),
+    (None, ["ibm", "nokia"], None, None),
+    (None, None, ["apple"], None),
+    (["intel"], ["ibm", "nokia", "intel", "apple"], ["nokia"], ["nokia", "ibm", "google"]),
+    (["amd"], None, ["google", "ibm"], ["google", "ibm", "apple"]),
+])
+def test_composed_filters_match_sequential_removal(network_of_individuals, ignore, only, neighbours, top):
+    """The keep-set and the induced subgraph are identical to removing nodes filter after filter."""
+    expected = remove_sequentially(network_of_individuals, ignore, only, neighbours, top)
+
+    organization_filter = OrganizationFilter(network_of_individuals)
+    if ignore:
+        organization_filter.exclude_organizations(ignore)
+    if only:
+        organization_filter.only_organizations(only)
+    if neighbours:
+        organization_filter.only_organizations_and_neighbours(neighbours)
+    if top:
+        organization_filter.only_organizations(top)
+    filtered = organization_filter.subgraph()
+
+    assert list(filtered.nodes()) == list(expected.nodes())
+    assert sorted(filtered.edges()) == sorted(expected.edges())
+    assert nx.number_of_isolates(filtered) == nx.number_of_isolates(expected)
+
+
+def test_removed_nodes_and_index(network_of_individuals):
+    """Filters return the nodes they removed; nodes without affiliation are indexed under ''."""
+    index = affiliation_index(network_of_individuals)
+    assert sum(len(nodes) for nodes in index.values()) == network_of_individuals.number_of_nodes()
+    assert "" in index
+
+    organization_filter = OrganizationFilter(network_of_individuals)
+    removed = organization_filter.exclude_organizations(["google", "ibm"])
+
+    assert removed == index["google"] | index["ibm"]
+    assert organization_filter.in_graph_order(removed) == sorted(removed)
+
+
+def test_subgraph_without_filters_is_the_graph(network_of_individuals):
+    """No view is created when no node is removed."""
+    organization_filter = OrganizationFilter(network_of_individuals)
+    organization_filter.exclude_organizations(["not-an-organization"])
+
+    assert organization_filter.subgraph() is network_of_individuals
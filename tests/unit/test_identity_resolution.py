@@ -0,0 +1,84 @@
+"""
+Test cases for utils/identity_resolution.py and its use by scrapLog.resolve_developer_identities
+
+For a single test case run:
+pytest -v -s tests/unit/test_identity_resolution.py::test_resolve_identities
+"""
+
+from collections import Counter
+
+from scrapLog import ProcessingState, process_commit_block, resolve_developer_identities
+from utils.identity_resolution import (github_noreply_login, identity_groups, normalise_author_name,
+                                       parse_mailmap_line, resolve_identities)
+
+
+def test_normalise_author_name():
+    assert normalise_author_name("  José  O'Neil-Teixeira ") == "jose o neil teixeira"
+    assert normalise_author_name("jose") is None
+    assert normalise_author_name("Your Name") is None
+    assert normalise_author_name("renovate[bot]") is None
+    assert normalise_author_name("copilot swe bot") is None
+
+
+def test_github_noreply_login():
+    assert github_noreply_login("12345+JDoe@users.noreply.github.com") == "jdoe"
+    assert github_noreply_login("jdoe@users.noreply.github.com") == "jdoe"
+    assert github_noreply_login("jdoe@github.com") is None
+
+
+def test_parse_mailmap_line():
+    assert parse_mailmap_line("# comment") is None
+    assert parse_mailmap_line("Jane Doe <Jane@Old.com>") == ("Jane Doe", None, None, "jane@old.com")
+    assert parse_mailmap_line("<jane@ibm.com> <jane@old.com>") == (None, "jane@ibm.com", None, "jane@old.com")
+    assert parse_mailmap_line("Jane Doe <jane@ibm.com> jd <jane@old.com>  # old laptop") == \
+           ("Jane Doe", "jane@ibm.com", "jd", "jane@old.com")
+
+
+def test_resolve_identities():
+    """Emails merge through shared names, noreply logins, case and mailmap entries; the most used email wins."""
+    author_names = {
+        "jane@ibm.com": {"Jane Doe"},
+        "jane.doe@gmail.com": {"jane  doe"},
+        "1+janed@users.noreply.github.com": {"janed"},
+        "janed@users.noreply.github.com": {"Jane D."},
+        "Jane@IBM.com": {"J"},
+        "john@google.com": {"John Smith"},
+        "js@old.com": {"js"},
+        "root@localhost": {"root"},
+        "admin@localhost": {"root"},
+    }
+    commit_counts = Counter({"jane.doe@gmail.com": 5, "jane@ibm.com": 3, "john@google.com": 1})
+    mailmap = [parse_mailmap_line("<john@google.com> <js@old.com>"),
+               parse_mailmap_line("Jane Doe <jane@ibm.com> <1+janed@users.noreply.github.com>")]
+
+    identity_map = resolve_identities(author_names, commit_counts, mailmap)
+
+    assert identity_groups(identity_map) == {
+        "jane@ibm.com": ["1+janed@users.noreply.github.com", "Jane@IBM.com", "jane.doe@gmail.com", "jane@ibm.com",
+                         "janed@users.noreply.github.com"],
+        "john@google.com": ["john@google.com", "js@old.com"],
+    }
+    assert identity_map["root@localhost"] == "root@localhost"
+
+    names_only = resolve_identities(author_names, commit_counts, match_noreply=False)
+    assert names_only["jane@ibm.com"] == "jane.doe@gmail.com"
+    assert names_only["janed@users.noreply.github.com"] == "janed@users.noreply.github.com"
+
+
+def test_resolve_developer_identities_rewrites_parsed_entries():
+    """Parsed entries and file history use canonical emails and their affiliation before network extraction."""
+    state = ProcessingState()
+    state.identity_resolution_mode = True
+    process_commit_block(["==Jane Doe;jane@ibm.com;Mon Jan 1 10:00:00 2024 +0000==", "a.py"], state, 0)
+    process_commit_block(["==Jane Doe;jane@ibm.com;Mon Jan 1 11:00:00 2024 +0000==", "b.py"], state, 1)
+    process_commit_block(["==Jane Doe;jane@gmail.com;Tue Jan 2 10:00:00 2024 +0000==", "a.py"], state, 2)
+    process_commit_block(["==John Smith;john@google.com;Tue Jan 2 11:00:00 2024 +0000==", "a.py"], state, 3)
+
+    resolve_developer_identities(state)
+
+    assert [entry[0] for entry in state.parsed_change_log_entries] == [("jane@ibm.com", "ibm")] * 3 + \
+           [("john@google.com", "google")]
+    assert [contribution.email for contribution in state.file_history["a.py"]] == \
+           ["jane@ibm.com", "jane@ibm.com", "john@google.com"]
+    assert state.identity_map["jane@gmail.com"] == "jane@ibm.com"
+    assert state.author_names["jane@ibm.com"] == {"Jane Doe"}
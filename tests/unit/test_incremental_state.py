@@ -0,0 +1,84 @@
+"""
+Test cases for utils/incremental_state.py and scrapLog --update
+
+For a single test case run:
+pytest -v -s tests/unit/test_incremental_state.py::test_update_equals_full_rebuild
+"""
+
+import pytest
+
+from scrapLog import ProcessingState, process_file_lines, process_file_lines_incrementally
+from utils.granularity import PathMapper
+from utils.incremental_state import drop_overlap, log_blocks
+
+OLD_LOG = """==Ann Lee;ann@redhat.com;Wed Jan 3 10:00:00 2024 +0000==
+a.py
+c.py
+
+==John Smith;john@google.com;Tue Jan 2 10:00:00 2024 +0000==
+a.py
+
+==Jane Doe;jane@ibm.com;Mon Jan 1 10:00:00 2024 +0000==
+a.py
+b.py
+"""
+
+# Commits since the latest stored one, git log --since including the latest stored commit itself
+NEW_LOG = """==Jane Doe;jane@ibm.com;Fri Jan 5 10:00:00 2024 +0000==
+b.py
+d.py
+
+==J. Doe;jane@ibm.com;Thu Jan 4 10:00:00 2024 +0000==
+c.py
+"""
+
+
+def lines_of(log: str):
+    return log.splitlines(keepends=True)
+
+
+def snapshot(state: ProcessingState):
+    return (state.parsed_change_log_entries, dict(state.file_history), dict(state.author_names),
+            list(state.author_names), state.statistics)
+
+
+def test_drop_overlap_keeps_identical_blocks_outside_the_overlap():
+    """Only the end of the tail matching the start of the stored log is dropped, not a cherry-pick of it."""
+    stored = [key for key, _ in log_blocks(lines_of(OLD_LOG))]
+    cherry_pick = OLD_LOG.split("\n\n")[1] + "\n\n"
+    tail = lines_of(NEW_LOG + "\n" + cherry_pick + OLD_LOG.split("\n\n")[0] + "\n")
+
+    lines, keys, n_dropped = drop_overlap(tail, stored)
+
+    assert n_dropped == 1
+    assert len(keys) == 3 and keys[2] == stored[1]
+    assert "".join(lines) == NEW_LOG + "\n" + cherry_pick
+    assert drop_overlap(lines_of(NEW_LOG), stored)[2] == 0
+
+
+def test_update_equals_full_rebuild(tmp_path):
+    state_dir = tmp_path / "state"
+    process_file_lines_incrementally(lines_of(OLD_LOG), ProcessingState(), state_dir)
+    tail = NEW_LOG + "\n" + OLD_LOG.split("\n\n")[0] + "\n"
+
+    updated = ProcessingState()
+    process_file_lines_incrementally(lines_of(tail), updated, state_dir)
+    rebuilt = ProcessingState()
+    process_file_lines(lines_of(NEW_LOG + "\n" + OLD_LOG), rebuilt)
+
+    assert snapshot(updated) == snapshot(rebuilt)
+    assert [c.commit_index for c in updated.file_history["a.py"]] == [2, 3, 4]
+
+    # Nothing new: the state is unchanged
+    again = ProcessingState()
+    process_file_lines_incrementally(lines_of(NEW_LOG), again, state_dir)
+    assert snapshot(again) == snapshot(rebuilt)
+
+
+def test_update_refuses_other_parsing_options(tmp_path):
+    process_file_lines_incrementally(lines_of(OLD_LOG), ProcessingState(), tmp_path)
+    state = ProcessingState()
+    state.path_mapper = PathMapper("dir", depth=1)
+
+    with pytest.raises(SystemExit):
+        process_file_lines_incrementally(lines_of(NEW_LOG), state, tmp_path)
@@ -0,0 +1,171 @@
+"""
+Test cases for utils/layout.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_layout.py::test_grid_repulsion_matches_exact_repulsion
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from utils.layout import (LAYOUT_ALGORITHMS, cached_layout, coarsen, compute_layout, grid_repulsion,
+                          layout_cache_key, load_layout, save_layout, warm_start_positions)
+
+
+def test_grid_repulsion_matches_exact_repulsion():
+    """The Barnes-Hut style approximation is close to the exact all-pairs repulsion."""
+    rng = np.random.default_rng(0)
+    positions = rng.normal(size=(2000, 2))
+    masses = rng.integers(1, 10, 2000).astype(float)
+
+    delta = positions[:, None, :] - positions[None, :, :]
+    distance2 = (delta ** 2).sum(axis=2)
+    np.fill_diagonal(distance2, np.inf)
+    exact = (masses[None, :, None] * delta / distance2[:, :, None]).sum(axis=1)
+
+    approximate = grid_repulsion(positions, masses)
+    error = np.linalg.norm(approximate - exact, axis=1) / np.linalg.norm(exact, axis=1)
+
+    assert np.median(error) < 0.01
+    assert error.max() < 0.1
+
+
+@pytest.mark.parametrize("algorithm", LAYOUT_ALGORITHMS)
+def test_layouts_position_every_node(algorithm):
+    """Every layout positions all nodes (also isolates and self-loops) in [-1, 1], reproducibly."""
+    graph = nx.connected_caveman_graph(8, 12)
+    graph.add_node("isolate")
+    graph.add_edge(0, 0)
+
+    positions = compute_layout(graph, algorithm, seed=1)
+    again = compute_layout(graph, algorithm, seed=1)
+
+    assert set(positions) == set(graph.nodes())
+    coordinates = np.array(list(positions.values()))
+    assert np.isfinite(coordinates).all()
+    assert np.abs(coordinates).max() <= 1 + 1e-9
+    assert all(np.allclose(positions[node], again[node]) for node in graph)
+
+
+@pytest.mark.parametrize("algorithm", ["forceatlas2", "sparse-spring", "multilevel"])
+def test_layouts_keep_communities_together(algorithm):
+    """Nodes of the same community are closer to each other than to the nodes of other communities."""
+    graph = nx.stochastic_block_model([60, 60, 60], [[0.3, 0.005, 0.005], [0.005, 0.3, 0.005],
+                                                     [0.005, 0.005, 0.3]], seed=3)
+    positions = compute_layout(graph, algorithm, seed=3)
+    coordinates = np.array([positions[node] for node in graph])
+    blocks = np.array([graph.nodes[node]["block"] for node in graph])
+
+    distance = np.linalg.norm(coordinates[:, None, :] - coordinates[None, :, :], axis=2)
+    same = blocks[:, None] == blocks[None, :]
+    assert distance[same].mean() < 0.5 * distance[~same].mean()
+
+
+def test_coarsen_merges_matched_nodes():
+    """A heavy-edge matching merges the heaviest edges first and sums parallel coarse edges."""
+    sources = np.array([0, 1, 2, 0])
+    targets = np.array([1, 2, 3, 3])
+    weights = np.array([5.0, 1.0, 5.0, 1.0])
+
+    mapping, n_coarse, coarse_sources, coarse_targets, coarse_weights = coarsen(
+        4, sources, targets, weights, np.random.default_rng(0))
+
+    assert n_coarse == 2
+    assert mapping[0] == mapping[1] and mapping[2] == mapping[3]
+    assert list(coarse_weights) == [2.0]
+    assert {int(coarse_sources[0]), int(coarse_targets[0])} == {0, 1}
+
+
+def test_unknown_layout():
+    """Unknown layouts are rejected."""
+    with pytest.raises(ValueError):
+        compute_layout(nx.path_graph(3), "kamada-kawai")
+
+
+def test_cached_layout_reuses_cached_positions(tmp_path):
+    """A second layout of the same network is read from the cache, other parameters are cached apart."""
+    graph = nx.connected_caveman_graph(6, 8)
+
+    positions = cached_layout(graph, "forceatlas2", seed=1, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+
+    again = cached_layout(graph, "forceatlas2", seed=1, cache_dir=str(tmp_path))
+    assert all(np.allclose(positions[node], again[node]) for node in graph)
+
+    cached_layout(graph, "forceatlas2", seed=2, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_layout_cache_key_depends_on_parameters():
+    """Keys differ by algorithm, iterations, seed, weight and initial positions."""
+    keys = {
+        layout_cache_key("hash", "forceatlas2", 100, 42, "weight"),
+        layout_cache_key("hash", "multilevel", 100, 42, "weight"),
+        layout_cache_key("hash", "forceatlas2", 25, 42, "weight"),
+        layout_cache_key("hash", "forceatlas2", 100, 1, "weight"),
+        layout_cache_key("hash", "forceatlas2", 100, 42, None),
+        layout_cache_key("hash", "forceatlas2", 100, 42, "weight", "init"),
+    }
+    assert len(keys) == 6
+    assert all(key.startswith("hash-") for key in keys)
+
+
+def test_save_and_load_layout(tmp_path):
+    """Layout files map node names back to the nodes of the graph and skip unknown nodes."""
+    graph = nx.path_graph(4)
+    positions = compute_layout(graph, "forceatlas2")
+    path = str(tmp_path / "2019.layout")
+    save_layout(positions, path, "forceatlas2")
+
+    loaded = load_layout(path, nx.path_graph(3))
+
+    assert set(loaded) == {0, 1, 2}
+    assert all(np.allclose(positions[node], loaded[node]) for node in loaded)
+
+
+def test_warm_start_places_new_nodes_near_their_neighbours():
+    """Known nodes keep their positions, new nodes start next to their neighbours."""
+    previous = nx.path_graph(20)
+    previous_positions = compute_layout(previous, "forceatlas2", seed=0)
+    graph = previous.copy()
+    graph.add_edge(0, "newcomer")
+    graph.add_node("isolate")
+
+    positions = warm_start_positions(graph, previous_positions)
+
+    assert set(positions) == set(graph.nodes())
+    assert all(np.allclose(positions[node], previous_positions[node]) for node in previous)
+    assert np.linalg.norm(positions["newcomer"] - positions[0]) < 0.1
+
+
+def test_warm_started_layout_stays_close_to_previous_layout():
+    """Starting from the previous layout keeps the nodes where they were, with fewer iterations."""
+    graph = nx.stochastic_block_model([50, 50], [[0.3, 0.01], [0.01, 0.3]], seed=5)
+    previous_positions = compute_layout(graph, "forceatlas2", seed=5)
+    grown = graph.copy()
+    grown.add_edges_from((("new", node) for node in range(5)))
+
+    positions = cached_layout(grown, "forceatlas2", seed=6, init_positions=previous_positions)
+    cold = compute_layout(grown, "forceatlas2", seed=6)
+
+    def displacement(layout):
+        return np.mean([np.linalg.norm(layout[node] - previous_positions[node]) for node in graph])
+
+    assert displacement(positions) < 0.5 * displacement(cold)
+
+
+@pytest.mark.parametrize("algorithm", ["forceatlas2", "multilevel"])
+def test_small_components_stay_next_to_the_largest(algorithm):
+    """Isolates and pairs are packed at the edge of the largest component instead of far away from it."""
+    graph = nx.barabasi_albert_graph(300, 5, seed=2)
+    graph.add_edge("a", "b")
+    graph.add_node("isolate")
+
+    positions = compute_layout(graph, algorithm, seed=2)
+    largest = np.array([positions[node] for node in range(300)])
+    radius = np.linalg.norm(largest - largest.mean(axis=0), axis=1).max()
+
+    assert np.ptp(largest, axis=0).max() > 1.0
+    for node in ("a", "b", "isolate"):
+        assert np.linalg.norm(positions[node] - largest.mean(axis=0)) < 1.5 * radius
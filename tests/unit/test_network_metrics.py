@@ -0,0 +1,133 @@
+"""
+Test cases for utils/network_metrics.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_network_metrics.py::test_cached_metrics_are_reused
+"""
+
+import os
+
+import networkx as nx
+import pytest
+
+from utils import network_metrics
+from utils.network_metrics import (
+    calculate_fast_metrics, calculate_metrics, compute_metrics_for_files, format_clustering, metrics_cache_key
+)
+
+
+@pytest.fixture
+def graphml_files(tmp_path):
+    """Three small GraphML networks of individuals."""
+    filepaths = []
+    for i, graph in enumerate([nx.path_graph(5), nx.complete_graph(4), nx.star_graph(6)]):
+        filepath = tmp_path / f"network-{i}.graphML"
+        nx.write_graphml(graph, filepath)
+        filepaths.append(str(filepath))
+    return filepaths
+
+
+def test_calculate_metrics():
+    """Metrics of a path with an isolated node."""
+    graph = nx.path_graph(3)
+    graph.add_node(3)
+
+    metrics = calculate_metrics(graph)
+
+    assert metrics['num_nodes'] == 4
+    assert metrics['num_isolates'] == 1
+    assert metrics['num_components'] == 2
+    assert metrics['largest_component_size'] == 3
+    assert metrics['avg_degree'] == 1.0
+
+
+def test_parallel_metrics_keep_input_order(graphml_files):
+    """Metrics computed by worker processes are returned in the order of the input files."""
+    sequential = compute_metrics_for_files(graphml_files, jobs=1)
+    parallel = compute_metrics_for_files(graphml_files, jobs=2)
+
+    assert parallel == sequential
+    assert [metrics['num_nodes'] for _, metrics, _ in parallel] == [5, 4, 7]
+
+
+def test_cached_metrics_are_reused(graphml_files, tmp_path, mocker):
+    """Only new or modified files are computed when the comparison is re-run."""
+    cache_dir = str(tmp_path / "cache")
+    compute_metrics_for_files(graphml_files[:2], cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+    spy = mocker.spy(network_metrics, "compute_file_metrics")
+    from_cache = []
+    results = compute_metrics_for_files(graphml_files, cache_dir=cache_dir,
+                                        on_result=lambda result, cached: from_cache.append(cached))
+
+    spy.assert_called_once_with(graphml_files[2])
+    assert sorted(from_cache) == [False, True, True]
+    assert [metrics['num_nodes'] for _, metrics, _ in results] == [5, 4, 7]
+
+    # The cache is keyed by content, not by file name
+    key = metrics_cache_key(network_metrics.file_hash(graphml_files[0]))
+    assert os.path.isfile(os.path.join(cache_dir, f"{key}.json"))
+
+
+def test_unreadable_file_is_reported(tmp_path):
+    """Files that fail to parse are returned with their error and are not cached."""
+    broken = tmp_path / "broken.graphML"
+    broken.write_text("<graphml>")
+    cache_dir = str(tmp_path / "cache")
+
+    [(filepath, metrics, error)] = compute_metrics_for_files([str(broken)], cache_dir=cache_dir)
+
+    assert filepath == str(broken)
+    assert metrics is None
+    assert error
+    assert not os.path.exists(cache_dir)
+
+
+def test_fast_metrics_match_exact_metrics():
+    """Array-based degree and component metrics are exact, the sampled clustering is within its confidence."""
+    graph = nx.connected_watts_strogatz_graph(2000, 10, 0.1, seed=1)
+    graph.add_edges_from(nx.complete_graph(range(2000, 2005)).edges())
+    graph.add_nodes_from([2005, 2006])
+
+    exact = calculate_metrics(graph)
+    fast = calculate_fast_metrics(graph, trials=20000, seed=7)
+
+    for key in ['num_nodes', 'num_edges', 'num_isolates', 'max_degree', 'min_degree', 'num_components',
+                'largest_component_size', 'largest_component_percentage', 'is_directed']:
+        assert fast[key] == exact[key], key
+    assert fast['avg_degree'] == pytest.approx(exact['avg_degree'])
+    assert fast['density'] == pytest.approx(exact['density'])
+
+    assert fast['approximate'] and not exact['approximate']
+    assert fast['clustering_trials'] == 20000
+    assert 0 < fast['avg_clustering_ci'] < 0.01
+    assert abs(fast['avg_clustering'] - exact['avg_clustering']) < 2 * fast['avg_clustering_ci']
+    assert format_clustering(fast).startswith("≈")
+    assert format_clustering(exact) == f"{exact['avg_clustering']:.3f}"
+
+
+def test_component_labels_directed_and_self_loops():
+    """Union-find components ignore edge direction, self-loops and multi-edges."""
+    graph = nx.MultiDiGraph([(3, 0), (1, 2), (2, 1), (4, 4), (5, 3)])
+
+    fast = calculate_fast_metrics(graph)
+    exact = calculate_metrics(graph)
+
+    assert fast['num_components'] == exact['num_components'] == 3
+    assert fast['largest_component_size'] == 3
+    assert fast['max_degree'] == exact['max_degree'] == 2
+    assert fast['avg_clustering'] == 0 and fast['clustering_trials'] == 0
+
+
+def test_fast_metrics_are_cached_separately(graphml_files, tmp_path):
+    """Approximate and exact metrics of the same file do not share cache entries."""
+    cache_dir = str(tmp_path / "cache")
+    [(_, exact, _)] = compute_metrics_for_files(graphml_files[1:2], cache_dir=cache_dir)
+    [(_, fast, _)] = compute_metrics_for_files(graphml_files[1:2], cache_dir=cache_dir, fast_metrics=True,
+                                               clustering_trials=100)
+
+    assert len(os.listdir(cache_dir)) == 2
+    assert not exact['approximate'] and fast['approximate']
+    # Every sampled neighbour pair of a complete graph closes a triangle
+    assert fast['avg_clustering'] == exact['avg_clustering'] == 1.0
@@ -0,0 +1,95 @@
+"""
+Test cases for utils/organization_analysis.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_organization_analysis.py::test_edge_counts_match_edge_by_edge_count
+"""
+
+import math
+import random
+
+import networkx as nx
+import pytest
+
+from utils.organization_analysis import analyze_organizations
+
+
+@pytest.fixture
+def network_of_individuals() -> nx.Graph:
+    """Two Google, two Nokia and one IBM developer, plus one developer without affiliation."""
+    graph = nx.Graph()
+    graph.add_node("g1", affiliation="google")
+    graph.add_node("g2", affiliation="google")
+    graph.add_node("n1", affiliation="nokia")
+    graph.add_node("n2", affiliation="nokia")
+    graph.add_node("i1", affiliation="ibm")
+    graph.add_node("x1")
+    graph.add_edges_from([("g1", "g2"), ("g1", "n1"), ("g2", "n1"), ("n1", "n2"), ("n2", "i1"), ("x1", "g1")])
+    return graph
+
+
+def test_contingency_derived_metrics(network_of_individuals):
+    """Intra/inter-organization edges, degrees, E-I index and pair ties come from the contingency matrix."""
+    analysis = analyze_organizations(network_of_individuals)
+    code = {organization: i for i, organization in enumerate(analysis.organizations)}
+
+    assert analysis.intra_organization_edges == 2
+    assert analysis.inter_organization_edges == 4
+    assert analysis.ei_index == pytest.approx((4 - 2) / 6)
+
+    assert analysis.intra_edge_counts() == {"google": 1, "nokia": 1}
+    assert analysis.degrees()[code["google"]] == 5
+    assert analysis.ei_indexes()[code["ibm"]] == 1.0
+    assert analysis.ei_indexes()[code["google"]] == pytest.approx((3 - 1) / 4)
+
+    assert analysis.organization_pair_ties()[0] == ("google", "nokia", 2)
+    assert ("nokia", "ibm", 1) in analysis.organization_pair_ties()
+    assert ("google", "unknown", 1) in analysis.organization_pair_ties()
+
+
+def test_node_counts_skip_unaffiliated_by_default(network_of_individuals):
+    """Nodes without affiliation only count as 'unknown' when asked for."""
+    analysis = analyze_organizations(network_of_individuals)
+
+    assert analysis.node_counts() == {"google": 2, "nokia": 2, "ibm": 1}
+    assert analysis.node_counts(include_unaffiliated=True) == {"google": 2, "nokia": 2, "ibm": 1, "unknown": 1}
+
+
+def test_edge_counts_match_edge_by_edge_count():
+    """The vectorised counts are identical to counting edge by edge, also with self-loops and multi-edges."""
+    rng = random.Random(42)
+    graph = nx.MultiGraph()
+    for node in range(300):
+        graph.add_node(node, affiliation=rng.choice(["google", "ibm", "nokia", "apple", "intel"]))
+    for _ in range(1500):
+        graph.add_edge(rng.randrange(300), rng.randrange(300))
+
+    analysis = analyze_organizations(graph)
+
+    intra, inter, intra_counts = 0, 0, {}
+    for u, v in graph.edges():
+        u_aff, v_aff = graph.nodes[u]["affiliation"], graph.nodes[v]["affiliation"]
+        if u_aff == v_aff:
+            intra += 1
+            intra_counts[u_aff] = intra_counts.get(u_aff, 0) + 1
+        else:
+            inter += 1
+
+    assert analysis.intra_organization_edges == intra
+    assert analysis.inter_organization_edges == inter
+    assert analysis.intra_edge_counts() == intra_counts
+    assert sum(ties for _, _, ties in analysis.organization_pair_ties()) == inter
+    assert analysis.degrees().sum() == 2 * graph.number_of_edges()
+
+
+def test_empty_network():
+    """Networks without edges have no E-I index."""
+    graph = nx.Graph()
+    graph.add_node("a", affiliation="google")
+
+    analysis = analyze_organizations(graph)
+
+    assert analysis.intra_organization_edges == 0
+    assert analysis.inter_organization_edges == 0
+    assert math.isnan(analysis.ei_index)
+    assert analysis.organization_pair_ties() == []
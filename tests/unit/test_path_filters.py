@@ -0,0 +1,74 @@
+"""
+Test cases for utils/path_filters.py and its use by scrapLog.extract_files_from_block
+
+For a single test case run:
+pytest -v -s tests/unit/test_path_filters.py::test_path_filter_rules
+"""
+
+from pathlib import Path
+
+import pytest
+
+from scrapLog import ProcessingState, extract_files_from_block
+from utils.path_filters import NOT_INCLUDED, PathFilter, glob_to_regex, path_suffix, rule_kind
+
+
+@pytest.mark.parametrize("path", ["a/b.PY", "b.tar.gz", ".bashrc", "dir.d/file", "file.", "a/.x.y", "no_ext", ""])
+def test_path_suffix_matches_pathlib(path):
+    assert path_suffix(path) == Path(path).suffix.lower()
+
+
+def test_rule_kind():
+    assert rule_kind("*.py") == "extension"
+    assert rule_kind("third_party/**") == rule_kind("third_party/") == "directory"
+    assert rule_kind("*.pb.txt") == rule_kind("tensorflow/**/BUILD") == rule_kind("file?.c") == "glob"
+    assert rule_kind("README.md") == rule_kind(".bazelrc") == "exact"
+
+
+@pytest.mark.parametrize("pattern, matching, not_matching", [
+    ("*.pb.txt", ["x.pb.txt", "a/b/x.pb.txt"], ["x.txt", "a/x.pb.txt/y"]),
+    ("docs/*.md", ["docs/a.md"], ["docs/a/b.md", "x/docs/a.md"]),
+    ("tensorflow/**/BUILD", ["tensorflow/BUILD", "tensorflow/core/kernels/BUILD"], ["xla/BUILD"]),
+    ("**/test_*.py", ["test_a.py", "a/b/test_a.py"], ["a/test_a.pyc"]),
+    ("file[0-9].[!h]", ["file1.c"], ["file1.h", "fileA.c"]),
+])
+def test_glob_to_regex(pattern, matching, not_matching):
+    import re
+    regex = re.compile(glob_to_regex(pattern))
+    assert all(regex.fullmatch(path) for path in matching)
+    assert not any(regex.fullmatch(path) for path in not_matching)
+
+
+def test_path_filter_rules():
+    """Exclude rules win over include rules; every file is counted under the rule that decided it."""
+    path_filter = PathFilter(include=["*.py", "*.CC", "tools/**"],
+                             exclude=["third_party/**", "*_test.py", "setup.py"])
+    paths = ["tf/ops/math_ops.py", "tf/ops/math_ops_test.py", "third_party/xla/a.cc", "tf/core/op.cc",
+             "tools/ci/run.sh", "setup.py", "README.md", "tf/ops/BUILD"]
+
+    assert [path for path in paths if path_filter.keeps(path)] == ["tf/ops/math_ops.py", "tf/core/op.cc",
+                                                                  "tools/ci/run.sh"]
+    assert path_filter.rejecting_rule("third_party/xla/a.cc") == "third_party/**"
+    assert path_filter.rejecting_rule("LICENSE") == NOT_INCLUDED
+    assert path_filter.hit_counts() == [
+        ("include", "*.py", 1), ("include", "*.CC", 1), ("include", "tools/**", 1), ("include", NOT_INCLUDED, 3),
+        ("exclude", "third_party/**", 2), ("exclude", "*_test.py", 1), ("exclude", "setup.py", 1),
+    ]
+    assert not PathFilter()
+
+
+def test_extract_files_from_block_with_path_rules():
+    """Extension, directory and glob rules of the state are compiled once and applied to every block."""
+    state = ProcessingState()
+    state.include_extensions = {".py", ".txt"}
+    state.exclude_paths = ["third_party/**", "*.pb.txt"]
+    state.file_filtering_mode = True
+    state.files_to_filter = {"setup.py"}
+    block = ["tf/a.py\n", "third_party/b.py\n", "tf/graph.pb.txt\n", "notes.txt\n", "setup.py\n", "tf/c.cc\n"]
+
+    assert extract_files_from_block(block, state) == ["tf/a.py", "notes.txt"]
+    assert extract_files_from_block(["tf/d.py\n", "\n"], state) == ["tf/d.py"]
+    assert state.statistics.n_blocks_changing_code == 3
+    assert dict(state.path_filter.hits) == {("include", "*.py"): 2, ("include", "*.txt"): 1,
+                                            ("include", NOT_INCLUDED): 1, ("exclude", "third_party/**"): 1,
+                                            ("exclude", "*.pb.txt"): 1, ("exclude", "setup.py"): 1}
@@ -0,0 +1,84 @@
+"""
+Test cases for utils/rendering.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_rendering.py::test_edge_segments_follow_edge_order
+"""
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+import pytest
+from matplotlib.collections import LineCollection, PathCollection
+
+from utils.rendering import (RASTERIZE_EDGES_THRESHOLD, bundled_edge_segments, draw_edges, draw_nodes,
+                             edge_segments, should_rasterize_edges)
+
+
+@pytest.fixture
+def two_organizations():
+    """Two organizations of three developers, with two inter-organization edges."""
+    graph = nx.Graph()
+    for node, (x, y) in enumerate([(0, 0), (0, 1), (1, 0), (10, 0), (10, 1), (11, 0)]):
+        graph.add_node(node, affiliation="google" if node < 3 else "ibm", pos=(x, y))
+    graph.add_edges_from([(0, 1), (1, 2), (3, 4), (0, 3), (2, 5)])
+    return graph, {node: np.array(data["pos"], dtype=float) for node, data in graph.nodes(data=True)}
+
+
+def test_edge_segments_follow_edge_order(two_organizations):
+    """Segments join the positions of the edge ends, in graph.edges() order."""
+    graph, pos = two_organizations
+    segments = edge_segments(graph, pos)
+
+    assert segments.shape == (graph.number_of_edges(), 2, 2)
+    for segment, (u, v) in zip(segments, graph.edges()):
+        assert np.allclose(segment, [pos[u], pos[v]])
+
+
+def test_bundled_edges_pass_through_organization_pair(two_organizations):
+    """Bundled edges start and end at their nodes; inter-organization edges share their middle point."""
+    graph, pos = two_organizations
+    curves = bundled_edge_segments(graph, pos, strength=1.0, points=11)
+    edges = list(graph.edges())
+
+    assert curves.shape == (graph.number_of_edges(), 11, 2)
+    assert np.allclose(curves[:, 0], [pos[u] for u, _ in edges])
+    assert np.allclose(curves[:, -1], [pos[v] for _, v in edges])
+
+    inter = [i for i, (u, v) in enumerate(edges) if (u < 3) != (v < 3)]
+    middle = np.array([(curves[i, 5] - (pos[edges[i][0]] + pos[edges[i][1]]) / 4) * 2 for i in inter])
+    assert np.allclose(middle, (np.array([1 / 3, 1 / 3]) + np.array([31 / 3, 1 / 3])) / 2)
+
+    assert np.allclose(bundled_edge_segments(graph, pos, strength=0.0, points=2), edge_segments(graph, pos))
+
+
+def test_should_rasterize_edges():
+    """'auto' rasterises dense edge layers only; unknown modes are rejected."""
+    assert should_rasterize_edges(RASTERIZE_EDGES_THRESHOLD, "auto")
+    assert not should_rasterize_edges(RASTERIZE_EDGES_THRESHOLD - 1, "auto")
+    assert should_rasterize_edges(1, "always")
+    assert not should_rasterize_edges(10 ** 6, "never")
+    with pytest.raises(ValueError):
+        should_rasterize_edges(10, "sometimes")
+
+
+def test_draw_network_creates_one_collection_per_layer(two_organizations):
+    """Nodes are one scatter above one LineCollection of edges, and the axes contain the whole network."""
+    graph, pos = two_organizations
+    fig, ax = plt.subplots()
+
+    nodes = draw_nodes(ax, graph, pos, color=["red"] * 6, size=[10, 20, 30, 40, 50, 60], alpha=0.8)
+    edges = draw_edges(ax, graph, pos, width=[1, 2, 3, 4, 5], alpha=0.5, rasterize="always", bundle=True)
+
+    assert isinstance(nodes, PathCollection) and isinstance(edges, LineCollection)
+    assert list(ax.collections) == [nodes, edges]
+    assert nodes.get_zorder() > edges.get_zorder()
+    assert edges.get_rasterized()
+    assert len(edges.get_segments()) == graph.number_of_edges()
+    x_low, x_high = ax.get_xlim()
+    assert x_low <= 0 and x_high >= 11
+    plt.close(fig)
@@ -0,0 +1,72 @@
+"""
+Test cases for utils/report_writer.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_report_writer.py::test_xlsx_exceeds_legacy_xls_row_limit
+"""
+
+import csv
+
+import pytest
+from openpyxl import load_workbook
+
+from utils.report_writer import ReportWriter, parse_report_formats, sheet_file_suffix
+
+
+def test_xlsx_and_csv_outputs(tmp_path):
+    """Each sheet goes to one xlsx worksheet and to its own CSV file."""
+    prefix = str(tmp_path / "network_report")
+
+    with ReportWriter(prefix, ["xlsx", "csv"]) as writer:
+        writer.write_sheet("Nodes (Developers)", ["ID", "Affiliation"], iter([("1", "google"), ("2", "ibm")]))
+        writer.write_sheet("Graph Statistics", ["Metric", "Value"], [("Number of nodes", 2)])
+
+    assert writer.output_files == [
+        f"{prefix}.xlsx",
+        f"{prefix}_nodes_developers.csv",
+        f"{prefix}_graph_statistics.csv",
+    ]
+
+    workbook = load_workbook(f"{prefix}.xlsx", read_only=True)
+    assert workbook.sheetnames == ["Nodes (Developers)", "Graph Statistics"]
+    assert list(workbook["Nodes (Developers)"].values) == [("ID", "Affiliation"), ("1", "google"), ("2", "ibm")]
+    assert list(workbook["Graph Statistics"].values) == [("Metric", "Value"), ("Number of nodes", 2)]
+
+    with open(f"{prefix}_nodes_developers.csv", newline="") as file:
+        assert list(csv.reader(file)) == [["ID", "Affiliation"], ["1", "google"], ["2", "ibm"]]
+
+
+def test_xlsx_exceeds_legacy_xls_row_limit(tmp_path):
+    """Node sheets of large networks are not capped at the 65,536 rows of legacy .xls files."""
+    prefix = str(tmp_path / "large")
+    n_rows = 70000
+
+    with ReportWriter(prefix, ["xlsx"]) as writer:
+        assert writer.write_sheet("Nodes", ["Node ID"], ((str(i),) for i in range(n_rows))) == n_rows
+
+    worksheet = load_workbook(f"{prefix}.xlsx", read_only=True)["Nodes"]
+    assert sum(1 for _ in worksheet.iter_rows(values_only=True)) == n_rows + 1
+
+
+def test_parquet_output(tmp_path):
+    """Parquet files keep numeric columns typed and write mixed columns as strings."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    prefix = str(tmp_path / "report")
+
+    with ReportWriter(prefix, ["parquet"]) as writer:
+        writer.write_sheet("Centralities", ["Node ID", "Degree Centrality"], [("a", 0.5), ("b", 0.25)])
+        writer.write_sheet("Graph Statistics", ["Metric", "Value"], [("Is connected", True), ("Density", 0.1)])
+
+    centralities = pq.read_table(f"{prefix}_centralities.parquet").to_pydict()
+    assert centralities == {"Node ID": ["a", "b"], "Degree Centrality": [0.5, 0.25]}
+    statistics = pq.read_table(f"{prefix}_graph_statistics.parquet").to_pydict()
+    assert statistics["Value"] == ["True", "0.1"]
+
+
+def test_formats_are_validated():
+    """Unknown formats are rejected by the writer and by the command line parser."""
+    with pytest.raises(ValueError):
+        ReportWriter("report", ["xls"])
+
+    assert parse_report_formats("XLSX, csv") == ["xlsx", "csv"]
+    assert sheet_file_suffix("Organizations by Node Count") == "organizations_by_node_count"
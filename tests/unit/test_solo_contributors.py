@@ -0,0 +1,76 @@
+"""
+Test cases for solo_contributors.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_solo_contributors.py::test_build_periods_data
+"""
+
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from solo_contributors import (PERIODS, assign_period, build_periods_data, load_changelog, make_periods, parse_log,
+                               parse_timestamp, period_boundaries)
+
+LOG = """==Jane Doe;jane@ibm.com;Mon Jan 1 10:00:00 2024 +0000==
+a.py
+b.py
+
+==John Smith;John@Google.com;Tue Jan 2 10:00:00 2024 +0000==
+a.py
+
+==Ann Lee;ann@redhat.com;Wed Jan 3 10:00:00 2024 +0000==
+c.py
+
+==Ann Lee;ann@redhat.com;Mon Jul 1 10:00:00 2024 +0200==
+a.py
+
+==Jane Doe;jane@ibm.com;Tue Jul 2 10:00:00 2024 +0000==
+d.py
+
+==Old Timer;old@example.org;Mon Jan 2 10:00:00 2017 +0000==
+a.py
+"""
+
+HALVES = make_periods([("h2", "2024-07-01", "2024-12-31"), ("h1", "2024-01-01", "2024-06-30")])
+
+
+def test_make_periods():
+    assert list(HALVES) == ["h1", "h2"]
+    assert HALVES["h1"][1] == datetime(2024, 6, 30, 23, 59, 59, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        make_periods([("a", "2024-01-01", "2024-06-30"), ("b", "2024-06-30", "2024-12-31")])
+    with pytest.raises(ValueError):
+        make_periods([("a", "2024-06-30", "2024-01-01")])
+
+
+def test_assign_period():
+    starts, ends = period_boundaries(PERIODS)
+    assert assign_period(parse_timestamp("Mon Jan 1 10:00:00 2018 +0000"), starts, ends) is None
+    assert assign_period(parse_timestamp("Thu Sep 1 00:00:00 2022 +0000"), starts, ends) == 1
+    # 00:30 in UTC+1 is still the last day of the pre period in UTC
+    assert assign_period(parse_timestamp("Thu Sep 1 00:30:00 2022 +0100"), starts, ends) == 0
+    assert assign_period(parse_timestamp("Sun Feb 1 00:00:00 2026 +0000"), starts, ends) is None
+
+
+def test_build_periods_data(tmp_path):
+    """Each commit lands in its period; developers touching only their own files are solo-only."""
+    log = tmp_path / "project.IN"
+    log.write_text(LOG)
+
+    results = build_periods_data(parse_log(str(log)), HALVES)
+
+    h1 = results["h1"]
+    assert h1["solo_only_devs"] == {"Ann Lee <ann@redhat.com>"}
+    assert h1["solo_file_dev"] == [("Ann Lee <ann@redhat.com>", "c.py"), ("Jane Doe <jane@ibm.com>", "b.py")]
+    assert (len(h1["author_files"]), len(h1["file_authors"]), len(h1["co_edited"])) == (3, 3, 1)
+    assert results["h2"]["solo_only_devs"] == {"Ann Lee <ann@redhat.com>", "Jane Doe <jane@ibm.com>"}
+    default = build_periods_data(parse_log(str(log)), PERIODS)
+    assert default["pre"] is None and default["washout"] is None and len(default["post"]["author_files"]) == 3
+
+    changelog = tmp_path / "project.pickle"
+    changelog.write_bytes(pickle.dumps([(("jane@ibm.com", "ibm"), ["a.py"], "Mon Jan 1 10:00:00 2024 +0000"),
+                                        (("John@Google.com", "google"), ["b.py"], "Mon Jan 1 11:00:00 2024 +0000")]))
+    assert build_periods_data(load_changelog(str(changelog)), HALVES)["h1"]["solo_only_devs"] == \
+           {"jane@ibm.com", "john@google.com"}
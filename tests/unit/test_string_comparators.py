@@ -0,0 +1,51 @@
+"""
+Test cases for utils/string_comparators.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_string_comparators.py::test_find_similar_strings_matches_all_pairs
+"""
+
+import random
+from difflib import SequenceMatcher
+from itertools import combinations
+
+import pytest
+
+from utils.string_comparators import candidate_pairs, find_similar_strings, prefix_length
+
+
+def all_similar_pairs(strings, similarity_threshold):
+    """Reference: every pair scored with SequenceMatcher."""
+    return {(str1, str2, SequenceMatcher(None, str1, str2).ratio()) for str1, str2 in combinations(strings, 2)
+            if SequenceMatcher(None, str1, str2).ratio() >= similarity_threshold}
+
+
+@pytest.mark.parametrize("similarity_threshold", [0.3, 0.6, 0.8, 1.0])
+def test_find_similar_strings_matches_all_pairs(similarity_threshold):
+    """Blocking never drops a pair that comparing all pairs finds, nor changes its orientation or score."""
+    rng = random.Random(42)
+    affiliations = {"google.com", "gooogle.com", "ibm.com", "us.ibm.com", "redhat.com", "redhat.org", "intel.com",
+                    "microsoft.com", "microsoft.org", "", "nvidia.com", "amd.com"}
+    affiliations |= {"".join(rng.choice("abcd.") for _ in range(rng.randint(1, 9))) for _ in range(60)}
+
+    assert find_similar_strings(affiliations, similarity_threshold) == \
+           all_similar_pairs(affiliations, similarity_threshold)
+
+
+def test_candidate_pairs_skip_strings_without_rare_characters_in_common():
+    """Strings without enough characters in common are never scored."""
+    pairs = set(candidate_pairs(["google.com", "gooogle.com", "ibm", "xyz"], 0.8))
+    assert (0, 1) in pairs
+    assert not {(0, 3), (1, 3), (2, 3)} & pairs
+
+
+def test_prefix_length():
+    assert prefix_length(0, 0.8) == 0
+    assert prefix_length(10, 1.0) == 1
+    assert prefix_length(5, 0.8) == 2
+
+
+def test_find_similar_strings_top_k():
+    pairs = find_similar_strings({"google.com", "gooogle.com", "google.org", "ibm.com"}, 0.7, top_k=1)
+    assert pairs == {("google.com", "gooogle.com", SequenceMatcher(None, "google.com", "gooogle.com").ratio())} \
+           or pairs == {("gooogle.com", "google.com", SequenceMatcher(None, "gooogle.com", "google.com").ratio())}
@@ -0,0 +1,122 @@
+"""
+Test cases for utils/temporal_animation.py
+
+For a single test case run:
+pytest -v -s tests/unit/test_temporal_animation.py::test_update_hides_absent_nodes_and_edges
+"""
+
+import os
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import networkx as nx
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.temporal_animation import (FRAME_FILE_PATTERN, TemporalAnimation, animation_format, frame_masks,
+                                      save_animation, union_graph)
+
+
+@pytest.fixture
+def snapshots():
+    """Three snapshots of a growing then shrinking collaboration."""
+    return [nx.Graph([("alice", "bob")]),
+            nx.Graph([("alice", "bob"), ("bob", "carol")]),
+            nx.Graph([("carol", "dave")])]
+
+
+@pytest.fixture
+def animation_kwargs(snapshots):
+    pos = {"alice": (0, 0), "bob": (1, 0), "carol": (1, 1), "dave": (0, 1)}
+    return dict(snapshots=snapshots, pos=pos, titles=["t=0", "t=1", "t=2"], figsize=(3, 3), node_size=50)
+
+
+def test_frame_masks(snapshots):
+    """Masks give the presence of each union node and edge in each snapshot, in either edge direction."""
+    union = union_graph(snapshots)
+    snapshots[2] = nx.DiGraph([("dave", "carol")])
+    node_masks, edge_masks = frame_masks(snapshots, union)
+
+    assert list(union.nodes()) == ["alice", "bob", "carol", "dave"]
+    assert node_masks.tolist() == [[True, True, False, False], [True, True, True, False],
+                                   [False, False, True, True]]
+    assert edge_masks.tolist() == [[True, False, False], [True, True, False], [False, False, True]]
+
+
+def test_update_hides_absent_nodes_and_edges(animation_kwargs):
+    """Frames reuse the same artists and only make absent nodes, edges and labels transparent or hidden."""
+    renderer = TemporalAnimation(**animation_kwargs)
+    nodes, edges = renderer.nodes, renderer.edges
+
+    artists = renderer.update(0)
+
+    assert artists[:2] == [edges, nodes]
+    assert np.allclose(nodes.get_facecolor()[:, 3], [1, 1, 0, 0])
+    assert np.allclose(edges.get_color()[:, 3], [1, 0, 0])
+    assert [label.get_visible() for label in renderer.labels] == [True, True, False, False]
+    assert renderer.title.get_text() == "t=0"
+
+    renderer.update(2)
+    assert np.allclose(nodes.get_facecolor()[:, 3], [0, 0, 1, 1])
+    assert len(renderer.ax.collections) == 2
+    renderer.close()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_save_animation(animation_kwargs, tmp_path, jobs):
+    """Animations are saved as a PNG sequence or a GIF with one frame per snapshot, by one or more workers."""
+    frames_dir = save_animation(animation_kwargs, str(tmp_path / "frames"), jobs=jobs)
+    assert sorted(os.listdir(frames_dir)) == [FRAME_FILE_PATTERN % frame for frame in range(3)]
+
+    gif = save_animation(animation_kwargs, str(tmp_path / "animation.gif"), jobs=jobs)
+    with Image.open(gif) as image:
+        assert image.n_frames == 3
+
+
+def test_animation_format():
+    assert animation_format("evolution.MP4") == "mp4"
+    assert animation_format("frames") == "png"
+    with pytest.raises(ValueError):
+        animation_format("evolution.avi")
+
+
+@pytest.mark.parametrize("animation_file, jobs", [("network.gif", 1), ("frames", 2)])
+def test_scraplog_animation_file(tmp_path, monkeypatch, animation_file, jobs):
+    """scrapLog --animation-file saves the animation of the temporal network it extracts."""
+    import sys
+
+    import scrapLog
+
+    log = tmp_path / "project.IN"
+    log.write_text("==Ann Lee;ann@redhat.com;Wed Jan 3 10:00:00 2024 +0000==\na.py\n\n"
+                   "==John Smith;john@google.com;Tue Jan 2 10:00:00 2024 +0000==\na.py\nb.py\n\n"
+                   "==Jane Doe;jane@ibm.com;Mon Jan 1 10:00:00 2024 +0000==\na.py\nb.py\n")
+    output = tmp_path / animation_file
+    monkeypatch.setattr(sys, "argv", ["scrapLog.py", "-r", str(log), "-o", str(tmp_path / "network.graphml"),
+                                      "-t", "inter_individual_graph_temporal", "--animation-file", str(output),
+                                      "--animation-fps", "4", "--animation-jobs", str(jobs)])
+    try:
+        scrapLog.main()
+    except SystemExit as e_exit:
+        # The processing summary exits (successfully) when the network has no affiliations to compare
+        assert not e_exit.code
+
+    if animation_format(str(output)) == "gif":
+        assert Image.open(output).n_frames == 2
+    else:
+        assert sorted(os.listdir(output)) == [FRAME_FILE_PATTERN % 0, FRAME_FILE_PATTERN % 1]
+
+
+def test_scraplog_rejects_unknown_animation_format(tmp_path, monkeypatch):
+    import sys
+
+    import scrapLog
+
+    monkeypatch.setattr(sys, "argv", ["scrapLog.py", "-r", str(tmp_path / "project.IN"),
+                                      "--animation-file", str(tmp_path / "network.avi")])
+    with pytest.raises(SystemExit) as exc_info:
+        scrapLog.main()
+    assert exc_info.value.code == 1
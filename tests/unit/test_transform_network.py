@@ -163,6 +163,140 @@ def test_create_organizational_network_complex_scenario(complex_network):
     assert org_network["Microsoft"]["Amazon"]["weight"] == 4
 
 
+def test_create_organizational_network_intra_firm_ties_attribute():
+    """Test that intra-firm tie counts are stored on organization nodes when requested."""
+    G = nx.Graph()
+    G.add_node("dev1", affiliation="Apple")
+    G.add_node("dev2", affiliation="Apple")
+    G.add_node("dev3", affiliation="Apple")
+    G.add_node("dev4", affiliation="Nokia")
+    G.add_edge("dev1", "dev2")  # Intra-Apple
+    G.add_edge("dev2", "dev3")  # Intra-Apple
+    G.add_edge("dev3", "dev4")  # Inter Apple-Nokia
+
+    org_network = transform_module.create_organizational_network(G, include_intra_firm_ties=True)
+
+    assert org_network["Apple"]["Nokia"]["weight"] == 1
+    assert org_network.nodes["Apple"]["intra_firm_ties"] == 2
+    assert org_network.nodes["Nokia"]["intra_firm_ties"] == 0
+
+    # Without the flag no node attribute is added
+    org_network = transform_module.create_organizational_network(G)
+    assert "intra_firm_ties" not in org_network.nodes["Apple"]
+
+
+def test_create_organizational_network_matches_edge_by_edge_count(complex_network):
+    """Test that the vectorised aggregation matches a plain edge-by-edge count."""
+    expected = {}
+    for u, v in complex_network.edges():
+        org_u = complex_network.nodes[u]["affiliation"]
+        org_v = complex_network.nodes[v]["affiliation"]
+        if org_u != org_v:
+            key = frozenset([org_u, org_v])
+            expected[key] = expected.get(key, 0) + 1
+
+    org_network = transform_module.create_organizational_network(complex_network)
+
+    obtained = {frozenset([u, v]): data["weight"] for u, v, data in org_network.edges(data=True)}
+    assert obtained == expected
+
+
+def test_encode_node_affiliations():
+    """Test that affiliations are encoded to integer ids in first-seen order."""
+    G = nx.Graph()
+    G.add_node("dev1", affiliation="Apple")
+    G.add_node("dev2", affiliation="Nokia")
+    G.add_node("dev3", affiliation="Apple")
+    G.add_node("dev4")  # No affiliation
+
+    node_index, org_ids, org_names = transform_module.encode_node_affiliations(G)
+
+    assert org_names == ["Apple", "Nokia"]
+    assert org_ids.tolist() == [0, 1, 0, -1]
+    assert node_index == {"dev1": 0, "dev2": 1, "dev3": 2, "dev4": 3}
+
+
+@pytest.fixture
+def weighted_temporal_network():
+    """Temporal multigraph of individuals with weights and ISO timestamps."""
+    G = nx.MultiGraph()
+    G.add_node("dev1", affiliation="Apple")
+    G.add_node("dev2", affiliation="Apple")
+    G.add_node("dev3", affiliation="Nokia")
+    G.add_edge("dev1", "dev3", weight=2, time="2023-01-15T14:30:22-05:00")
+    G.add_edge("dev1", "dev3", weight=3, time="2024-02-01T10:00:00+00:00")
+    G.add_edge("dev2", "dev3", weight=1, time="2024-03-01T10:00:00+00:00")
+    G.add_edge("dev1", "dev2", weight=7, time="2024-03-01T10:00:00+00:00")  # Intra-Apple
+    return G
+
+
+def test_create_organizational_network_pairs_aggregation_ignores_parallel_edges(weighted_temporal_network):
+    """Test that the default aggregation counts distinct developer pairs."""
+    org_network = transform_module.create_organizational_network(weighted_temporal_network)
+
+    assert org_network["Apple"]["Nokia"]["weight"] == 2
+
+
+def test_create_organizational_network_weight_aggregation(weighted_temporal_network):
+    """Test that the weight aggregation sums the weights of developer edges."""
+    org_network = transform_module.create_organizational_network(
+        weighted_temporal_network, aggregation="weight", include_intra_firm_ties=True
+    )
+
+    assert org_network["Apple"]["Nokia"]["weight"] == 6
+    assert org_network.nodes["Apple"]["intra_firm_ties"] == 7
+
+
+def test_create_organizational_network_developers_aggregation(weighted_temporal_network):
+    """Test that the developers aggregation counts distinct developers on both sides."""
+    org_network = transform_module.create_organizational_network(
+        weighted_temporal_network, aggregation="developers"
+    )
+
+    # dev1 and dev2 from Apple, dev3 from Nokia
+    assert org_network["Apple"]["Nokia"]["weight"] == 3
+
+
+def test_create_organizational_network_time_aggregation(weighted_temporal_network):
+    """Test that the time aggregation creates one organization edge per time bucket."""
+    org_network = transform_module.create_organizational_network(
+        weighted_temporal_network, aggregation="time", time_bucket="year"
+    )
+
+    assert isinstance(org_network, nx.MultiGraph)
+    edges = {data["time"]: data["weight"] for _, _, data in org_network.edges(data=True)}
+    assert edges == {"2023": 2, "2024": 4}
+
+
+def test_create_organizational_network_time_aggregation_requires_time():
+    """Test that the time aggregation fails on edges without time attribute."""
+    G = nx.Graph()
+    G.add_node("dev1", affiliation="Apple")
+    G.add_node("dev2", affiliation="Nokia")
+    G.add_edge("dev1", "dev2")
+
+    with pytest.raises(ValueError):
+        transform_module.create_organizational_network(G, aggregation="time")
+
+
+def test_create_organizational_network_affiliation_from_email():
+    """Test the affiliation fallback for weighted networks whose nodes are e-mails only."""
+    G = nx.Graph()
+    G.add_edge("dev1@apple.com", "dev2@nokia.com", weight=4)
+
+    org_network = transform_module.create_organizational_network(
+        G, aggregation="weight", affiliation_from_email=lambda email: email.split("@")[1].split(".")[0]
+    )
+
+    assert org_network["apple"]["nokia"]["weight"] == 4
+
+
+def test_create_organizational_network_unknown_aggregation(sample_individual_network):
+    """Test that unknown aggregation modes are rejected."""
+    with pytest.raises(ValueError):
+        transform_module.create_organizational_network(sample_individual_network, aggregation="median")
+
+
 # Test remove_isolates function
 def test_remove_isolates_basic(network_with_isolates):
     """Test removing isolated nodes."""
@@ -784,6 +918,73 @@ def test_network_with_duplicate_edges():
     assert org_network["Apple"]["Nokia"]["weight"] == 1
 
 
+# Test batch mode
+def test_collect_input_files_from_directory(sample_individual_network, tmp_path):
+    """Test that directories are expanded to their networks, leaving transformed ones out."""
+    nx.write_graphml_lxml(sample_individual_network, str(tmp_path / "b.graphML"))
+    nx.write_graphml_lxml(sample_individual_network, str(tmp_path / "a.graphml"))
+    nx.write_graphml_lxml(sample_individual_network, str(tmp_path / "a-transformed-to-nofo.graphML"))
+
+    files = transform_module.collect_input_files(str(tmp_path))
+
+    assert [os.path.basename(f) for f in files] == ["a.graphml", "b.graphML"]
+    assert transform_module.collect_input_files(str(tmp_path / "b*")) == [str(tmp_path / "b.graphML")]
+    # Outputs of a previous run over the same pattern are not transformed again
+    assert transform_module.collect_input_files(str(tmp_path / "a*")) == [str(tmp_path / "a.graphml")]
+
+
+def test_apply_affiliation_aliases(sample_individual_network):
+    """Test that aliases rename node affiliations in place."""
+    n_replaced = transform_module.apply_affiliation_aliases(sample_individual_network, {"Nokia": "HMD"})
+
+    assert n_replaced == 2
+    assert sample_individual_network.nodes["dev3"]["affiliation"] == "HMD"
+
+
+def test_main_batch_mode_transforms_and_skips_up_to_date(mocker, monkeypatch, tmp_path, sample_individual_network):
+    """Test that batch mode transforms every file once and then skips up-to-date outputs."""
+    input_dir = tmp_path / "in"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    for year in (2022, 2023):
+        nx.write_graphml_lxml(sample_individual_network, str(input_dir / f"net-{year}.graphML"))
+    summary_file = tmp_path / "summary.csv"
+
+    test_args = ["script.py", str(input_dir), "--output-dir", str(output_dir),
+                 "--summary-file", str(summary_file)]
+    monkeypatch.setattr(sys, 'argv', test_args)
+    transform_module.main()
+
+    output_2023 = output_dir / "net-2023-transformed-to-nofo.graphML"
+    assert output_2023.exists()
+    assert nx.read_graphml(str(output_2023))["Apple"]["Nokia"]["weight"] == 4
+    assert summary_file.read_text().count("transformed") >= 2
+
+    # Second run: outputs are newer than inputs
+    summaries = transform_module.run_batch(transform_module.argparse.Namespace(
+        file=str(input_dir), output_dir=str(output_dir), summary_file=None, force=False, jobs=1,
+        affiliation_alias_in_config_file=None, affiliation_from_email=False,
+        intra_firm_ties=False, aggregation="pairs", time_bucket="year"
+    ))
+    assert [row["status"] for row in summaries] == ["skipped (up to date)"] * 2
+
+
+@pytest.mark.parametrize("option", ["-o", "-s", "-v"])
+def test_main_batch_mode_rejects_single_network_options(monkeypatch, tmp_path, sample_individual_network, option):
+    """Test that options of single network runs are rejected rather than ignored in batch mode."""
+    nx.write_graphml_lxml(sample_individual_network, str(tmp_path / "net.graphML"))
+    test_args = ["script.py", str(tmp_path / "net.graphML"), "--output-dir", str(tmp_path / "out"), option]
+    if option == "-o":
+        test_args.append(str(tmp_path / "org.graphML"))
+    monkeypatch.setattr(sys, 'argv', test_args)
+
+    with pytest.raises(SystemExit) as exc_info:
+        transform_module.main()
+
+    assert exc_info.value.code == 2
+    assert not (tmp_path / "out").exists()
+
+
 # Test that all required functions exist
 def test_module_structure():
     """Test that the module has all required functions."""
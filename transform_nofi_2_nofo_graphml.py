@@ -8,6 +8,9 @@ Edge between org. networks is the sum of developers that worked together.
 Example:
 Nokia and Apple have three developers co-editing the same files
 Nokia and Apple are then connected with an edge weight of 3.
+
+Weighted and temporal networks of individuals can be aggregated with other
+semantics (sum of weights, distinct developers, time-bucketed edges), see --aggregation.
 """
 
 
@@ -17,22 +20,32 @@ noo_viz_script = "/home/apolinex/rep_clones/own-tools/ScrapLogGit2Net/transform-
 import sys
 import os
 import argparse
+import configparser
+import csv
+import glob
 import subprocess
-from collections import defaultdict
-from typing import Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 import networkx as nx
+import numpy as np
 
 
 from utils.unified_console import (
     console,
     rprint,
-    Table,
-    track
+    Table
 )
 
 from utils.unified_logger import logger
 
+# How developer edges are aggregated into organization edges
+AGGREGATION_MODES = ("pairs", "weight", "developers", "time")
+
+# Length of the ISO 8601 timestamp prefix kept by each time bucket
+TIME_BUCKETS = {"year": 4, "month": 7, "day": 10}
+
 
 def print_graph_as_dict_of_dicts(graph: nx.Graph) -> None:
     """Print graph as dictionary of dictionaries."""
@@ -72,75 +85,275 @@ def determine_file_name(base_name: str) -> str:
     return file_name
 
 
+def encode_node_affiliations(
+        individual_network: nx.Graph,
+        affiliation_from_email: Optional[Callable[[str], Optional[str]]] = None
+) -> Tuple[Dict[Hashable, int], np.ndarray, List[str]]:
+    """
+    Encode the affiliation of every node as an integer organization id.
+
+    The node attributes are read once, so callers can work on integer arrays
+    instead of looking up node dictionaries edge after edge.
+
+    Args:
+        individual_network: Network of individuals
+        affiliation_from_email: Optional fallback called with the node id (an email in
+            weighted and temporal scrapLog networks) for nodes without affiliation attribute
+
+    Returns:
+        Tuple of (node -> row index, row index -> organization id, organization id -> name).
+        Nodes without an affiliation get the organization id -1.
+    """
+    node_index: Dict[Hashable, int] = {}
+    org_index: Dict[str, int] = {}
+    org_ids = np.full(individual_network.number_of_nodes(), -1, dtype=np.int64)
+
+    for row, (node, affiliation) in enumerate(individual_network.nodes(data="affiliation")):
+        node_index[node] = row
+        if affiliation is None and affiliation_from_email is not None:
+            affiliation = affiliation_from_email(str(node))
+        if affiliation is not None:
+            org_ids[row] = org_index.setdefault(affiliation, len(org_index))
+
+    return node_index, org_ids, list(org_index)
+
+
+def edge_endpoint_arrays(
+        individual_network: nx.Graph,
+        node_index: Dict[Hashable, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the edges of a network as two integer arrays of node row indices.
+
+    Parallel edges of multigraphs (e.g. temporal networks) are returned once each.
+
+    Args:
+        individual_network: Network of individuals
+        node_index: Mapping from node to row index (see encode_node_affiliations)
+
+    Returns:
+        Tuple of (source rows, target rows), one entry per edge
+    """
+    n_edges = individual_network.number_of_edges()
+    sources = np.empty(n_edges, dtype=np.int64)
+    targets = np.empty(n_edges, dtype=np.int64)
+
+    for position, (u, v) in enumerate(individual_network.edges()):
+        sources[position] = node_index[u]
+        targets[position] = node_index[v]
+
+    return sources, targets
+
+
+def edge_weight_array(individual_network: nx.Graph) -> np.ndarray:
+    """
+    Return the 'weight' attribute of every edge, in edge iteration order.
+
+    Edges without weight (unweighted and temporal networks) count as 1.
+    """
+    return np.fromiter(
+        (float(weight) for _, _, weight in individual_network.edges(data="weight", default=1)),
+        dtype=np.float64,
+        count=individual_network.number_of_edges()
+    )
+
+
+def edge_time_bucket_array(
+        individual_network: nx.Graph,
+        time_bucket: str
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode the ISO 'time' attribute of every edge into integer time bucket ids.
+
+    Args:
+        individual_network: Temporal network of individuals (edges with ISO 8601 'time')
+        time_bucket: One of TIME_BUCKETS ('year', 'month' or 'day')
+
+    Returns:
+        Tuple of (edge -> bucket id, bucket id -> bucket label); labels are sorted
+
+    Raises:
+        ValueError: If an edge has no 'time' attribute
+    """
+    prefix_length = TIME_BUCKETS[time_bucket]
+    labels = []
+    for u, v, time in individual_network.edges(data="time"):
+        if time is None:
+            raise ValueError(f"Edge {u} - {v} has no 'time' attribute required by time aggregation")
+        labels.append(str(time)[:prefix_length])
+
+    bucket_labels, bucket_ids = np.unique(np.array(labels, dtype=str), return_inverse=True)
+    return bucket_ids.astype(np.int64), bucket_labels.tolist()
+
+
 def create_organizational_network(
         individual_network: nx.Graph,
-        verbose: bool = False
+        verbose: bool = False,
+        include_intra_firm_ties: bool = False,
+        aggregation: str = "pairs",
+        time_bucket: str = "year",
+        affiliation_from_email: Optional[Callable[[str], Optional[str]]] = None
 ) -> nx.Graph:
     """
     Transform individual network into organizational network.
 
+    Affiliations are encoded once into an integer array, edges are turned into
+    integer endpoint arrays, and inter-firm edges are aggregated by packing each
+    (min_org, max_org) pair into a single integer key that is counted with NumPy.
+    The transform is therefore O(N + E) instead of a per-edge walk over all nodes.
+
+    Aggregation modes (the value stored as the 'weight' of each organization edge):
+        pairs:      number of distinct pairs of developers collaborating across the two firms
+        weight:     sum of the 'weight' of the developer edges (co-editing intensity)
+        developers: number of distinct developers involved, summed over both firms
+        time:       as 'weight', but one edge per time bucket, with the bucket as 'time' attribute
+
     Args:
-        individual_network: Network of individuals
+        individual_network: Network of individuals (unweighted, weighted or temporal)
         verbose: Whether to print verbose output
+        include_intra_firm_ties: If True, every organization node gets an
+            'intra_firm_ties' attribute aggregated the same way over its own developers
+        aggregation: One of AGGREGATION_MODES
+        time_bucket: Bucket size for the 'time' aggregation, one of TIME_BUCKETS
+        affiliation_from_email: Optional fallback for nodes without affiliation attribute
 
     Returns:
-        Network of organizations with weighted edges
+        Network of organizations with weighted edges (a MultiGraph for 'time' aggregation)
     """
-    logger.info("Creating organizational network from individual network")
-    org_network = nx.Graph()
-    org_edges = defaultdict(int)
+    if aggregation not in AGGREGATION_MODES:
+        raise ValueError(f"Unknown aggregation mode {aggregation!r}, expected one of {AGGREGATION_MODES}")
 
-    console.print("\n[yellow]Iterating over all edges of G (network of individuals)[/yellow]")
+    logger.info(f"Creating organizational network from individual network ({aggregation} aggregation)")
+    org_network = nx.MultiGraph() if aggregation == "time" else nx.Graph()
 
-    # For every edge in individual network, find inter-organizational edges
-    for edge in track(individual_network.edges(), description="Processing edges..."):
-        org_affiliation_from = nx.get_node_attributes(
-            individual_network, "affiliation"
-        )[edge[0]]
-        org_affiliation_to = nx.get_node_attributes(
-            individual_network, "affiliation"
-        )[edge[1]]
+    console.print("\n[yellow]Encoding affiliations and edges of G (network of individuals)[/yellow]")
 
-        if verbose:
-            logger.debug(f"Edge info: {edge} FROM node id {edge[0]} TO node id {edge[1]}")
-            logger.debug(f"{org_affiliation_from}  <-->  {org_affiliation_to}")
+    node_index, org_ids, org_names = encode_node_affiliations(individual_network, affiliation_from_email)
+    sources, targets = edge_endpoint_arrays(individual_network, node_index)
+    weights = edge_weight_array(individual_network) if aggregation in ("weight", "time") else None
 
-        # Skip intra-firm relationships
-        if org_affiliation_from == org_affiliation_to:
-            if verbose:
-                logger.debug("Intra-firm relationship - To IGNORE")
-            continue
+    bucket_labels: List[str] = [""]
+    buckets = np.zeros(len(sources), dtype=np.int64)
+    if aggregation == "time":
+        buckets, bucket_labels = edge_time_bucket_array(individual_network, time_bucket)
 
-        # Count inter-firm relationships
-        if org_affiliation_from != org_affiliation_to:
-            if verbose:
-                logger.debug("Inter-firm relationship")
+    org_from = org_ids[sources]
+    org_to = org_ids[targets]
 
-            # Use frozenset for immutable edge representation
-            org_edges[frozenset([org_affiliation_from, org_affiliation_to])] += 1
+    # Edges touching a node without affiliation cannot be mapped to any organization
+    has_affiliation = (org_from >= 0) & (org_to >= 0)
+    n_unaffiliated_edges = int(np.count_nonzero(~has_affiliation))
+    if n_unaffiliated_edges:
+        logger.warning(f"Ignoring {n_unaffiliated_edges} edges with nodes without affiliation")
 
-            if verbose:
-                logger.debug(f"FOUND NEW orgG relation {org_affiliation_from}  <-->  {org_affiliation_to}. "
-                             f"Increasing the weight attribute by 1")
+    intra_firm = has_affiliation & (org_from == org_to)
+    inter_firm = has_affiliation & (org_from != org_to)
 
-    # Add nodes and weighted edges to the organizational network
     if verbose:
-        logger.debug("Adding nodes and weighted edges to the inter-organizational network")
+        logger.debug(f"Intra-firm relationships to IGNORE: {int(np.count_nonzero(intra_firm))}")
+        logger.debug(f"Inter-firm relationships: {int(np.count_nonzero(inter_firm))}")
+
+    # Pack the unordered organization pair (and time bucket) into one integer key per edge
+    n_orgs = len(org_names)
+    n_buckets = len(bucket_labels)
+    low_org = np.minimum(org_from, org_to)
+    high_org = np.maximum(org_from, org_to)
+    keys = (low_org * n_orgs + high_org) * n_buckets + buckets
+
+    pair_keys, pair_values = aggregate_edge_keys(
+        keys[inter_firm], sources[inter_firm], targets[inter_firm],
+        None if weights is None else weights[inter_firm],
+        aggregation, individual_network.number_of_nodes()
+    )
+
+    logger.info(f"Number of inter organisational edges={len(pair_keys)}")
 
-    logger.info(f"Number of inter organisational edges={len(org_edges.items())}")
+    for pair_key, value in zip(pair_keys.tolist(), pair_values.tolist()):
+        org_pair, bucket = divmod(pair_key, n_buckets)
+        org_u, org_v = org_names[org_pair // n_orgs], org_names[org_pair % n_orgs]
+        weight = int(value) if float(value).is_integer() else value
 
-    for org_edge, weight in org_edges.items():
         if verbose:
-            logger.debug(f"org_edge={org_edge}, weight={weight}")
+            logger.debug(f"org_edge={{{org_u!r}, {org_v!r}}}, weight={weight}")
 
-        org_u, org_v = list(org_edge)
-        org_network.add_edge(org_u, org_v, weight=weight)
+        if aggregation == "time":
+            org_network.add_edge(org_u, org_v, weight=weight, time=bucket_labels[bucket])
+        else:
+            org_network.add_edge(org_u, org_v, weight=weight)
+
+    if include_intra_firm_ties:
+        # Intra-firm ties are aggregated over all time buckets
+        intra_keys, intra_values = aggregate_edge_keys(
+            org_from[intra_firm], sources[intra_firm], targets[intra_firm],
+            None if weights is None else weights[intra_firm],
+            "weight" if aggregation == "time" else aggregation, individual_network.number_of_nodes()
+        )
+        intra_counts = np.zeros(n_orgs, dtype=np.float64)
+        intra_counts[intra_keys] = intra_values
+        for org_id, org_name in enumerate(org_names):
+            if org_network.has_node(org_name):
+                value = float(intra_counts[org_id])
+                org_network.nodes[org_name]["intra_firm_ties"] = int(value) if value.is_integer() else value
 
     logger.info(f"Organizational network created with {org_network.number_of_nodes()} nodes "
                    f"and {org_network.number_of_edges()} edges")
     return org_network
 
 
+def aggregate_edge_keys(
+        keys: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: Optional[np.ndarray],
+        aggregation: str,
+        n_nodes: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate developer edges sharing the same organization key in one vectorised pass.
+
+    Args:
+        keys: Packed organization key of every edge
+        sources: Source node row of every edge
+        targets: Target node row of every edge
+        weights: Edge weights (required by the 'weight' and 'time' aggregations)
+        aggregation: One of AGGREGATION_MODES
+        n_nodes: Number of nodes of the individual network (used to pack node pairs)
+
+    Returns:
+        Tuple of (sorted unique keys, aggregated value of each key)
+    """
+    if aggregation in ("weight", "time"):
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        return unique_keys, np.bincount(inverse, weights=weights, minlength=len(unique_keys))
+
+    if aggregation == "pairs":
+        # Parallel edges between the same two developers count once
+        low_node = np.minimum(sources, targets)
+        high_node = np.maximum(sources, targets)
+        _, first_edges = np.unique(low_node * n_nodes + high_node, return_index=True)
+        return np.unique(keys[first_edges], return_counts=True)
+
+    # developers: distinct (key, developer) memberships, counted per key
+    key_developer = np.unique(np.stack([
+        np.concatenate([keys, keys]),
+        np.concatenate([sources, targets])
+    ], axis=1), axis=0)
+    return np.unique(key_developer[:, 0], return_counts=True)
+
+
+def email_affiliation_resolver() -> Callable[[str], Optional[str]]:
+    """
+    Return a function inferring the affiliation of an e-mail the same way scrapLog.py does.
+
+    scrapLog is imported lazily as it is only needed for networks without affiliation attributes.
+    """
+    from scrapLog import extract_affiliation_from_email
+    from core.models import ProcessingState
+
+    state = ProcessingState()
+    return lambda email: extract_affiliation_from_email(email, state)
+
+
 def remove_isolates(graph: nx.Graph, verbose: bool = False) -> nx.Graph:
     """
     Remove isolated nodes from graph.
@@ -216,6 +429,195 @@ def save_network(
     return transformed_file_name
 
 
+def load_affiliation_aliases(config_file: str) -> Dict[str, str]:
+    """
+    Load the [aliases] section of an affiliation alias config file (e.g. alias.scraplog.config.ini).
+
+    Args:
+        config_file: Path to the config file
+
+    Returns:
+        Mapping from affiliation to its alias (empty if the file has no [aliases] section)
+    """
+    config = configparser.ConfigParser()
+    if not config.read(config_file):
+        raise FileNotFoundError(f"Affiliation alias config file not found: {config_file}")
+
+    aliases = dict(config["aliases"]) if "aliases" in config else {}
+    logger.info(f"Loaded {len(aliases)} affiliation aliases from {config_file}")
+    return aliases
+
+
+def apply_affiliation_aliases(graph: nx.Graph, aliases: Dict[str, str]) -> int:
+    """
+    Replace node affiliations by their alias, in place.
+
+    Returns:
+        Number of nodes whose affiliation was replaced
+    """
+    n_replaced = 0
+    for _, data in graph.nodes(data=True):
+        affiliation = data.get("affiliation")
+        if affiliation in aliases:
+            data["affiliation"] = aliases[affiliation]
+            n_replaced += 1
+    return n_replaced
+
+
+def collect_input_files(file_or_pattern: str) -> List[str]:
+    """
+    Expand a directory or glob pattern into the sorted list of GraphML networks to transform.
+
+    Networks already transformed (named *-transformed-to-nofo*) are left out, so that rerunning a batch over
+    the same directory or pattern does not transform its own outputs.
+    """
+    if os.path.isdir(file_or_pattern):
+        candidates = glob.glob(os.path.join(file_or_pattern, "*.graphML")) + \
+                     glob.glob(os.path.join(file_or_pattern, "*.graphml"))
+    else:
+        candidates = glob.glob(file_or_pattern, recursive=True)
+
+    return sorted(set(f for f in candidates
+                      if os.path.isfile(f) and "-transformed-to-nofo" not in os.path.basename(f)))
+
+
+def batch_output_file(input_file: str, output_dir: Optional[str] = None) -> str:
+    """Deterministic output filename of an input network in batch mode."""
+    base_name = os.path.basename(input_file).replace('.graphML', '').replace('.graphml', '')
+    return os.path.join(output_dir or os.path.dirname(input_file), f"{base_name}-transformed-to-nofo.graphML")
+
+
+def is_output_up_to_date(input_file: str, output_file: str) -> bool:
+    """True if the output exists and is newer than the input."""
+    return os.path.exists(output_file) and os.path.getmtime(output_file) >= os.path.getmtime(input_file)
+
+
+# Configuration shared by all the files of a batch, loaded once per worker process
+_batch_aliases: Dict[str, str] = {}
+_batch_affiliation_from_email: Optional[Callable[[str], Optional[str]]] = None
+
+
+def init_batch_worker(aliases: Dict[str, str], affiliation_from_email: bool) -> None:
+    """Process pool initializer receiving the batch configuration loaded by the parent process."""
+    global _batch_aliases, _batch_affiliation_from_email
+    _batch_aliases = aliases
+    _batch_affiliation_from_email = email_affiliation_resolver() if affiliation_from_email else None
+
+
+def transform_file(input_file: str, output_file: str, options: Dict[str, object]) -> Dict[str, object]:
+    """
+    Transform one network of individuals file into a network of organizations file (batch mode worker).
+
+    Args:
+        input_file: GraphML network of individuals
+        output_file: GraphML network of organizations to write
+        options: Keyword arguments for create_organizational_network (aggregation, time_bucket, ...)
+
+    Returns:
+        Summary row of the transformation
+    """
+    start = time.perf_counter()
+    summary: Dict[str, object] = {"input": input_file, "output": output_file, "status": "transformed",
+                                  "nodes": "", "edges": "", "isolates": "", "organizations": "",
+                                  "inter_org_edges": "", "seconds": ""}
+    try:
+        g = nx.read_graphml(input_file)
+        isolate_ids = list(nx.isolates(g))
+        g.remove_nodes_from(isolate_ids)
+        if _batch_aliases:
+            apply_affiliation_aliases(g, _batch_aliases)
+
+        org_g = create_organizational_network(g, affiliation_from_email=_batch_affiliation_from_email, **options)
+        nx.write_graphml_lxml(org_g, output_file)
+
+        summary.update(nodes=g.number_of_nodes(), edges=g.number_of_edges(), isolates=len(isolate_ids),
+                       organizations=org_g.number_of_nodes(), inter_org_edges=org_g.number_of_edges())
+    except Exception as e_transform:
+        summary["status"] = f"failed: {e_transform}"
+
+    summary["seconds"] = f"{time.perf_counter() - start:.2f}"
+    return summary
+
+
+def run_batch(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """
+    Transform every network matched by args.file, in parallel with args.jobs worker processes.
+
+    Files whose output is newer than the input are skipped unless args.force is set.
+
+    Returns:
+        Summary rows, one per input file
+    """
+    input_files = collect_input_files(args.file)
+    if not input_files:
+        logger.error(f"No GraphML files found for {args.file}")
+        sys.exit(1)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    aliases = load_affiliation_aliases(args.affiliation_alias_in_config_file) \
+        if args.affiliation_alias_in_config_file else {}
+    options = {"include_intra_firm_ties": args.intra_firm_ties,
+               "aggregation": args.aggregation,
+               "time_bucket": args.time_bucket}
+
+    summaries: List[Dict[str, object]] = []
+    pending: List[Tuple[str, str]] = []
+    for input_file in input_files:
+        output_file = batch_output_file(input_file, args.output_dir)
+        if not args.force and is_output_up_to_date(input_file, output_file):
+            summaries.append({"input": input_file, "output": output_file, "status": "skipped (up to date)",
+                              "nodes": "", "edges": "", "isolates": "", "organizations": "",
+                              "inter_org_edges": "", "seconds": ""})
+        else:
+            pending.append((input_file, output_file))
+
+    console.print(f"[cyan]Transforming {len(pending)} of {len(input_files)} networks "
+                  f"with {args.jobs} job(s)[/cyan]")
+
+    if args.jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_batch_worker,
+                                 initargs=(aliases, args.affiliation_from_email)) as executor:
+            futures = [executor.submit(transform_file, input_file, output_file, options)
+                       for input_file, output_file in pending]
+            summaries.extend(future.result() for future in futures)
+    else:
+        init_batch_worker(aliases, args.affiliation_from_email)
+        summaries.extend(transform_file(input_file, output_file, options) for input_file, output_file in pending)
+
+    summaries.sort(key=lambda row: row["input"])
+    print_batch_summary(summaries)
+
+    if args.summary_file:
+        with open(args.summary_file, "w", newline="") as summary_file:
+            writer = csv.DictWriter(summary_file, fieldnames=list(summaries[0]))
+            writer.writeheader()
+            writer.writerows(summaries)
+        logger.success(f"Batch summary saved to {args.summary_file}")
+
+    return summaries
+
+
+def print_batch_summary(summaries: List[Dict[str, object]]) -> None:
+    """Print the per-file summary table of a batch transformation."""
+    table = Table(title="Batch Transformation Summary", show_header=True)
+    table.add_column("Input", style="cyan")
+    table.add_column("Status", style="green")
+    table.add_column("Nodes", justify="right")
+    table.add_column("Edges", justify="right")
+    table.add_column("Organizations", justify="right")
+    table.add_column("Inter-org edges", justify="right")
+    table.add_column("Seconds", justify="right")
+
+    for row in summaries:
+        table.add_row(os.path.basename(str(row["input"])), str(row["status"]), str(row["nodes"]),
+                      str(row["edges"]), str(row["organizations"]), str(row["inter_org_edges"]),
+                      str(row["seconds"]))
+
+    console.print(table)
+
+
 def main() -> None:
     """Main function to orchestrate the transformation."""
     console.print("\n[bold blue]transform-nofi-2-nofo-GraphML.py[/bold blue] - "
@@ -230,7 +632,7 @@ def main() -> None:
     parser.add_argument(
         "file",
         type=str,
-        help="the network file"
+        help="the network file, or a directory or quoted glob pattern of network files (batch mode)"
     )
     parser.add_argument(
         "-v", "--verbose",
@@ -258,9 +660,68 @@ def main() -> None:
         default=None,
         help="Output filename for the transformed network"
     )
+    parser.add_argument(
+        "-i", "--intra-firm-ties",
+        action="store_true",
+        help="store the number of intra-firm ties as the 'intra_firm_ties' attribute of each organization"
+    )
+    parser.add_argument(
+        "-a", "--aggregation",
+        choices=AGGREGATION_MODES,
+        default="pairs",
+        help="how developer edges become organization edge weights: pairs (distinct developer pairs, default), "
+             "weight (sum of edge weights), developers (distinct developers on both sides), "
+             "time (sum of edge weights per time bucket of the 'time' edge attribute)"
+    )
+    parser.add_argument(
+        "-b", "--time-bucket",
+        choices=list(TIME_BUCKETS),
+        default="year",
+        help="time bucket used by the time aggregation (default: year)"
+    )
+    parser.add_argument(
+        "-e", "--affiliation-from-email",
+        action="store_true",
+        help="infer the affiliation from the node e-mail when the node has no affiliation attribute "
+             "(e.g. weighted and temporal networks created by scrapLog.py)"
+    )
+    parser.add_argument(
+        "--affiliation-alias-in-config-file",
+        type=str,
+        default=None,
+        help="config file with an [aliases] section renaming affiliations before the transformation"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes transforming files in batch mode (default: 1)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="directory for the transformed networks in batch mode (default: next to each input)"
+    )
+    parser.add_argument(
+        "--summary-file",
+        type=str,
+        default=None,
+        help="CSV file for the per-file summary table in batch mode"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="in batch mode, transform files even if their output is newer than the input"
+    )
 
     args = parser.parse_args()
 
+    batch_mode = os.path.isdir(args.file) or glob.has_magic(args.file) or args.output_dir is not None
+    if batch_mode and (args.outfile or args.show or args.verbose):
+        parser.error("-o/--outfile, -s/--show and -v/--verbose apply to a single network, not to batch mode "
+                     "(a directory or glob pattern, or --output-dir)")
+
     # Check for unimplemented features
     if args.top_firms_only:
         console.print("\n[bold yellow]In top-firms only mode[/bold yellow]")
@@ -275,6 +736,11 @@ def main() -> None:
     if args.verbose:
         logger.info("Running in verbose mode")
 
+    if batch_mode:
+        run_batch(args)
+        console.print("\n[bold green]✓ Batch transformation completed![/bold green]")
+        return
+
     if args.show:
         logger.info("Will display results after transformation")
 
@@ -309,6 +775,10 @@ def main() -> None:
     console.print("\n[cyan]Checking for isolates[/cyan]")
     g = remove_isolates(g, args.verbose)
 
+    if args.affiliation_alias_in_config_file:
+        n_replaced = apply_affiliation_aliases(g, load_affiliation_aliases(args.affiliation_alias_in_config_file))
+        console.print(f"[cyan]Affiliation aliases applied to {n_replaced} nodes[/cyan]")
+
     # Display updated statistics
     stats_table = Table(title="Graph Statistics After Removing Isolates", show_header=True)
     stats_table.add_column("Metric", style="cyan")
@@ -325,7 +795,14 @@ def main() -> None:
     console.print("[bold yellow]Transforming it into a network of organizations...[/bold yellow]\n")
 
     # Create organizational network
-    org_g: nx.Graph = create_organizational_network(g, args.verbose)
+    org_g: nx.Graph = create_organizational_network(
+        g,
+        verbose=args.verbose,
+        include_intra_firm_ties=args.intra_firm_ties,
+        aggregation=args.aggregation,
+        time_bucket=args.time_bucket,
+        affiliation_from_email=email_affiliation_resolver() if args.affiliation_from_email else None
+    )
 
     if args.verbose:
         console.print("\n[bold]Current orgG (network of organizations):[/bold]")
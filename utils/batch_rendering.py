@@ -0,0 +1,134 @@
+"""
+Batch rendering of many GraphML networks with the nofi and nofo visualizers.
+
+Inputs are files and directories of GraphML files. Each file is rendered by a worker function returning a
+summary row, in a process pool of --jobs workers that import matplotlib/networkx (and build the font cache)
+once and draw on the headless Agg backend. Configuration shared by the batch, such as colour maps and
+affiliation aliases, is loaded once by the parent process and handed to the workers by their initializer.
+
+In batch mode, --init-layout and --save-layout are directories holding one <network>.layout.json file per
+input (see batch_layout_file), so that each network warm-starts from and saves its own layout.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import matplotlib
+
+from utils.unified_console import Table, console
+
+
+def collect_graphml_files(paths: Iterable[str], missing_ok: bool = False) -> List[str]:
+    """
+    Expand files and directories into the list of GraphML networks to render.
+
+    Directories contribute their *.graphml and *.graphML files in sorted order, files are kept in the
+    order given and duplicates are dropped.
+
+    Args:
+        paths: GraphML files and directories
+        missing_ok: Keep paths that do not exist (to be reported when loaded) instead of raising
+
+    Raises:
+        FileNotFoundError: If a path is neither a file nor a directory (unless missing_ok)
+    """
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = glob.glob(os.path.join(path, "*.graphml")) + glob.glob(os.path.join(path, "*.graphML"))
+            files.extend(sorted(set(candidates)))
+        elif os.path.isfile(path) or missing_ok:
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"No such GraphML file or directory: {path}")
+    return list(dict.fromkeys(files))
+
+
+LAYOUT_FILE_SUFFIX = ".layout.json"
+
+
+def batch_layout_file(layout_dir: Optional[str], input_file: str, existing_only: bool = False) -> Optional[str]:
+    """
+    Layout file of an input network in a --init-layout/--save-layout directory: <layout_dir>/<stem>.layout.json.
+
+    Returns None without a directory, and with existing_only, when the network has no layout there yet.
+    """
+    if not layout_dir:
+        return None
+    layout_file = os.path.join(layout_dir, os.path.splitext(os.path.basename(input_file))[0] + LAYOUT_FILE_SUFFIX)
+    return None if existing_only and not os.path.isfile(layout_file) else layout_file
+
+
+def batch_layout_error(init_layout: Optional[str], save_layout: Optional[str]) -> Optional[str]:
+    """Error message if --init-layout/--save-layout are not usable as the layout directories of a batch."""
+    if init_layout and not os.path.isdir(init_layout):
+        return f"--init-layout must be a directory of <network>{LAYOUT_FILE_SUFFIX} files in batch mode: {init_layout}"
+    if save_layout and os.path.isfile(save_layout):
+        return f"--save-layout must be a directory in batch mode, not a file: {save_layout}"
+    return None
+
+
+def use_headless_backend() -> None:
+    """Draw on the non-interactive Agg backend (no display, no Tk)."""
+    matplotlib.use("Agg", force=True)
+
+
+def summary_row(input_file: str) -> Dict[str, Any]:
+    """Empty summary row of an input file, filled in by the worker functions."""
+    return {"input": input_file, "status": "rendered", "nodes": "", "edges": "", "outputs": [], "seconds": ""}
+
+
+def render_batch(
+        render: Callable[[str], Dict[str, Any]],
+        input_files: Sequence[str],
+        jobs: int = 1,
+        initializer: Callable[..., None] = use_headless_backend,
+        initargs: Tuple = ()
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Render input files with render(input_file), in parallel with jobs worker processes.
+
+    Args:
+        render: Picklable worker function returning the summary row of a file (see summary_row)
+        input_files: GraphML files to render
+        jobs: Number of worker processes, 1 to render in the current process
+        initializer: Called once per worker (and once in the current process when jobs is 1)
+        initargs: Arguments of the initializer
+
+    Returns:
+        Summary rows in input order, and the wall-clock seconds of the whole batch
+    """
+    start = time.perf_counter()
+    if jobs > 1 and len(input_files) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(input_files)), initializer=initializer,
+                                 initargs=initargs) as executor:
+            summaries = list(executor.map(render, input_files))
+    else:
+        initializer(*initargs)
+        summaries = [render(input_file) for input_file in input_files]
+    return summaries, time.perf_counter() - start
+
+
+def print_batch_summary(summaries: List[Dict[str, Any]], wall_seconds: float, jobs: int) -> None:
+    """Print the per-file timing summary of a batch, with its wall-clock time."""
+    table = Table(title="Batch Rendering Summary", show_header=True)
+    table.add_column("Input", style="cyan")
+    table.add_column("Status", style="green")
+    table.add_column("Nodes", justify="right")
+    table.add_column("Edges", justify="right")
+    table.add_column("Outputs")
+    table.add_column("Seconds", justify="right")
+
+    for row in summaries:
+        table.add_row(os.path.basename(str(row["input"])), str(row["status"]), str(row["nodes"]),
+                      str(row["edges"]), ", ".join(os.path.splitext(str(f))[1].lstrip(".") for f in row["outputs"]),
+                      str(row["seconds"]))
+    console.print(table)
+
+    render_seconds = sum(float(row["seconds"]) for row in summaries if row["seconds"] != "")
+    n_failed = sum(1 for row in summaries if str(row["status"]).startswith("failed"))
+    console.print(f"Rendered {len(summaries) - n_failed} of {len(summaries)} files in {wall_seconds:.2f} s "
+                  f"with {jobs} job(s) ({render_seconds:.2f} s summed over the files)")
@@ -0,0 +1,424 @@
+"""
+Centrality engine shared by the reporters and visualizers of nofi/nofo GraphML networks.
+
+Offers degree, eigenvector, closeness and betweenness centrality with the same normalisation as networkx,
+but computed on a SciPy sparse adjacency matrix so that 20k-node networks of individuals remain tractable:
+
+- eigenvector: sparse power iteration (same iteration and stopping rule as nx.eigenvector_centrality)
+- closeness: breadth-first searches from chunks of source nodes with scipy.sparse.csgraph
+- betweenness: Brandes' accumulation run level by level for a block of sources at once,
+  optionally on k sampled sources only (see --betweenness-samples)
+
+Closeness and betweenness are parallelised across source nodes with a process pool (see --jobs).
+Results are cached per graph hash, in memory and optionally on disk, so that the reporter and the
+visualizers can reuse them when run on the same network.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from utils.unified_logger import logger
+
+CENTRALITY_MEASURES = ("degree", "eigenvector", "closeness", "betweenness")
+
+# Bump when the algorithms change in a way that invalidates previously cached results
+CENTRALITY_CACHE_VERSION = 1
+
+DEFAULT_CENTRALITY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ScrapLogGit2Net", "centralities")
+
+# Number of source nodes processed together by one breadth-first search block
+SOURCE_BLOCK_SIZE = 64
+
+_memory_cache: Dict[str, Dict[Hashable, float]] = {}
+
+# Adjacency matrix shared with the worker processes (set by init_centrality_worker)
+_worker_adjacency: Optional[sparse.csr_matrix] = None
+
+
+def graph_hash(graph: nx.Graph, weight: Optional[str] = None) -> str:
+    """Hash the structure of a graph (and the given edge weight) independently of node and edge order.
+
+    Args:
+        graph: Network to hash
+        weight: Edge attribute to include in the hash, None for structure only
+
+    Returns:
+        Hexadecimal SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"directed={graph.is_directed()};multigraph={graph.is_multigraph()};".encode())
+    for node in sorted(map(str, graph.nodes())):
+        digest.update(node.encode())
+        digest.update(b"\0")
+
+    edges = []
+    for u, v, data in graph.edges(data=True):
+        u, v = str(u), str(v)
+        if not graph.is_directed() and v < u:
+            u, v = v, u
+        edges.append(f"{u}\0{v}\0{data.get(weight, 1) if weight else ''}")
+    for edge in sorted(edges):
+        digest.update(edge.encode())
+        digest.update(b"\n")
+
+    return digest.hexdigest()
+
+
+def adjacency_matrix(graph: nx.Graph, weight: Optional[str] = None, binary: bool = False) -> sparse.csr_matrix:
+    """Sparse adjacency matrix in graph.nodes() order.
+
+    A binary matrix has no self-loops, as parallel edges and self-loops do not change the number of
+    shortest paths.
+    """
+    matrix = nx.to_scipy_sparse_array(graph, weight=None if binary else weight, dtype=np.float64, format="csr")
+    if binary:
+        matrix.setdiag(0)
+        matrix.eliminate_zeros()
+        matrix.data = np.ones_like(matrix.data)
+    return sparse.csr_matrix(matrix)
+
+
+def degree_centrality_scores(graph: nx.Graph) -> np.ndarray:
+    """Degree centrality in graph.nodes() order, as nx.degree_centrality."""
+    n = graph.number_of_nodes()
+    degrees = np.fromiter((degree for _, degree in graph.degree()), dtype=np.float64, count=n)
+    return degrees / (n - 1) if n > 1 else np.ones(n)
+
+
+def eigenvector_centrality_scores(
+        adjacency: sparse.csr_matrix,
+        max_iter: int = 1000,
+        tol: float = 1.0e-6
+) -> np.ndarray:
+    """Eigenvector centrality by sparse power iteration.
+
+    Follows nx.eigenvector_centrality: the iteration x <- (A^T + I) x avoids oscillations on bipartite
+    graphs and stops when the L1 change is below n * tol.
+
+    Raises:
+        nx.PowerIterationFailedConvergence: If the iteration does not converge within max_iter
+    """
+    n = adjacency.shape[0]
+    transposed = adjacency.T.tocsr()
+    x = np.full(n, 1.0 / n)
+
+    for _ in range(max_iter):
+        x_last = x
+        x = transposed @ x_last + x_last
+        norm = np.linalg.norm(x) or 1.0
+        x = x / norm
+        if np.abs(x - x_last).sum() < n * tol:
+            return x
+
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
+def init_centrality_worker(adjacency: sparse.csr_matrix) -> None:
+    """Share the adjacency matrix with a worker process of the pool."""
+    global _worker_adjacency
+    _worker_adjacency = adjacency
+
+
+def closeness_block(sources: np.ndarray, adjacency: Optional[sparse.csr_matrix] = None) -> np.ndarray:
+    """Closeness centrality of a block of nodes, as nx.closeness_centrality (wf_improved=True).
+
+    For directed graphs, the adjacency matrix must be transposed so that incoming distances are used.
+    """
+    adjacency = _worker_adjacency if adjacency is None else adjacency
+    n = adjacency.shape[0]
+    distances = csgraph.shortest_path(adjacency, directed=True, unweighted=True, indices=sources)
+    reachable = np.isfinite(distances)
+    total_distance = np.where(reachable, distances, 0).sum(axis=1)
+    n_reachable = reachable.sum(axis=1)
+
+    closeness = np.zeros(len(sources))
+    connected = total_distance > 0
+    closeness[connected] = (n_reachable[connected] - 1) / total_distance[connected]
+    if n > 1:
+        closeness *= (n_reachable - 1) / (n - 1)
+    return closeness
+
+
+def betweenness_block(sources: np.ndarray, adjacency: Optional[sparse.csr_matrix] = None) -> np.ndarray:
+    """Unnormalised betweenness dependencies accumulated from a block of sources (Brandes' algorithm).
+
+    All sources of the block are explored together, one breadth-first level at a time, with sparse x dense
+    products: sigma counts the shortest paths from each source and delta accumulates the dependencies
+    backwards from the deepest level.
+
+    Returns:
+        Sum over the block of the dependency of every node, endpoints excluded
+    """
+    adjacency = _worker_adjacency if adjacency is None else adjacency
+    n = adjacency.shape[0]
+    columns = np.arange(len(sources))
+    transposed = adjacency.T.tocsr()
+
+    depth = np.full((n, len(sources)), -1, dtype=np.int64)
+    sigma = np.zeros((n, len(sources)))
+    depth[sources, columns] = 0
+    sigma[sources, columns] = 1.0
+
+    frontier = sigma.copy()
+    level = 0
+    while True:
+        paths = transposed @ frontier
+        discovered = (paths > 0) & (depth < 0)
+        if not discovered.any():
+            break
+        level += 1
+        depth[discovered] = level
+        sigma[discovered] = paths[discovered]
+        frontier = np.where(discovered, sigma, 0.0)
+
+    delta = np.zeros_like(sigma)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for current in range(level - 1, -1, -1):
+            coefficient = np.where(depth == current + 1, (1.0 + delta) / sigma, 0.0)
+            delta += np.where(depth == current, sigma * (adjacency @ coefficient), 0.0)
+
+    delta[sources, columns] = 0.0
+    return delta.sum(axis=1)
+
+
+def rescale_betweenness(
+        betweenness: np.ndarray,
+        sources: np.ndarray,
+        sampled: bool,
+        directed: bool,
+        normalized: bool = True
+) -> np.ndarray:
+    """Rescale raw betweenness as networkx does (endpoints excluded), including the k-sample adjustment."""
+    n_pairs = len(betweenness) - 1
+    if n_pairs < 2:
+        return betweenness
+
+    k = len(sources)
+    correction = 1 if directed else 2
+    if not sampled:
+        scale = 1 / (n_pairs * (n_pairs - 1)) if normalized else 1 / correction
+        return betweenness * scale
+
+    if normalized:
+        scale_source = 1 / ((k - 1) * (n_pairs - 1)) if k > 1 else np.nan
+        scale_nonsource = 1 / (k * (n_pairs - 1))
+    else:
+        scale_source = n_pairs / ((k - 1) * correction) if k > 1 else np.nan
+        scale_nonsource = n_pairs / (k * correction)
+
+    scale = np.full(len(betweenness), scale_nonsource)
+    scale[sources] = scale_source
+    return betweenness * scale
+
+
+def _source_blocks(sources: np.ndarray, block_size: int) -> List[np.ndarray]:
+    return [sources[start:start + block_size] for start in range(0, len(sources), block_size)]
+
+
+def _map_source_blocks(
+        function,
+        adjacency: sparse.csr_matrix,
+        sources: np.ndarray,
+        jobs: int
+) -> List[np.ndarray]:
+    """Run function over blocks of sources, in a process pool when jobs > 1."""
+    blocks = _source_blocks(sources, SOURCE_BLOCK_SIZE)
+    if jobs <= 1 or len(blocks) <= 1:
+        return [function(block, adjacency) for block in blocks]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_centrality_worker,
+                             initargs=(adjacency,)) as executor:
+        return list(executor.map(function, blocks))
+
+
+def closeness_centrality_scores(adjacency: sparse.csr_matrix, directed: bool = False, jobs: int = 1) -> np.ndarray:
+    """Closeness centrality of all nodes, parallelised across source nodes."""
+    n = adjacency.shape[0]
+    if directed:
+        adjacency = adjacency.T.tocsr()
+    blocks = _map_source_blocks(closeness_block, adjacency, np.arange(n), jobs)
+    return np.concatenate(blocks) if blocks else np.zeros(0)
+
+
+def betweenness_centrality_scores(
+        adjacency: sparse.csr_matrix,
+        directed: bool = False,
+        samples: Optional[int] = None,
+        seed: Optional[int] = 42,
+        jobs: int = 1,
+        normalized: bool = True
+) -> np.ndarray:
+    """Betweenness centrality of all nodes, exact or estimated from samples source nodes.
+
+    Args:
+        adjacency: Binary adjacency matrix
+        directed: Whether the graph is directed
+        samples: Number of source nodes to sample (k), None for exact betweenness
+        seed: Seed of the source node sampling
+        jobs: Number of worker processes
+        normalized: Normalise as nx.betweenness_centrality(normalized=True)
+    """
+    n = adjacency.shape[0]
+    sampled = samples is not None and samples < n
+    if sampled:
+        sources = np.sort(np.random.default_rng(seed).choice(n, size=samples, replace=False))
+    else:
+        sources = np.arange(n)
+
+    betweenness = np.zeros(n)
+    for block in _map_source_blocks(betweenness_block, adjacency, sources, jobs):
+        betweenness += block
+
+    return rescale_betweenness(betweenness, sources, sampled, directed, normalized)
+
+
+def centrality_cache_key(
+        structure_hash: str,
+        measure: str,
+        weight: Optional[str] = None,
+        samples: Optional[int] = None,
+        seed: Optional[int] = None
+) -> str:
+    """Cache key of one centrality measure computed on a given graph with given parameters."""
+    parameters = f"v{CENTRALITY_CACHE_VERSION}-{measure}-{weight}"
+    if measure == "betweenness" and samples is not None:
+        parameters += f"-k{samples}-seed{seed}"
+    return f"{structure_hash}-{hashlib.sha256(parameters.encode()).hexdigest()[:16]}"
+
+
+def _read_cached(key: str, graph: nx.Graph, cache_dir: Optional[str]) -> Optional[Dict[Hashable, float]]:
+    # Scores are returned in the node order of graph, which may differ from the order they were cached in
+    # (graph_hash does not depend on node order) and which the visualizers rely on
+    if key in _memory_cache:
+        cached = _memory_cache[key]
+        return {node: cached[node] for node in graph.nodes()}
+    if not cache_dir:
+        return None
+
+    cache_file = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, "r") as file:
+            cached = json.load(file)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable centrality cache {cache_file}: {e}")
+        return None
+
+    nodes_by_name = {str(node): node for node in graph.nodes()}
+    if set(cached) != set(nodes_by_name):
+        return None
+    scores = {node: cached[name] for name, node in nodes_by_name.items()}
+    _memory_cache[key] = scores
+    return scores
+
+
+def _write_cached(key: str, scores: Dict[Hashable, float], cache_dir: Optional[str]) -> None:
+    _memory_cache[key] = scores
+    if not cache_dir:
+        return
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, f"{key}.json"), "w") as file:
+            json.dump({str(node): value for node, value in scores.items()}, file)
+    except OSError as e:
+        logger.warning(f"Could not write centrality cache in {cache_dir}: {e}")
+
+
+def compute_centralities(
+        graph: nx.Graph,
+        measures: Iterable[str] = ("degree",),
+        betweenness_samples: Optional[int] = None,
+        jobs: int = 1,
+        weight: Optional[str] = None,
+        seed: Optional[int] = 42,
+        cache_dir: Optional[str] = None,
+        max_iter: int = 1000
+) -> Dict[str, Dict[Hashable, float]]:
+    """Compute the requested centrality measures of a network, reusing cached results.
+
+    Args:
+        graph: Network of individuals or organizations
+        measures: Any of CENTRALITY_MEASURES
+        betweenness_samples: Number of sampled source nodes for approximate betweenness, None for exact
+        jobs: Number of worker processes for closeness and betweenness
+        weight: Edge attribute used as weight by eigenvector centrality, None for unweighted
+        seed: Seed of the betweenness source sampling
+        cache_dir: Directory of the on-disk cache, None to cache in memory only
+        max_iter: Maximum number of power iterations for eigenvector centrality
+
+    Returns:
+        Dictionary measure -> {node: centrality}
+
+    Raises:
+        ValueError: If a measure is unknown
+        nx.PowerIterationFailedConvergence: If eigenvector centrality does not converge
+    """
+    measures = list(measures)
+    unknown = [measure for measure in measures if measure not in CENTRALITY_MEASURES]
+    if unknown:
+        raise ValueError(f"Unknown centrality measure(s) {unknown}, expected any of {CENTRALITY_MEASURES}")
+
+    nodes = list(graph.nodes())
+    results: Dict[str, Dict[Hashable, float]] = {}
+    if not nodes:
+        return {measure: {} for measure in measures}
+
+    structure_hash = graph_hash(graph, weight)
+    adjacency: Optional[sparse.csr_matrix] = None
+
+    for measure in measures:
+        key = centrality_cache_key(structure_hash, measure, weight if measure == "eigenvector" else None,
+                                   betweenness_samples, seed)
+        cached = _read_cached(key, graph, cache_dir)
+        if cached is not None:
+            logger.debug(f"Reusing cached {measure} centrality ({key})")
+            results[measure] = cached
+            continue
+
+        if measure == "degree":
+            scores = degree_centrality_scores(graph)
+        elif measure == "eigenvector":
+            scores = eigenvector_centrality_scores(adjacency_matrix(graph, weight), max_iter=max_iter)
+        else:
+            if adjacency is None:
+                adjacency = adjacency_matrix(graph, binary=True)
+            if measure == "closeness":
+                scores = closeness_centrality_scores(adjacency, graph.is_directed(), jobs)
+            else:
+                scores = betweenness_centrality_scores(adjacency, graph.is_directed(), betweenness_samples,
+                                                       seed, jobs)
+
+        results[measure] = {node: float(score) for node, score in zip(nodes, scores)}
+        _write_cached(key, results[measure], cache_dir)
+
+    return results
+
+
+def top_central_nodes(scores: Dict[Hashable, float], n: int) -> List[Tuple[Hashable, float]]:
+    """Top n (node, centrality) pairs sorted by decreasing centrality."""
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+def clear_centrality_cache() -> None:
+    """Forget the centralities cached in memory (the on-disk cache is kept)."""
+    _memory_cache.clear()
+
+
+def parse_centrality_measures(value: str) -> Sequence[str]:
+    """argparse type for a comma-separated list of centrality measures."""
+    measures = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [measure for measure in measures if measure not in CENTRALITY_MEASURES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown centrality measure(s) {unknown}, expected any of {', '.join(CENTRALITY_MEASURES)}")
+    return measures
@@ -0,0 +1,94 @@
+"""
+Changelogs read directly from a git repository, streaming the output of git log into the parser.
+
+scrapLog.py --repo PATH runs the git log command otherwise run by hand (or by repo_bash_scripts/) to write
+a changelog file,
+
+    git log --pretty=format:"==%an;%ae;%ad==" --name-only
+
+and parses its stdout line by line as git writes it, so git's traversal of the history overlaps with the
+parsing and no intermediate file is written and read again. --since, --until and --rev-range restrict the
+commits as in git log, and --tee-log keeps a copy of the log as parsed, to rerun scrapLog.py -r on it.
+"""
+
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Union
+
+from utils.unified_logger import logger
+
+GIT_LOG_ARGUMENTS = ["--pretty=format:==%an;%ae;%ad==", "--name-only"]
+
+
+class GitLogError(RuntimeError):
+    """git log could not be run or failed."""
+
+
+def git_log_command(repo: Union[str, Path], since: Optional[str] = None, until: Optional[str] = None,
+                    rev_range: Optional[str] = None) -> List[str]:
+    """git log command writing the changelog of a repository in the format parsed by scrapLog.py."""
+    command = ["git", "-C", str(repo), "log", *GIT_LOG_ARGUMENTS]
+    if since:
+        command.append(f"--since={since}")
+    if until:
+        command.append(f"--until={until}")
+    if rev_range:
+        command.append(rev_range)
+    # Revisions only, so that a range is never taken for a path
+    command.append("--")
+    return command
+
+
+def tee_lines(lines: Iterable[str], copy: IO[str]) -> Iterator[str]:
+    """Lines of an iterable, written to copy as they are read."""
+    for line in lines:
+        copy.write(line)
+        yield line
+
+
+@contextmanager
+def stream_git_log(repo: Union[str, Path], since: Optional[str] = None, until: Optional[str] = None,
+                   rev_range: Optional[str] = None, tee_path: Optional[Union[str, Path]] = None
+                   ) -> Iterator[Iterator[str]]:
+    """
+    Lines of the changelog of a repository, read from the stdout of git log while it runs.
+
+    Example:
+        >>> with stream_git_log("tensorflow", since="2024-01-01", tee_path="tensorflow.IN") as lines:
+        ...     process_file_lines(lines, state)
+
+    Raises:
+        GitLogError: If git is not installed or git log fails (e.g. repo is not a git repository), once the
+            lines were read
+    """
+    command = git_log_command(repo, since, until, rev_range)
+    logger.info(f"Streaming {' '.join(command)}")
+
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            # Decoded as the changelog files are read, undecodable bytes kept as they are for the tee
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file, text=True,
+                                       encoding="utf-8", errors="surrogateescape")
+        except FileNotFoundError as e_git:
+            raise GitLogError(f"Cannot run git: {e_git}") from e_git
+
+        tee = open(tee_path, "w", encoding="utf-8", errors="surrogateescape") if tee_path else None
+        try:
+            yield tee_lines(process.stdout, tee) if tee else process.stdout
+            # Lines not consumed, e.g. by a parser stopping early, are drained so that git can exit
+            for line in process.stdout:
+                if tee:
+                    tee.write(line)
+            if process.wait() != 0:
+                stderr_file.seek(0)
+                error = stderr_file.read().decode("utf-8", errors="replace").strip()
+                raise GitLogError(f"git log failed with exit code {process.returncode}: {error}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            if tee:
+                tee.close()
@@ -0,0 +1,237 @@
+"""
+Deanonymization of GitHub noreply emails across whole collections of GraphML networks.
+
+Used by deanonymize_github_users.py --batch. Networks of the same project (per period, per release, per
+filter) share most of their developers, so resolving each file on its own looks the same users up again
+and again. The batch runs in three phases:
+
+1. every input file is scanned for the noreply emails of its nodes, streaming the GraphML XML without
+   building the graph,
+2. the global set of unique noreply emails is resolved once (see utils/github_resolver.py), reusing the
+   persistent cache of resolutions,
+3. the files are rewritten in parallel by --jobs worker processes, which receive the resolutions from
+   their initializer.
+
+The summary reports how many lookups per-file runs would have done and how many API calls were actually made.
+"""
+
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+import networkx as nx
+
+from utils.batch_rendering import render_batch
+from utils.github_resolver import (DEFAULT_BACKEND, DEFAULT_CONCURRENCY, GITHUB_API_URL, UNKNOWN_AFFILIATION,
+                                   UNKNOWN_EMAIL, Resolution, default_cache_path, resolve_noreply_emails)
+from utils.identity_resolution import GITHUB_NOREPLY_DOMAIN
+from utils.unified_console import Table, console
+from utils.unified_logger import logger
+
+# Node attribute holding the email as found in the git log, and attributes rewritten from its resolution
+EMAIL_ATTRIBUTE = "e-mail"
+RESOLVED_EMAIL_ATTRIBUTE = "email"
+AFFILIATION_ATTRIBUTE = "affiliation"
+
+OUTPUT_SUFFIX = ".out.graphml"
+
+
+def output_file_of(input_file: str, output_dir: Optional[str] = None) -> str:
+    """Deanonymized network of an input file: <input>.out.graphml, in output_dir if given."""
+    base = os.path.splitext(input_file)[0] + OUTPUT_SUFFIX
+    return os.path.join(output_dir, os.path.basename(base)) if output_dir else base
+
+
+def is_noreply_email(email: Any) -> bool:
+    return isinstance(email, str) and f"@{GITHUB_NOREPLY_DOMAIN}" in email
+
+
+def noreply_emails_of_graph(graph: nx.Graph) -> Set[str]:
+    """Noreply emails of the nodes of a network."""
+    return {data[EMAIL_ATTRIBUTE] for _, data in graph.nodes(data=True) if is_noreply_email(data.get(EMAIL_ATTRIBUTE))}
+
+
+def scan_noreply_emails(input_file: str) -> Set[str]:
+    """
+    Noreply emails of the nodes of a GraphML file, read by streaming its XML.
+
+    Only the <key> declaring the node e-mail attribute and the <data> elements using it are looked at, and
+    elements are freed as soon as they are parsed, so a scan costs a fraction of loading the graph.
+    """
+    email_keys: Set[str] = set()
+    emails: Set[str] = set()
+    for _, element in ET.iterparse(input_file, events=("end",)):
+        tag = element.tag.rpartition("}")[2]
+        if tag == "key":
+            if element.get("attr.name") == EMAIL_ATTRIBUTE and element.get("for", "all") in ("node", "all"):
+                email_keys.add(element.get("id"))
+        elif tag == "data":
+            if element.get("key") in email_keys and is_noreply_email(element.text):
+                emails.add(element.text)
+        elif tag in ("node", "edge"):
+            element.clear()
+    return emails
+
+
+def apply_resolutions(graph: nx.Graph, resolutions: Mapping[str, Resolution]) -> int:
+    """
+    Set the email and affiliation of the nodes whose noreply email was resolved.
+
+    Unknown emails and affiliations (UNKNOWN_EMAIL, UNKNOWN_AFFILIATION) leave the node attributes as they are.
+
+    Returns:
+        Number of nodes with a resolved noreply email
+    """
+    n_resolved = 0
+    for node, data in graph.nodes(data=True):
+        resolution = resolutions.get(data.get(EMAIL_ATTRIBUTE, ""))
+        if resolution is None:
+            continue
+        new_email, new_affiliation = resolution
+        logger.debug(f"Updating node={node} with email={new_email} and affiliation={new_affiliation}")
+        if new_email != UNKNOWN_EMAIL:
+            data[RESOLVED_EMAIL_ATTRIBUTE] = new_email
+        if new_affiliation.lower() != UNKNOWN_AFFILIATION:
+            data[AFFILIATION_ATTRIBUTE] = new_affiliation.lower()
+        n_resolved += 1
+    return n_resolved
+
+
+_batch_resolutions: Dict[str, Resolution] = {}
+_batch_output_dir: Optional[str] = None
+
+
+def init_deanonymize_worker(resolutions: Dict[str, Resolution], output_dir: Optional[str]) -> None:
+    """Process pool initializer receiving the resolutions of the whole batch from the parent process."""
+    global _batch_resolutions, _batch_output_dir
+    _batch_resolutions = resolutions
+    _batch_output_dir = output_dir
+
+
+def deanonymize_file(input_file: str) -> Dict[str, Any]:
+    """
+    Rewrite one network with the resolutions of the batch (batch mode worker).
+
+    Returns:
+        Summary row of the file
+    """
+    start = time.perf_counter()
+    output_file = output_file_of(input_file, _batch_output_dir)
+    summary: Dict[str, Any] = {"input": input_file, "output": output_file, "status": "deanonymized",
+                               "nodes": "", "noreply": "", "resolved": "", "seconds": ""}
+    try:
+        graph = nx.read_graphml(input_file)
+        summary["noreply"] = len(noreply_emails_of_graph(graph))
+        summary["resolved"] = apply_resolutions(graph, _batch_resolutions)
+        nx.write_graphml(graph, output_file)
+        summary["nodes"] = graph.number_of_nodes()
+    except Exception as e_deanonymize:
+        summary["status"] = f"failed: {e_deanonymize}"
+    summary["seconds"] = f"{time.perf_counter() - start:.2f}"
+    return summary
+
+
+def scan_files(input_files: Sequence[str], jobs: int = 1) -> List[Optional[Set[str]]]:
+    """Noreply emails of each input file (None for files that cannot be parsed), scanned with jobs processes."""
+    if jobs > 1 and len(input_files) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(input_files))) as executor:
+            return list(executor.map(_scan_or_none, input_files))
+    return [_scan_or_none(input_file) for input_file in input_files]
+
+
+def _scan_or_none(input_file: str) -> Optional[Set[str]]:
+    try:
+        return scan_noreply_emails(input_file)
+    except (ET.ParseError, OSError) as e_scan:
+        logger.error(f"Cannot scan {input_file}: {e_scan}")
+        return None
+
+
+def deanonymize_files(
+        input_files: Sequence[str],
+        output_dir: Optional[str] = None,
+        github_token: Optional[str] = None,
+        api_url: str = GITHUB_API_URL,
+        cache_path: Optional[str] = default_cache_path(),
+        concurrency: int = DEFAULT_CONCURRENCY,
+        backend: str = DEFAULT_BACKEND,
+        graphql_url: Optional[str] = None,
+        jobs: int = 1
+) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """
+    Deanonymize a collection of networks, resolving each noreply email of the collection once.
+
+    Args:
+        input_files: GraphML networks (see utils.batch_rendering.collect_graphml_files)
+        output_dir: Directory of the deanonymized networks, next to the inputs if None (see output_file_of)
+        github_token: GitHub API token
+        api_url: Base URL of the GitHub REST API
+        cache_path: SQLite cache of resolved emails shared across runs, no cache if None
+        concurrency: GitHub API requests in flight at once
+        backend: "graphql" to look users up in batches (REST for misses) or "rest"
+        graphql_url: GraphQL endpoint (api_url + "/graphql" if None)
+        jobs: Worker processes scanning and rewriting the files
+
+    Returns:
+        Summary rows in input order, and the statistics of the batch: files, per_file_lookups (noreply
+        emails summed over the files), unique_emails, the resolver counters (see resolve_noreply_emails)
+        and the seconds of each phase
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    scanned = scan_files(input_files, jobs)
+    unique_emails: Set[str] = set().union(*(emails for emails in scanned if emails is not None))
+    stats: Dict[str, float] = {"files": len(input_files),
+                               "per_file_lookups": sum(len(emails) for emails in scanned if emails is not None),
+                               "unique_emails": len(unique_emails),
+                               "scan_seconds": time.perf_counter() - start}
+
+    start = time.perf_counter()
+    console.print(f"[cyan]Resolving {len(unique_emails)} unique noreply emails found in "
+                  f"{len(input_files)} networks[/cyan]")
+    resolutions = resolve_noreply_emails(sorted(unique_emails), github_token, api_url, cache_path, concurrency,
+                                         backend, graphql_url, stats=stats)
+    stats["resolve_seconds"] = time.perf_counter() - start
+
+    parsable = [input_file for input_file, emails in zip(input_files, scanned) if emails is not None]
+    summaries, stats["rewrite_seconds"] = render_batch(deanonymize_file, parsable, jobs,
+                                                       initializer=init_deanonymize_worker,
+                                                       initargs=(resolutions, output_dir))
+    rows = iter(summaries)
+    summaries = [next(rows) if emails is not None else
+                 {"input": input_file, "output": "", "status": "failed: not a GraphML file", "nodes": "",
+                  "noreply": "", "resolved": "", "seconds": ""}
+                 for input_file, emails in zip(input_files, scanned)]
+    return summaries, stats
+
+
+def print_deanonymization_summary(summaries: List[Dict[str, Any]], stats: Mapping[str, float], jobs: int) -> None:
+    """Print the per-file summary of a batch, with the lookups saved by resolving each email once."""
+    table = Table(title="Batch Deanonymization Summary", show_header=True)
+    table.add_column("Input", style="cyan")
+    table.add_column("Status", style="green")
+    table.add_column("Nodes", justify="right")
+    table.add_column("Noreply", justify="right")
+    table.add_column("Resolved", justify="right")
+    table.add_column("Seconds", justify="right")
+
+    for row in summaries:
+        table.add_row(os.path.basename(str(row["input"])), str(row["status"]), str(row["nodes"]),
+                      str(row["noreply"]), str(row["resolved"]), str(row["seconds"]))
+    console.print(table)
+
+    n_failed = sum(1 for row in summaries if str(row["status"]).startswith("failed"))
+    looked_up = stats["unique_emails"] - stats["cache_hits"]
+    api_calls = stats["graphql_queries"] + stats["requests"]
+    console.print(f"Deanonymized {len(summaries) - n_failed} of {len(summaries)} files with {jobs} job(s): "
+                  f"scan {stats['scan_seconds']:.2f} s, resolution {stats['resolve_seconds']:.2f} s, "
+                  f"rewrite {stats['rewrite_seconds']:.2f} s")
+    console.print(f"Per-file runs would have looked up {stats['per_file_lookups']} noreply emails; "
+                  f"{stats['unique_emails']} are unique, {stats['cache_hits']} came from the cache and "
+                  f"{looked_up} were looked up with {api_calls} API calls "
+                  f"({stats['graphql_queries']} GraphQL queries, {stats['requests']} REST requests): "
+                  f"{stats['per_file_lookups'] - looked_up} lookups saved")
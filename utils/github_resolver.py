@@ -0,0 +1,508 @@
+"""
+Concurrent, rate-limit-aware resolution of GitHub noreply emails to public emails and affiliations.
+
+Used by deanonymize_github_users.py. Each <id>+<login>@users.noreply.github.com email is resolved by
+requesting the user (/users/<login>) and their organizations (/users/<login>/orgs) from the GitHub REST API:
+the affiliation is the first public organization, else the company of the profile.
+
+- Lookups run on an asyncio event loop, at most --concurrency requests in flight, each done with urllib
+  in a thread of a pool of the same size. Lookups of the same email are done once.
+- A token bucket paces requests, and is reset from the X-RateLimit-Remaining/X-RateLimit-Reset headers of
+  every response: when the budget is exhausted, requests wait for the reset time instead of failing.
+  Rate-limited responses (403/429) are retried after the reset time (or Retry-After).
+- Resolutions are stored in an SQLite cache shared across runs and files (see --github-cache-dir).
+- With the GraphQL backend (see --backend), up to GRAPHQL_BATCH_SIZE users are looked up by one query of
+  aliased user(login:) fields returning the email, company and first organization together, instead of two
+  REST requests per user. Users the query misses (organizations, failed batches) fall back to REST.
+
+The API URL is configurable, so that the resolver can run against a local stand-in of the REST endpoints.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from utils.identity_resolution import github_noreply_login
+from utils.unified_logger import logger
+
+GITHUB_API_URL = "https://api.github.com"
+
+DEFAULT_GITHUB_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ScrapLogGit2Net", "github")
+
+GITHUB_CACHE_FILE = "users.sqlite"
+
+GITHUB_BACKENDS = ("graphql", "rest")
+DEFAULT_BACKEND = "graphql"
+
+# Users looked up by one GraphQL query (GitHub allows up to 100 nodes per connection and query cost unit)
+GRAPHQL_BATCH_SIZE = 100
+
+GRAPHQL_USER_FIELDS = "login email company organizations(first: 1) { nodes { login } }"
+
+# Requests in flight at once
+DEFAULT_CONCURRENCY = 8
+
+# Local pacing of requests (per second, and burst), on top of the budget announced by GitHub
+DEFAULT_REQUEST_RATE = 10.0
+DEFAULT_REQUEST_BURST = 10
+
+# Retries of a rate-limited request, each after the rate-limit reset
+MAX_RETRIES = 3
+
+REQUEST_TIMEOUT = 30
+
+# Wait before retrying a rate-limited request without reset information
+DEFAULT_RETRY_DELAY = 60.0
+
+UNKNOWN_EMAIL = "unknown-by-GitHub"
+UNKNOWN_AFFILIATION = "unknown-by-github"
+
+Resolution = Tuple[str, str]
+"""(email, affiliation) of a noreply email, UNKNOWN_EMAIL/UNKNOWN_AFFILIATION when GitHub does not tell."""
+
+
+class GitHubAPIError(Exception):
+    """Unexpected response of the GitHub REST API."""
+
+
+def default_cache_path(cache_dir: str = DEFAULT_GITHUB_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, GITHUB_CACHE_FILE)
+
+
+class GitHubUserCache:
+    """
+    SQLite cache of resolved noreply emails, shared across runs and files.
+
+    Args:
+        path: SQLite database file, created with its directory if missing
+        max_age_days: Resolutions older than this are fetched again (never if None)
+    """
+
+    def __init__(self, path: str = default_cache_path(), max_age_days: Optional[float] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_age_days = max_age_days
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "noreply_email TEXT PRIMARY KEY, email TEXT NOT NULL, affiliation TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.connection.commit()
+
+    def get(self, noreply_email: str) -> Optional[Resolution]:
+        row = self.connection.execute("SELECT email, affiliation, fetched_at FROM users WHERE noreply_email = ?",
+                                      (noreply_email,)).fetchone()
+        if row is None:
+            return None
+        if self.max_age_days is not None and time.time() - row[2] > self.max_age_days * 86400:
+            return None
+        return row[0], row[1]
+
+    def put(self, noreply_email: str, resolution: Resolution) -> None:
+        self.connection.execute("INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?)",
+                                (noreply_email, resolution[0], resolution[1], time.time()))
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "GitHubUserCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RateLimiter:
+    """
+    Token bucket pacing requests locally, combined with the request budget announced by GitHub.
+
+    The bucket holds up to burst tokens refilled at rate per second. The budget is the X-RateLimit-Remaining
+    of the latest response, decremented by every request sent since; once spent, requests wait until the
+    X-RateLimit-Reset time.
+
+    Args:
+        rate: Requests per second
+        burst: Requests that can be sent at once
+        clock: Wall clock in seconds since the epoch (the unit of X-RateLimit-Reset)
+        sleep: Coroutine function sleeping for a number of seconds
+    """
+
+    def __init__(
+            self,
+            rate: float = DEFAULT_REQUEST_RATE,
+            burst: int = DEFAULT_REQUEST_BURST,
+            clock: Callable[[], float] = time.time,
+            sleep: Callable[[float], Any] = asyncio.sleep
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(burst)
+        self.updated = clock()
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.waited = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, and count it."""
+        while True:
+            now = self.clock()
+            if self.remaining is not None and self.remaining <= 0:
+                if now < self.reset_at:
+                    await self._wait(self.reset_at - now)
+                    continue
+                # New rate-limit window, budget unknown until the next response
+                self.remaining = None
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                if self.remaining is not None:
+                    self.remaining -= 1
+                return
+            await self._wait((1 - self.tokens) / self.rate)
+
+    async def _wait(self, seconds: float) -> None:
+        self.waited += seconds
+        await self.sleep(seconds)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Take the budget of a response (header names lower-cased) into account."""
+        remaining, reset = headers.get("x-ratelimit-remaining"), headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        self.remaining = int(remaining)
+        self.reset_at = float(reset)
+
+    def block_until(self, timestamp: float) -> None:
+        """Hold every request until timestamp, e.g. after a rate-limited response."""
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, timestamp)
+
+
+def http_request(
+        url: str,
+        token: Optional[str] = None,
+        timeout: float = REQUEST_TIMEOUT,
+        body: Optional[Dict[str, Any]] = None
+) -> Tuple[int, Dict[str, str], Any]:
+    """
+    GET a GitHub API URL, or POST a JSON body to it.
+
+    Returns:
+        Status code, headers with lower-cased names, and decoded JSON body (None if not JSON)
+    """
+    headers = {"Accept": "application/vnd.github+json", "User-Agent": "ScrapLogGit2Net"}
+    if token:
+        headers["Authorization"] = f"token {token}"
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    request = urllib.request.Request(url, data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, response_headers, body = response.status, response.headers, response.read()
+    except urllib.error.HTTPError as error:
+        status, response_headers, body = error.code, error.headers, error.read()
+
+    try:
+        payload = json.loads(body) if body else None
+    except ValueError:
+        payload = None
+    return status, {name.lower(): value for name, value in response_headers.items()}, payload
+
+
+def is_rate_limited(status: int, headers: Mapping[str, str], payload: Any) -> bool:
+    """Whether a response is a primary or secondary (REST or GraphQL) rate-limit error."""
+    if status == 429:
+        return True
+    if isinstance(payload, dict) and any(isinstance(error, dict) and error.get("type") == "RATE_LIMITED"
+                                         for error in payload.get("errors") or []):
+        return True
+    if status != 403:
+        return False
+    message = payload.get("message", "") if isinstance(payload, dict) else ""
+    return headers.get("x-ratelimit-remaining") == "0" or "retry-after" in headers or "rate limit" in message.lower()
+
+
+def rate_limit_reset(headers: Mapping[str, str], now: float) -> float:
+    """Time at which a rate-limited request can be retried."""
+    if "retry-after" in headers:
+        return now + float(headers["retry-after"])
+    if "x-ratelimit-reset" in headers:
+        return float(headers["x-ratelimit-reset"])
+    return now + DEFAULT_RETRY_DELAY
+
+
+def graphql_users_query(logins: Iterable[str]) -> Tuple[str, Dict[str, str]]:
+    """GraphQL query looking up users by login, as aliased fields u0, u1... with variables l0, l1..."""
+    variables = {f"l{i}": login for i, login in enumerate(logins)}
+    declarations = ", ".join(f"${name}: String!" for name in variables)
+    fields = " ".join(f"u{i}: user(login: $l{i}) {{ {GRAPHQL_USER_FIELDS} }}" for i in range(len(variables)))
+    return f"query({declarations}) {{ {fields} }}", variables
+
+
+def graphql_user_resolution(user: Mapping[str, Any]) -> Resolution:
+    """Resolution of a GraphQL user node (first organization, else company)."""
+    organizations = (user.get("organizations") or {}).get("nodes") or []
+    email = user.get("email") or UNKNOWN_EMAIL
+    affiliation = organizations[0]["login"] if organizations else user.get("company") or UNKNOWN_AFFILIATION
+    return email, affiliation
+
+
+class GitHubResolver:
+    """
+    Resolves GitHub noreply emails concurrently, within the rate limits, through an optional cache.
+
+    Args:
+        token: GitHub API token (anonymous requests if None)
+        api_url: Base URL of the GitHub REST API
+        cache: Cache of resolutions, read before and written after each lookup
+        concurrency: Requests in flight at once
+        rate_limiter: Pacing of the REST requests (a RateLimiter with default settings if None)
+        timeout: Timeout of each request in seconds
+        backend: "graphql" to look users up in batches (falling back to REST for misses) or "rest"
+        graphql_url: GraphQL endpoint (api_url + "/graphql" if None)
+        graphql_rate_limiter: Pacing of the GraphQL queries, which have their own budget
+    """
+
+    def __init__(
+            self,
+            token: Optional[str] = None,
+            api_url: str = GITHUB_API_URL,
+            cache: Optional[GitHubUserCache] = None,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            rate_limiter: Optional[RateLimiter] = None,
+            timeout: float = REQUEST_TIMEOUT,
+            backend: str = DEFAULT_BACKEND,
+            graphql_url: Optional[str] = None,
+            graphql_rate_limiter: Optional[RateLimiter] = None
+    ):
+        if backend not in GITHUB_BACKENDS:
+            raise ValueError(f"Unknown GitHub backend: {backend}, choose one of {GITHUB_BACKENDS}")
+        self.token = token
+        self.api_url = api_url.rstrip("/")
+        self.cache = cache
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.timeout = timeout
+        self.backend = backend
+        self.graphql_url = graphql_url or self.api_url + "/graphql"
+        self.graphql_rate_limiter = graphql_rate_limiter or RateLimiter()
+        self.n_requests = 0
+        self.n_graphql_queries = 0
+        self.n_graphql_misses = 0
+        self.n_cache_hits = 0
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="github")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lookups: Dict[str, "asyncio.Future[Resolution]"] = {}
+
+    async def request(
+            self,
+            url: str,
+            body: Optional[Dict[str, Any]] = None,
+            rate_limiter: Optional[RateLimiter] = None
+    ) -> Tuple[int, Any]:
+        """Request an API URL, paced by a rate limiter and retried after rate-limit errors."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        rate_limiter = rate_limiter or self.rate_limiter
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(MAX_RETRIES + 1):
+            async with self._semaphore:
+                # Pace inside the pool, so that queued requests see the budget of the latest responses
+                await rate_limiter.acquire()
+                status, headers, payload = await loop.run_in_executor(
+                    self._executor, http_request, url, self.token, self.timeout, body)
+            rate_limiter.update(headers)
+
+            if is_rate_limited(status, headers, payload) and attempt < MAX_RETRIES:
+                reset_at = rate_limit_reset(headers, rate_limiter.clock())
+                logger.warning(f"GitHub API rate limit reached, retrying {url} at "
+                               f"{time.strftime('%H:%M:%S', time.localtime(reset_at))}")
+                rate_limiter.block_until(reset_at)
+                continue
+            return status, payload
+
+    async def get(self, path: str) -> Tuple[int, Any]:
+        """GET a REST API path."""
+        self.n_requests += 1
+        return await self.request(self.api_url + path)
+
+    async def fetch_users_graphql(self, logins: List[str]) -> Dict[str, Resolution]:
+        """
+        Look users up with one GraphQL query.
+
+        Returns:
+            Resolutions of the users found; users missing from the answer (unknown logins, organizations,
+            failed queries) are left out
+        """
+        query, variables = graphql_users_query(logins)
+        self.n_graphql_queries += 1
+        try:
+            status, payload = await self.request(self.graphql_url, {"query": query, "variables": variables},
+                                                 self.graphql_rate_limiter)
+        except OSError as e:
+            logger.warning(f"GraphQL lookup of {len(logins)} users failed: {e}")
+            return {}
+        data = payload.get("data") if status == 200 and isinstance(payload, dict) else None
+        if not isinstance(data, dict):
+            logger.warning(f"GraphQL lookup of {len(logins)} users returned {status}, falling back to REST")
+            return {}
+        return {login: graphql_user_resolution(data[f"u{i}"]) for i, login in enumerate(logins)
+                if isinstance(data.get(f"u{i}"), dict)}
+
+    async def fetch_user(self, login: str) -> Resolution:
+        """Public email and affiliation of a GitHub user (first organization, else company)."""
+        quoted_login = urllib.parse.quote(login)
+        status, user = await self.get(f"/users/{quoted_login}")
+        if status == 404:
+            return UNKNOWN_EMAIL, UNKNOWN_AFFILIATION
+        if status != 200 or not isinstance(user, dict):
+            raise GitHubAPIError(f"GET /users/{login} returned {status}: {user}")
+
+        email = user.get("email") or UNKNOWN_EMAIL
+        affiliation = user.get("company") or UNKNOWN_AFFILIATION
+
+        status, organizations = await self.get(f"/users/{quoted_login}/orgs")
+        if status == 200 and organizations:
+            affiliation = organizations[0]["login"]
+        return email, affiliation
+
+    async def resolve(self, noreply_email: str) -> Resolution:
+        """
+        Resolve a noreply email, from the cache if possible.
+
+        Failed lookups resolve to unknowns and are not cached, so that they are retried by the next run.
+
+        Raises:
+            ValueError: If the email is not a GitHub noreply email
+        """
+        login = github_noreply_login(noreply_email)
+        if not login:
+            raise ValueError(f"Not a GitHub noreply email: {noreply_email}")
+
+        if self.cache is not None:
+            cached = self.cache.get(noreply_email)
+            if cached is not None:
+                self.n_cache_hits += 1
+                return cached
+
+        if noreply_email not in self._lookups:
+            self._lookups[noreply_email] = asyncio.ensure_future(self._lookup(noreply_email, login))
+        return await self._lookups[noreply_email]
+
+    async def _lookup_in_batch(self, batch: "asyncio.Future[Dict[str, Resolution]]", noreply_email: str,
+                               login: str) -> Resolution:
+        """Resolution of an email from a GraphQL batch, from REST if the batch missed it."""
+        resolution = (await batch).get(login)
+        if resolution is None:
+            self.n_graphql_misses += 1
+            return await self._lookup(noreply_email, login)
+        if self.cache is not None:
+            self.cache.put(noreply_email, resolution)
+        return resolution
+
+    def _start_graphql_batches(self, noreply_emails: List[str]) -> None:
+        """Start GraphQL queries for the emails neither cached nor being looked up, GRAPHQL_BATCH_SIZE users each."""
+        pending = {}
+        for email in noreply_emails:
+            login = github_noreply_login(email)
+            if not login or email in self._lookups or (self.cache is not None and self.cache.get(email)):
+                continue
+            pending[email] = login
+
+        logins = list(dict.fromkeys(pending.values()))
+        batches = {}
+        for start in range(0, len(logins), GRAPHQL_BATCH_SIZE):
+            batch_logins = logins[start:start + GRAPHQL_BATCH_SIZE]
+            batch = asyncio.ensure_future(self.fetch_users_graphql(batch_logins))
+            batches.update((login, batch) for login in batch_logins)
+        for email, login in pending.items():
+            self._lookups[email] = asyncio.ensure_future(self._lookup_in_batch(batches[login], email, login))
+
+    async def _lookup(self, noreply_email: str, login: str) -> Resolution:
+        try:
+            resolution = await self.fetch_user(login)
+        except (GitHubAPIError, OSError) as e:
+            logger.warning(f"Could not resolve {noreply_email}: {e}")
+            return UNKNOWN_EMAIL, UNKNOWN_AFFILIATION
+        if self.cache is not None:
+            self.cache.put(noreply_email, resolution)
+        return resolution
+
+    async def resolve_many(self, noreply_emails: Iterable[str]) -> Dict[str, Resolution]:
+        """Resolve noreply emails concurrently, each once."""
+        emails = list(dict.fromkeys(noreply_emails))
+        if self.backend == "graphql":
+            self._start_graphql_batches(emails)
+        resolutions = await asyncio.gather(*(self.resolve(email) for email in emails))
+        return dict(zip(emails, resolutions))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def resolve_noreply_emails(
+        noreply_emails: Iterable[str],
+        token: Optional[str] = None,
+        api_url: str = GITHUB_API_URL,
+        cache_path: Optional[str] = default_cache_path(),
+        concurrency: int = DEFAULT_CONCURRENCY,
+        backend: str = DEFAULT_BACKEND,
+        graphql_url: Optional[str] = None,
+        stats: Optional[Dict[str, float]] = None
+) -> Dict[str, Resolution]:
+    """
+    Resolve GitHub noreply emails to (email, affiliation), see GitHubResolver.
+
+    Args:
+        noreply_emails: GitHub noreply emails
+        token: GitHub API token
+        api_url: Base URL of the GitHub REST API
+        cache_path: SQLite cache file, no cache if None
+        concurrency: Requests in flight at once
+        backend: "graphql" (batched, REST for misses) or "rest"
+        graphql_url: GraphQL endpoint (api_url + "/graphql" if None)
+        stats: Filled with the counters of the resolution (requests, graphql_queries, graphql_misses,
+            cache_hits and waited seconds) if given
+
+    Returns:
+        Dict mapping each noreply email to its resolution
+    """
+    cache = GitHubUserCache(cache_path) if cache_path else None
+    resolver = GitHubResolver(token, api_url, cache, concurrency, backend=backend, graphql_url=graphql_url)
+    try:
+        resolutions = asyncio.run(resolver.resolve_many(noreply_emails))
+    finally:
+        resolver.close()
+        if cache is not None:
+            cache.close()
+
+    waited = resolver.rate_limiter.waited + resolver.graphql_rate_limiter.waited
+    if stats is not None:
+        stats.update(requests=resolver.n_requests, graphql_queries=resolver.n_graphql_queries,
+                     graphql_misses=resolver.n_graphql_misses, cache_hits=resolver.n_cache_hits, waited=waited)
+    logger.info(f"Resolved {len(resolutions)} noreply emails with {resolver.n_graphql_queries} GraphQL queries and "
+                f"{resolver.n_requests} REST requests ({resolver.n_cache_hits} from the cache, "
+                f"{resolver.n_graphql_misses} GraphQL misses, {waited:.1f} s waiting for rate limits)")
+    return resolutions
@@ -0,0 +1,105 @@
+"""
+Granularity of the co-editing networks: files, directories at a given depth, or user-defined modules.
+
+On monorepos, file-level co-editing yields huge numbers of files and developer pairs, while many questions are
+about collaboration on modules. A PathMapper maps each changed file to its unit when the changelog is parsed,
+so that the file -> contributors map, the temporal extractors and the pair generation only see the (much
+smaller) vocabulary of units:
+
+- "file": files are kept as they are,
+- "dir:N": files are mapped to their directory at depth N ("tensorflow/core/kernels/a.cc" -> "tensorflow/core"
+  for N=2), files in shallower directories to their own directory and files at the root to ".",
+- "module-map": files are mapped by the rules of a JSON file {"<path rule>": "<module>", ...}, in the order of
+  the file, the first matching rule winning. Rules are globs and directories as in utils/path_filters.py
+  ("tensorflow/compiler/**", "*.md", "docs/"), directories matching from the root as in -ip/-xp ("docs/"
+  maps "docs/a.md" but not "src/docs/a.md"); files matching no rule are kept as they are.
+
+Each distinct path is mapped once and cached, and units are interned, so the cost of the mapping grows with
+the number of distinct paths rather than with the number of file changes.
+"""
+
+import json
+import re
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.path_filters import rule_to_regex
+
+GRANULARITIES = ("file", "dir:N", "module-map")
+
+ROOT_DIRECTORY = "."
+
+
+def parse_granularity(value: str) -> Tuple[str, int]:
+    """
+    Parse a --granularity value into (kind, depth): ("file", 0), ("dir", N) or ("module-map", 0).
+
+    Raises:
+        ValueError: For other values and for directory depths below 1
+    """
+    if value in ("file", "module-map"):
+        return value, 0
+    kind, _, depth = value.partition(":")
+    if kind == "dir" and depth.isdigit() and int(depth) >= 1:
+        return kind, int(depth)
+    raise ValueError(f"Invalid granularity '{value}', expected one of {', '.join(GRANULARITIES)} (N >= 1)")
+
+
+def directory_at_depth(path: str, depth: int) -> str:
+    """Directory of a path truncated to its first depth components, ROOT_DIRECTORY for files at the root."""
+    components = path.split("/")[:-1]
+    return "/".join(components[:depth]) if components else ROOT_DIRECTORY
+
+
+def load_module_map(path: str) -> List[Tuple[str, str]]:
+    """(path rule, module) pairs of a JSON module map file, in file order."""
+    with open(path, "r", encoding="utf-8") as module_map_file:
+        module_map = json.load(module_map_file)
+    if not isinstance(module_map, dict) or not all(isinstance(module, str) for module in module_map.values()):
+        raise ValueError(f"{path} should map path rules to module names")
+    return list(module_map.items())
+
+
+class PathMapper:
+    """
+    Maps file paths to the unit (file, directory or module) of the network, caching the unit of each path.
+
+    Example:
+        >>> mapper = PathMapper("dir", depth=2)
+        >>> mapper.map_files(["tensorflow/core/a.cc", "tensorflow/core/kernels/b.cc", "README.md"])
+        ['tensorflow/core', '.']
+    """
+
+    def __init__(self, kind: str = "file", depth: int = 0, module_map: Sequence[Tuple[str, str]] = ()):
+        self.kind = kind
+        self.depth = depth
+        self.modules = [module for _, module in module_map]
+        # Alternatives are tried in order, so the first rule of the map that matches wins
+        self.regex: Optional[re.Pattern] = re.compile(
+            "|".join(f"(?P<m{i}>{rule_to_regex(rule)})" for i, (rule, _) in enumerate(module_map))) \
+            if module_map else None
+        self.units: Dict[str, str] = {}
+
+    def unit_of(self, path: str) -> str:
+        """Unit of a path (cached)."""
+        unit = self.units.get(path)
+        if unit is None:
+            if self.kind == "dir":
+                unit = directory_at_depth(path, self.depth)
+            elif self.regex is not None:
+                match = self.regex.fullmatch(path)
+                unit = self.modules[int(match.lastgroup[1:])] if match else path
+            else:
+                unit = path
+            unit = self.units[path] = sys.intern(unit)
+        return unit
+
+    def map_files(self, files: Sequence[str]) -> List[str]:
+        """Distinct units of the files changed by a commit, in order of first appearance."""
+        if self.kind == "file":
+            return list(files)
+        return list(dict.fromkeys(map(self.unit_of, files)))
+
+    def vocabulary_sizes(self) -> Tuple[int, int]:
+        """Number of distinct paths mapped so far, and of distinct units they were mapped to."""
+        return len(self.units), len(set(self.units.values()))
@@ -0,0 +1,74 @@
+"""
+Organization filters of networks of individuals, shared by the nofi visualizer and reporter.
+
+An affiliation -> node-set index is built once per graph. Each filter narrows a keep-set with set algebra
+(difference, intersection, union with neighbours), and the result is a single induced subgraph view of the
+original graph, so no intermediate copies are made whatever the number of filters.
+
+Filters are applied in the order they are called and give the same nodes as removing the filtered-out
+nodes from a copy of the graph one filter after the other.
+"""
+
+from typing import Dict, Hashable, Iterable, List, Set
+
+import networkx as nx
+
+
+def affiliation_index(graph: nx.Graph, attribute: str = "affiliation") -> Dict[str, Set[Hashable]]:
+    """Nodes of each affiliation, nodes without the attribute are indexed under ''."""
+    index: Dict[str, Set[Hashable]] = {}
+    for node, affiliation in graph.nodes(data=attribute, default=""):
+        index.setdefault(affiliation, set()).add(node)
+    return index
+
+
+class OrganizationFilter:
+    """Composable organization filters over an affiliation index of a graph."""
+
+    def __init__(self, graph: nx.Graph, attribute: str = "affiliation"):
+        self.graph = graph
+        self.attribute = attribute
+        self.index = affiliation_index(graph, attribute)
+        self.keep: Set[Hashable] = set(graph.nodes())
+
+    def nodes_of(self, organizations: Iterable[str]) -> Set[Hashable]:
+        """Nodes (of the whole graph) affiliated with any of the organizations."""
+        nodes: Set[Hashable] = set()
+        for organization in set(organizations):
+            nodes |= self.index.get(organization, set())
+        return nodes
+
+    def exclude_organizations(self, organizations: Iterable[str]) -> Set[Hashable]:
+        """Remove the nodes affiliated with the organizations, returns the removed nodes."""
+        return self._restrict(self.keep - self.nodes_of(organizations))
+
+    def only_organizations(self, organizations: Iterable[str]) -> Set[Hashable]:
+        """Keep only the nodes affiliated with the organizations, returns the removed nodes."""
+        return self._restrict(self.keep & self.nodes_of(organizations))
+
+    def only_organizations_and_neighbours(self, organizations: Iterable[str]) -> Set[Hashable]:
+        """Keep only the nodes of the organizations and their neighbours among the kept nodes.
+
+        Returns:
+            The removed nodes
+        """
+        members = self.keep & self.nodes_of(organizations)
+        kept = set(members)
+        for node in members:
+            kept.update(self.graph.neighbors(node))
+        return self._restrict(kept & self.keep)
+
+    def subgraph(self) -> nx.Graph:
+        """Read-only induced subgraph view of the kept nodes (the graph itself when nothing was removed)."""
+        if len(self.keep) == self.graph.number_of_nodes():
+            return self.graph
+        return self.graph.subgraph(self.keep)
+
+    def in_graph_order(self, nodes: Set[Hashable]) -> List[Hashable]:
+        """Nodes of a set in the node order of the graph, for reproducible listings."""
+        return [node for node in self.graph.nodes() if node in nodes]
+
+    def _restrict(self, keep: Set[Hashable]) -> Set[Hashable]:
+        removed = self.keep - keep
+        self.keep = keep
+        return removed
@@ -0,0 +1,209 @@
+"""
+Developer identity resolution: merging the emails used by the same person into one canonical email.
+
+The same developer often commits with several emails (corporate, personal, <id>+<login>@users.noreply.github.com),
+each of which would otherwise become a separate node. Emails are blocked on the keys that identify a person:
+
+- their normalised author names (accents, case and punctuation removed, at least two words),
+- their GitHub login for users.noreply.github.com emails,
+- the proper email or name a .mailmap file maps them to.
+
+Emails sharing a key are merged with a union-find, which keeps the whole resolution linear in the number of
+(email, key) pairs, i.e. seconds for 100k distinct emails. Each group is represented by its mailmap proper
+email if it has one, else by its most used email that is not a noreply one.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Set, Tuple
+
+GITHUB_NOREPLY_DOMAIN = "users.noreply.github.com"
+
+# Author names shared by unrelated people, never used to merge emails
+GENERIC_AUTHOR_NAMES = {
+    "unknown", "root", "admin", "administrator", "ubuntu", "user", "github", "github action", "github actions",
+    "dependabot", "dependabot bot", "dependabot preview bot", "renovate bot", "copybara service", "tensorflower gardener",
+    "your name", "no name", "none",
+}
+
+MailmapEntry = Tuple[Optional[str], Optional[str], Optional[str], str]
+"""(proper_name, proper_email, commit_name, commit_email) of a .mailmap line, emails lower-cased."""
+
+_MAILMAP_EMAIL = re.compile(r"<([^>]*)>")
+
+
+class UnionFind:
+    """Disjoint sets of hashable items, with path halving and union by size."""
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable) -> None:
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item: Hashable) -> Hashable:
+        self.add(item)
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first: Hashable, second: Hashable) -> Hashable:
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return first
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+        return first
+
+    def groups(self) -> Dict[Hashable, List[Hashable]]:
+        """Items of each set, by representative."""
+        groups: Dict[Hashable, List[Hashable]] = defaultdict(list)
+        for item in self.parent:
+            groups[self.find(item)].append(item)
+        return groups
+
+
+def normalise_author_name(name: Optional[str]) -> Optional[str]:
+    """
+    Author name reduced to lower-case ASCII words, or None if it cannot identify a person.
+
+    Names of a single word and generic names (bots, "root", "Your Name") do not identify a person.
+    """
+    if not name:
+        return None
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    words = re.sub(r"[^a-z0-9]+", " ", ascii_name.lower()).split()
+    normalised = " ".join(words)
+    if len(words) < 2 or normalised in GENERIC_AUTHOR_NAMES or normalised.endswith(" bot"):
+        return None
+    return normalised
+
+
+def github_noreply_login(email: str) -> Optional[str]:
+    """GitHub login of a <id>+<login>@users.noreply.github.com or <login>@users.noreply.github.com email."""
+    local, _, domain = email.lower().rpartition("@")
+    if domain != GITHUB_NOREPLY_DOMAIN or not local:
+        return None
+    return local.split("+", 1)[-1]
+
+
+def parse_mailmap_line(line: str) -> Optional[MailmapEntry]:
+    """
+    Parse one line of a .mailmap file, in any of the forms documented by git-check-mailmap:
+
+        Proper Name <commit@email.xx>
+        <proper@email.xx> <commit@email.xx>
+        Proper Name <proper@email.xx> <commit@email.xx>
+        Proper Name <proper@email.xx> Commit Name <commit@email.xx>
+
+    Returns:
+        The (proper_name, proper_email, commit_name, commit_email) entry, or None for comments and blank lines
+    """
+    line = line.split("#", 1)[0].strip()
+    emails = list(_MAILMAP_EMAIL.finditer(line))
+    if not emails:
+        return None
+
+    proper_name = line[:emails[0].start()].strip() or None
+    if len(emails) == 1:
+        return proper_name, None, None, emails[0].group(1).strip().lower()
+
+    commit_name = line[emails[0].end():emails[1].start()].strip() or None
+    return proper_name, emails[0].group(1).strip().lower() or None, commit_name, emails[1].group(1).strip().lower()
+
+
+def load_mailmap(path: str) -> List[MailmapEntry]:
+    """Entries of a .mailmap file (see parse_mailmap_line)."""
+    with open(path, "r", encoding="utf-8") as mailmap_file:
+        return [entry for entry in map(parse_mailmap_line, mailmap_file) if entry is not None]
+
+
+def resolve_identities(
+        author_names: Mapping[str, Iterable[str]],
+        commit_counts: Optional[Mapping[str, int]] = None,
+        mailmap: Iterable[MailmapEntry] = (),
+        match_names: bool = True,
+        match_noreply: bool = True
+) -> Dict[str, str]:
+    """
+    Map every email to the canonical email of the developer using it.
+
+    Args:
+        author_names: Author names used with each email (emails are compared lower-cased)
+        commit_counts: Number of commits of each email, to pick the most used email of a group
+        mailmap: Entries of a .mailmap file (see load_mailmap)
+        match_names: Merge emails used with the same normalised author name
+        match_noreply: Merge the GitHub noreply emails of the same login
+
+    Returns:
+        Dict mapping each email of author_names to its canonical email (itself if not merged)
+    """
+    commit_counts = commit_counts or {}
+    identities = UnionFind()
+    for email in author_names:
+        identities.add(email)
+
+    # Emails as written in the log, by lower-cased email, for matching mailmap entries
+    emails_by_lowercase: Dict[str, List[str]] = defaultdict(list)
+    for email in author_names:
+        emails_by_lowercase[email.lower()].append(email)
+    # Emails differing only by case are the same mailbox
+    for emails in emails_by_lowercase.values():
+        for email in emails[1:]:
+            identities.union(emails[0], email)
+
+    proper_emails: Set[str] = set()
+    mailmap_names: Dict[str, str] = {}
+    for proper_name, proper_email, commit_name, commit_email in mailmap:
+        for email in emails_by_lowercase.get(commit_email, []):
+            if commit_name is not None and commit_name not in author_names[email]:
+                continue
+            if proper_email:
+                for proper in emails_by_lowercase.get(proper_email, []) or [proper_email]:
+                    identities.union(proper, email)
+                    proper_emails.add(proper)
+            if proper_name:
+                mailmap_names[email] = proper_name
+
+    # Block emails on the keys identifying a person; emails sharing a key are the same developer
+    first_email_by_key: Dict[Tuple[str, str], str] = {}
+    for email, names in author_names.items():
+        keys = set()
+        if match_names:
+            names = [mailmap_names[email]] if email in mailmap_names else names
+            keys.update(("name", name) for name in map(normalise_author_name, names) if name)
+        login = github_noreply_login(email) if match_noreply else None
+        if login:
+            keys.add(("login", login))
+        for key in keys:
+            if key in first_email_by_key:
+                identities.union(first_email_by_key[key], email)
+            else:
+                first_email_by_key[key] = email
+
+    identity_map: Dict[str, str] = {}
+    for group in identities.groups().values():
+        canonical = min(group, key=lambda email: (email not in proper_emails,
+                                                  github_noreply_login(email) is not None,
+                                                  -commit_counts.get(email, 0), email))
+        for email in group:
+            if email in author_names:
+                identity_map[email] = canonical
+    return identity_map
+
+
+def identity_groups(identity_map: Mapping[str, str]) -> Dict[str, List[str]]:
+    """Emails merged into each canonical email, for canonical emails with more than one email."""
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for email, canonical in identity_map.items():
+        groups[canonical].append(email)
+    return {canonical: sorted(emails) for canonical, emails in groups.items() if len(emails) > 1}
+
@@ -0,0 +1,229 @@
+"""
+Incremental updates of the parsed changelog: ingesting only the new commits of a log instead of its whole history.
+
+scrapLog.py --update STATE_DIR keeps, in STATE_DIR, everything the parser accumulates from a changelog (the
+parsed entries, the file -> contributions history, the author names and the parsing statistics), the keys of
+the commit blocks already ingested and the timestamp of the latest commit. The next run is given only the
+tail of the log (e.g. `git log --since=<latest commit>` output):
+
+1. the blocks at the end of the tail that are the first blocks of the stored log (--since is inclusive, so
+   the tail overlaps the previous log) are dropped. Only this overlap is dropped: identical blocks elsewhere
+   (cherry-picks keep the author, date and files of a commit) are distinct commits and are kept,
+2. the new blocks are parsed as usual,
+3. the stored state is appended after them, as git lists the newest commits first, shifting the stored
+   commit indexes by the number of new blocks,
+4. the merged state is saved, and the networks are extracted from it.
+
+The merged state is the one a full parse of the new blocks followed by the previous log would give, so the
+outputs are identical to a full rebuild, while only the new commits are parsed. Parsing options changing the
+parsed entries (file filters, granularity, email aggregation) are recorded with the state, and a state built
+with other options is refused rather than silently mixed.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from core.models import ProcessingState, ProcessingStatistics
+
+STATE_FILE = "state.pickle"
+METADATA_FILE = "state.json"
+
+# Version of the pickled state, bumped when its content changes
+STATE_VERSION = 1
+
+GIT_TIMESTAMP_FORMAT = "%a %b %d %H:%M:%S %Y %z"
+
+GIT_LOG_FORMAT = '--pretty=format:"==%an;%ae;%ad==" --name-only'
+
+
+@dataclass
+class IncrementalState:
+    """Parser state accumulated over the ingested commits of a changelog."""
+    fingerprint: str
+    parsed_change_log_entries: list = field(default_factory=list)
+    file_history: dict = field(default_factory=dict)
+    author_names: dict = field(default_factory=dict)
+    statistics: ProcessingStatistics = field(default_factory=ProcessingStatistics)
+    block_keys: List[Optional[bytes]] = field(default_factory=list)  # in log order, newest first
+    latest_timestamp: Optional[str] = None
+    version: int = STATE_VERSION
+
+
+def parsing_fingerprint(state: ProcessingState) -> str:
+    """Digest of the options of the state that change the parsed entries."""
+    mapper = state.path_mapper
+    options = {
+        "include_extensions": sorted(state.include_extensions),
+        "exclude_extensions": sorted(state.exclude_extensions),
+        "include_paths": state.include_paths,
+        "exclude_paths": state.exclude_paths,
+        "files_to_filter": sorted(state.files_to_filter) if state.file_filtering_mode else [],
+        "email_aggregation_config": state.email_aggregation_config,
+        "granularity": [mapper.kind, mapper.depth, mapper.regex.pattern if mapper.regex else None,
+                        mapper.modules] if mapper is not None else "file",
+    }
+    return hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def log_blocks(lines: List[str]) -> Iterator[Tuple[Optional[bytes], List[str]]]:
+    """
+    Commit blocks of a changelog as (key, lines), split like scrapLog.process_file_lines does.
+
+    The key digests the header and file lines of a block (None for lines before the first header), so
+    the same commit found in two logs has the same key. Blank lines before the first header, which the
+    parser skips, are not a block.
+    """
+    key_lines: List[str] = []
+    block: List[str] = []
+    for line in lines:
+        if line.startswith("=="):
+            if key_lines:
+                yield _block_key(key_lines), block
+            key_lines, block = [], []
+        block.append(line)
+        if line.strip():
+            key_lines.append(line.rstrip("\n"))
+    if key_lines:
+        yield _block_key(key_lines), block
+
+
+def _block_key(key_lines: List[str]) -> Optional[bytes]:
+    if not key_lines or not key_lines[0].startswith("=="):
+        return None
+    return hashlib.blake2b("\n".join(key_lines).encode("utf-8"), digest_size=16).digest()
+
+
+def drop_overlap(lines: List[str], ingested: Sequence[Optional[bytes]]) -> Tuple[List[str], List[Optional[bytes]], int]:
+    """
+    Lines of the blocks of a log tail that are not in the stored log.
+
+    The longest run of blocks ending the tail that starts the stored log (whose block keys are ingested) is
+    dropped.
+
+    Returns:
+        The lines to parse, the keys of their blocks and the number of blocks dropped
+    """
+    blocks = list(log_blocks(lines))
+    keys = [key for key, _ in blocks]
+    n_dropped = 0
+    if ingested and ingested[0] is not None:
+        for start in (i for i, key in enumerate(keys) if key == ingested[0]):
+            if keys[start:] == list(ingested[:len(keys) - start]):
+                n_dropped = len(keys) - start
+                break
+    kept = blocks[:len(blocks) - n_dropped]
+    return [line for _, block in kept for line in block], keys[:len(kept)], n_dropped
+
+
+def latest_timestamp(entries: list, latest: Optional[str] = None) -> Optional[str]:
+    """Latest git timestamp of parsed changelog entries (and of latest, if given)."""
+    candidates = [latest] if latest else []
+    candidates.extend(entry[2] for entry in entries)
+    best, best_time = None, None
+    for timestamp in candidates:
+        try:
+            timestamp_time = datetime.strptime(timestamp, GIT_TIMESTAMP_FORMAT)
+        except (TypeError, ValueError):
+            continue
+        if best_time is None or timestamp_time > best_time:
+            best, best_time = timestamp, timestamp_time
+    return best
+
+
+def load_incremental_state(state_dir: str, fingerprint: str) -> Optional[IncrementalState]:
+    """
+    Incremental state stored in state_dir, None if there is none yet.
+
+    Raises:
+        ValueError: If the state was built with other parsing options or by another version
+    """
+    path = os.path.join(state_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as state_file:
+        stored = pickle.load(state_file)
+    if not isinstance(stored, IncrementalState) or stored.version != STATE_VERSION:
+        raise ValueError(f"{path} was written by another version of scrapLog, rebuild it from the full log")
+    if stored.fingerprint != fingerprint:
+        raise ValueError(f"{path} was built with other file filters, granularity or email aggregation options, "
+                         f"rebuild it from the full log or use the same options")
+    return stored
+
+
+def merge_stored_state(state: ProcessingState, stored: IncrementalState, n_new_blocks: int) -> None:
+    """
+    Append a stored state after the commits just parsed into state (which are newer).
+
+    Args:
+        state: State holding the new commits only, parsed by scrapLog.process_file_lines
+        stored: State of the previously ingested commits
+        n_new_blocks: Number of commit blocks parsed into state, by which stored commit indexes are shifted
+    """
+    state.parsed_change_log_entries.extend(stored.parsed_change_log_entries)
+
+    for filename, contributions in stored.file_history.items():
+        for contribution in contributions:
+            contribution.commit_index += n_new_blocks
+        state.file_history[filename].extend(contributions)
+
+    for email, names in stored.author_names.items():
+        state.author_names[email].update(names)
+
+    for statistic in fields(ProcessingStatistics):
+        setattr(state.statistics, statistic.name,
+                getattr(state.statistics, statistic.name) + getattr(stored.statistics, statistic.name))
+
+
+def snapshot_state(state: ProcessingState, fingerprint: str, block_keys: List[Optional[bytes]],
+                   latest: Optional[str]) -> IncrementalState:
+    """Incremental state of the commits parsed into state (before identity resolution rewrites them)."""
+    return IncrementalState(
+        fingerprint=fingerprint,
+        parsed_change_log_entries=list(state.parsed_change_log_entries),
+        file_history=dict(state.file_history),
+        author_names=dict(state.author_names),
+        statistics=state.statistics,
+        block_keys=block_keys,
+        latest_timestamp=latest,
+    )
+
+
+def save_incremental_state(state_dir: str, incremental_state: IncrementalState) -> None:
+    """Write the state (atomically) and a human-readable summary of it into state_dir."""
+    os.makedirs(state_dir, exist_ok=True)
+    path = os.path.join(state_dir, STATE_FILE)
+    with open(path + ".tmp", "wb") as state_file:
+        pickle.dump(incremental_state, state_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+    metadata = {
+        "version": incremental_state.version,
+        "commits": len(incremental_state.parsed_change_log_entries),
+        "blocks": len(incremental_state.block_keys),
+        "latest_timestamp": incremental_state.latest_timestamp,
+        "fingerprint": incremental_state.fingerprint,
+        "next_update": next_update_command(incremental_state.latest_timestamp),
+    }
+    with open(os.path.join(state_dir, METADATA_FILE), "w", encoding="utf-8") as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+
+
+def stored_latest_timestamp(state_dir: str) -> Optional[str]:
+    """Timestamp of the latest commit of the state stored in state_dir (from its summary), None if none."""
+    try:
+        with open(os.path.join(state_dir, METADATA_FILE), "r", encoding="utf-8") as metadata_file:
+            return json.load(metadata_file).get("latest_timestamp")
+    except FileNotFoundError:
+        return None
+
+
+def next_update_command(latest: Optional[str]) -> Optional[str]:
+    """git log command printing the commits to give to the next --update."""
+    if not latest:
+        return None
+    return f'git log --since="{latest}" {GIT_LOG_FORMAT}'
@@ -0,0 +1,688 @@
+"""
+Scalable force-directed layouts, shared by the nofi and nofo visualizers.
+
+nx.spring_layout computes all N^2 pairwise repulsions at every iteration, which takes minutes (or runs out of
+memory) on all-history networks. The layouts here work on NumPy arrays of node positions and edge endpoints:
+
+- forceatlas2: ForceAtlas2 forces and adaptive speed, with Barnes-Hut style repulsion (see grid_repulsion)
+- sparse-spring: Fruchterman-Reingold forces of nx.spring_layout, attraction along the edges only and the
+  same approximated repulsion
+- multilevel: the graph is coarsened by repeated heavy-edge matching, the coarsest graph is laid out with
+  forceatlas2, and positions are prolonged and refined level by level
+
+cached_layout stores computed positions in a layout cache keyed by the structure hash of the graph and the
+layout parameters, so that re-rendering a network with other colours, legends or filters reuses its layout.
+Layouts can also start from the positions of a previous layout (e.g. the previous year of a yearly series,
+see save_layout/load_layout), which keeps positions comparable and needs far fewer iterations.
+
+grid_repulsion approximates the repulsion of all nodes in O(N log N): nodes are binned in a quadtree of
+regular grids, each node interacts exactly with the nodes of its neighbouring leaf cells and, at each coarser
+level, with the centre of mass of the well-separated cells of its parent's neighbours (the Barnes-Hut
+interaction list).
+
+See for more information on ForceAtlas2
+----
+Jacomy, M., Venturini, T., Heymann, S., & Bastian, M. (2014). ForceAtlas2, a continuous graph layout
+algorithm for handy network visualization designed for the Gephi software. PloS one, 9(6), e98679.
+----
+"""
+
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from utils.centrality import graph_hash
+from utils.unified_logger import logger
+
+LAYOUT_ALGORITHMS = ("spring", "circular", "forceatlas2", "sparse-spring", "multilevel")
+
+DEFAULT_LAYOUT_ITERATIONS = {"spring": 50, "forceatlas2": 100, "sparse-spring": 100, "multilevel": 100}
+
+# Share of the default iterations run when a layout starts from the positions of a previous layout
+WARM_START_ITERATION_RATIO = 0.25
+
+# Bump when the layouts change, so that previously cached positions are recomputed
+LAYOUT_CACHE_VERSION = 1
+
+DEFAULT_LAYOUT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ScrapLogGit2Net", "layouts")
+
+# Gap left between the largest component and the components packed around it, relative to its radius
+COMPONENT_MARGIN = 0.1
+
+# Target mean number of nodes per leaf cell of grid_repulsion, and depth limit of its quadtree
+LEAF_SIZE = 4
+MAX_GRID_LEVEL = 20
+# Deepest level whose cells are looked up in a dense table rather than by binary search
+DENSE_GRID_LEVEL = 10
+
+# multilevel_layout stops coarsening at this number of nodes, or when a matching shrinks the graph by less
+# than MIN_COARSENING_RATIO
+COARSEST_SIZE = 100
+MIN_COARSENING_RATIO = 0.1
+
+Positions = Dict[Hashable, np.ndarray]
+
+
+# Offsets (dx, dy) of the 27 cells of the interaction list (children of the parent's neighbours that are not
+# neighbours of the cell itself), for each parity of the cell coordinates
+_INTERACTION_LISTS = {
+    (px, py): np.array([(dx, dy)
+                        for dx in range(-2 - px, 4 - px)
+                        for dy in range(-2 - py, 4 - py)
+                        if abs(dx) > 1 or abs(dy) > 1])
+    for px in (0, 1) for py in (0, 1)
+}
+
+_NEIGHBOUR_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def _cell_finder(cell_ids: np.ndarray, level: int) -> Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+    """Lookup of cell ids (-1 for none) in the sorted occupied cells of a level.
+
+    The lookup returns the index of each queried cell in cell_ids, and whether it is occupied.
+    """
+    if level <= DENSE_GRID_LEVEL:
+        # Direct lookup table of all the cells of the level, its last entry is for -1
+        table = np.full((1 << level) ** 2 + 1, -1, dtype=np.int64)
+        table[cell_ids] = np.arange(len(cell_ids))
+
+        def find(query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            index = table[query]
+            return np.maximum(index, 0), index >= 0
+    else:
+        def find(query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            index = np.minimum(np.searchsorted(cell_ids, query), len(cell_ids) - 1)
+            return index, cell_ids[index] == query
+    return find
+
+
+def grid_repulsion(positions: np.ndarray, masses: np.ndarray, leaf_size: int = LEAF_SIZE) -> np.ndarray:
+    """Approximate sum over j != i of masses[j] * (x_i - x_j) / |x_i - x_j|^2 for every node i.
+
+    Only occupied cells are stored (as sorted cell ids), so the quadtree can be deep where nodes clump.
+
+    Args:
+        positions: (N, 2) node positions
+        masses: (N,) node masses
+        leaf_size: Target mean number of nodes per leaf cell, smaller is more exact and slower
+
+    Returns:
+        (N, 2) repulsion of each node (to be scaled by its own mass and the repulsion constant)
+    """
+    n = len(positions)
+    forces = np.zeros((n, 2))
+    if n < 2:
+        return forces
+
+    low = positions.min(axis=0)
+    span = float((positions.max(axis=0) - low).max()) or 1.0
+    levels = int(np.clip(np.ceil(np.log(n / leaf_size) / np.log(4)), 2, MAX_GRID_LEVEL))
+    while True:
+        leaf_cells = np.minimum(((positions - low) / span * (1 << levels)).astype(np.int64), (1 << levels) - 1)
+        # Clumped nodes get a deeper quadtree, so that the exact near field stays close to O(N)
+        _, occupancy = np.unique(leaf_cells[:, 0] << levels | leaf_cells[:, 1], return_counts=True)
+        if levels == MAX_GRID_LEVEL or (occupancy.astype(np.float64) ** 2).sum() <= 2 * leaf_size * n:
+            break
+        levels += 1
+
+    # Far field: centres of mass of the interaction list cells at every level of the quadtree
+    for level in range(2, levels + 1):
+        size = 1 << level
+        cells = leaf_cells >> (levels - level)
+        cell_ids, inverse = np.unique(cells[:, 0] << level | cells[:, 1], return_inverse=True)
+        cell_mass = np.bincount(inverse, weights=masses)
+        centre_x, centre_y = (
+            np.divide(np.bincount(inverse, weights=masses * positions[:, axis]), cell_mass,
+                      out=np.zeros(len(cell_ids)), where=cell_mass > 0)
+            for axis in (0, 1)
+        )
+        find_cells = _cell_finder(cell_ids, level)
+
+        parity = cells & 1
+        for (px, py), offsets in _INTERACTION_LISTS.items():
+            members = np.flatnonzero((parity[:, 0] == px) & (parity[:, 1] == py))
+            if not len(members):
+                continue
+            other_x = cells[members, 0, None] + offsets[None, :, 0]
+            other_y = cells[members, 1, None] + offsets[None, :, 1]
+            valid = (other_x >= 0) & (other_x < size) & (other_y >= 0) & (other_y < size)
+            other, occupied = find_cells(np.where(valid, other_x << level | other_y, -1))
+            # Only the (member, occupied cell) pairs, most cells of the deeper levels are empty
+            member, _ = np.nonzero(occupied)
+            other = other[occupied]
+            delta_x = positions[members[member], 0] - centre_x[other]
+            delta_y = positions[members[member], 1] - centre_y[other]
+            strength = cell_mass[other] / np.maximum(delta_x * delta_x + delta_y * delta_y, 1e-12)
+            forces[members, 0] += np.bincount(member, weights=strength * delta_x, minlength=len(members))
+            forces[members, 1] += np.bincount(member, weights=strength * delta_y, minlength=len(members))
+
+    # Near field: exact repulsion of the nodes in the neighbouring leaf cells
+    size = 1 << levels
+    flat = leaf_cells[:, 0] << levels | leaf_cells[:, 1]
+    order = np.argsort(flat, kind="stable")
+    cell_ids, starts, counts = np.unique(flat[order], return_index=True, return_counts=True)
+    find_cells = _cell_finder(cell_ids, levels)
+    for dx, dy in _NEIGHBOUR_OFFSETS:
+        other_x, other_y = leaf_cells[:, 0] + dx, leaf_cells[:, 1] + dy
+        valid = (other_x >= 0) & (other_x < size) & (other_y >= 0) & (other_y < size)
+        other, occupied = find_cells(np.where(valid, other_x << levels | other_y, -1))
+        pair_counts = np.where(occupied, counts[other], 0)
+        total = int(pair_counts.sum())
+        if not total:
+            continue
+        sources = np.repeat(np.arange(n), pair_counts)
+        within = np.arange(total) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        targets = order[np.repeat(starts[other], pair_counts) + within]
+
+        delta = positions[sources] - positions[targets]
+        distance2 = (delta ** 2).sum(axis=1)
+        # Coincident nodes (and a node with itself) do not repel each other
+        weights = np.divide(masses[targets], distance2, out=np.zeros(total), where=distance2 > 0)
+        for axis in (0, 1):
+            forces[:, axis] += np.bincount(sources, weights=weights * delta[:, axis], minlength=n)
+
+    return forces
+
+
+def graph_arrays(graph: nx.Graph, weight: Optional[str] = "weight") -> Tuple[List, np.ndarray, np.ndarray,
+                                                                             np.ndarray]:
+    """Nodes, edge endpoint indexes and edge weights (1 without the attribute) of a graph, without self-loops."""
+    nodes = list(graph.nodes())
+    node_index = {node: index for index, node in enumerate(nodes)}
+    edges = [(node_index[u], node_index[v], data.get(weight, 1) if weight else 1)
+             for u, v, data in graph.edges(data=True) if u != v]
+    if not edges:
+        return nodes, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    sources, targets, weights = zip(*edges)
+    return (nodes, np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64),
+            np.array(weights, dtype=np.float64))
+
+
+def initial_positions(
+        nodes: List,
+        seed: Optional[int] = None,
+        init_positions: Optional[Positions] = None
+) -> np.ndarray:
+    """Positions of the nodes in init_positions, uniformly random in the unit square for the others."""
+    rng = np.random.default_rng(seed)
+    positions = rng.random((len(nodes), 2))
+    if init_positions:
+        for index, node in enumerate(nodes):
+            if node in init_positions:
+                positions[index] = init_positions[node]
+    return positions
+
+
+def _attraction(positions: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+                strengths: np.ndarray) -> np.ndarray:
+    """Sum over the edges of each node of strength * (x_j - x_i)."""
+    forces = np.zeros_like(positions)
+    delta = positions[targets] - positions[sources]
+    for axis in (0, 1):
+        pull = strengths * delta[:, axis]
+        forces[:, axis] += np.bincount(sources, weights=pull, minlength=len(positions))
+        forces[:, axis] -= np.bincount(targets, weights=pull, minlength=len(positions))
+    return forces
+
+
+def forceatlas2_positions(
+        positions: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        masses: np.ndarray,
+        iterations: int = DEFAULT_LAYOUT_ITERATIONS["forceatlas2"],
+        scaling_ratio: float = 2.0,
+        gravity: float = 1.0,
+        jitter_tolerance: float = 1.0
+) -> np.ndarray:
+    """Run ForceAtlas2 iterations from the given (N, 2) positions.
+
+    Repulsion kr * m_i * m_j / d, linear attraction along the edges and gravity kg * m_i towards the origin,
+    with the adaptive global and per-node speeds of ForceAtlas2.
+    """
+    positions = positions.copy()
+    n = len(positions)
+    if n < 2:
+        return positions
+
+    previous_forces = np.zeros_like(positions)
+    speed, speed_efficiency = 1.0, 1.0
+
+    for _ in range(iterations):
+        forces = scaling_ratio * masses[:, None] * grid_repulsion(positions, masses)
+        distance = np.linalg.norm(positions, axis=1)
+        forces -= gravity * (masses / np.maximum(distance, 1e-12))[:, None] * positions
+        forces += _attraction(positions, sources, targets, weights)
+
+        # Adaptive speed: slow down when nodes swing, speed up when they move consistently
+        swinging = masses * np.linalg.norm(forces - previous_forces, axis=1)
+        traction = masses * np.linalg.norm(forces + previous_forces, axis=1) / 2
+        total_swinging, total_traction = swinging.sum(), traction.sum()
+
+        estimated_jitter = 0.05 * np.sqrt(n)
+        jitter = jitter_tolerance * max(np.sqrt(estimated_jitter),
+                                        min(10.0, estimated_jitter * total_traction / n ** 2))
+        if total_traction > 0 and total_swinging / total_traction > 2.0:
+            if speed_efficiency > 0.05:
+                speed_efficiency *= 0.5
+            jitter = max(jitter, jitter_tolerance)
+
+        target_speed = jitter * speed_efficiency * total_traction / total_swinging if total_swinging else speed
+        if total_swinging > jitter * total_traction:
+            if speed_efficiency > 0.05:
+                speed_efficiency *= 0.7
+        elif speed < 1000:
+            speed_efficiency *= 1.3
+        speed += min(target_speed - speed, 0.5 * speed)
+
+        positions += forces * (speed / (1.0 + np.sqrt(speed * swinging)))[:, None]
+        previous_forces = forces
+
+    return positions
+
+
+def equilibrium_scale(
+        positions: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        masses: np.ndarray,
+        scaling_ratio: float = 2.0,
+        gravity: float = 1.0
+) -> float:
+    """Factor by which to scale centred positions so that the ForceAtlas2 forces balance on the whole.
+
+    The virial sum(x_i . F_i) of the repulsion, kr * sum_{i<j} m_i * m_j, does not depend on the scale s,
+    while those of the attraction and the gravity grow with s^2 and s. Scaling a previous layout by the root
+    of the balance keeps its shape instead of letting the first iterations blow it up or collapse it.
+    """
+    repulsion = scaling_ratio * (masses.sum() ** 2 - (masses ** 2).sum()) / 2
+    attraction = (weights * ((positions[sources] - positions[targets]) ** 2).sum(axis=1)).sum()
+    pull = gravity * (masses * np.linalg.norm(positions, axis=1)).sum()
+    if attraction <= 0:
+        return repulsion / pull if pull > 0 else 1.0
+    return (np.sqrt(pull ** 2 + 4 * attraction * repulsion) - pull) / (2 * attraction)
+
+
+def _warm_started(positions: np.ndarray, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+                  masses: np.ndarray, scaling_ratio: float = 2.0, gravity: float = 1.0) -> np.ndarray:
+    positions = positions - positions.mean(axis=0)
+    return positions * equilibrium_scale(positions, sources, targets, weights, masses, scaling_ratio, gravity)
+
+
+def pack_components(positions: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+                    margin: float = COMPONENT_MARGIN) -> np.ndarray:
+    """Move the components pushed far away from the largest component back to its edge.
+
+    ForceAtlas2 balances the repulsion of the whole network on a small component with a constant gravity,
+    so isolates and pairs settle tens of times farther away than the radius of the largest component and,
+    once rescaled, shrink it to a dot. Each smaller component whose centroid lies beyond that radius (plus
+    the margin) is translated towards the centre, keeping its direction, until it lies on that circle.
+    """
+    n = len(positions)
+    if n < 2:
+        return positions
+    adjacency = sparse.coo_matrix((np.ones(len(sources)), (sources, targets)), shape=(n, n))
+    n_components, labels = csgraph.connected_components(adjacency, directed=False)
+    if n_components < 2:
+        return positions
+
+    sizes = np.bincount(labels)
+    largest = labels == sizes.argmax()
+    centre = positions[largest].mean(axis=0)
+    radius = (1 + margin) * np.linalg.norm(positions[largest] - centre, axis=1).max()
+
+    offsets = np.stack([np.bincount(labels, weights=positions[:, axis]) / sizes for axis in (0, 1)],
+                       axis=1) - centre
+    distance = np.linalg.norm(offsets, axis=1)
+    factor = np.where(distance > radius, radius / np.maximum(distance, 1e-12), 1.0)
+    return positions + ((factor - 1)[:, None] * offsets)[labels]
+
+
+def forceatlas2_layout(
+        graph: nx.Graph,
+        iterations: int = DEFAULT_LAYOUT_ITERATIONS["forceatlas2"],
+        seed: Optional[int] = None,
+        weight: Optional[str] = "weight",
+        init_positions: Optional[Positions] = None,
+        scaling_ratio: float = 2.0,
+        gravity: float = 1.0
+) -> Positions:
+    """ForceAtlas2 layout with Barnes-Hut style repulsion, node masses are degree + 1."""
+    nodes, sources, targets, weights = graph_arrays(graph, weight)
+    masses = 1.0 + np.bincount(np.concatenate((sources, targets)), minlength=len(nodes))
+    positions = initial_positions(nodes, seed, init_positions)
+    if init_positions:
+        positions = _warm_started(positions, sources, targets, weights, masses, scaling_ratio, gravity)
+    else:
+        positions *= np.sqrt(len(nodes))
+    positions = forceatlas2_positions(positions, sources, targets, weights, masses, iterations, scaling_ratio,
+                                      gravity)
+    return _rescaled(nodes, pack_components(positions, sources, targets))
+
+
+def sparse_spring_layout(
+        graph: nx.Graph,
+        iterations: int = DEFAULT_LAYOUT_ITERATIONS["sparse-spring"],
+        seed: Optional[int] = None,
+        weight: Optional[str] = "weight",
+        init_positions: Optional[Positions] = None,
+        k: Optional[float] = None
+) -> Positions:
+    """Fruchterman-Reingold layout of nx.spring_layout, with attraction along the edges only.
+
+    Repulsion k^2 / d is approximated with grid_repulsion and attraction w * d^2 / k summed over the edge
+    arrays, with the linear cooling schedule of nx.spring_layout.
+    """
+    nodes, sources, targets, weights = graph_arrays(graph, weight)
+    n = len(nodes)
+    positions = initial_positions(nodes, seed, init_positions)
+    if n < 2:
+        return _rescaled(nodes, positions)
+
+    k = k if k is not None else np.sqrt(1.0 / n)
+    temperature = max(float(np.ptp(positions, axis=0).max()), 1e-6) * 0.1
+    cooling = temperature / (iterations + 1)
+    unit_masses = np.ones(n)
+
+    for _ in range(iterations):
+        displacement = k ** 2 * grid_repulsion(positions, unit_masses)
+        distance = np.linalg.norm(positions[targets] - positions[sources], axis=1)
+        displacement += _attraction(positions, sources, targets, weights * distance / k)
+
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 0.01)
+        positions += displacement * (temperature / length)[:, None]
+        temperature -= cooling
+
+    return _rescaled(nodes, positions)
+
+
+def coarsen(
+        n_nodes: int,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        rng: np.random.Generator
+) -> Tuple[np.ndarray, int, np.ndarray, np.ndarray, np.ndarray]:
+    """Merge the nodes of a heavy-edge matching, and the unmatched nodes with a matched neighbour.
+
+    Returns:
+        Coarse node of each node, number of coarse nodes, and the coarse edges (sources, targets, weights)
+        with the weights of merged parallel edges summed
+    """
+    matched_to = np.full(n_nodes, -1, dtype=np.int64)
+    # Heaviest edges first, ties broken at random
+    order = np.lexsort((rng.random(len(weights)), -weights))
+    for u, v in zip(sources[order].tolist(), targets[order].tolist()):
+        if matched_to[u] < 0 and matched_to[v] < 0 and u != v:
+            matched_to[u], matched_to[v] = v, u
+
+    representative = np.where((matched_to >= 0) & (matched_to < np.arange(n_nodes)), matched_to, np.arange(n_nodes))
+
+    # Unmatched nodes join the pair of their heaviest matched neighbour, so that stars collapse onto their hub
+    ordered_sources, ordered_targets = sources[order], targets[order]
+    joining = np.concatenate((ordered_sources, ordered_targets))
+    joined = np.concatenate((ordered_targets, ordered_sources))
+    candidates = (matched_to[joining] < 0) & (matched_to[joined] >= 0)
+    unmatched, first = np.unique(joining[candidates], return_index=True)
+    representative[unmatched] = representative[joined[candidates][first]]
+    _, mapping = np.unique(representative, return_inverse=True)
+    n_coarse = int(mapping.max()) + 1 if n_nodes else 0
+
+    coarse_sources, coarse_targets = mapping[sources], mapping[targets]
+    keep = coarse_sources != coarse_targets
+    low = np.minimum(coarse_sources[keep], coarse_targets[keep])
+    high = np.maximum(coarse_sources[keep], coarse_targets[keep])
+    pairs, inverse = np.unique(low * n_coarse + high, return_inverse=True)
+    coarse_weights = np.bincount(inverse, weights=weights[keep], minlength=len(pairs))
+
+    return mapping, n_coarse, pairs // max(n_coarse, 1), pairs % max(n_coarse, 1), coarse_weights
+
+
+def multilevel_layout(
+        graph: nx.Graph,
+        iterations: int = DEFAULT_LAYOUT_ITERATIONS["multilevel"],
+        seed: Optional[int] = None,
+        weight: Optional[str] = "weight",
+        init_positions: Optional[Positions] = None,
+        coarsest_size: int = COARSEST_SIZE
+) -> Positions:
+    """Multilevel ForceAtlas2: lay out the coarsest graph of a heavy-edge matching hierarchy, then refine.
+
+    The coarsest graph gets `iterations` iterations, each finer level a quarter of them, starting from the
+    positions of the coarse nodes (plus a small jitter). With init_positions, the graph is refined directly
+    from those positions instead, for `iterations` iterations.
+    """
+    rng = np.random.default_rng(seed)
+    nodes, sources, targets, weights = graph_arrays(graph, weight)
+    n = len(nodes)
+    masses = 1.0 + np.bincount(np.concatenate((sources, targets)), minlength=n)
+
+    if init_positions:
+        positions = _warm_started(initial_positions(nodes, seed, init_positions), sources, targets, weights, masses)
+        positions = forceatlas2_positions(positions, sources, targets, weights, masses, iterations)
+        return _rescaled(nodes, pack_components(positions, sources, targets))
+
+    refinement_iterations = max(iterations // 4, 1)
+
+    # Hierarchy of (mapping to the coarser level, its edges and masses)
+    levels = [(None, n, sources, targets, weights, masses)]
+    while levels[-1][1] > coarsest_size:
+        _, size, level_sources, level_targets, level_weights, level_masses = levels[-1]
+        mapping, n_coarse, coarse_sources, coarse_targets, coarse_weights = coarsen(
+            size, level_sources, level_targets, level_weights, rng)
+        if n_coarse > size * (1 - MIN_COARSENING_RATIO):
+            break
+        levels[-1] = (mapping,) + levels[-1][1:]
+        levels.append((None, n_coarse, coarse_sources, coarse_targets, coarse_weights,
+                       np.bincount(mapping, weights=level_masses, minlength=n_coarse)))
+
+    _, size, level_sources, level_targets, level_weights, level_masses = levels[-1]
+    positions = forceatlas2_positions(rng.random((size, 2)) * np.sqrt(size), level_sources, level_targets,
+                                      level_weights, level_masses, iterations)
+
+    for mapping, size, level_sources, level_targets, level_weights, level_masses in reversed(levels[:-1]):
+        spread = max(float(np.ptp(positions, axis=0).max()), 1.0) / np.sqrt(size)
+        positions = positions[mapping] + rng.normal(scale=spread, size=(size, 2))
+        positions = forceatlas2_positions(positions, level_sources, level_targets, level_weights, level_masses,
+                                          refinement_iterations)
+
+    return _rescaled(nodes, pack_components(positions, sources, targets))
+
+
+def compute_layout(
+        graph: nx.Graph,
+        algorithm: str = "spring",
+        iterations: Optional[int] = None,
+        seed: Optional[int] = 42,
+        weight: Optional[str] = "weight",
+        init_positions: Optional[Positions] = None
+) -> Positions:
+    """Node positions of a graph with one of LAYOUT_ALGORITHMS.
+
+    Args:
+        graph: Network to lay out
+        algorithm: One of LAYOUT_ALGORITHMS, 'spring' and 'circular' are the networkx layouts
+        iterations: Number of iterations, None for the algorithm default (DEFAULT_LAYOUT_ITERATIONS)
+        seed: Seed of the initial random positions
+        weight: Edge attribute used as attraction weight, None for unweighted
+        init_positions: Initial positions of (some of) the nodes
+
+    Returns:
+        Dictionary of node -> position (numpy array [x, y])
+    """
+    if algorithm not in LAYOUT_ALGORITHMS:
+        raise ValueError(f"Unknown layout {algorithm}, valid layouts are {', '.join(LAYOUT_ALGORITHMS)}")
+
+    if algorithm == "circular":
+        return nx.circular_layout(graph)
+
+    iterations = iterations if iterations is not None else DEFAULT_LAYOUT_ITERATIONS[algorithm]
+    if algorithm == "spring":
+        return nx.spring_layout(graph, pos=init_positions or None, iterations=iterations, weight=weight, seed=seed)
+    if algorithm == "forceatlas2":
+        return forceatlas2_layout(graph, iterations, seed, weight, init_positions)
+    if algorithm == "sparse-spring":
+        return sparse_spring_layout(graph, iterations, seed, weight, init_positions)
+    return multilevel_layout(graph, iterations, seed, weight, init_positions)
+
+
+def warm_start_positions(graph: nx.Graph, init_positions: Positions, seed: Optional[int] = 42) -> Positions:
+    """Initial positions of all nodes of a graph from the positions of a previous layout.
+
+    Nodes of the previous layout keep their position. New nodes are placed at the mean position of their
+    already placed neighbours (closest to the previous layout first), and nodes without any placed neighbour
+    at random within the previous layout.
+    """
+    rng = np.random.default_rng(seed)
+    positions = {node: np.asarray(init_positions[node], dtype=np.float64)
+                 for node in graph.nodes() if node in init_positions}
+    if not positions:
+        return {}
+
+    coordinates = np.array(list(positions.values()))
+    low, high = coordinates.min(axis=0), coordinates.max(axis=0)
+    jitter = 0.01 * max(float((high - low).max()), 1e-6)
+
+    unplaced = [node for node in graph.nodes() if node not in positions]
+    while unplaced:
+        placed_now = {}
+        for node in unplaced:
+            neighbours = [positions[other] for other in nx.all_neighbors(graph, node) if other in positions]
+            if neighbours:
+                placed_now[node] = np.mean(neighbours, axis=0) + rng.normal(scale=jitter, size=2)
+        if not placed_now:
+            break
+        positions.update(placed_now)
+        unplaced = [node for node in unplaced if node not in placed_now]
+
+    for node in unplaced:
+        positions[node] = low + rng.random(2) * (high - low)
+    return positions
+
+
+def positions_hash(positions: Positions) -> str:
+    """Hash of node positions, independent of the node order."""
+    digest = hashlib.sha256()
+    for name, (x, y) in sorted((str(node), tuple(position)) for node, position in positions.items()):
+        digest.update(f"{name}\0{x:.6g}\0{y:.6g}\n".encode())
+    return digest.hexdigest()
+
+
+def layout_cache_key(
+        structure_hash: str,
+        algorithm: str,
+        iterations: int,
+        seed: Optional[int],
+        weight: Optional[str],
+        init_hash: Optional[str] = None
+) -> str:
+    """Cache key of a layout computed on a given graph with given parameters (and initial positions)."""
+    parameters = f"v{LAYOUT_CACHE_VERSION}-{algorithm}-i{iterations}-seed{seed}-{weight}-init{init_hash}"
+    return f"{structure_hash}-{hashlib.sha256(parameters.encode()).hexdigest()[:16]}"
+
+
+def save_layout(positions: Positions, path: str, algorithm: Optional[str] = None) -> None:
+    """Write node positions to a JSON layout file (nodes are stored by name)."""
+    layout = {
+        "version": LAYOUT_CACHE_VERSION,
+        "algorithm": algorithm,
+        "positions": {str(node): [float(x), float(y)] for node, (x, y) in positions.items()},
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(layout, file)
+
+
+def load_layout(path: str, graph: Optional[nx.Graph] = None) -> Positions:
+    """Read node positions from a layout file.
+
+    Args:
+        path: Layout file written by save_layout
+        graph: If given, names are mapped back to the nodes of the graph and unknown nodes are skipped
+
+    Returns:
+        Dictionary of node -> position (numpy array [x, y])
+    """
+    with open(path, "r") as file:
+        positions = json.load(file)["positions"]
+    if graph is None:
+        return {name: np.array(position) for name, position in positions.items()}
+    nodes_by_name = {str(node): node for node in graph.nodes()}
+    return {nodes_by_name[name]: np.array(position) for name, position in positions.items()
+            if name in nodes_by_name}
+
+
+def cached_layout(
+        graph: nx.Graph,
+        algorithm: str = "spring",
+        iterations: Optional[int] = None,
+        seed: Optional[int] = 42,
+        weight: Optional[str] = "weight",
+        init_positions: Optional[Positions] = None,
+        cache_dir: Optional[str] = None
+) -> Positions:
+    """compute_layout with an on-disk layout cache and warm starts from a previous layout.
+
+    Args:
+        graph: Network to lay out
+        algorithm: One of LAYOUT_ALGORITHMS
+        iterations: Number of iterations, None for the algorithm default, or WARM_START_ITERATION_RATIO of it
+            when starting from init_positions
+        seed: Seed of the initial random positions
+        weight: Edge attribute used as attraction weight, None for unweighted
+        init_positions: Positions of a previous layout (of the same or an overlapping network)
+        cache_dir: Directory of the layout cache, None to disable caching
+
+    Returns:
+        Dictionary of node -> position (numpy array [x, y])
+    """
+    if algorithm == "circular":
+        return compute_layout(graph, algorithm)
+
+    if init_positions:
+        init_positions = warm_start_positions(graph, init_positions, seed)
+        if iterations is None and init_positions and algorithm in DEFAULT_LAYOUT_ITERATIONS:
+            iterations = max(int(DEFAULT_LAYOUT_ITERATIONS[algorithm] * WARM_START_ITERATION_RATIO), 1)
+
+    key, cache_file = None, None
+    if cache_dir:
+        key = layout_cache_key(
+            graph_hash(graph, weight), algorithm,
+            iterations if iterations is not None else DEFAULT_LAYOUT_ITERATIONS.get(algorithm, 0),
+            seed, weight, positions_hash(init_positions) if init_positions else None
+        )
+        cache_file = os.path.join(cache_dir, f"{key}.layout")
+        if os.path.isfile(cache_file):
+            try:
+                positions = load_layout(cache_file, graph)
+                if len(positions) == graph.number_of_nodes():
+                    logger.debug(f"Reusing cached {algorithm} layout ({key})")
+                    return positions
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable layout cache {cache_file}: {e}")
+
+    positions = compute_layout(graph, algorithm, iterations, seed, weight, init_positions or None)
+
+    if cache_file:
+        try:
+            save_layout(positions, cache_file, algorithm)
+        except OSError as e:
+            logger.warning(f"Could not write layout cache in {cache_dir}: {e}")
+    return positions
+
+
+def _rescaled(nodes: List, positions: np.ndarray) -> Positions:
+    """Centre positions and scale them to [-1, 1], as the networkx layouts do."""
+    if len(nodes):
+        positions = nx.rescale_layout(positions.copy(), scale=1)
+    return dict(zip(nodes, positions))
@@ -0,0 +1,333 @@
+"""
+Network metrics of GraphML files, shared by compare-set-nofi-GraphML.py and compare-two-nofi-GraphML-metrics.py.
+
+Metrics are computed one file per worker process (see --jobs) and stored in a metrics cache keyed by the
+hash of the file content and the metric-set version, so that re-running a comparison with new plot options
+or additional files only computes the metrics of new or modified files.
+
+For very large networks (see --fast-metrics) calculate_fast_metrics replaces the exact clustering coefficient
+by a sampled triangle estimate with a 95% confidence interval, and counts components with a union-find over
+the edge arrays. Approximate metrics are flagged with 'approximate' so that the tools can label them.
+"""
+
+import hashlib
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from utils.unified_logger import logger
+
+# Bump when calculate_metrics changes, so that previously cached metrics are recomputed
+METRICS_VERSION = 2
+
+DEFAULT_CLUSTERING_TRIALS = 1000
+
+DEFAULT_METRICS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ScrapLogGit2Net", "metrics")
+
+# (filepath, metrics or None, error message or None)
+FileMetrics = Tuple[str, Optional[Dict[str, Any]], Optional[str]]
+
+
+def calculate_metrics(graph: nx.Graph) -> Dict[str, Any]:
+    """Calculate various network metrics."""
+    metrics: Dict[str, Any] = {}
+
+    # Basic metrics
+    metrics['num_nodes'] = graph.number_of_nodes()
+    metrics['num_edges'] = graph.number_of_edges()
+    metrics['num_isolates'] = nx.number_of_isolates(graph)
+
+    # Degree metrics
+    degrees = [d for n, d in graph.degree()]
+    metrics['avg_degree'] = float(np.mean(degrees)) if degrees else 0
+    metrics['max_degree'] = max(degrees) if degrees else 0
+    metrics['min_degree'] = min(degrees) if degrees else 0
+
+    # Graph properties
+    metrics['density'] = nx.density(graph) if metrics['num_nodes'] > 1 else 0
+
+    # Clustering coefficient (only for undirected graphs)
+    if not nx.is_directed(graph):
+        try:
+            metrics['avg_clustering'] = nx.average_clustering(graph)
+        except Exception:
+            metrics['avg_clustering'] = 0
+    else:
+        metrics['avg_clustering'] = 0
+
+    # Connected components
+    if nx.is_directed(graph):
+        # Use weakly connected components for directed graphs
+        components = list(nx.weakly_connected_components(graph))
+    else:
+        components = list(nx.connected_components(graph))
+
+    metrics['num_components'] = len(components)
+
+    # Size of largest component
+    if components:
+        largest_component = max(components, key=len)
+        metrics['largest_component_size'] = len(largest_component)
+        metrics['largest_component_percentage'] = (len(largest_component) / metrics['num_nodes']) * 100
+    else:
+        metrics['largest_component_size'] = 0
+        metrics['largest_component_percentage'] = 0
+
+    # Graph type
+    metrics['is_directed'] = nx.is_directed(graph)
+    metrics['is_weighted'] = nx.is_weighted(graph)
+    metrics['approximate'] = False
+
+    return metrics
+
+
+def edge_index_arrays(graph: nx.Graph) -> Tuple[np.ndarray, np.ndarray]:
+    """Source and target node indexes (in graph.nodes() order) of all edges of a graph."""
+    node_index = {node: index for index, node in enumerate(graph.nodes())}
+    endpoints = np.fromiter(
+        (node_index[node] for edge in graph.edges() for node in edge),
+        dtype=np.int64,
+        count=2 * graph.number_of_edges()
+    )
+    return endpoints[0::2], endpoints[1::2]
+
+
+def component_labels(n_nodes: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Connected component label of each node, ignoring edge direction.
+
+    Vectorised union-find: every edge hooks the larger root onto the smaller one, then the parent pointers
+    are compressed by pointer jumping, until no edge joins two different roots.
+    """
+    parent = np.arange(n_nodes, dtype=np.int64)
+    while True:
+        source_roots, target_roots = parent[sources], parent[targets]
+        joining = source_roots != target_roots
+        if not joining.any():
+            return parent
+        low = np.minimum(source_roots[joining], target_roots[joining])
+        high = np.maximum(source_roots[joining], target_roots[joining])
+        np.minimum.at(parent, high, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def clustering_confidence(estimate: float, trials: int, z: float = 1.96) -> float:
+    """Half-width of the (normal approximation) confidence interval of a sampled clustering coefficient."""
+    if trials <= 0:
+        return 0.0
+    return z * math.sqrt(max(estimate * (1 - estimate), 0.0) / trials)
+
+
+def calculate_fast_metrics(
+        graph: nx.Graph,
+        trials: int = DEFAULT_CLUSTERING_TRIALS,
+        seed: Optional[int] = 42
+) -> Dict[str, Any]:
+    """Calculate the metrics of calculate_metrics with approximate clustering for very large networks.
+
+    Degree, density and component metrics are exact but computed with NumPy over the edge arrays. The
+    average clustering coefficient is estimated from `trials` sampled triangles (undirected graphs only).
+
+    Args:
+        graph: Network
+        trials: Number of sampled node/neighbour-pair trials of the clustering estimate
+        seed: Seed of the clustering sampler, for reproducible reports
+
+    Returns:
+        Metrics with 'approximate' set and the confidence ('avg_clustering_ci') of the clustering estimate
+    """
+    metrics: Dict[str, Any] = {}
+    n_nodes = graph.number_of_nodes()
+    n_edges = graph.number_of_edges()
+    directed = nx.is_directed(graph)
+    sources, targets = edge_index_arrays(graph)
+
+    metrics['num_nodes'] = n_nodes
+    metrics['num_edges'] = n_edges
+
+    # Degree metrics (a self-loop counts twice, as in graph.degree())
+    degrees = np.bincount(np.concatenate((sources, targets)), minlength=n_nodes)
+    metrics['num_isolates'] = int(np.count_nonzero(degrees == 0))
+    metrics['avg_degree'] = float(degrees.mean()) if n_nodes else 0
+    metrics['max_degree'] = int(degrees.max()) if n_nodes else 0
+    metrics['min_degree'] = int(degrees.min()) if n_nodes else 0
+
+    # Graph properties
+    if n_nodes > 1:
+        possible_edges = n_nodes * (n_nodes - 1)
+        metrics['density'] = n_edges / (possible_edges if directed else possible_edges / 2)
+    else:
+        metrics['density'] = 0
+
+    # Sampled clustering coefficient (only for undirected graphs)
+    metrics['clustering_trials'] = 0
+    metrics['avg_clustering'] = 0
+    if not directed and n_nodes:
+        try:
+            metrics['avg_clustering'] = nx.approximation.average_clustering(graph, trials=trials, seed=seed)
+            metrics['clustering_trials'] = trials
+        except Exception:
+            metrics['avg_clustering'] = 0
+    metrics['avg_clustering_ci'] = clustering_confidence(metrics['avg_clustering'], metrics['clustering_trials'])
+
+    # Connected components (weakly connected for directed graphs)
+    if n_nodes:
+        component_sizes = np.bincount(component_labels(n_nodes, sources, targets))
+        component_sizes = component_sizes[component_sizes > 0]
+        metrics['num_components'] = len(component_sizes)
+        metrics['largest_component_size'] = int(component_sizes.max())
+        metrics['largest_component_percentage'] = (metrics['largest_component_size'] / n_nodes) * 100
+    else:
+        metrics['num_components'] = 0
+        metrics['largest_component_size'] = 0
+        metrics['largest_component_percentage'] = 0
+
+    # Graph type
+    metrics['is_directed'] = directed
+    metrics['is_weighted'] = nx.is_weighted(graph)
+    metrics['approximate'] = True
+
+    return metrics
+
+
+def format_clustering(metrics: Dict[str, Any], decimals: int = 3) -> str:
+    """Average clustering coefficient of metrics, labelled '≈value±ci' when it is a sampled estimate."""
+    value = f"{metrics['avg_clustering']:.{decimals}f}"
+    if not metrics.get('approximate') or not metrics.get('clustering_trials'):
+        return value
+    return f"≈{value}±{metrics['avg_clustering_ci']:.{decimals}f}"
+
+
+def file_hash(filepath: str) -> str:
+    """SHA-256 of the content of a file."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def metrics_cache_key(content_hash: str, metric_set: str = "exact") -> str:
+    """Cache key of the metrics of a file content computed with a given metric set."""
+    return f"{content_hash}-v{METRICS_VERSION}-{metric_set}"
+
+
+def read_cached_metrics(cache_dir: Optional[str], key: str) -> Optional[Dict[str, Any]]:
+    """Cached metrics of a key, None if not cached."""
+    if not cache_dir:
+        return None
+
+    cache_file = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, "r") as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable metrics cache {cache_file}: {e}")
+        return None
+
+
+def write_cached_metrics(cache_dir: Optional[str], key: str, metrics: Dict[str, Any]) -> None:
+    """Store the metrics of a key in the cache."""
+    if not cache_dir:
+        return
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, f"{key}.json"), "w") as file:
+            json.dump(metrics, file)
+    except OSError as e:
+        logger.warning(f"Could not write metrics cache in {cache_dir}: {e}")
+
+
+def compute_file_metrics(
+        filepath: str,
+        fast_metrics: bool = False,
+        clustering_trials: int = DEFAULT_CLUSTERING_TRIALS
+) -> FileMetrics:
+    """Read a GraphML file and calculate its metrics (worker of compute_metrics_for_files)."""
+    try:
+        graph = nx.read_graphml(filepath)
+    except Exception as e:
+        return filepath, None, str(e)
+    if fast_metrics:
+        return filepath, calculate_fast_metrics(graph, trials=clustering_trials), None
+    return filepath, calculate_metrics(graph), None
+
+
+def compute_metrics_for_files(
+        filepaths: List[str],
+        jobs: int = 1,
+        cache_dir: Optional[str] = None,
+        on_result: Optional[Callable[[FileMetrics, bool], None]] = None,
+        fast_metrics: bool = False,
+        clustering_trials: int = DEFAULT_CLUSTERING_TRIALS
+) -> List[FileMetrics]:
+    """Calculate the metrics of many GraphML files, reusing cached metrics.
+
+    Args:
+        filepaths: GraphML files
+        jobs: Number of worker processes, one file per worker at a time
+        cache_dir: Directory of the metrics cache, None to disable caching
+        on_result: Called with (result, from_cache) as soon as the metrics of a file are available
+        fast_metrics: Use calculate_fast_metrics (sampled clustering) instead of the exact metrics
+        clustering_trials: Number of trials of the sampled clustering coefficient with fast_metrics
+
+    Returns:
+        One (filepath, metrics, error) tuple per file, in the order of filepaths
+    """
+    results: Dict[str, FileMetrics] = {}
+    keys: Dict[str, str] = {}
+    missing: List[str] = []
+    metric_set = f"fast-t{clustering_trials}" if fast_metrics else "exact"
+
+    for filepath in filepaths:
+        if cache_dir:
+            try:
+                keys[filepath] = metrics_cache_key(file_hash(filepath), metric_set)
+            except OSError as e:
+                results[filepath] = (filepath, None, str(e))
+                if on_result:
+                    on_result(results[filepath], False)
+                continue
+
+            cached = read_cached_metrics(cache_dir, keys[filepath])
+            if cached is not None:
+                results[filepath] = (filepath, cached, None)
+                if on_result:
+                    on_result(results[filepath], True)
+                continue
+        missing.append(filepath)
+
+    def collect(result: FileMetrics) -> None:
+        filepath, metrics, _ = result
+        results[filepath] = result
+        if metrics is not None and filepath in keys:
+            write_cached_metrics(cache_dir, keys[filepath], metrics)
+        if on_result:
+            on_result(result, False)
+
+    if fast_metrics:
+        compute = partial(compute_file_metrics, fast_metrics=True, clustering_trials=clustering_trials)
+    else:
+        compute = compute_file_metrics
+
+    if jobs > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(missing))) as executor:
+            futures = [executor.submit(compute, filepath) for filepath in missing]
+            for future in as_completed(futures):
+                collect(future.result())
+    else:
+        for filepath in missing:
+            collect(compute(filepath))
+
+    return [results[filepath] for filepath in filepaths]
@@ -0,0 +1,142 @@
+"""
+Organization analysis of networks of individuals, shared by the formatFilterAndReport tools.
+
+Affiliations are encoded to integer codes once, and the edges of the network are counted in a single
+vectorised pass into a sparse organization x organization contingency matrix C where C[a, b] is the number
+of edges between developers of organizations a and b, and C[a, a] the number of edges within organization a.
+
+Intra/inter-organization edges, per-organization degree, the E-I index and the ties between each pair of
+organizations are all derived from C.
+
+See for more information on the E-I index
+----
+Krackhardt, D., & Stern, R. N. (1988). Informal networks and organizational crises: An experimental
+simulation. Social Psychology Quarterly, 51(2), 123-140.
+----
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+
+@dataclass
+class OrganizationAnalysis:
+    """Organization x organization edge counts of a network of individuals."""
+    organizations: List[str]
+    # Organization code of each node, in graph.nodes() order
+    node_codes: np.ndarray
+    # Whether each node has a (non-empty) affiliation attribute
+    affiliated: np.ndarray
+    # Symmetric organization x organization edge counts, intra-organization edges on the diagonal
+    contingency: sparse.csr_matrix
+
+    @property
+    def intra_organization_edges(self) -> int:
+        return int(self.contingency.diagonal().sum())
+
+    @property
+    def inter_organization_edges(self) -> int:
+        return int((self.contingency.sum() - self.contingency.diagonal().sum()) // 2)
+
+    def node_counts(self, include_unaffiliated: bool = False) -> Dict[str, int]:
+        """Number of nodes per organization, sorted by decreasing count."""
+        codes = self.node_codes if include_unaffiliated else self.node_codes[self.affiliated]
+        counts = np.bincount(codes, minlength=len(self.organizations))
+        return self._sorted_counts(counts)
+
+    def intra_edge_counts(self) -> Dict[str, int]:
+        """Number of edges within each organization, for organizations with any, sorted by decreasing count."""
+        return self._sorted_counts(self.contingency.diagonal())
+
+    def inter_edge_counts(self) -> np.ndarray:
+        """Number of edges between each organization and the other organizations."""
+        return np.asarray(self.contingency.sum(axis=1)).ravel() - self.contingency.diagonal()
+
+    def degrees(self) -> np.ndarray:
+        """Sum of the degrees of the members of each organization (intra edges count for both ends)."""
+        return np.asarray(self.contingency.sum(axis=1)).ravel() + self.contingency.diagonal()
+
+    def ei_indexes(self) -> np.ndarray:
+        """E-I index (external - internal) / (external + internal) of each organization, NaN without edges."""
+        internal = self.contingency.diagonal().astype(np.float64)
+        external = self.inter_edge_counts().astype(np.float64)
+        total = external + internal
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(total > 0, (external - internal) / total, np.nan)
+
+    @property
+    def ei_index(self) -> float:
+        """E-I index of the whole network, NaN without edges."""
+        intra, inter = self.intra_organization_edges, self.inter_organization_edges
+        return (inter - intra) / (inter + intra) if inter + intra else float("nan")
+
+    def organization_pair_ties(self) -> List[Tuple[str, str, int]]:
+        """Edges between each pair of different organizations, sorted by decreasing count."""
+        upper = sparse.triu(self.contingency, k=1).tocoo()
+        order = np.lexsort((upper.col, upper.row, -upper.data))
+        return [
+            (self.organizations[upper.row[i]], self.organizations[upper.col[i]], int(upper.data[i]))
+            for i in order
+        ]
+
+    def _sorted_counts(self, counts: np.ndarray) -> Dict[str, int]:
+        # Stable sort keeps the first-seen order of organizations with the same count
+        order = np.argsort(-counts, kind="stable")
+        return {self.organizations[i]: int(counts[i]) for i in order if counts[i] > 0}
+
+
+def analyze_organizations(
+        graph: nx.Graph,
+        attribute: str = "affiliation",
+        missing: str = "unknown"
+) -> OrganizationAnalysis:
+    """Encode affiliations and count edges in an organization x organization contingency matrix.
+
+    Args:
+        graph: Network of individuals with an affiliation node attribute
+        attribute: Node attribute holding the affiliation
+        missing: Organization of nodes without the attribute
+
+    Returns:
+        OrganizationAnalysis of the network
+    """
+    organization_codes: Dict[str, int] = {}
+    node_index: Dict = {}
+    codes: List[int] = []
+    affiliated: List[bool] = []
+
+    for index, (node, data) in enumerate(graph.nodes(data=True)):
+        affiliation = data.get(attribute, missing)
+        node_index[node] = index
+        codes.append(organization_codes.setdefault(affiliation, len(organization_codes)))
+        affiliated.append(bool(data.get(attribute)))
+
+    node_codes = np.array(codes, dtype=np.int64)
+    n_organizations = len(organization_codes)
+
+    endpoints = np.fromiter(
+        (node_index[node] for node in chain.from_iterable(graph.edges())),
+        dtype=np.int64,
+        count=2 * graph.number_of_edges()
+    )
+    source_codes = node_codes[endpoints[0::2]]
+    target_codes = node_codes[endpoints[1::2]]
+
+    counts = sparse.coo_matrix(
+        (np.ones(len(source_codes), dtype=np.int64), (source_codes, target_codes)),
+        shape=(n_organizations, n_organizations)
+    ).tocsr()
+    # Make the matrix symmetric without counting intra-organization edges twice
+    contingency = (counts + counts.T - sparse.diags(counts.diagonal(), dtype=np.int64)).tocsr()
+
+    return OrganizationAnalysis(
+        organizations=list(organization_codes),
+        node_codes=node_codes,
+        affiliated=np.array(affiliated, dtype=bool),
+        contingency=contingency
+    )
@@ -0,0 +1,209 @@
+"""
+Compiled include/exclude filters of the file paths listed in a git changelog.
+
+Rules are written like .gitignore patterns and sorted by kind when the filter is compiled:
+
+- "*.py": extension rules, looked up in a dict by the lower-cased extension of the path (as given to -ie/-xe),
+- "third_party/**" or "third_party/": directory rules, matched by walking a trie of path components,
+- "*.pb.txt", "tensorflow/**/BUILD", "docs/*.md": glob rules, all matched by one combined regex. "*" and "?"
+  stay within a path component, "**" spans components, and globs without "/" match the last component at
+  any depth,
+- "README.md": exact paths, looked up in a set (the lines of a -ff/--filter-files file).
+
+A path is kept if it matches no exclude rule and, when there are include rules, at least one include rule.
+Paths are matched as plain strings, without allocating a pathlib.Path per file, and the number of files
+each rule matched is counted for the processing summary.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+GLOB_CHARACTERS = frozenset("*?[")
+
+# Rule reported for the paths that match none of the include rules
+NOT_INCLUDED = "(no include rule)"
+
+_EXTENSION_RULE = re.compile(r"^\*(\.[^./*?\[]+)$")
+_DIRECTORY_RULE = re.compile(r"^/?([^*?\[]+?)/(\*\*)?$")
+
+# Key of the rule ending at a trie node (never a path component)
+_RULE = None
+
+
+def path_suffix(path: str) -> str:
+    """Lower-cased extension of the last component of a path, as pathlib.PurePath(path).suffix.lower()."""
+    name = path[path.rfind("/") + 1:]
+    i = name.rfind(".")
+    return name[i:].lower() if 0 < i < len(name) - 1 else ""
+
+
+def extension_rule(extension: str) -> str:
+    """Rule of a -ie/-xe extension: '.py' or 'py' -> '*.py'."""
+    return "*" + (extension if extension.startswith(".") else f".{extension}")
+
+
+def rule_kind(rule: str) -> str:
+    """Kind of a rule: 'extension', 'directory', 'glob' or 'exact' (see the module docstring)."""
+    if _EXTENSION_RULE.match(rule):
+        return "extension"
+    if _DIRECTORY_RULE.match(rule):
+        return "directory"
+    if GLOB_CHARACTERS.intersection(rule):
+        return "glob"
+    return "exact"
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    Regex matching the paths of a glob pattern (to be used with fullmatch).
+
+    "*" and "?" match within a path component, "**" across components ("**/" also matches no directory),
+    and [...] is a character class ("[!...]" negated). Patterns without "/" match the last path component.
+    """
+    anchored = "/" in pattern.rstrip("/")
+    pattern = pattern.lstrip("/")
+    if pattern.endswith("/"):
+        pattern += "**"
+
+    parts: List[str] = [] if anchored else ["(?:.*/)?"]
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) else i + 1)
+            if end < 0:
+                parts.append(re.escape(c))
+            else:
+                members = pattern[i + 1:end]
+                if members.startswith("!"):
+                    members = "^" + members[1:]
+                parts.append("[" + members.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+def rule_to_regex(rule: str) -> str:
+    """
+    Regex matching the paths of a directory or glob rule (to be used with fullmatch).
+
+    Directory rules match the paths below that directory from the root of the repository, as when a
+    PathFilter walks its trie, rather than below a directory of that name at any depth.
+    """
+    if rule_kind(rule) == "directory":
+        return re.escape(_DIRECTORY_RULE.match(rule).group(1)) + "/.*"
+    return glob_to_regex(rule)
+
+
+class _CompiledRules:
+    """Rules of one side (include or exclude) of a PathFilter, indexed by kind."""
+
+    def __init__(self, rules: Iterable[str]):
+        self.rules: List[str] = list(dict.fromkeys(rules))
+        self.exact: Set[str] = set()
+        self.extensions: Dict[str, str] = {}
+        self.directories: Dict = {}
+        globs: List[str] = []
+
+        for rule in self.rules:
+            kind = rule_kind(rule)
+            if kind == "exact":
+                self.exact.add(rule)
+            elif kind == "extension":
+                self.extensions.setdefault(rule[1:].lower(), rule)
+            elif kind == "directory":
+                node = self.directories
+                for component in _DIRECTORY_RULE.match(rule).group(1).split("/"):
+                    node = node.setdefault(component, {})
+                node.setdefault(_RULE, rule)
+            else:
+                globs.append(rule)
+
+        self.globs = globs
+        self.regex = re.compile("|".join(f"(?P<g{i}>{glob_to_regex(glob)})" for i, glob in enumerate(globs))) \
+            if globs else None
+
+    def match(self, path: str) -> Optional[str]:
+        """First rule matching a path (exact, extension, directory, then glob rules), None if none does."""
+        if path in self.exact:
+            return path
+        if self.extensions:
+            rule = self.extensions.get(path_suffix(path))
+            if rule is not None:
+                return rule
+        if self.directories:
+            node = self.directories
+            for component in path.split("/")[:-1]:
+                node = node.get(component)
+                if node is None:
+                    break
+                if _RULE in node:
+                    return node[_RULE]
+        if self.regex is not None:
+            match = self.regex.fullmatch(path)
+            if match:
+                return self.globs[int(match.lastgroup[1:])]
+        return None
+
+
+class PathFilter:
+    """
+    Include and exclude rules compiled into one matcher, counting the files matched by each rule.
+
+    Example:
+        >>> path_filter = PathFilter(include=["*.py", "*.cc"], exclude=["third_party/**", "*_test.py"])
+        >>> path_filter.keeps("tensorflow/python/ops/math_ops.py")
+        True
+        >>> path_filter.rejecting_rule("third_party/xla/service.cc")
+        'third_party/**'
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = ()):
+        self.include = _CompiledRules(include)
+        self.exclude = _CompiledRules(exclude)
+        self.hits: Counter = Counter()
+
+    def __bool__(self) -> bool:
+        return bool(self.include.rules or self.exclude.rules)
+
+    def rejecting_rule(self, path: str) -> Optional[str]:
+        """
+        Exclude rule matching a path, NOT_INCLUDED if it matches none of the include rules, None to keep it.
+
+        Counts the rule deciding the fate of the path in self.hits, by (side, rule).
+        """
+        rule = self.exclude.match(path) if self.exclude.rules else None
+        if rule is not None:
+            self.hits["exclude", rule] += 1
+            return rule
+        if self.include.rules:
+            rule = self.include.match(path)
+            self.hits["include", rule if rule is not None else NOT_INCLUDED] += 1
+            return None if rule is not None else NOT_INCLUDED
+        return None
+
+    def keeps(self, path: str) -> bool:
+        return self.rejecting_rule(path) is None
+
+    def hit_counts(self) -> List[Tuple[str, str, int]]:
+        """(side, rule, files matched) of every rule, include rules first, in the order they were given."""
+        rules = [("include", rule) for rule in self.include.rules]
+        if self.include.rules:
+            rules.append(("include", NOT_INCLUDED))
+        rules.extend(("exclude", rule) for rule in self.exclude.rules)
+        return [(side, rule, self.hits[side, rule]) for side, rule in rules]
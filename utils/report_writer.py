@@ -0,0 +1,200 @@
+"""
+Report writer shared by the formatFilterAndReport tools.
+
+Sheets are streamed row by row to every requested output format, so that reports of 50k-node networks
+are never held in memory as a whole:
+
+- xlsx: a single workbook written with openpyxl in write-only mode (no 65,536 rows limit of legacy .xls)
+- csv: one <prefix>_<sheet>.csv file per sheet
+- parquet: one <prefix>_<sheet>.parquet file per sheet, written in row groups (requires pyarrow)
+"""
+
+import argparse
+import csv
+import re
+from typing import Any, Iterable, List, Optional, Sequence
+
+from openpyxl import Workbook
+
+from utils.unified_logger import logger
+
+REPORT_FORMATS = ("xlsx", "csv", "parquet")
+
+# Number of rows buffered before a Parquet row group is written
+PARQUET_BATCH_SIZE = 10000
+
+# Excel limits sheet titles to 31 characters, without []:*?/\
+_INVALID_SHEET_TITLE = re.compile(r"[\[\]:*?/\\]")
+
+
+def sheet_file_suffix(sheet_name: str) -> str:
+    """File name suffix of a sheet in the CSV and Parquet outputs, e.g. 'Nodes (Developers)' -> 'nodes_developers'."""
+    return re.sub(r"[^A-Za-z0-9]+", "_", sheet_name).strip("_").lower()
+
+
+def parse_report_formats(value: str) -> List[str]:
+    """argparse type for a comma-separated list of report formats."""
+    formats = [item.strip().lower() for item in value.split(",") if item.strip()]
+    unknown = [report_format for report_format in formats if report_format not in REPORT_FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"unknown report format(s) {unknown}, expected any of {', '.join(REPORT_FORMATS)}")
+    return formats
+
+
+class _ParquetSheet:
+    """Writes the rows of one sheet to a Parquet file, one row group per PARQUET_BATCH_SIZE rows."""
+
+    def __init__(self, filename: str, header: Sequence[str]):
+        self.filename = filename
+        self.header = list(header)
+        self.rows: List[Sequence[Any]] = []
+        self.writer = None
+        self.string_columns: Optional[List[bool]] = None
+
+    def append(self, row: Sequence[Any]) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= PARQUET_BATCH_SIZE:
+            self.flush()
+
+    def _table(self):
+        import pyarrow as pa
+
+        columns = [list(column) for column in zip(*self.rows)] if self.rows else [[] for _ in self.header]
+        if self.string_columns is None:
+            # Columns mixing types (e.g. a 'Value' column of statistics) are written as strings
+            self.string_columns = []
+            for column in columns:
+                try:
+                    pa.array(column)
+                    self.string_columns.append(False)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    self.string_columns.append(True)
+
+        arrays = [
+            pa.array([None if value is None else str(value) for value in column], type=pa.string())
+            if as_string else pa.array(column)
+            for column, as_string in zip(columns, self.string_columns)
+        ]
+        table = pa.Table.from_arrays(arrays, names=self.header)
+        if self.writer is not None:
+            table = table.cast(self.writer.schema)
+        return table
+
+    def flush(self) -> None:
+        import pyarrow.parquet as pq
+
+        if not self.rows and self.writer is not None:
+            return
+        table = self._table()
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.filename, table.schema)
+        self.writer.write_table(table)
+        self.rows = []
+
+    def close(self) -> None:
+        self.flush()
+        self.writer.close()
+
+
+class ReportWriter:
+    """Streams report sheets to .xlsx, CSV and Parquet outputs at once.
+
+    Example:
+        with ReportWriter("network_report", ["xlsx", "csv"]) as writer:
+            writer.write_sheet("Nodes", ["Node ID", "Affiliation"], rows)
+        print(writer.output_files)
+    """
+
+    def __init__(self, output_prefix: str, formats: Sequence[str] = ("xlsx",)):
+        """
+        Args:
+            output_prefix: Path prefix of the output files, without extension
+            formats: Any of REPORT_FORMATS
+
+        Raises:
+            ValueError: If a format is unknown
+            ImportError: If parquet is requested and pyarrow is not installed
+        """
+        unknown = [report_format for report_format in formats if report_format not in REPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown report format(s) {unknown}, expected any of {REPORT_FORMATS}")
+
+        if "parquet" in formats:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError("Parquet reports require pyarrow (pip install pyarrow)") from e
+
+        self.output_prefix = output_prefix
+        self.formats = list(formats)
+        self.output_files: List[str] = []
+        self.workbook: Optional[Workbook] = Workbook(write_only=True) if "xlsx" in self.formats else None
+
+    def write_sheet(self, name: str, header: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """Stream the rows of one sheet to every output format.
+
+        Args:
+            name: Sheet name, also used to name the CSV and Parquet files
+            header: Column names
+            rows: Iterable of rows, consumed once
+
+        Returns:
+            Number of rows written (header excluded)
+        """
+        suffix = sheet_file_suffix(name)
+        worksheet = None
+        csv_file = csv_writer = parquet_sheet = None
+
+        if self.workbook is not None:
+            worksheet = self.workbook.create_sheet(_INVALID_SHEET_TITLE.sub("_", name)[:31])
+            worksheet.append(list(header))
+        if "csv" in self.formats:
+            csv_filename = f"{self.output_prefix}_{suffix}.csv"
+            csv_file = open(csv_filename, "w", newline="", encoding="utf-8")
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(header)
+            self.output_files.append(csv_filename)
+        if "parquet" in self.formats:
+            parquet_sheet = _ParquetSheet(f"{self.output_prefix}_{suffix}.parquet", header)
+            self.output_files.append(parquet_sheet.filename)
+
+        n_rows = 0
+        try:
+            for row in rows:
+                row = list(row)
+                if worksheet is not None:
+                    worksheet.append(row)
+                if csv_writer is not None:
+                    csv_writer.writerow(row)
+                if parquet_sheet is not None:
+                    parquet_sheet.append(row)
+                n_rows += 1
+        finally:
+            if csv_file is not None:
+                csv_file.close()
+            if parquet_sheet is not None:
+                parquet_sheet.close()
+
+        logger.debug(f"Wrote {n_rows} rows to sheet {name}")
+        return n_rows
+
+    def close(self) -> List[str]:
+        """Save the workbook, if any.
+
+        Returns:
+            Paths of all the written files, the .xlsx workbook first
+        """
+        if self.workbook is not None:
+            xlsx_filename = f"{self.output_prefix}.xlsx"
+            self.workbook.save(xlsx_filename)
+            self.workbook = None
+            self.output_files.insert(0, xlsx_filename)
+        return self.output_files
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
@@ -1,18 +1,84 @@
+import math
 import sys
+from collections import Counter, defaultdict
 from difflib import SequenceMatcher
 from itertools import combinations
-from typing import Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from utils.unified_console import console
 
+CharToken = Tuple[str, int]
 
-def find_similar_strings(strings: set[str], similarity_threshold: float = 0.8) -> set[Tuple[str, str, float]]:
+
+def char_tokens(string: str) -> List[CharToken]:
+    """Characters of a string numbered by occurrence, so that its multiset of characters becomes a set."""
+    seen: Dict[str, int] = defaultdict(int)
+    tokens = []
+    for char in string:
+        tokens.append((char, seen[char]))
+        seen[char] += 1
+    return tokens
+
+
+def prefix_length(length: int, similarity_threshold: float) -> int:
+    """
+    Number of rarest characters of a string to index so that no pair above the threshold is missed.
+
+    A SequenceMatcher ratio 2*M/(len(a)+len(b)) of at least t needs M >= t*len(a)/(2-t) matching characters,
+    and M is bounded by the common characters of the two strings. Two strings sharing that many characters
+    share at least one of their length - ceil(t*length/(2-t)) + 1 rarest ones.
+    """
+    if length == 0:
+        return 0
+    required_overlap = max(1, math.ceil(similarity_threshold * length / (2 - similarity_threshold) - 1e-9))
+    return max(0, length - required_overlap + 1)
+
+
+def candidate_pairs(strings: List[str], similarity_threshold: float) -> Iterable[Tuple[int, int]]:
+    """
+    Index pairs (i, j), i < j, of strings that may be at least similarity_threshold similar.
+
+    Strings are blocked on their rarest characters (prefix filtering): each string is indexed by the prefix
+    of its characters ordered by increasing corpus frequency, and only strings sharing a prefix character
+    are compared. The filter is lossless for SequenceMatcher ratios (see prefix_length).
+    """
+    tokens = [char_tokens(string) for string in strings]
+    frequency = Counter(token for string_tokens in tokens for token in set(string_tokens))
+
+    index: Dict[CharToken, List[int]] = defaultdict(list)
+    empty: List[int] = []
+    for j, string_tokens in enumerate(tokens):
+        if not string_tokens:
+            # Empty strings are only similar to each other
+            yield from ((i, j) for i in empty)
+            empty.append(j)
+            continue
+
+        prefix = sorted(string_tokens, key=lambda token: (frequency[token], token))
+        prefix = prefix[:prefix_length(len(string_tokens), similarity_threshold)]
+        candidates: Set[int] = set()
+        for token in prefix:
+            candidates.update(index[token])
+            index[token].append(j)
+        yield from ((i, j) for i in sorted(candidates))
+
+
+def find_similar_strings(
+        strings: set[str],
+        similarity_threshold: float = 0.8,
+        top_k: Optional[int] = None
+) -> set[Tuple[str, str, float]]:
     """
     Find pairs of strings that are at least n% similar to each other.
 
+    Candidate pairs are found by character blocking (see candidate_pairs) and only they are scored with
+    difflib.SequenceMatcher, so the pairs are the same as comparing all pairs, in near-linear time for
+    dissimilar strings such as email domains.
+
     Args:
         strings: List of strings to compare
         similarity_threshold: Minimum similarity ratio (0.0 to 1.0), e.g., 0.8 for 80%
+        top_k: Only keep the top_k most similar pairs (all pairs if None)
 
     Returns:
         List of tuples (string1, string2, similarity_score) for pairs above threshold
@@ -21,16 +87,25 @@ def find_similar_strings(strings: set[str], similarity_threshold: float = 0.8) -
         console.print()
         sys.exit()
 
-    similar_pairs = []
+    # Same order as iterating over the strings, so that pairs keep their orientation
+    candidates = [string for string in strings if string is not None]
 
-    # Generate all unique pairs of strings
-    for str1, str2 in combinations(strings, 2):
+    if similarity_threshold <= 0:
+        pairs = combinations(range(len(candidates)), 2)
+    else:
+        pairs = candidate_pairs(candidates, similarity_threshold)
 
-        if None in (str1, str2):
+    similar_pairs = []
+    for i, j in pairs:
+        str1, str2 = candidates[i], candidates[j]
+        matcher = SequenceMatcher(None, str1, str2)
+
+        # Cheap upper bounds of the ratio first
+        if matcher.real_quick_ratio() < similarity_threshold or matcher.quick_ratio() < similarity_threshold:
             continue
 
         # Calculate similarity ratio (0.0 to 1.0)
-        similarity = SequenceMatcher(None, str1, str2).ratio()
+        similarity = matcher.ratio()
 
         if similarity >= similarity_threshold:
             similar_pairs.append((str1, str2, similarity))
@@ -38,4 +113,7 @@ def find_similar_strings(strings: set[str], similarity_threshold: float = 0.8) -
     # Sort by similarity score (highest first)
     similar_pairs.sort(key=lambda x: x[2], reverse=True)
 
+    if top_k is not None:
+        similar_pairs = similar_pairs[:top_k]
+
     return set(similar_pairs)
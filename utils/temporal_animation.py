@@ -0,0 +1,278 @@
+"""
+Animation of temporal networks that draws the union graph once and only restyles it per frame.
+
+The nodes and edges of all snapshots are drawn once, as one scatter and one LineCollection (see
+utils/rendering.py), and node labels as one text artist per node. A frame then only updates the
+face colours of the nodes and the colours of the edges (fully transparent when absent from the
+snapshot), the visibility of the labels and the title, which is cheap enough to blit interactively.
+
+Animations are written as GIF (pillow), MP4 or WebM (ffmpeg) or as a PNG image sequence. Frames can
+be rendered in parallel worker processes, each building the figure once, as a PNG sequence that
+ffmpeg or pillow then encodes.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import matplotlib
+import matplotlib.animation as animation
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+from matplotlib.colors import to_rgba
+
+from utils.rendering import draw_edges, draw_nodes
+
+# Output formats by file extension, "png" being an image sequence in a directory
+ANIMATION_FORMATS = ("gif", "mp4", "webm", "png")
+
+DEFAULT_FPS = 2
+
+FRAME_FILE_PATTERN = "frame_%05d.png"
+
+# Codec options of ffmpeg by output format
+FFMPEG_CODECS = {
+    "mp4": ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"],
+    "webm": ["-c:v", "libvpx-vp9", "-b:v", "0", "-crf", "32"],
+}
+
+
+def animation_format(path: str) -> str:
+    """Output format of an animation path: its extension, or "png" for a directory (image sequence)."""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if not extension:
+        return "png"
+    if extension not in ANIMATION_FORMATS:
+        raise ValueError(f"Unknown animation format: {extension}, choose one of {ANIMATION_FORMATS}")
+    return extension
+
+
+def ffmpeg_available() -> bool:
+    """Whether the ffmpeg executable needed for MP4/WebM outputs is installed."""
+    return animation.writers.is_available("ffmpeg")
+
+
+def union_graph(snapshots: Sequence[nx.Graph]) -> nx.Graph:
+    """Undirected graph of the nodes and edges of all snapshots, in order of first appearance."""
+    union = nx.Graph()
+    for snapshot in snapshots:
+        union.add_nodes_from(snapshot.nodes())
+        union.add_edges_from(snapshot.edges())
+    return union
+
+
+def frame_masks(snapshots: Sequence[nx.Graph], union: nx.Graph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Presence of the nodes and edges of the union graph in each snapshot.
+
+    Returns:
+        (frames, nodes) and (frames, edges) boolean arrays, in union.nodes() and union.edges() order
+    """
+    node_index = {node: i for i, node in enumerate(union.nodes())}
+    edge_index = {}
+    for i, (u, v) in enumerate(union.edges()):
+        edge_index[(u, v)] = edge_index[(v, u)] = i
+
+    node_masks = np.zeros((len(snapshots), union.number_of_nodes()), dtype=bool)
+    edge_masks = np.zeros((len(snapshots), union.number_of_edges()), dtype=bool)
+    for frame, snapshot in enumerate(snapshots):
+        node_masks[frame, [node_index[node] for node in snapshot.nodes()]] = True
+        edge_masks[frame, [edge_index[(u, v)] for u, v in snapshot.edges()]] = True
+    return node_masks, edge_masks
+
+
+class TemporalAnimation:
+    """
+    Figure of the union graph of temporal snapshots, restyled in place for each frame.
+
+    Args:
+        snapshots: Snapshots of the temporal network (e.g. a sliced networkx-temporal graph)
+        pos: Positions of all the nodes of the snapshots
+        titles: Title of each frame
+        figsize: Figure size as (width, height)
+        show_labels: Whether to show node labels
+        node_size: Size of nodes
+        node_color: Color of nodes
+        edge_color: Color of edges
+        edge_width: Width of edges
+        dpi: Resolution of the figure
+    """
+
+    def __init__(
+            self,
+            snapshots: Sequence[nx.Graph],
+            pos: Dict[Hashable, Any],
+            titles: Sequence[str],
+            figsize: Tuple[float, float] = (15, 10),
+            show_labels: bool = True,
+            node_size: float = 300,
+            node_color: Any = "lightblue",
+            edge_color: Any = "gray",
+            edge_width: float = 2,
+            dpi: int = 100
+    ):
+        self.n_frames = len(snapshots)
+        self.titles = list(titles)
+        union = union_graph(snapshots)
+        self.node_masks, self.edge_masks = frame_masks(snapshots, union)
+
+        self.fig, self.ax = plt.subplots(figsize=figsize, dpi=dpi)
+        self.ax.axis("off")
+        self.edges = draw_edges(self.ax, union, pos, width=edge_width, color=edge_color, rasterize="never")
+        self.nodes = draw_nodes(self.ax, union, pos, color=node_color, size=node_size)
+        self.labels = [self.ax.text(*pos[node][:2], str(node), fontsize=9, ha="center", va="center",
+                                    zorder=3, visible=False)
+                       for node in union.nodes()] if show_labels else []
+        self.title = self.ax.set_title("", fontsize=14)
+
+        self.node_colors = np.tile(to_rgba(node_color), (union.number_of_nodes(), 1))
+        self.edge_colors = np.tile(to_rgba(edge_color), (union.number_of_edges(), 1))
+        self.ax.margins(0.05)
+
+    def artists(self) -> List[Any]:
+        """Artists changed by update(), for blitting."""
+        return [self.edges, self.nodes, self.title] + self.labels
+
+    def init(self) -> List[Any]:
+        """Blank frame: blitting draws it as the background, so everything that changes starts hidden."""
+        self.nodes.set_facecolor(np.zeros_like(self.node_colors))
+        self.edges.set_color(np.zeros_like(self.edge_colors))
+        for label in self.labels:
+            label.set_visible(False)
+        self.title.set_text("")
+        return self.artists()
+
+    def update(self, frame: int) -> List[Any]:
+        """Show the nodes and edges of one snapshot by making the others fully transparent."""
+        node_colors = self.node_colors.copy()
+        node_colors[~self.node_masks[frame], 3] = 0.0
+        edge_colors = self.edge_colors.copy()
+        edge_colors[~self.edge_masks[frame], 3] = 0.0
+
+        self.nodes.set_facecolor(node_colors)
+        self.edges.set_color(edge_colors)
+        for label, visible in zip(self.labels, self.node_masks[frame]):
+            label.set_visible(bool(visible))
+        self.title.set_text(self.titles[frame])
+        return self.artists()
+
+    def animation(self, interval: int = 800, blit: bool = True) -> animation.FuncAnimation:
+        """Interactive animation of the frames."""
+        return animation.FuncAnimation(self.fig, self.update, frames=self.n_frames, init_func=self.init,
+                                       interval=interval, blit=blit, repeat=True)
+
+    def save_frames(self, frames: Sequence[int], directory: str) -> List[str]:
+        """Save frames as PNG files named after FRAME_FILE_PATTERN."""
+        paths = []
+        for frame in frames:
+            self.update(frame)
+            path = os.path.join(directory, FRAME_FILE_PATTERN % frame)
+            self.fig.savefig(path)
+            paths.append(path)
+        return paths
+
+    def close(self) -> None:
+        plt.close(self.fig)
+
+
+# Animation of the worker process, built once by init_frame_worker
+_worker_animation: Optional[TemporalAnimation] = None
+
+
+def init_frame_worker(kwargs: Dict[str, Any]) -> None:
+    """Build the figure of a frame-rendering worker on the headless Agg backend."""
+    global _worker_animation
+    matplotlib.use("Agg", force=True)
+    _worker_animation = TemporalAnimation(**kwargs)
+
+
+def render_frame_chunk(task: Tuple[Sequence[int], str]) -> List[str]:
+    frames, directory = task
+    return _worker_animation.save_frames(frames, directory)
+
+
+def render_frames(kwargs: Dict[str, Any], directory: str, jobs: int = 1) -> List[str]:
+    """
+    Render all frames of a TemporalAnimation(**kwargs) as a PNG sequence, with jobs worker processes.
+
+    Each worker builds the figure once and renders a contiguous chunk of frames.
+
+    Returns:
+        Paths of the frames, in frame order
+    """
+    os.makedirs(directory, exist_ok=True)
+    n_frames = len(kwargs["snapshots"])
+    if jobs <= 1 or n_frames <= 1:
+        renderer = TemporalAnimation(**kwargs)
+        try:
+            return renderer.save_frames(range(n_frames), directory)
+        finally:
+            renderer.close()
+
+    chunks = [chunk.tolist() for chunk in np.array_split(np.arange(n_frames), min(jobs, n_frames))]
+    with ProcessPoolExecutor(max_workers=len(chunks), initializer=init_frame_worker,
+                             initargs=(kwargs,)) as executor:
+        return [path for paths in executor.map(render_frame_chunk, [(chunk, directory) for chunk in chunks])
+                for path in paths]
+
+
+def encode_frames(directory: str, output: str, fps: float = DEFAULT_FPS) -> None:
+    """Encode a PNG sequence rendered by render_frames into a GIF (pillow) or an MP4/WebM video (ffmpeg)."""
+    output_format = animation_format(output)
+    if output_format == "gif":
+        from PIL import Image
+
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".png"))
+        frames = [Image.open(path).convert("RGB") for path in paths]
+        frames[0].save(output, save_all=True, append_images=frames[1:], duration=int(1000 / fps), loop=0)
+    elif output_format in FFMPEG_CODECS:
+        if not ffmpeg_available():
+            raise RuntimeError(f"ffmpeg is required to write {output}, save a .gif or a PNG directory instead")
+        ffmpeg = matplotlib.rcParams["animation.ffmpeg_path"]
+        subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-framerate", str(fps),
+                        "-i", os.path.join(directory, FRAME_FILE_PATTERN)] + FFMPEG_CODECS[output_format] + [output],
+                       check=True)
+    else:
+        raise ValueError(f"Frames are already a PNG sequence in {directory}")
+
+
+def save_animation(kwargs: Dict[str, Any], output: str, fps: float = DEFAULT_FPS, jobs: int = 1) -> str:
+    """
+    Save the animation of TemporalAnimation(**kwargs) to a .gif, .mp4 or .webm file or a PNG directory.
+
+    With one job, frames are streamed to the pillow or ffmpeg writer; with more, they are rendered in
+    parallel as a PNG sequence and then encoded.
+
+    Raises:
+        ValueError: If the output format is unknown
+        RuntimeError: If ffmpeg is needed but not installed
+    """
+    output_format = animation_format(output)
+    if output_format in FFMPEG_CODECS and not ffmpeg_available():
+        raise RuntimeError(f"ffmpeg is required to write {output}, save a .gif or a PNG directory instead")
+
+    if output_format == "png":
+        render_frames(kwargs, output, jobs)
+    elif jobs > 1:
+        directory = tempfile.mkdtemp(prefix="frames-")
+        try:
+            render_frames(kwargs, directory, jobs)
+            encode_frames(directory, output, fps)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    else:
+        renderer = TemporalAnimation(**kwargs)
+        try:
+            writer = (animation.PillowWriter(fps=fps) if output_format == "gif" else
+                      animation.FFMpegWriter(fps=fps, extra_args=FFMPEG_CODECS[output_format]))
+            with writer.saving(renderer.fig, output, renderer.fig.dpi):
+                for frame in range(renderer.n_frames):
+                    renderer.update(frame)
+                    writer.grab_frame()
+        finally:
+            renderer.close()
+    return output